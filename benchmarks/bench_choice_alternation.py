@@ -0,0 +1,87 @@
+"""Benchmark for matching a choice of many options.
+
+Compares per-line matching time of a flat alternation, i.e. ``a|b|c``,
+with the factored alternation which ElementPattern builds for
+``choice(...)``, e.g. ``Gig(?:E|abitEthernet)|TenGig(?:E|abitEthernet)``,
+as the number of options grows.  The factored alternation tries a shared
+prefix once instead of once per option.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_choice_alternation.py [--options N ...] [--lines N]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from regexapp import ElementPattern
+
+PREFIXES = [
+    'GigabitEthernet', 'GigE', 'TenGigabitEthernet', 'TenGigE', 'FastEthernet',
+    'Ethernet', 'Port-channel', 'Loopback', 'Vlan', 'Tunnel', 'Serial', 'mgmt'
+]
+
+
+def get_options(total):
+    options = []
+    for index in range(total):
+        prefix = PREFIXES[index % len(PREFIXES)]
+        options.append('{}0/0/{}'.format(prefix, index // len(PREFIXES)))
+    return options
+
+
+def get_lines(options, total_lines):
+    rand = random.Random(0)
+    lines = []
+    for _ in range(total_lines):
+        if rand.random() < 0.5:
+            name = rand.choice(options)
+        else:
+            name = '{}9/9/{}'.format(rand.choice(PREFIXES), rand.randint(0, 99))
+        lines.append('interface {} is up'.format(name))
+    return lines
+
+
+def get_patterns(options):
+    flat = '|'.join(re.escape(option) for option in options)
+    flat_pattern = r'interface (?P<intf>{}) is'.format(flat)
+    choice = 'choice({}, var_intf)'.format(', '.join(options))
+    factored_pattern = r'interface {} is'.format(ElementPattern(choice))
+    return re.compile(flat_pattern), re.compile(factored_pattern)
+
+
+def run(regex, lines):
+    result = []
+    start = time.perf_counter()
+    for line in lines:
+        match = regex.search(line)
+        result.append(match.groupdict() if match else None)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--options', type=int, nargs='+', default=[4, 16, 64, 128, 256])
+    parser.add_argument('--lines', type=int, default=20000)
+    options = parser.parse_args()
+
+    print('{:>8} {:>12} {:>12} {:>9}'.format('options', 'flat us', 'factored us', 'speedup'))
+    for total in options.options:
+        choices = get_options(total)
+        lines = get_lines(choices, options.lines)
+        flat_regex, factored_regex = get_patterns(choices)
+
+        flat_time, flat_result = run(flat_regex, lines)
+        factored_time, factored_result = run(factored_regex, lines)
+        assert flat_result == factored_result
+
+        flat_us = flat_time / len(lines) * 10 ** 6
+        factored_us = factored_time / len(lines) * 10 ** 6
+        print('{:>8} {:>12.3f} {:>12.3f} {:>8.2f}x'.format(
+            total, flat_us, factored_us, flat_time / factored_time))
+
+
+if __name__ == '__main__':
+    main()
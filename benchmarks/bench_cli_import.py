@@ -0,0 +1,88 @@
+"""Import-time regression check for the command-line interface.
+
+Runs ``python -X importtime -c "import regexapp.main"`` several times and
+checks the core CLI path against a budget:
+
+- GUI and process-pool modules, i.e. tkinter, regexapp.application, and
+  concurrent.futures.process, must not be imported.
+- Median self time of regexapp modules must stay within ``--budget``.
+- Median total import time must stay within ``--total-budget`` if given;
+  it includes third-party packages, so it depends on the machine.
+
+Exits with status 1 if the budget is exceeded.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_cli_import.py [--runs N] [--budget MS] [--total-budget MS]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+FORBIDDEN_MODULES = ['tkinter', 'regexapp.application', 'concurrent.futures.process']
+
+
+def get_import_times(module):
+    cmd = [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    table = dict()
+    pattern = r'import time: +(?P<self>\d+) \| +(?P<total>\d+) \| (?P<name> *\S+)$'
+    for line in result.stderr.splitlines():
+        match = re.match(pattern, line)
+        if match:
+            name = match.group('name').strip()
+            table[name] = (int(match.group('self')) / 1000, int(match.group('total')) / 1000)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='regexapp.main')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=100.0,
+                        help='budget of self time of regexapp modules in ms.')
+    parser.add_argument('--total-budget', type=float, default=0.0,
+                        help='budget of total import time in ms.  Default is no budget.')
+    options = parser.parse_args()
+
+    own_times, total_times, tables = [], [], []
+    for _ in range(options.runs):
+        table = get_import_times(options.module)
+        tables.append(table)
+        own_times.append(sum(
+            self_time for name, (self_time, _) in table.items()
+            if name == 'regexapp' or name.startswith('regexapp.')
+        ))
+        total_times.append(table[options.module][1])
+
+    is_failed = False
+    imported = sorted(set(name for table in tables for name in table))
+    for name in FORBIDDEN_MODULES:
+        if name in imported:
+            print('FAILED: {} is imported'.format(name))
+            is_failed = True
+
+    own_time = statistics.median(own_times)
+    total_time = statistics.median(total_times)
+    print('regexapp modules   : {:8.1f} ms (budget {:.1f} ms)'.format(own_time, options.budget))
+    print('total import       : {:8.1f} ms'.format(total_time))
+
+    slowest = sorted(tables[-1].items(), key=lambda item: -item[1][0])[:5]
+    for name, (self_time, _) in slowest:
+        print('  {:<32} {:8.1f} ms'.format(name, self_time))
+
+    if own_time > options.budget:
+        print('FAILED: regexapp modules exceed budget')
+        is_failed = True
+    if options.total_budget and total_time > options.total_budget:
+        print('FAILED: total import exceeds budget of {:.1f} ms'.format(options.total_budget))
+        is_failed = True
+
+    sys.exit(1 if is_failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Microbenchmark for parsing keyword(params) of ElementPattern.
+
+Compares the per-argument ``re.match`` chain that every build strategy
+used to run against the single-pass ElementParams tokenizer, over
+elements built from the keywords in ``system_references.yaml``.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_element_params.py [--repeat N]
+"""
+
+import argparse
+import re
+import timeit
+
+from regexapp.collection import REF
+from regexapp.collection import ElementPattern
+from regexapp.collection import ElementParams
+
+ARGUMENTS = [
+    'var_name', 'or_empty', 'word_bound', 'head_ws', 'tail_ws',
+    'repetition_1_3', '0_or_more_occurrence', 'meta_data_filldown',
+    'or_digits', 'or_repeat_2_3_spaces', 'abc',
+]
+
+
+def legacy_parse(params):
+    """classify arguments with one re.match call per argument kind"""
+    arguments = re.split(r' *, *', params) if params else []
+    result = []
+    for arg in arguments:
+        if re.match(r'var_(?P<name>\w+)$', arg, flags=re.I):
+            result.append('var')
+        elif re.match(ElementPattern.word_bound_pattern, arg):
+            result.append('word_bound')
+        elif re.match(ElementPattern.head_pattern, arg):
+            result.append('head')
+        elif re.match(ElementPattern.tail_pattern, arg):
+            result.append('tail')
+        elif re.match(ElementPattern.repetition_pattern, arg):
+            result.append('repetition')
+        elif re.match(ElementPattern.occurrence_pattern, arg):
+            result.append('occurrence')
+        elif re.match(ElementPattern.meta_data_pattern, arg):
+            result.append('meta_data')
+        elif re.match(r'or_(?P<case>[^,]+)', arg, flags=re.I):
+            result.append('or_case')
+        else:
+            result.append('text')
+    return result
+
+
+def single_pass_parse(params):
+    """classify arguments with the ElementParams tokenizer"""
+    return [arg.kind for arg in ElementParams('', params).arguments]
+
+
+def get_elements():
+    params = ', '.join(ARGUMENTS)
+    return ['{}({})'.format(keyword, params) for keyword in REF]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    elements = get_elements()
+    params = ', '.join(ARGUMENTS)
+    total = options.repeat * len(elements)
+
+    legacy = timeit.timeit(lambda: legacy_parse(params), number=total)
+    single = timeit.timeit(lambda: single_pass_parse(params), number=total)
+
+    def build_all():
+        for element in elements:
+            ElementPattern.pattern_cache.clear()
+            ElementPattern(element)
+
+    build = timeit.timeit(build_all, number=options.repeat)
+
+    print('keywords           : {}'.format(len(elements)))
+    print('arguments/element  : {}'.format(len(ARGUMENTS)))
+    print('legacy parse       : {:8.2f} us/element'.format(legacy / total * 1e6))
+    print('single-pass parse  : {:8.2f} us/element'.format(single / total * 1e6))
+    print('speedup            : {:8.2f}x'.format(legacy / single))
+    print('uncached build     : {:8.2f} us/element'.format(build / total * 1e6))
+
+
+if __name__ == '__main__':
+    main()
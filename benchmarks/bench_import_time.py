@@ -0,0 +1,56 @@
+"""Benchmark for import time of regexapp.
+
+Every run imports regexapp in a new interpreter with its own home
+directory, then builds a first keyword pattern.  References are loaded on
+first use, so import itself touches no reference file.  A cold run starts
+without reference cache, so references are YAML-parsed and cached; a warm
+run loads reference tables from cache.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_import_time.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CODE = """
+import time
+start = time.perf_counter()
+import regexapp
+middle = time.perf_counter()
+regexapp.LinePattern('word(var_name)')
+print(middle - start, time.perf_counter() - middle)
+"""
+
+
+def import_time(home):
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    output = subprocess.check_output([sys.executable, '-c', CODE], env=env)
+    return [float(value) for value in output.splitlines()[-1].split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    options = parser.parse_args()
+
+    cold, warm = [], []
+    for _ in range(options.runs):
+        with tempfile.TemporaryDirectory() as home:
+            cold.append(import_time(home))
+            warm.append(import_time(home))
+
+    fmt = '{:<16} {:<10} : median {:7.1f} ms  min {:7.1f} ms'
+    for name, result in [('cold (no cache)', cold), ('warm (cached)', warm)]:
+        for index, step in enumerate(['import', 'first use']):
+            values = [item[index] * 1000 for item in result]
+            print(fmt.format(name, step, statistics.median(values), min(values)))
+
+
+if __name__ == '__main__':
+    main()
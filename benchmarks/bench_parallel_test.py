@@ -0,0 +1,51 @@
+"""Benchmark for matching test data in a process pool.
+
+Shards test data across 1, 2, 4 and 8 worker processes with
+PatternSet.iter_records, i.e. the engine of RegexBuilder.test(workers=N),
+and checks that every run yields the same records as the serial run.
+Speedup is bounded by number of processors of the machine.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_parallel_test.py [--patterns N] [--lines N]
+"""
+
+import argparse
+import os
+import time
+
+from regexapp import PatternSet
+
+from bench_pattern_scanning import get_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--patterns', type=int, default=500)
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    options = parser.parse_args()
+
+    patterns, lines = get_data(options.patterns, options.lines)
+    pattern_set = PatternSet(patterns)
+
+    print('processors         : {}'.format(os.cpu_count()))
+    print('patterns           : {}'.format(len(patterns)))
+    print('lines              : {}'.format(len(lines)))
+
+    expected = None
+    serial_time = None
+    for workers in options.workers:
+        start = time.perf_counter()
+        records = list(pattern_set.iter_records(lines, workers=workers))
+        elapsed = time.perf_counter() - start
+
+        expected = expected or records
+        assert records == expected
+        serial_time = serial_time or elapsed
+        fmt = 'workers {:<2}         : {:8.3f} s  speedup {:6.2f}x'
+        print(fmt.format(workers, elapsed, serial_time / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark for deduplicating patterns while building large user data.
+
+RegexBuilder.build appends a pattern only if patterns do not contain it.
+With a plain list, every check scans the list, so n lines cost O(n**2).
+IndexedList keeps a hash index, so the check is O(1) and a build scales
+linearly.  The dedup step is timed alone for both containers, then the
+full build is timed, at 10k, 50k and 100k lines by default.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_pattern_dedup.py [--lines N [N ...]] [--list-max N]
+"""
+
+import argparse
+import time
+
+from regexapp import RegexBuilder
+from regexapp.collection import IndexedList
+
+
+def get_user_data(total_lines):
+    lines = [
+        'Counter{} word(var_name) digits(var_value) end'.format(index % (total_lines // 2 or 1))
+        for index in range(total_lines)
+    ]
+    return '\n'.join(lines)
+
+
+def dedup(container, patterns):
+    lst = container()
+    start = time.perf_counter()
+    for pattern in patterns:
+        pattern not in lst and lst.append(pattern)
+    return time.perf_counter() - start, len(lst)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--list-max', type=int, default=50000,
+                        help='skip list dedup above this number of lines.')
+    options = parser.parse_args()
+
+    fmt = '{:>8} lines: build {:8.3f} s ({:6.2f} us/line)  dedup IndexedList {:7.3f} s  list {}'
+    for total_lines in options.lines:
+        factory = RegexBuilder(
+            user_data=get_user_data(total_lines), is_line=True, deferred_validation=True
+        )
+        start = time.perf_counter()
+        factory.build()
+        build_time = time.perf_counter() - start
+
+        patterns = [factory.user_data_pattern_table[line] for line in factory.get_lst_of_user_data()]
+        indexed_time, total = dedup(IndexedList, patterns)
+        assert total == len(factory.patterns)
+        if total_lines <= options.list_max:
+            list_time, list_total = dedup(list, patterns)
+            assert list_total == total
+            list_result = '{:7.3f} s'.format(list_time)
+        else:
+            list_result = 'skipped'
+
+        print(fmt.format(
+            total_lines, build_time, build_time / total_lines * 1e6,
+            indexed_time, list_result
+        ))
+
+
+if __name__ == '__main__':
+    main()
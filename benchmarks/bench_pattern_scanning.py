@@ -0,0 +1,99 @@
+"""Benchmark for scanning test data against many line patterns.
+
+Compares the nested loop that RegexBuilder.test used to run, i.e. every
+pattern searched against every line, with the single-pass PatternSet
+engine which only tries a pattern against lines containing its required
+literal.  With a few patterns, literals are checked with ``in``; with
+many patterns, each line is scanned once for all literals.
+
+Usage
+-----
+    PYTHONPATH=. python benchmarks/bench_pattern_scanning.py [--patterns N] [--lines N]
+"""
+
+import argparse
+import random
+import time
+
+from regexapp import LinePattern
+from regexapp import PatternSet
+
+KEYWORDS = ['word', 'digits', 'mac_address', 'ipv4_address', 'mixed_word', 'number']
+
+VALUES = dict(
+    word='GigabitEthernet', digits='1500', mac_address='00:1a:2b:3c:4d:5e',
+    ipv4_address='10.0.0.1', mixed_word='eth0/1', number='-2.5'
+)
+
+
+def get_data(total_patterns, total_lines):
+    rand = random.Random(0)
+    templates = []
+    for index in range(total_patterns):
+        first, second = rand.sample(KEYWORDS, 2)
+        templates.append((index, first, second))
+
+    patterns = [
+        LinePattern('Counter{} word(var_name) {}(var_a) value{} {}(var_b)'.format(
+            index, first, index, second))
+        for index, first, second in templates
+    ]
+
+    lines = []
+    for _ in range(total_lines):
+        if rand.random() < 0.2:
+            index, first, second = rand.choice(templates)
+            line = 'Counter{} state {} value{} {}'.format(
+                index, VALUES[first], index, VALUES[second])
+        else:
+            line = 'log message {} without any counter'.format(rand.randint(0, 10 ** 6))
+        lines.append(line)
+    return patterns, lines
+
+
+def nested_loop(pattern_set, lines):
+    result = []
+    for entry in pattern_set:
+        for line in lines:
+            match = entry.regex.search(line)
+            match and result.append((entry.index, line))
+    return len(result)
+
+
+def single_pass(pattern_set, lines):
+    result = []
+    for line in lines:
+        for item in pattern_set.match_all(line):
+            result.append((item.entry.index, line))
+    return len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--patterns', type=int, default=500)
+    parser.add_argument('--lines', type=int, default=20000)
+    options = parser.parse_args()
+
+    patterns, lines = get_data(options.patterns, options.lines)
+    pattern_set = PatternSet(patterns)
+
+    start = time.perf_counter()
+    nested_total = nested_loop(pattern_set, lines)
+    nested_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single_total = single_pass(pattern_set, lines)
+    single_time = time.perf_counter() - start
+
+    assert nested_total == single_total
+
+    print('patterns           : {}'.format(len(patterns)))
+    print('lines              : {}'.format(len(lines)))
+    print('matches            : {}'.format(single_total))
+    print('nested loop        : {:8.3f} s'.format(nested_time))
+    print('single pass        : {:8.3f} s'.format(single_time))
+    print('speedup            : {:8.2f}x'.format(nested_time / single_time))
+
+
+if __name__ == '__main__':
+    main()
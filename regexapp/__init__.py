@@ -16,6 +16,7 @@ Features
   * `PatternBuilder` for assembling complex regex patterns.
   * `PatternReference` for accessing predefined system references
     from `system_references.yaml`.
+  * `PatternSet` for matching test data against precompiled patterns.
 - Customization:
   * End-users can override or extend predefined patterns by editing
     `~/.geekstrident/regexapp/user_references.yaml`.
@@ -28,6 +29,8 @@ Features
     and validating regex-based test workflows.
   * `add_reference` and `remove_reference` for managing reference
     entries programmatically.
+  * `refresh_references` for reloading a changed
+    `user_references.yaml`.
 
 Metadata
 --------
@@ -44,24 +47,46 @@ Notes
   `.geekstrident/regexapp/`.
 - This module centralizes imports and metadata for convenience,
   making regexapp easier to use directly from the top-level package.
+  Pattern classes and builders are imported on first access.
 """
 
-from regexapp.collection import TextPattern
-from regexapp.collection import ElementPattern
-from regexapp.collection import LinePattern
-from regexapp.collection import PatternBuilder
-from regexapp.collection import MultilinePattern
-from regexapp.collection import PatternReference
-from regexapp.core import RegexBuilder
-from regexapp.core import DynamicTestScriptBuilder
-from regexapp.core import add_reference
-from regexapp.core import remove_reference
+import importlib
 
 from regexapp.config import version
 from regexapp.config import edition
 __version__ = version
 __edition__ = edition
 
+# pattern classes and builders are imported on first access, so
+# `regexapp.main` can forward a request to a daemon without loading them
+lazy_imports = dict(
+    TextPattern='regexapp.collection',
+    ElementPattern='regexapp.collection',
+    LinePattern='regexapp.collection',
+    PatternBuilder='regexapp.collection',
+    MultilinePattern='regexapp.collection',
+    PatternReference='regexapp.collection',
+    PatternSet='regexapp.collection',
+    RegexBuilder='regexapp.core',
+    DynamicTestScriptBuilder='regexapp.core',
+    add_reference='regexapp.core',
+    remove_reference='regexapp.core',
+    refresh_references='regexapp.core',
+)
+
+
+def __getattr__(name):
+    if name not in lazy_imports:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(importlib.import_module(lazy_imports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(lazy_imports))
+
+
 __all__ = [
     'TextPattern',
     'ElementPattern',
@@ -69,10 +94,12 @@ __all__ = [
     'MultilinePattern',
     'PatternBuilder',
     'PatternReference',
+    'PatternSet',
     'RegexBuilder',
     'DynamicTestScriptBuilder',
     'add_reference',
     'remove_reference',
+    'refresh_references',
     'version',
     'edition',
 ]
@@ -0,0 +1,142 @@
+"""
+regexapp.client
+===============
+Client side of the regexapp daemon mode.
+
+The CLI imports this module before it knows if a daemon is running, so
+it only depends on `socket`, `json`, and `regexapp.config`.  Pattern
+conversion modules are imported by `regexapp.daemon` and only in the
+daemon process or if a request is processed locally.
+
+Contents
+--------
+Functions
+---------
+get_default_address() -> str
+    Return the default daemon address of this platform.
+parse_address(address) -> tuple
+    Return a socket family and a socket address of a daemon address.
+
+Classes
+-------
+DaemonClient
+    Forward CLI requests to a running daemon.
+"""
+
+import os
+import json
+import socket
+
+from regexapp.config import Data
+from regexapp.config import version
+
+
+def get_default_address():
+    """
+    Return the default daemon address of this platform.
+
+    Returns
+    -------
+    str
+        A Unix domain socket file name if the platform supports it,
+        otherwise ``127.0.0.1:<Data.daemon_port>``.
+    """
+    if hasattr(socket, 'AF_UNIX'):
+        return Data.daemon_socket_filename
+    return '127.0.0.1:{}'.format(Data.daemon_port)
+
+
+def parse_address(address=''):
+    """
+    Return a socket family and a socket address of a daemon address.
+
+    Parameters
+    ----------
+    address : str, optional
+        A Unix domain socket file name, or ``host:port`` for TCP.
+        Default is empty, i.e. `get_default_address`.
+
+    Returns
+    -------
+    tuple
+        A socket family and a socket address.
+    """
+    address = address or get_default_address()
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and os.sep not in address:
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+
+class DaemonClient:
+    """
+    Forward CLI requests to a running daemon.
+
+    Attributes
+    ----------
+    address : str
+        A Unix domain socket file name, or ``host:port`` for TCP.
+    timeout : float
+        Timeout of connecting to a daemon in seconds.
+
+    Methods
+    -------
+    is_available() -> bool
+    request(request) -> dict
+    """
+    timeout = 1.0
+
+    def __init__(self, address=''):
+        self.family, self.socket_address = parse_address(address)
+        self.address = address or get_default_address()
+
+    def connect(self):
+        """Return a connected socket, or None if no daemon listens."""
+        if self.family == socket.AF_UNIX and not os.path.exists(self.socket_address):
+            return None
+
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_address)
+        except OSError:
+            sock.close()
+            return None
+        sock.settimeout(None)
+        return sock
+
+    def is_available(self):
+        """Return True if a daemon of the same version answers a ping."""
+        response = self.request(dict(command='ping'))
+        return bool(response) and response.get('version') == version
+
+    def request(self, request):
+        """
+        Send a request to a daemon.
+
+        Parameters
+        ----------
+        request : dict
+            A request of `process_request`.
+
+        Returns
+        -------
+        dict
+            A response with `status` and `output`, or None if no daemon
+            is available or it rejects a request, e.g. another version.
+        """
+        sock = self.connect()
+        if not sock:
+            return None
+
+        request = dict(request, version=version)
+        try:
+            with sock, sock.makefile('rwb') as stream:
+                data = json.dumps(request, default=str) + '\n'
+                stream.write(data.encode('utf-8'))
+                stream.flush()
+                line = stream.readline()
+            response = json.loads(line.decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+        return None if 'error' in response else response
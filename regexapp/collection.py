@@ -1,10 +1,18 @@
 """Module containing the logic for the collection of pattern."""
 
+import os
 import re
+import json
 import yaml
 import string
+import hashlib
+import pickle
+import sys
+import threading
+import time
 from textwrap import dedent
 from copy import copy
+from collections import OrderedDict
 
 from regexapp.exceptions import EscapePatternError
 from regexapp.exceptions import PatternReferenceError
@@ -13,15 +21,25 @@ from regexapp.exceptions import ElementPatternError
 from regexapp.exceptions import LinePatternError
 from regexapp.exceptions import MultilinePatternError
 from regexapp.exceptions import PatternBuilderError
+from regexapp.exceptions import PatternSetError
+from regexapp.exceptions import PatternAnalysisError
 from regexapp.config import Data
 
 from genericlib import File
 from genericlib.text import WHITESPACE_CHARS
 from genericlib.text import Line
 
+try:
+    from re import _parser as sre_parse
+except ImportError:     # Python < 3.11
+    import sre_parse
+
 import logging
 logger = logging.getLogger(__file__)
 
+POSSESSIVE_REPEAT = getattr(sre_parse, 'POSSESSIVE_REPEAT', None)
+ATOMIC_GROUP = getattr(sre_parse, 'ATOMIC_GROUP', None)
+
 
 def validate_pattern(pattern, flags=0, exception_cls=None):
     """validate a pattern
@@ -30,11 +48,44 @@ def validate_pattern(pattern, flags=0, exception_cls=None):
     ----------
     pattern (str): a pattern.
     exception_cls (Exception): an exception class.  Default is None.
+
+    Returns
+    -------
+    re.Pattern: a compiled pattern, or None if validation is deferred
+            to the outermost pattern of a build.
+    """
+    if DeferredValidation.is_active() and BuildContext.is_nested():
+        return None
+
+    exception_cls = exception_cls or Exception
+    try:
+        return re.compile(pattern, flags=flags)
+    except Exception as ex:
+        msg = '{} - {}'.format(type(ex).__name__, ex)
+        raise exception_cls(msg)
+
+
+def compile_deferred_pattern(pattern, rebuild, exception_cls=None):
+    """compile a final pattern which is built in deferred validation mode
+
+    Parameters
+    ----------
+    pattern (str): a final pattern.
+    rebuild (callable): a callable to rebuild a pattern with validation
+            enabled.  It is invoked when the final pattern is invalid
+            to locate the offending fragment.
+    exception_cls (Exception): an exception class.  Default is None.
+
+    Returns
+    -------
+    re.Pattern: a compiled pattern.
     """
     exception_cls = exception_cls or Exception
     try:
-        re.compile(pattern, flags=flags)
+        return re.compile(pattern)
     except Exception as ex:
+        with DeferredValidation(enabled=False):
+            rebuild()
         msg = '{} - {}'.format(type(ex).__name__, ex)
         raise exception_cls(msg)
 
@@ -70,6 +121,162 @@ def do_soft_regex_escape(pattern, is_validated=True):
     return new_pattern
 
 
+def get_required_literal(pattern):
+    """return the longest literal text which every match of a pattern contains
+
+    Parameters
+    ----------
+    pattern (str): a regex pattern.
+
+    Returns
+    -------
+    str: a required literal text or empty string if there is none.
+    """
+    runs = get_literal_runs(pattern)
+    return max(runs, key=len) if runs else ''
+
+
+def get_literal_runs(pattern):
+    """return runs of literal text which every match of a pattern contains
+
+    Only literal text at the top level of a pattern is taken into account,
+    i.e. text inside a group, a character class, or under a quantifier that
+    allows zero occurrence is skipped.
+
+    Parameters
+    ----------
+    pattern (str): a regex pattern.
+
+    Returns
+    -------
+    list: a list of literal text, or None if a pattern has a top-level
+            alternation or ignore-case, verbose flags.
+    """
+    pattern = str(pattern)
+    match = re.match(r'[(][?](?P<flags>[aiLmsux]+)[)]', pattern)
+    if match:
+        if re.search('[ix]', match.group('flags')):
+            return None
+        pattern = pattern[match.end():]
+
+    escapes = dict(x=2, u=4, U=8)
+    quantifier_pat = re.compile(r'[{](?P<min>\d*)(,\d*)?[}]')
+    runs, run = [], []
+    index, total = 0, len(pattern)
+
+    def end_run():
+        run and runs.append(''.join(run))
+        run.clear()
+
+    while index < total:
+        char = pattern[index]
+        if char == '\\':
+            nxt = pattern[index + 1:index + 2]
+            if nxt and not nxt.isalnum() and nxt != '_':
+                run.append(nxt)
+                index += 2
+                continue
+            end_run()
+            index += 2 + escapes.get(nxt, 0)
+            if nxt == 'N' and pattern[index:index + 1] == '{':
+                index = pattern.find('}', index) + 1 or total
+            while nxt.isdigit() and pattern[index:index + 1].isdigit():
+                index += 1
+            continue
+
+        if char in '[(':
+            end_run()
+            index = skip_group(pattern, index)
+            continue
+
+        if char == '|':
+            return None
+
+        if char in '*?+{':
+            match = quantifier_pat.match(pattern, index) if char == '{' else None
+            if char == '{' and not match:
+                run.append(char)
+                index += 1
+                continue
+            is_optional = char in '*?' or (match and match.group('min') in ('', '0'))
+            is_optional and run and run.pop()
+            end_run()
+            index = match.end() if match else index + 1
+            while pattern[index:index + 1] in ('?', '+') and index < total:
+                index += 1
+            continue
+
+        if char in '.^$':
+            end_run()
+        else:
+            run.append(char)
+        index += 1
+
+    end_run()
+    return runs
+
+
+def skip_group(pattern, index):
+    """return an index after a group or a character class
+
+    Parameters
+    ----------
+    pattern (str): a regex pattern.
+    index (int): an index of opening parenthesis or opening bracket.
+
+    Returns
+    -------
+    int: an index after the matching closing parenthesis or bracket.
+    """
+    depth, total = 0, len(pattern)
+    in_class = False
+    while index < total:
+        char = pattern[index]
+        if char == '\\':
+            index += 2
+            continue
+        if in_class:
+            if char == ']' and not is_class_start(pattern, index):
+                in_class = False
+                if not depth:
+                    return index + 1
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if not depth:
+                return index + 1
+        index += 1
+    return total
+
+
+def restore_pattern(cls, pattern):
+    """recreate a pattern instance from its regex pattern without conversion
+
+    Attributes of instance are restored by pickle or copy from a state
+    of `__reduce__`, so a pattern round-trips with its metadata.
+
+    Parameters
+    ----------
+    cls (class): a pattern class, i.e. TextPattern, ElementPattern,
+            LinePattern, MultilinePattern, or PatternBuilder.
+    pattern (str): a regex pattern.
+
+    Returns
+    -------
+    str: an instance of pattern class.
+    """
+    return str.__new__(cls, pattern)
+
+
+def is_class_start(pattern, index):
+    """check if a closing bracket is a first literal member of a character class"""
+    prefix = pattern[:index]
+    return prefix.endswith('[') or prefix.endswith('[^')
+
+
 class VarCls:
     """Use to store variable for pattern
 
@@ -113,2286 +320,5507 @@ class VarCls:
         return result
 
 
-class PatternReference(dict):
-    """Use to load regular expression pattern from system_references.yaml
-    or/and user_references.yaml
+class BuildContext:
+    """Use to store per-call state while converting text to regex pattern
+
+    Every ElementPattern and LinePattern construction activates its own
+    context on a per-thread stack, so nested or concurrent constructions
+    never share variables, nodes, or head/tail patterns.
 
     Attribute
     ---------
-    sys_ref_loc (str): a system references file name.
-    user_ref_loc (str): a user references file name.
+    variable (VarCls): a regex variable of an element pattern.
+    or_empty (bool): a flag if element pattern is expecting a zero match.
+    prepended_pattern (str): a start of string pattern of an element pattern.
+    appended_pattern (str): an end of string pattern of an element pattern.
+    variables (list): a list of pattern variable of a line pattern.
+    nodes (list): a list of PatternNode of sub-pattern of a line pattern.
+    node (SequenceNode): a node of a line or multiline pattern.
+    compiled (re.Pattern): a compiled pattern if pattern is validated.
+    required_literal (str): a literal text which every match contains.
 
     Methods
     -------
-    load_reference(filename) -> None
-    PatternReference.get_pattern_layout(name) -> str
-    is_violated(dict_obj) -> bool
-    test(self, content) -> bool
-
-    Raises
-    ------
-    PatternReferenceError: raise exception if filename doesn't exist or
-            an invalid format
+    BuildContext.get_current() -> BuildContext
+    BuildContext.is_nested() -> bool
+    finalize(pattern, rebuild, exception_cls=None) -> re.Pattern
     """
-
-    # regexp pattern - from system references
-    sys_ref_loc = Data.system_reference_filename
-    # regex patterns - from user references
-    user_ref_loc = Data.user_reference_filename
+    _local = threading.local()
 
     def __init__(self):
-        super().__init__()
-        self.load_sys_ref()
-        self.load_reference(self.user_ref_loc)
-        self.test_result = ''
-        self.violated_format = ''
+        self.variable = VarCls()
+        self.or_empty = False
+        self.prepended_pattern = ''
+        self.appended_pattern = ''
+        self.variables = []
+        self.nodes = []
+        self.node = None
+        self.compiled = None
+        self.required_literal = ''
+
+    def __enter__(self):
+        stack = self.__class__._get_stack()
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stack = self.__class__._get_stack()
+        stack and stack[-1] is self and stack.pop()
 
-    def load_sys_ref(self):
-        with open(self.sys_ref_loc) as stream:
-            yaml_obj = yaml.safe_load(stream)
-            self.update(yaml_obj)
+    @classmethod
+    def _get_stack(cls):
+        stack = getattr(cls._local, 'stack', None)
+        if stack is None:
+            stack = cls._local.stack = []
+        return stack
 
-    def load_reference(self, filename, is_warning=True):
-        """Load reference from YAML references file.
-        Parameters
-        ----------
-        filename (str): a file name.
+    @classmethod
+    def get_current(cls):
+        """return an active build context of current thread
 
         Returns
         -------
-        None: no return
-
-        Raises
-        ------
-        PatternReferenceError: raise exception if filename doesn't exist or
-                an invalid format
+        BuildContext: an active build context.  If there is no active
+                context, i.e. a build method is invoked directly, a new
+                detached context is returned.
         """
-
-        if not File.is_exist(filename):
-            if filename == self.user_ref_loc:
-                sample_file = Data.sample_user_keywords_filename
-                File.create(filename)
-                File.copy_file(sample_file, filename)
-            else:
-                msg = '{} is NOT FOUND.'.format(filename)
-                raise PatternReferenceError(msg)
-
-        try:
-            with open(filename) as stream:
-                yaml_obj = yaml.safe_load(stream)
-
-                if not yaml_obj:
-                    return
-
-                if not isinstance(yaml_obj, dict):
-                    fmt = '{} must be structure as dictionary.'
-                    raise PatternReferenceError(fmt.format(filename))
-
-                for key, value in yaml_obj.items():
-                    if key not in self:
-                        self[key] = value
-                    else:
-                        if key == 'datetime':
-                            self[key] = value
-                        else:
-                            fmt = ('%r key is already existed.  '
-                                   'Wont update %r data to key.')
-                            is_warning and logger.warning(fmt, key, value)
-        except Exception as ex:
-            msg = '{} - {}'.format(type(ex).__name__, ex)
-            raise PatternReferenceError(msg)
+        stack = cls._get_stack()
+        return stack[-1] if stack else cls()
 
     @classmethod
-    def get_pattern_layout(cls, name):
-        layout1 = """
-            name_placeholder:
-              ##################################################################
-              # double back flash must be used in a value of pattern if needed
-              # positive test and/or negative test is/are optional
-              ##################################################################
-              group: "replace_me"
-              description: "replace_me"
-              pattern: "replace_me"
-              # positive test:
-              #   change this positive test name: "replace_me -> (string or list of string)"
-              # negative test:
-              #   change this negative test name: "replace_me -> (string or list of string)"
-        """
-        layout2 = """
-            name_placeholder:
-              ##################################################################
-              # double back flash must be used in a value of format if needed
-              # positive test and/or negative test is/are optional
-              ##################################################################
-              group: "replace_me"
-              description: "replace_me"
-              format: "replace_me"
-              # format1: "replace_me"
-              # format2: "replace_me"
-              # formatn: "replace_me"
-              # positive test:
-              #   change this positive test name: "replace_me -> (string or list of string)"
-              # negative test:
-              #   change this negative test name: "replace_me -> (string or list of string)"
+    def is_nested(cls):
+        """check if there is an active build context in current thread
+
+        Returns
+        -------
+        bool: True if a pattern is being built inside another pattern.
         """
-        layout1, layout2 = dedent(layout1).strip(), dedent(layout2).strip()
-        return layout2 if 'datetime' in name else layout1
+        return bool(cls._get_stack())
 
-    def is_violated(self, dict_obj):
-        """Check if new pattern reference doesn't violate with system reference
+    def finalize(self, pattern, rebuild, exception_cls=None):
+        """return a compiled pattern of a finished build
+
+        In deferred validation mode, the outermost pattern is compiled
+        here once instead of validating every fragment.
 
         Parameters
         ----------
-        dict_obj (dict): a dict object.
+        pattern (str): a final pattern.
+        rebuild (callable): a callable to rebuild a pattern with validation.
+        exception_cls (Exception): an exception class.  Default is None.
 
         Returns
         -------
-        bool: True there is a violation.
+        re.Pattern: a compiled pattern or None.
         """
-        with open(self.sys_ref_loc) as stream:
-            sys_ref = yaml.safe_load(stream)
-            fmt = '{} is ALREADY existed in system_references.yaml'
-            for name in dict_obj:
-                if 'datetime' not in name:
-                    if name in sys_ref:
-                        self.violated_format = fmt.format(name)
-                        return True
-        return False
+        is_deferred = DeferredValidation.is_active()
+        if self.compiled is None and is_deferred and not self.is_nested():
+            self.compiled = compile_deferred_pattern(
+                pattern, rebuild, exception_cls=exception_cls
+            )
+        return self.compiled
 
-    def test(self, content):
-        """test pattern reference.
-        Parameters
-        ----------
-        content (str): a content of YAML format.
 
-        Returns
-        -------
-        bool: True if content is a valid format
+class DeferredValidation:
+    """Use to skip validation of intermediate fragments of a pattern
 
-        Raises
-        ------
-        PatternReferenceError: raise exception if a content is
-                an invalid format or violate system_references.yaml
-        """
+    Inside this context, TextPattern, ElementPattern, and other fragments
+    built as part of a bigger pattern are not compiled.  Only the outermost
+    pattern is compiled once, and if it is invalid, it is rebuilt with
+    validation to report the offending fragment.  The setting is per thread.
 
-        try:
-            yaml_obj = yaml.safe_load(content)
-        except Exception as ex:
-            msg = '{} - {}'.format(type(ex).__name__, ex)
-            raise PatternReferenceError(msg)
+    Parameters
+    ----------
+    enabled (bool): a flag to defer validation.  Default is True.
 
-        if not yaml_obj:
-            logger.warning('CANT test an empty content')
-            self.test_result = 'not_tested'
-            return True
+    Methods
+    -------
+    DeferredValidation.is_active() -> bool
+    """
+    _local = threading.local()
 
-        if not isinstance(yaml_obj, dict):
-            msg = 'content must be structure of dictionary.'
-            raise PatternReferenceError(msg)
+    def __init__(self, enabled=True):
+        self.enabled = bool(enabled)
 
-        if self.is_violated(yaml_obj):
-            raise PatternReferenceError(self.violated_format)
+    def __enter__(self):
+        self.__class__._get_stack().append(self.enabled)
+        return self
 
-        self.test_result = 'tested'
-        return True
+    def __exit__(self, exc_type, exc_value, traceback):
+        stack = self.__class__._get_stack()
+        stack and stack.pop()
+
+    @classmethod
+    def _get_stack(cls):
+        stack = getattr(cls._local, 'stack', None)
+        if stack is None:
+            stack = cls._local.stack = []
+        return stack
 
+    @classmethod
+    def is_active(cls):
+        """check if validation is deferred in current thread
 
-class SymbolCls(dict):
-    """Use to load symbols.yaml
+        Returns
+        -------
+        bool: True if validation is deferred.
+        """
+        stack = cls._get_stack()
+        return stack[-1] if stack else False
+
+
+class VersionedDict(dict):
+    """Use to track modification of a reference dictionary
+
+    Every top-level modification increases a version number that caches
+    use to detect a stale entry.  A nested modification, e.g. updating
+    a format of datetime reference, must be reported via mark_modified.
 
     Attribute
     ---------
-    filename (str): a system references file name.
+    version (int): a modification counter.  Default is 0.
+
+    Methods
+    -------
+    mark_modified() -> None
+    get_content_hash() -> str
     """
+    version = 0
+    content_hash_entry = None
 
-    filename = Data.symbol_reference_filename
+    def mark_modified(self):
+        """increase version after modifying content of dictionary"""
+        self.version += 1
 
-    def __init__(self):
-        with open(self.filename) as stream:
-            obj = yaml.safe_load(stream)
-            super().__init__(obj)
+    def get_content_hash(self):
+        """return sha256 hash of content which is computed once per version
+
+        Unlike version, a content hash is the same in every process which
+        loads the same content, so it can key a persistent cache.
+        """
+        entry = self.content_hash_entry
+        if entry and entry[0] == self.version:
+            return entry[1]
+
+        content = json.dumps(dict(self.items()), sort_keys=True, default=repr)
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self.content_hash_entry = (self.version, content_hash)
+        return content_hash
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.mark_modified()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.mark_modified()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self.mark_modified()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self.mark_modified()
+        return result
 
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self.mark_modified()
+        return result
 
-REF = PatternReference()
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.mark_modified()
 
-SYMBOL = SymbolCls()
+    def clear(self):
+        super().clear()
+        self.mark_modified()
 
 
-class TextPattern(str):
-    """Use to convert text data to regex pattern
+class LazyVersionedDict(VersionedDict):
+    """Use to load content of a versioned dictionary on first use
 
-    Attributes
+    Content is loaded by load_content when the dictionary is first read
+    or modified, so creating an instance touches no disk.  Loading does
+    not increase version because nothing could be cached against content
+    which was not loaded yet.  Loading is guarded by a lock, so other
+    threads wait until content is completely loaded, while a thread which
+    is loading content can read or modify it without loading it again.
+
+    Parameters
     ----------
-    text (str): a text.
-    as_is (bool): keeping text an AS-IS pattern.
+    is_lazy (bool): defer loading until first use.  Default is False.
+
+    Attribute
+    ---------
+    is_loaded (bool): a flag if content is loaded.
 
     Methods
     -------
-    is_empty() -> bool
-        check if a pattern matches empty string.
-    is_empty_or_whitespace() -> bool
-        check if a pattern matches empty string or whitespace
-    is_whitespace() -> bool
-        check if a pattern matches whitespace
+    ensure_loaded() -> None
+    load_content() -> None
+    is_loading() -> bool
+    """
+    is_loaded = True
+    _lock = threading.RLock()
+    _local = threading.local()
 
-    TextPattern.get_pattern(text) -> str
-    lstrip(chars=None) -> TextPattern
-    rstrip(chars=None) -> TextPattern
-    strip(chars=None) -> TextPattern
-    add(other, as_is=True) -> TextPattern
-    concatenate(*other, as_is=True) -> TextPattern
+    def __init__(self, is_lazy=False):
+        super().__init__()
+        self.is_loaded = False
+        self.is_lazy = is_lazy
 
-    Raises
-    ------
-    TextPatternError: raise an exception if pattern is invalid.
-    """
-    def __new__(cls, text, as_is=False):
-        data = str(text)
+    @classmethod
+    def _get_loading(cls):
+        if not hasattr(cls._local, 'loading'):
+            cls._local.loading = set()
+        return cls._local.loading
+
+    def is_loading(self):
+        """return True if content is being loaded by current thread"""
+        return id(self) in self._get_loading()
+
+    def ensure_loaded(self):
+        """load content if it is not loaded yet"""
+        if self.is_loaded or self.is_loading():
+            return
+        with self._lock:
+            if self.is_loaded:
+                return
+            loading = self._get_loading()
+            loading.add(id(self))
+            version = self.version
+            try:
+                self.load_content()
+                self.version = version
+                self.is_loaded = True
+            finally:
+                loading.discard(id(self))
 
-        if as_is:
-            return str.__new__(cls, data)
+    def load_content(self):
+        """load content of dictionary"""
 
-        if data:
-            text_pattern = cls.get_pattern(data)
-        else:
-            text_pattern = ''
-        return str.__new__(cls, text_pattern)
+    def __getitem__(self, key):
+        self.ensure_loaded()
+        return super().__getitem__(key)
 
-    def __init__(self, text, as_is=False):
-        self.text = text
-        self.as_is = as_is
+    def __contains__(self, key):
+        self.ensure_loaded()
+        return super().__contains__(key)
 
-    def __add__(self, other):
-        result = super().__add__(other)
-        result_pat = TextPattern(result, as_is=True)
-        return result_pat
+    def __iter__(self):
+        self.ensure_loaded()
+        return super().__iter__()
 
-    def __radd__(self, other):
-        if isinstance(other, TextPattern):
-            return other.__add__(self)
-        else:
-            other_pat = TextPattern(other, as_is=True)
-            return other_pat.__add__(self)
+    def __len__(self):
+        self.ensure_loaded()
+        return super().__len__()
 
-    @property
-    def is_empty(self):
-        if self == '':
-            return True
-        else:
-            result = re.match(str(self), '')
-            return bool(result)
+    def __eq__(self, other):
+        self.ensure_loaded()
+        return super().__eq__(other)
 
-    @property
-    def is_space(self):
-        is_space = bool(re.match(self, ' '))
-        return is_space
+    def __ne__(self, other):
+        self.ensure_loaded()
+        return super().__ne__(other)
 
-    @property
-    def is_empty_or_space(self):
-        is_empty = self.is_empty
-        is_space = self.is_space
-        return is_empty or is_space
+    __hash__ = None
 
-    @property
-    def is_whitespace(self):
-        is_ws = all(True for c in WHITESPACE_CHARS if re.match(self, c))
-        return is_ws
+    def __repr__(self):
+        self.ensure_loaded()
+        return super().__repr__()
 
-    @property
-    def is_empty_or_whitespace(self):
-        is_empty = self.is_empty
-        is_ws = self.is_whitespace
-        return is_empty or is_ws
+    def __reduce_ex__(self, protocol):
+        self.ensure_loaded()
+        return super().__reduce_ex__(protocol)
 
-    @classmethod
-    def get_pattern(cls, text):
-        """convert data to regex pattern
+    def get(self, key, default=None):
+        self.ensure_loaded()
+        return super().get(key, default)
 
-        Parameters
-        ----------
-        text (str): a text
+    def keys(self):
+        self.ensure_loaded()
+        return super().keys()
 
-        Returns
-        -------
-        str: a regex pattern.
+    def values(self):
+        self.ensure_loaded()
+        return super().values()
 
-        Raises
-        ------
-        TextPatternError: raise an exception if pattern is invalid.
-        """
-        text_pattern = ''
-        start = 0
-        m = None
-        for m in re.finditer(r'[\r\n]+', text):
-            pre_match = text[start:m.start()]
-            if pre_match:
-                text_pattern += Line(pre_match).convert_to_regex_pattern()
-            match = m.group()
-            multi = '{1,2}' if len(match) == len(set(match)) else '{2,}'
-            text_pattern += f'[\\r\\n]{multi}'
-        if m:
-            post_match = text[m.end():]
-            if post_match:
-                text_pattern += Line(post_match).convert_to_regex_pattern()
-        else:
-            text_pattern = Line(text).convert_to_regex_pattern()
+    def items(self):
+        self.ensure_loaded()
+        return super().items()
 
-        validate_pattern(text_pattern, exception_cls=TextPatternError)
-        return text_pattern
+    def copy(self):
+        self.ensure_loaded()
+        return dict(self)
 
-    @classmethod
-    def get_pattern_bak(cls, text):
-        """convert data to regex pattern
+    def __setitem__(self, key, value):
+        self.ensure_loaded()
+        super().__setitem__(key, value)
 
-        Parameters
-        ----------
-        text (str): a text
+    def __delitem__(self, key):
+        self.ensure_loaded()
+        super().__delitem__(key)
 
-        Returns
-        -------
-        str: a regex pattern.
+    def pop(self, *args):
+        self.ensure_loaded()
+        return super().pop(*args)
 
-        Raises
-        ------
-        TextPatternError: raise an exception if pattern is invalid.
-        """
-        start = 0
-        result = []
-        for item in re.finditer(r'\s+', text):
-            before_matched = text[start: item.start()]
-            before_matched and result.append(do_soft_regex_escape(before_matched))
-            matched = item.group()
-            total = len(matched)
-            lst = list(matched)
-            is_space = lst[0] == ' ' and len(set(lst)) == 1
-            is_space and result.append(' ' if total == 1 else ' +')
-            not is_space and result.append(r'\s' if total == 1 else r'\s+')
-            start = item.end()
-        else:
-            if result:
-                after_matched = text[start:]
-                after_matched and result.append(do_soft_regex_escape(after_matched))
-            else:
-                result.append(do_soft_regex_escape(text))
+    def popitem(self):
+        self.ensure_loaded()
+        return super().popitem()
 
-        text_pattern = ''.join(result)
+    def setdefault(self, key, default=None):
+        self.ensure_loaded()
+        return super().setdefault(key, default)
 
-        validate_pattern(text_pattern, exception_cls=TextPatternError)
-        return text_pattern
+    def update(self, *args, **kwargs):
+        self.ensure_loaded()
+        super().update(*args, **kwargs)
 
-    def lstrip(self, chars=None):
-        """Return a copy of the TextPattern with leading whitespace removed.
+    def clear(self):
+        self.ensure_loaded()
+        super().clear()
+
+
+class PatternCache:
+    """Use to memoize converted patterns in a bounded LRU cache
+
+    Entries are bound to a version of references.  When a lookup is made
+    with a different version, i.e. REF or SYMBOL was modified, all entries
+    are discarded.
+
+    Attribute
+    ---------
+    maxsize (int): a maximum number of entries.  Default is 4096.
+    hits (int): a number of successful lookups.
+    misses (int): a number of failed lookups.
+    invalidations (int): a number of invalidations due to version change.
+
+    Methods
+    -------
+    get(key, version=None) -> object
+    set(key, value, version=None) -> None
+    clear() -> None
+    get_stats() -> dict
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._data:
+                self._data.clear()
+                self.invalidations += 1
+            self.version = version
+
+    def get(self, key, version=None):
+        """return a cached value
 
         Parameters
         ----------
-        chars (None, str): If chars is given and not None,
-                remove characters in chars instead.
+        key (hashable): a cache key.
+        version (hashable): a version of references.  Default is None.
 
         Returns
         -------
-        TextPattern: a new TextPattern with leading whitespace removed.
-
+        object: a cached value or None if key is not cached.
         """
-        new_text = self.text.lstrip() if chars is None else self.text.lstrip(chars)
-        pattern = TextPattern(new_text)
-        return pattern
-
-    def rstrip(self, chars=None):
-        """Return a copy of the TextPattern with trailing whitespace removed.
+        with self._lock:
+            self._check_version(version)
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, version=None):
+        """store a value to cache
 
         Parameters
         ----------
-        chars (None, str): If chars is given and not None,
-                remove characters in chars instead.
+        key (hashable): a cache key.
+        value (object): a value.
+        version (hashable): a version of references.  Default is None.
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._check_version(version)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """remove all entries and reset statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def get_stats(self):
+        """return cache statistics
 
         Returns
         -------
-        TextPattern: a new TextPattern with trailing whitespace removed.
-
+        dict: hits, misses, invalidations, size, and maxsize.
         """
-        new_text = self.text.rstrip() if chars is None else self.text.rstrip(chars)
-        pattern = TextPattern(new_text)
-        return pattern
+        with self._lock:
+            stats = dict(
+                hits=self.hits, misses=self.misses,
+                invalidations=self.invalidations,
+                size=len(self._data), maxsize=self.maxsize
+            )
+            return stats
 
-    def strip(self, chars=None):
-        """Return a copy of the TextPattern with leading and
-        trailing whitespace removed.
+
+class IndexedList(list):
+    """Use to hold an ordered list with a hash index for membership test
+
+    A list of patterns is checked for a duplicate before every append,
+    e.g. ``pat not in lst and lst.append(pat)``.  A hash index makes
+    the check O(1), so deduplicating n items is linear instead of
+    quadratic.  Items must be hashable, and the list keeps duplicates
+    which are appended explicitly.
+
+    Methods
+    -------
+    add(item) -> bool
+    rebuild_index() -> None
+    """
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.rebuild_index()
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __getitem__(self, index):
+        result = super().__getitem__(index)
+        return self.__class__(result) if isinstance(index, slice) else result
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.rebuild_index()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.rebuild_index()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, other):
+        result = super().__imul__(other)
+        self.rebuild_index()
+        return result
+
+    def copy(self):
+        return self.__class__(self)
+
+    def rebuild_index(self):
+        """recount items after an arbitrary modification"""
+        self.index = dict()
+        for item in self:
+            self.index[item] = self.index.get(item, 0) + 1
+
+    def add_to_index(self, item):
+        self.index[item] = self.index.get(item, 0) + 1
+
+    def remove_from_index(self, item):
+        count = self.index[item] - 1
+        if count:
+            self.index[item] = count
+        else:
+            del self.index[item]
+
+    def add(self, item):
+        """append item if list does not contain it
 
         Parameters
         ----------
-        chars (None, str): If chars is given and not None,
-                remove characters in chars instead.
+        item (object): a hashable item.
 
         Returns
         -------
-        TextPattern: a new TextPattern with leading and trailing whitespace removed.
-
+        bool: True if item is appended.
         """
-        new_text = self.text.strip() if chars is None else self.text.strip(chars)
-        pattern = TextPattern(new_text)
-        return pattern
+        if item in self.index:
+            return False
+        self.append(item)
+        return True
 
-    def add(self, other, as_is=True):
-        """return a concatenated TextPattern.
+    def append(self, item):
+        super().append(item)
+        self.add_to_index(item)
 
-        Parameters
-        ----------
-        other (str, TextElement): other
-        as_is (bool): a flag to keep adding other AS-IS condition.
+    def extend(self, iterable):
+        for item in iterable:
+            self.append(item)
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self.add_to_index(item)
+
+    def remove(self, item):
+        super().remove(item)
+        self.remove_from_index(item)
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self.remove_from_index(item)
+        return item
+
+    def clear(self):
+        super().clear()
+        self.index = dict()
+
+
+class ReferenceCache:
+    """Use to store a reference table in a serialized file
+
+    A reference table is serialized with pickle together with its
+    source files, i.e. file name, modification time, size, and content
+    hash.  It is loaded only if cache format, regexapp version, and
+    Python version match, and every source is unchanged, i.e. same
+    modification time and size, or else same content hash.  A cache file
+    is written to a temporary file and renamed, so concurrent processes
+    never read a partial file.
+
+    Parameters
+    ----------
+    name (str): a cache name.
+    sources (list): a list of source file names.
+    dirname (str): a cache directory.  Default is None, i.e.
+            Data.reference_cache_dirname.
+
+    Attributes
+    ----------
+    filename (str): a cache file name.
+    is_enabled (bool): a flag to use cache.  Default is True.
+
+    Methods
+    -------
+    ReferenceCache.get_file_hash(filename) -> str
+    get_header() -> tuple
+    get_sources() -> list
+    load() -> object
+    save(obj) -> bool
+    """
+    cache_version = 1
+    is_enabled = True
+
+    def __init__(self, name, sources, dirname=None):
+        self.name = name
+        self.sources = list(sources)
+        dirname = dirname or Data.reference_cache_dirname
+        self.filename = os.path.join(dirname, '{}.cache'.format(name))
+
+    @classmethod
+    def get_file_hash(cls, filename):
+        """return sha256 hash of file content"""
+        with open(filename, 'rb') as stream:
+            return hashlib.sha256(stream.read()).hexdigest()
+
+    def get_header(self):
+        """return a header which a cache file must match"""
+        return self.cache_version, Data.app_version, tuple(sys.version_info[:2])
+
+    def get_sources(self):
+        """return file name, modification time, size, and content hash of sources"""
+        result = []
+        for filename in self.sources:
+            stat = os.stat(filename)
+            file_stat = (stat.st_mtime_ns, stat.st_size)
+            result.append((filename, file_stat, self.get_file_hash(filename)))
+        return result
+
+    def load(self):
+        """load a cached object if its sources are unchanged
 
         Returns
         -------
-        TextPattern: a concatenated TextPattern instance.
+        object: a cached object or None if cache is missing or stale.
         """
-        if isinstance(other, TextPattern):
-            result = self + other
-        else:
-            if isinstance(other, (list, tuple)):
-                result = self
-                for item in other:
-                    if isinstance(item, TextPattern):
-                        result = result + item
-                    else:
-                        item_pat = TextPattern(str(item), as_is=as_is)
-                        result = result + item_pat
-            else:
-                other_pat = TextPattern(str(other), as_is=as_is)
-                result = self + other_pat
+        if not self.is_enabled:
+            return None
 
-        return result
+        try:
+            with open(self.filename, 'rb') as stream:
+                header, sources, obj = pickle.load(stream)
+            if header != self.get_header():
+                return None
+
+            if [item[0] for item in sources] != self.sources:
+                return None
+
+            for filename, file_stat, file_hash in sources:
+                stat = os.stat(filename)
+                if (stat.st_mtime_ns, stat.st_size) == tuple(file_stat):
+                    continue
+                if self.get_file_hash(filename) != file_hash:
+                    return None
+            return obj
+        except Exception as ex:
+            logger.debug('CANT load %s - %s', self.filename, ex)
+            return None
 
-    def concatenate(self, *other, as_is=True):
-        """return a concatenated TextPattern.
+    def save(self, obj):
+        """serialize an object with stats and hashes of its sources
 
         Parameters
         ----------
-        other (tuple): other
-        as_is (bool): a flag to keep adding other AS-IS condition.
+        obj (object): a picklable object.
 
         Returns
         -------
-        TextPattern: a concatenated TextPattern instance.
+        bool: True if cache file is written.
         """
-        result = self
-        for item in other:
-            result = result.add(item, as_is=as_is)
-        return result
+        if not self.is_enabled:
+            return False
 
+        tmp_filename = '{}.{}.tmp'.format(self.filename, os.getpid())
+        try:
+            data = pickle.dumps(
+                (self.get_header(), self.get_sources(), obj),
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(tmp_filename, 'wb') as stream:
+                stream.write(data)
+            os.replace(tmp_filename, self.filename)
+            return True
+        except Exception as ex:
+            logger.debug('CANT save %s - %s', self.filename, ex)
+            File.is_exist(tmp_filename) and os.remove(tmp_filename)
+            return False
 
-class ElementPattern(str):
-    """Use to convert element data to regex pattern
 
-    Attributes
-    ----------
-    variable (VarCls): a regex variable.
-    or_empty (bool): a flag if pattern is expecting a zero match, i.e. empty.
-            Default is False.
+class BuildCache:
+    """Use to store build results of RegexBuilder in content-addressed files
+
+    A cache key is a sha256 hash of user data, build options, regexapp
+    and Python versions, and content hashes of REF and SYMBOL, so a
+    change of any of them is a miss and a stale entry is never read.  An
+    entry is written to a temporary file and renamed, so concurrent
+    processes never read a partial file, and a file which disappears
+    under a concurrent eviction is a miss.  Total size of cache files is
+    bounded; the least recently used files are removed first.  The size
+    is read from the cache directory once, then counted per save, so a
+    save does not scan the directory unless the count exceeds max_size.
 
     Parameters
     ----------
-    text (str): a text.
-    as_is (bool): keeping text an AS-IS pattern.
+    dirname (str): a cache directory.  Default is None, i.e.
+            Data.build_cache_dirname.
+    max_size (int): a maximum total size of cache files in bytes.
+            Default is None, i.e. BuildCache.max_size.
+
+    Attributes
+    ----------
+    hits (int): a number of loaded entries.
+    misses (int): a number of missing or stale entries.
+    evictions (int): a number of removed cache files.
+    total_size (int): an estimated total size of cache files in bytes,
+            or None before the first save.  Files which other processes
+            write are counted at the next eviction.
 
     Methods
     -------
-    ElementPattern.get_pattern(data) -> str
-    ElementPattern.build_pattern(keyword, params) -> str
-    ElementPattern.build_custom_pattern(keyword, params) -> bool, str
-    ElementPattern.build_datetime_pattern(keyword, params) -> bool, str
-    ElementPattern.build_choice_pattern(keyword, params) -> bool, str
-    ElementPattern.build_data_pattern(keyword, params) -> bool, str
-    ElementPattern.build_start_pattern(keyword, params) -> bool, str
-    ElementPattern.build_end_pattern(keyword, params) -> bool, str
-    ElementPattern.build_raw_pattern(keyword, params) -> bool, str
-    ElementPattern.build_default_pattern(keyword, params) -> bool, str
-    ElementPattern.join_list(lst) -> str
-    ElementPattern.add_var_name(pattern, name='') -> str
-    ElementPattern.add_word_bound(pattern, word_bound='', added_parentheses=True) -> str
-    ElementPattern.add_start_of_string(pattern, head='') -> str
-    ElementPattern.add_end_of_string(pattern, tail='') -> str
-    ElementPattern.add_repetition(lst, repetition='') -> list
-    ElementPattern.add_occurrence(lst, occurrence='') -> list
-    ElementPattern.add_case_occurrence(lst, first, last, is_phrase) -> bool
-    ElementPattern.is_singular_pattern(pattern) -> bool
-    remove_head_of_string() -> ElementPattern
-    remove_tail_of_string() -> ElementPattern
-
-    Raises
-    ------
-    ElementPatternError: raise an exception if pattern is invalid.
+    get_key(user_data, **options) -> str
+    get_filename(key) -> str
+    load(key) -> object
+    save(key, obj) -> bool
+    get_entries() -> list
+    get_size() -> int
+    evict() -> int
+    clear() -> int
     """
-    # patterns
-    word_bound_pattern = r'word_bound(_left|_right|_raw)?$'
-    head_pattern = r'head(_raw|((_just)?_(whitespaces?|ws|spaces?)(_plus)?))?$'
-    tail_pattern = r'tail(_raw|((_just)?_(whitespaces?|ws|spaces?)(_plus)?))?$'
-    repetition_pattern = r'repetition_\d*(_\d*)?$'
-    occurrence_pattern = r'({})(?P<is_phrase>_(group|phrase))?_occurrences?$'.format(
-        '|'.join([
-            r'((?P<fda>\d+)_or_(?P<lda>\d+))',
-            r'((?P<fdb>\d+)_or_(?P<ldb>more))',
-            r'(at_(?P<fdc>least|most)_(?P<ldc>\d+))',
-            r'(?P<fdd>\d+)'
-        ])
-    )
-    meta_data_pattern = r'^meta_data_\w+'
-    _variable = None
-
-    def __new__(cls, text, as_is=False):
-        cls._variable = VarCls()
-        cls._or_empty = False
-        cls._prepended_pattern = ''
-        cls._appended_pattern = ''
-        data = str(text)
+    cache_version = 1
+    max_size = 64 * 1024 * 1024
+    evicted_ratio = 0.8
+    stale_tmp_age = 3600
+    extension = '.cache'
+
+    def __init__(self, dirname=None, max_size=None):
+        self.dirname = dirname or Data.build_cache_dirname
+        self.max_size = max_size or self.max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_size = None
+
+    def get_key(self, user_data, **options):
+        """return a content-addressed key of a build
 
-        if as_is:
-            return str.__new__(cls, data)
-
-        if data:
-            pattern = cls.get_pattern(data)
-        else:
-            pattern = ''
-        return str.__new__(cls, pattern)
+        Parameters
+        ----------
+        user_data (str, list): user data.
+        options (dict): build options, e.g. is_line or ignore_case.
 
-    def __init__(self, text, as_is=False):
-        self.text = text
-        self.as_is = as_is
-        self.variable = self._variable
-        self.or_empty = self._or_empty
-        self.prepended_pattern = self._prepended_pattern
-        self.appended_pattern = self._appended_pattern
+        Returns
+        -------
+        str: a sha256 hash.
+        """
+        content = json.dumps(
+            [
+                self.cache_version, Data.app_version, list(sys.version_info[:2]),
+                user_data, sorted(options.items()),
+                REF.get_content_hash(), SYMBOL.get_content_hash()
+            ],
+            default=repr
+        )
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-        # clear class variable after initialization
-        self._variable = VarCls()
-        self._or_empty = False
-        self._prepended_pattern = ''
-        self._appended_pattern = ''
+    def get_filename(self, key):
+        """return a cache file name of a key"""
+        return os.path.join(self.dirname, key + self.extension)
 
-    @classmethod
-    def get_pattern(cls, text):
-        """convert data to regex pattern
+    def load(self, key):
+        """load a cached object of a key
 
         Parameters
         ----------
-        text (str): a text
+        key (str): a cache key.
 
         Returns
         -------
-        str: a regex pattern.
-
-        Raises
-        ------
-        ElementPatternError: raise an exception if pattern is invalid.
+        object: a cached object or None if it is missing.
         """
-        sep_pat = r'(?P<keyword>\w+)[(](?P<params>.*)[)]$'
-        match = re.match(sep_pat, text.strip())
-        if match:
-            keyword = match.group('keyword')
-            params = match.group('params').strip()
-            pattern = cls.build_pattern(keyword, params)
-        else:
-            pattern = do_soft_regex_escape(text)
+        filename = self.get_filename(key)
+        try:
+            with open(filename, 'rb') as stream:
+                cached_key, obj = pickle.load(stream)
+            if cached_key != key:
+                self.misses += 1
+                return None
+        except Exception as ex:
+            isinstance(ex, FileNotFoundError) or logger.debug(
+                'CANT load %s - %s', filename, ex)
+            self.misses += 1
+            return None
 
-        validate_pattern(pattern, exception_cls=ElementPatternError)
-        return pattern
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+        self.hits += 1
+        return obj
 
-    @classmethod
-    def build_pattern(cls, keyword, params):
-        """build a regex pattern over given keyword, params
+    def save(self, key, obj):
+        """serialize an object of a key and evict files over size limit
 
         Parameters
         ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+        key (str): a cache key.
+        obj (object): a picklable object.
 
         Returns
         -------
-        str: a regex pattern.
+        bool: True if cache file is written.
         """
-        is_built, raw_pattern = cls.build_raw_pattern(keyword, params)
-        if is_built:
-            return raw_pattern
+        filename = self.get_filename(key)
+        tmp_filename = '{}.{}.{}.tmp'.format(filename, os.getpid(), threading.get_ident())
+        try:
+            data = pickle.dumps((key, obj), protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(self.dirname, exist_ok=True)
+            with open(tmp_filename, 'wb') as stream:
+                stream.write(data)
+            os.replace(tmp_filename, filename)
+        except Exception as ex:
+            logger.debug('CANT save %s - %s', filename, ex)
+            File.is_exist(tmp_filename) and os.remove(tmp_filename)
+            return False
 
-        is_built, start_pattern = cls.build_start_pattern(keyword, params)
-        if is_built:
-            return start_pattern
+        if self.total_size is None:
+            self.total_size = self.get_size()
+        else:
+            self.total_size += len(data)
+        self.total_size > self.max_size and self.evict()
+        return True
 
-        is_built, end_pattern = cls.build_end_pattern(keyword, params)
-        if is_built:
-            return end_pattern
+    def get_entries(self):
+        """return modification time, size, and name of cache files"""
+        entries = []
+        try:
+            iterator = os.scandir(self.dirname)
+        except OSError:
+            return entries
+
+        with iterator:
+            for entry in iterator:
+                if not entry.name.endswith(self.extension):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def get_size(self):
+        """return total size of cache files in bytes"""
+        return sum(size for _, size, _ in self.get_entries())
+
+    def remove_file(self, filename):
+        """remove a file which another process may have removed already"""
+        try:
+            os.remove(filename)
+            return True
+        except OSError:
+            return False
 
-        is_built, symbol_pattern = cls.build_symbol_pattern(keyword, params)
-        if is_built:
-            return symbol_pattern
+    def evict(self):
+        """remove least recently used cache files over size limit
 
-        is_built, datetime_pattern = cls.build_datetime_pattern(keyword, params)
-        if is_built:
-            return datetime_pattern
+        Files are removed until total size is below a fraction of
+        max_size, so a following save does not evict again right away.
+        Temporary files which a terminated process left are removed too.
 
-        is_built, choice_pattern = cls.build_choice_pattern(keyword, params)
-        if is_built:
-            return choice_pattern
+        Returns
+        -------
+        int: a number of removed cache files.
+        """
+        entries = sorted(self.get_entries())
+        total_size = sum(size for _, size, _ in entries)
+        limit = self.max_size * self.evicted_ratio
+        removed = 0
+        for _, size, filename in entries:
+            if total_size <= limit:
+                break
+            total_size -= size
+            removed += 1 if self.remove_file(filename) else 0
+        self.total_size = total_size
+
+        expired_time = time.time() - self.stale_tmp_age
+        try:
+            with os.scandir(self.dirname) as iterator:
+                tmp_entries = [entry for entry in iterator if entry.name.endswith('.tmp')]
+        except OSError:
+            tmp_entries = []
+
+        for entry in tmp_entries:
+            try:
+                entry.stat().st_mtime < expired_time and self.remove_file(entry.path)
+            except OSError:
+                continue
 
-        is_built, data_pattern = cls.build_data_pattern(keyword, params)
-        if is_built:
-            return data_pattern
+        self.evictions += removed
+        return removed
 
-        is_built, custom_pattern = cls.build_custom_pattern(keyword, params)
-        if is_built:
-            return custom_pattern
+    def clear(self):
+        """remove every cache file and return a number of removed files"""
+        removed = 0
+        for _, _, filename in self.get_entries():
+            removed += 1 if self.remove_file(filename) else 0
+        self.total_size = None
+        return removed
 
-        _, default_pattern = cls.build_default_pattern(keyword, params)
-        return default_pattern
 
-    @classmethod
-    def build_custom_pattern(cls, keyword, params):
-        """build a custom pattern over given keyword, params
+class PatternReference(LazyVersionedDict):
+    """Use to load regular expression pattern from system_references.yaml
+    or/and user_references.yaml
 
-        Parameters
-        ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+    Parameters
+    ----------
+    is_lazy (bool): defer loading references until first use.
+            Default is False.
 
-        Returns
-        -------
-        tuple: status, a regex pattern.
-        """
-        if keyword not in REF:
-            return False, ''
+    Attribute
+    ---------
+    sys_ref_loc (str): a system references file name.
+    user_ref_loc (str): a user references file name.
+    version (int): a modification counter.
+    file_stats (dict): a mapping of a loaded file name to its
+            modification time, size, and content hash.
+    file_keys (dict): a mapping of a loaded file name to keys which
+            are added from it.
+    reload_count (int): a number of times a references file is parsed
+            after it was first loaded.
 
-        arguments = re.split(r' *, *', params) if params else []
+    Methods
+    -------
+    load_all_references() -> None
+    load_reference(filename, is_warning=True, force=False) -> bool
+    get_file_stat(filename) -> tuple
+    PatternReference.get_pattern_layout(name) -> str
+    is_violated(dict_obj) -> bool
+    test(self, content) -> bool
 
-        lst = [REF.get(keyword).get('pattern')]
+    Raises
+    ------
+    PatternReferenceError: raise exception if filename doesn't exist or
+            an invalid format
+    """
 
-        name, vpat = '', r'var_(?P<name>\w+)$'
-        or_pat = r'or_(?P<case>[^,]+)'
-        is_empty = False
-        word_bound = ''
-        head = ''
-        tail = ''
-        is_repeated = False
-        is_occurrence = False
-        is_or_either = False
-        spaces_occurrence_pat = ''
+    # regexp pattern - from system references
+    sys_ref_loc = Data.system_reference_filename
+    # regex patterns - from user references
+    user_ref_loc = Data.user_reference_filename
 
-        for arg in arguments:
-            match = re.match(vpat, arg, flags=re.I)
-            if match:
-                name = match.group('name') if not name else name
-            elif re.match(cls.word_bound_pattern, arg):
-                if arg == 'word_bound_raw':
-                    'word_bound' not in lst and lst.append('word_bound')
-                else:
-                    word_bound = arg
-            elif re.match(cls.head_pattern, arg):
-                if arg == 'head_raw':
-                    'head' not in lst and lst.append('head')
-                else:
-                    head = arg
-            elif re.match(cls.tail_pattern, arg):
-                if arg == 'tail_raw':
-                    'tail' not in lst and lst.append('tail')
-                else:
-                    tail = arg
-            elif re.match(cls.repetition_pattern, arg):
-                if not is_repeated or not is_occurrence:
-                    lst = cls.add_repetition(lst, repetition=arg)
-                    is_repeated = True
-            elif re.match(cls.occurrence_pattern, arg):
-                if not is_repeated or not is_occurrence:
-                    lst = cls.add_occurrence(lst, occurrence=arg)
-                    is_occurrence = True
-            elif re.match(cls.meta_data_pattern, arg):
-                if arg == 'meta_data_raw':
-                    'meta_data' not in lst and lst.append('meta_data')
-                else:
-                    cls._variable.option = arg.lstrip('meta_data_')
-            else:
-                match = re.match(or_pat, arg, flags=re.I)
-                if match:
-                    case = match.group('case')
-                    repeating_space_pat = r'(?:either_)?repeat(?:s|ing)?(_[0-9_]+)_spaces?$'
-                    occurring_space_pat = r'(?:either_)?((at_(least|most)_)?\d+(_occurrences?)?)_spaces?$'
-
-                    if case == 'empty':
-                        is_empty = True
-                        cls._or_empty = is_empty
-                    elif re.match(repeating_space_pat, case, flags=re.I):
-                        r_case = re.sub(repeating_space_pat, r'repetition\1', case.lower())
-                        spaces_occurrence_pat = cls('space(%s)' % r_case)
-                        is_or_either = str.lower(case).startswith('either_')
-                    elif re.match(occurring_space_pat, case, flags=re.I):
-                        o_case = re.sub(occurring_space_pat, r'\1', case.lower())
-                        o_case = o_case if 'occurrence' in o_case else '%s_occurrence' % o_case
-                        spaces_occurrence_pat = cls('space(%s)' % o_case)
-                        is_or_either = str.lower(case).startswith('either_')
-                    else:
-                        if case in REF:
-                            if re.match('(?i)time|date(time)?', case):
-                                pat = REF.get(case).get('format', f'unsupported-{case}-format')
-                                pat not in lst and lst.append(pat)
-                            else:
-                                pat = REF.get(case).get('pattern')
-                                pat not in lst and lst.append(pat)
-                        else:
-                            if re.match('(?i)time|date(time)?', case):
-                                kw, *indices = re.split('_format', case)
-                                node = REF.get(kw, None)
-                                if node:
-                                    if indices:
-                                        for index in indices:
-                                            key = f'format{index}'
-                                            pat = node.get(key, f'unsupported-{kw}{key}')
-                                            pat not in lst and lst.append(pat)
-                                    else:
-                                        pat = node.get('format', f'unsupported-{kw}format')
-                                        pat not in lst and lst.append(pat)
-                                else:
-                                    pat = case
-                                    pat not in lst and lst.append(pat)
-                            else:
-                                pat = case
-                                pat not in lst and lst.append(pat)
-                else:
-                    pat = do_soft_regex_escape(arg)
-                    pat not in lst and lst.append(pat)
+    def __init__(self, is_lazy=False):
+        super().__init__(is_lazy=is_lazy)
+        self.file_stats = dict()
+        self.file_keys = dict()
+        self.reload_count = 0
+        self.test_result = ''
+        self.violated_format = ''
+        is_lazy or self.ensure_loaded()
 
-        is_empty and lst.append('')
-        is_multiple = len(lst) > 1
-        pattern = cls.join_list(lst)
-        pattern = cls.add_word_bound(
-            pattern, word_bound=word_bound, added_parentheses=is_multiple
+    def load_content(self):
+        self.load_all_references()
+
+    def load_all_references(self):
+        """load system and user references, from cache if they are unchanged"""
+        cache = ReferenceCache(
+            'pattern_reference', [self.sys_ref_loc, self.user_ref_loc]
         )
-        if spaces_occurrence_pat:
-            fmt = '(%s)|( *%s *)' if is_or_either else '(%s)|(%s)'
-            pattern = fmt % (spaces_occurrence_pat, pattern)
+        obj = cache.load()
+        if obj:
+            table, file_stats, file_keys = obj
+            super().update(table)
+            self.file_stats.update(file_stats)
+            self.file_keys.update(file_keys)
+            return
 
-        pattern = cls.add_var_name(pattern, name=name)
-        pattern = cls.add_head_of_string(pattern, head=head)
-        pattern = cls.add_tail_of_string(pattern, tail=tail)
-        pattern = pattern.replace('__comma__', ',')
-        return True, pattern
+        self.load_sys_ref()
+        self.load_reference(self.user_ref_loc)
+        cache.save((dict(self), self.file_stats, self.file_keys))
 
-    @classmethod
-    def build_symbol_pattern(cls, keyword, params):
-        """build a symbol over given keyword, params
+    def load_sys_ref(self):
+        with open(self.sys_ref_loc) as stream:
+            yaml_obj = yaml.safe_load(stream)
+            self.update(yaml_obj)
+
+    def get_file_stat(self, filename):
+        """return modification time and size of a file
 
         Parameters
         ----------
-        keyword (str): a symbol keyword
-        params (str): a list of parameters
+        filename (str): a file name.
 
         Returns
         -------
-        tuple: status, a regex pattern.
+        tuple: modification time in nanoseconds and size in bytes.
         """
-        if keyword != 'symbol' or not params.strip():
-            return False, ''
-
-        arguments = re.split(r' *, *', params) if params else []
-        symbol_name, removed_items = '', []
-        for arg in arguments:
-            if arg.startswith('name='):
-                symbol_name = arg[5:]
-                removed_items.append(arg)
-
-        if not removed_items:
-            return False, ''
-        else:
-            for item in removed_items:
-                item in arguments and arguments.remove(item)
-
-        val = SYMBOL.get(symbol_name, do_soft_regex_escape(symbol_name))
-        lst = [val]
-
-        name, vpat = '', r'var_(?P<name>\w+)$'
-        or_pat = r'or_(?P<case>[^,]+)'
-        is_empty = False
-        word_bound = ''
-        head = ''
-        tail = ''
-        is_repeated = False
-        is_occurrence = False
-
-        for arg in arguments:
-            match = re.match(vpat, arg, flags=re.I)
-            if match:
-                name = match.group('name') if not name else name
-            elif re.match(cls.word_bound_pattern, arg):
-                if arg == 'word_bound_raw':
-                    'word_bound' not in lst and lst.append('word_bound')
-                else:
-                    word_bound = arg
-            elif re.match(cls.head_pattern, arg):
-                if arg == 'head_raw':
-                    'head' not in lst and lst.append('head')
-                else:
-                    head = arg
-            elif re.match(cls.tail_pattern, arg):
-                if arg == 'tail_raw':
-                    'tail' not in lst and lst.append('tail')
-                else:
-                    tail = arg
-            elif re.match(cls.repetition_pattern, arg):
-                if not is_repeated or not is_occurrence:
-                    lst = cls.add_repetition(lst, repetition=arg)
-                    is_repeated = True
-            elif re.match(cls.occurrence_pattern, arg):
-                if not is_repeated or not is_occurrence:
-                    lst = cls.add_occurrence(lst, occurrence=arg)
-                    is_occurrence = True
-            elif re.match(cls.meta_data_pattern, arg):
-                if arg == 'meta_data_raw':
-                    'meta_data' not in lst and lst.append('meta_data')
-                else:
-                    cls._variable.option = arg.lstrip('meta_data_')
-            else:
-                match = re.match(or_pat, arg, flags=re.I)
-                if match:
-                    case = match.group('case')
-                    if case == 'empty':
-                        is_empty = True
-                        cls._or_empty = is_empty
-                    else:
-                        if case in REF:
-                            if re.match('(?i)time|date(time)?', case):
-                                pat = REF.get(case).get('format', f'unsupported-{case}-format')
-                                pat not in lst and lst.append(pat)
-                            else:
-                                pat = REF.get(case).get('pattern')
-                                pat not in lst and lst.append(pat)
-                        else:
-                            if re.match('(?i)time|date(time)?', case):
-                                kw, *indices = re.split('_format', case)
-                                node = REF.get(kw, None)
-                                if node:
-                                    if indices:
-                                        for index in indices:
-                                            key = f'format{index}'
-                                            pat = node.get(key, f'unsupported-{kw}{key}')
-                                            pat not in lst and lst.append(pat)
-                                    else:
-                                        pat = node.get('format', f'unsupported-{kw}format')
-                                        pat not in lst and lst.append(pat)
-                                else:
-                                    pat = case
-                                    pat not in lst and lst.append(pat)
-                            else:
-                                pat = case
-                                pat not in lst and lst.append(pat)
-                else:
-                    pat = do_soft_regex_escape(arg)
-                    pat not in lst and lst.append(pat)
+        stat = os.stat(filename)
+        return stat.st_mtime_ns, stat.st_size
 
-        is_empty and lst.append('')
-        is_multiple = len(lst) > 1
-        pattern = cls.join_list(lst)
-        pattern = cls.add_word_bound(
-            pattern, word_bound=word_bound, added_parentheses=is_multiple
-        )
-        pattern = cls.add_var_name(pattern, name=name)
-        pattern = cls.add_head_of_string(pattern, head=head)
-        pattern = cls.add_tail_of_string(pattern, tail=tail)
-        pattern = pattern.replace('__comma__', ',')
-        return True, pattern
+    def load_reference(self, filename, is_warning=True, force=False):
+        """Load reference from YAML references file.
 
-    @classmethod
-    def build_datetime_pattern(cls, keyword, params):
-        """build a datetime pattern over given keyword, params
+        A file which was loaded before is only read again if its
+        modification time or size changes, and only parsed again if its
+        content hash changes.  Keys which a previous content added are
+        replaced by keys of a new content.
 
         Parameters
         ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+        filename (str): a file name.
+        is_warning (bool): log a warning if a key already exists.
+                Default is True.
+        force (bool): parse file even if it is unchanged.  Default is False.
 
         Returns
         -------
-        tuple: status, a regex pattern.
-        """
-        if keyword not in REF:
-            return False, ''
+        bool: True if file is parsed.
 
-        node = REF.get(keyword)
-        fmt_lst = [key for key in node if key.startswith('format')]
-        if not fmt_lst:
-            return False, ''
+        Raises
+        ------
+        PatternReferenceError: raise exception if filename doesn't exist or
+                an invalid format
+        """
+        self.ensure_loaded()
 
-        arguments = re.split(r' *, *', params) if params else []
-        lst = []
-        name, vpat = '', r'var_(?P<name>\w+)$'
-        for arg in arguments:
-            match = re.match(vpat, arg, flags=re.I)
-            if match:
-                name = match.group('name') if not name else name
-            elif arg.startswith('format'):
-                pat = node.get(arg)
-                pat not in lst and lst.append(pat)
-            # else:
-            #     pat = arg
-            #     pat not in lst and lst.append(pat)
-        if not lst:
-            lst.append(node.get('format'))
-
-        or_pat = r'or_(?P<case>[^,]+)'
-        is_empty = False
-        word_bound = ''
-        head = ''
-        tail = ''
+        if not File.is_exist(filename):
+            if filename == self.user_ref_loc:
+                sample_file = Data.sample_user_keywords_filename
+                File.create(filename)
+                File.copy_file(sample_file, filename)
+            else:
+                msg = '{} is NOT FOUND.'.format(filename)
+                raise PatternReferenceError(msg)
 
-        for arg in arguments:
-            match = re.match(vpat, arg, flags=re.I)
-            if match or arg.startswith('format'):
-                continue
-            elif re.match(cls.word_bound_pattern, arg):
-                if arg == 'word_bound_raw':
-                    'word_bound' not in lst and lst.append('word_bound')
-                else:
-                    word_bound = arg
-            elif re.match(cls.head_pattern, arg):
-                if arg == 'head_raw':
-                    'head' not in lst and lst.append('head')
-                else:
-                    head = arg
-            elif re.match(cls.tail_pattern, arg):
-                if arg == 'tail_raw':
-                    'tail' not in lst and lst.append('tail')
-                else:
-                    tail = arg
-            elif re.match(cls.meta_data_pattern, arg):
-                if arg == 'meta_data_raw':
-                    'meta_data' not in lst and lst.append('meta_data')
+        try:
+            file_stat = self.get_file_stat(filename)
+            prev_stat, prev_hash = self.file_stats.get(filename, (None, None))
+            if file_stat == prev_stat and not force:
+                return False
+
+            with open(filename, 'rb') as stream:
+                content = stream.read()
+            content_hash = hashlib.sha256(content).hexdigest()
+            self.file_stats[filename] = (file_stat, content_hash)
+            if content_hash == prev_hash and not force:
+                return False
+
+            if filename in self.file_keys:
+                self.reload_count += 1
+                for key in self.file_keys.pop(filename):
+                    self.pop(key, None)
+
+            keys = self.file_keys.setdefault(filename, [])
+            yaml_obj = yaml.safe_load(content.decode('utf-8'))
+            if not yaml_obj:
+                return True
+
+            if not isinstance(yaml_obj, dict):
+                fmt = '{} must be structure as dictionary.'
+                raise PatternReferenceError(fmt.format(filename))
+
+            for key, value in yaml_obj.items():
+                if key not in self:
+                    self[key] = value
+                    keys.append(key)
                 else:
-                    cls._variable.option = arg.lstrip('meta_data_')
-            else:
-                match = re.match(or_pat, arg, flags=re.I)
-                if match:
-                    case = match.group('case')
-                    if case == 'empty':
-                        is_empty = True
-                        cls._or_empty = is_empty
+                    if key == 'datetime':
+                        self[key] = value
                     else:
-                        if case in REF:
-                            if re.match('(?i)time|date(time)?', case):
-                                pat = REF.get(case).get('format', f'unsupported-{case}-format')
-                                pat not in lst and lst.append(pat)
-                            else:
-                                pat = REF.get(case).get('pattern')
-                                pat not in lst and lst.append(pat)
-                        else:
-                            if re.match('(?i)time|date(time)?', case):
-                                kw, *indices = re.split('_format', case)
-                                node = REF.get(kw, None)
-                                if node:
-                                    if indices:
-                                        for index in indices:
-                                            key = f'format{index}'
-                                            pat = node.get(key, f'unsupported-{kw}{key}')
-                                            pat not in lst and lst.append(pat)
-                                    else:
-                                        pat = node.get('format', f'unsupported-{kw}format')
-                                        pat not in lst and lst.append(pat)
-                                else:
-                                    pat = case
-                                    pat not in lst and lst.append(pat)
-                            else:
-                                pat = case
-                                pat not in lst and lst.append(pat)
-                else:
-                    pat = do_soft_regex_escape(arg)
-                    pat not in lst and lst.append(pat)
-
-        is_empty and lst.append('')
-        pattern = cls.join_list(lst)
-        pattern = cls.add_word_bound(pattern, word_bound=word_bound)
-        pattern = cls.add_var_name(pattern, name=name)
-        pattern = cls.add_head_of_string(pattern, head=head)
-        pattern = cls.add_tail_of_string(pattern, tail=tail)
-        pattern = pattern.replace('__comma__', ',')
-        return True, pattern
+                        fmt = ('%r key is already existed.  '
+                               'Wont update %r data to key.')
+                        is_warning and logger.warning(fmt, key, value)
+            return True
+        except Exception as ex:
+            self.file_stats.pop(filename, None)
+            msg = '{} - {}'.format(type(ex).__name__, ex)
+            raise PatternReferenceError(msg)
 
     @classmethod
-    def build_choice_pattern(cls, keyword, params):
-        """build a choice pattern over given keyword, params
+    def get_pattern_layout(cls, name):
+        layout1 = """
+            name_placeholder:
+              ##################################################################
+              # double back flash must be used in a value of pattern if needed
+              # positive test and/or negative test is/are optional
+              ##################################################################
+              group: "replace_me"
+              description: "replace_me"
+              pattern: "replace_me"
+              # positive test:
+              #   change this positive test name: "replace_me -> (string or list of string)"
+              # negative test:
+              #   change this negative test name: "replace_me -> (string or list of string)"
+        """
+        layout2 = """
+            name_placeholder:
+              ##################################################################
+              # double back flash must be used in a value of format if needed
+              # positive test and/or negative test is/are optional
+              ##################################################################
+              group: "replace_me"
+              description: "replace_me"
+              format: "replace_me"
+              # format1: "replace_me"
+              # format2: "replace_me"
+              # formatn: "replace_me"
+              # positive test:
+              #   change this positive test name: "replace_me -> (string or list of string)"
+              # negative test:
+              #   change this negative test name: "replace_me -> (string or list of string)"
+        """
+        layout1, layout2 = dedent(layout1).strip(), dedent(layout2).strip()
+        return layout2 if 'datetime' in name else layout1
+
+    def is_violated(self, dict_obj):
+        """Check if new pattern reference doesn't violate with system reference
 
         Parameters
         ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+        dict_obj (dict): a dict object.
 
         Returns
         -------
-        str: a regex pattern.
+        bool: True there is a violation.
         """
-        if keyword != 'choice':
-            return False, ''
+        with open(self.sys_ref_loc) as stream:
+            sys_ref = yaml.safe_load(stream)
+            fmt = '{} is ALREADY existed in system_references.yaml'
+            for name in dict_obj:
+                if 'datetime' not in name:
+                    if name in sys_ref:
+                        self.violated_format = fmt.format(name)
+                        return True
+        return False
 
-        arguments = re.split(r' *, *', params) if params else []
-        lst = []
+    def test(self, content):
+        """test pattern reference.
+        Parameters
+        ----------
+        content (str): a content of YAML format.
 
-        name, vpat = '', r'var_(?P<name>\w+)$'
-        or_pat = r'or_(?P<case>[^,]+)'
-        is_empty = False
-        word_bound = ''
-        head = ''
-        tail = ''
+        Returns
+        -------
+        bool: True if content is a valid format
 
-        for arg in arguments:
-            match = re.match(vpat, arg, flags=re.I)
-            if match:
-                name = match.group('name') if not name else name
-            elif re.match(cls.word_bound_pattern, arg):
-                if arg == 'word_bound_raw':
-                    'word_bound' not in lst and lst.append('word_bound')
-                else:
-                    word_bound = arg
-            elif re.match(cls.head_pattern, arg):
-                if arg == 'head_raw':
-                    'head' not in lst and lst.append('head')
-                else:
-                    head = arg
-            elif re.match(cls.tail_pattern, arg):
-                if arg == 'tail_raw':
-                    'tail' not in lst and lst.append('tail')
-                else:
-                    tail = arg
-            elif re.match(cls.meta_data_pattern, arg):
-                if arg == 'meta_data_raw':
-                    'meta_data' not in lst and lst.append('meta_data')
-                else:
-                    cls._variable.option = arg.lstrip('meta_data_')
-            else:
-                match = re.match(or_pat, arg, flags=re.I)
-                if match:
-                    case = match.group('case')
-                    if case == 'empty':
-                        is_empty = True
-                        cls._or_empty = is_empty
-                    else:
-                        if case in REF:
-                            if re.match('(?i)time|date(time)?', case):
-                                pat = REF.get(case).get('format', f'unsupported-{case}-format')
-                                pat not in lst and lst.append(pat)
-                            else:
-                                pat = REF.get(case).get('pattern')
-                                pat not in lst and lst.append(pat)
-                        else:
-                            if re.match('(?i)time|date(time)?', case):
-                                kw, *indices = re.split('_format', case)
-                                node = REF.get(kw, None)
-                                if node:
-                                    if indices:
-                                        for index in indices:
-                                            key = f'format{index}'
-                                            pat = node.get(key, f'unsupported-{kw}{key}')
-                                            pat not in lst and lst.append(pat)
-                                    else:
-                                        pat = node.get('format', f'unsupported-{kw}format')
-                                        pat not in lst and lst.append(pat)
-                                else:
-                                    pat = case
-                                    pat not in lst and lst.append(pat)
-                            else:
-                                pat = case
-                                pat not in lst and lst.append(pat)
-                else:
-                    pat = do_soft_regex_escape(arg)
-                    pat not in lst and lst.append(pat)
+        Raises
+        ------
+        PatternReferenceError: raise exception if a content is
+                an invalid format or violate system_references.yaml
+        """
 
-        is_empty and lst.append('')
-        pattern = cls.join_list(lst)
-        pattern = cls.add_word_bound(pattern, word_bound=word_bound)
-        pattern = cls.add_var_name(pattern, name=name)
-        pattern = cls.add_head_of_string(pattern, head=head)
-        pattern = cls.add_tail_of_string(pattern, tail=tail)
-        pattern = pattern.replace('__comma__', ',')
-        return True, pattern
+        try:
+            yaml_obj = yaml.safe_load(content)
+        except Exception as ex:
+            msg = '{} - {}'.format(type(ex).__name__, ex)
+            raise PatternReferenceError(msg)
+
+        if not yaml_obj:
+            logger.warning('CANT test an empty content')
+            self.test_result = 'not_tested'
+            return True
+
+        if not isinstance(yaml_obj, dict):
+            msg = 'content must be structure of dictionary.'
+            raise PatternReferenceError(msg)
+
+        if self.is_violated(yaml_obj):
+            raise PatternReferenceError(self.violated_format)
+
+        self.test_result = 'tested'
+        return True
+
+
+class SymbolCls(LazyVersionedDict):
+    """Use to load symbols.yaml
+
+    Parameters
+    ----------
+    is_lazy (bool): defer loading symbols until first use.
+            Default is False.
+
+    Attribute
+    ---------
+    filename (str): a system references file name.
+    version (int): a modification counter.
+    """
+
+    filename = Data.symbol_reference_filename
+
+    def __init__(self, is_lazy=False):
+        super().__init__(is_lazy=is_lazy)
+        is_lazy or self.ensure_loaded()
+
+    def load_content(self):
+        cache = ReferenceCache('symbol_reference', [self.filename])
+        obj = cache.load()
+        if obj is None:
+            with open(self.filename) as stream:
+                obj = yaml.safe_load(stream)
+            cache.save(obj)
+        super().update(obj)
+
+
+# references are loaded on first use, so importing regexapp touches no disk
+REF = PatternReference(is_lazy=True)
+
+SYMBOL = SymbolCls(is_lazy=True)
+
+
+def parse_pattern_nodes(pattern):
+    """parse a regex pattern to a tuple of leaf nodes
+
+    A pattern is split into literal text, whitespace, anchors, inline
+    flags, and quantified atoms.  A group or a character class is kept
+    as an opaque RawNode.  Parsed nodes are immutable, so they are cached
+    and shared by every pattern which contains the same text.
+
+    Parameters
+    ----------
+    pattern (str): a regex pattern.
+
+    Returns
+    -------
+    tuple: a tuple of PatternNode.
+    """
+    pattern = str(pattern)
+    if not pattern:
+        return ()
+
+    nodes = PatternNode.parse_cache.get(pattern)
+    if nodes is not None:
+        return nodes
+
+    branches = PatternNode.split_alternation(pattern)
+    if len(branches) > 1:
+        lst = [SequenceNode(parse_pattern_nodes(branch)) for branch in branches]
+        nodes = (AlternationNode(lst, prefix=''),)
+    else:
+        nodes = tuple(PatternNode.iter_nodes(pattern))
+    PatternNode.parse_cache.set(pattern, nodes)
+    return nodes
+
+
+class PatternNode:
+    """Use to represent a node of a structured regex pattern
+
+    A node is immutable.  A transformation returns a new node, so a
+    rendered pattern and other derived values are cached per node.
+
+    Attributes
+    ----------
+    parse_cache (PatternCache): a shared cache of parsed patterns.
+
+    Properties
+    ----------
+    leaves (tuple): a tuple of leaf nodes.
+    first (PatternNode): a first leaf node or None.
+    last (PatternNode): a last leaf node or None.
+    is_literal_start (bool): True if node starts with a literal character.
+    is_literal_end (bool): True if node ends with a literal character.
+
+    Methods
+    -------
+    PatternNode.split_alternation(pattern) -> list
+    PatternNode.iter_nodes(pattern) -> generator
+    get_cached(key, func, *args) -> object
+    render() -> str
+    render_pattern() -> str
+    get_literal_runs() -> list
+    match_leaves(*patterns, at_end=False, is_exact=False) -> bool
+    to_pattern() -> TextPattern
+    """
+    __slots__ = ('_cache',)
+    parse_cache = PatternCache(maxsize=4096)
+    quantifier_pattern = r'(?:[*+?]|[{](?:\d+(?:,\d*)?|,\d+)[}])[+?]?'
+    escape_pattern = r'\\(?:{})'.format('|'.join([
+        r'x[0-9A-Fa-f]{2}', r'u[0-9A-Fa-f]{4}', r'U[0-9A-Fa-f]{8}',
+        r'N[{][^}]*[}]', r'0[0-7]{0,2}', r'[1-9][0-9]?', r'.'
+    ]))
+
+    def __init__(self):
+        self._cache = None
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.render())
+
+    def __eq__(self, other):
+        if not isinstance(other, PatternNode):
+            return NotImplemented
+        return type(self) is type(other) and self.render() == other.render()
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.render()))
+
+    @property
+    def leaves(self):
+        return (self,)
+
+    @property
+    def first(self):
+        leaves = self.leaves
+        return leaves[0] if leaves else None
+
+    @property
+    def last(self):
+        leaves = self.leaves
+        return leaves[-1] if leaves else None
+
+    @property
+    def is_literal_start(self):
+        return False
+
+    @property
+    def is_literal_end(self):
+        return False
 
     @classmethod
-    def build_data_pattern(cls, keyword, params):
-        """build a data pattern over given keyword, params
+    def split_alternation(cls, pattern):
+        """split a pattern by its top-level alternation
 
         Parameters
         ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+        pattern (str): a regex pattern.
 
         Returns
         -------
-        str: a regex pattern.
+        list: a list of alternative patterns.
         """
-        if keyword != 'data':
-            return False, ''
+        lst, start, index, total = [], 0, 0, len(pattern)
+        while index < total:
+            char = pattern[index]
+            if char == '\\':
+                index += 2
+            elif char in '([':
+                index = skip_group(pattern, index)
+            elif char == '|':
+                lst.append(pattern[start:index])
+                index = start = index + 1
+            else:
+                index += 1
+        lst.append(pattern[start:])
+        return lst
 
-        arguments = re.split(r' *, *', params) if params else []
-        lst = []
+    @classmethod
+    def iter_nodes(cls, pattern):
+        """yield leaf nodes of a pattern without top-level alternation
 
-        name, vpat = '', r'var_(?P<name>\w+)$'
-        or_pat = r'or_(?P<case>[^,]+)'
-        is_empty = False
-        word_bound = ''
-        head = ''
-        tail = ''
+        Parameters
+        ----------
+        pattern (str): a regex pattern.
 
-        for arg in arguments:
-            match = re.match(vpat, arg, flags=re.I)
-            if match:
-                name = match.group('name') if not name else name
-            elif re.match(cls.word_bound_pattern, arg):
-                if arg == 'word_bound_raw':
-                    'word_bound' not in lst and lst.append('word_bound')
-                else:
-                    word_bound = arg
-            elif re.match(cls.head_pattern, arg):
-                if arg == 'head_raw':
-                    'head' not in lst and lst.append('head')
-                else:
-                    head = arg
-            elif re.match(cls.tail_pattern, arg):
-                if arg == 'tail_raw':
-                    'tail' not in lst and lst.append('tail')
+        Yields
+        ------
+        PatternNode: a leaf node.
+        """
+        literal, index, total = '', 0, len(pattern)
+        while index < total:
+            char = pattern[index]
+            if char in '([':
+                end = skip_group(pattern, index)
+                atom = pattern[index:end]
+                if re.fullmatch(r'[(][?][aiLmsux]+[)]', atom):
+                    node = FlagNode(atom[2:-1])
+                elif atom == r'[\r\n]':
+                    node = WhitespaceNode(atom)
                 else:
-                    tail = arg
-            elif re.match(cls.meta_data_pattern, arg):
-                if arg == 'meta_data_raw':
-                    'meta_data' not in lst and lst.append('meta_data')
+                    node = RawNode(atom)
+            elif char == '\\':
+                match = re.compile(cls.escape_pattern, re.S).match(pattern, index)
+                end = match.end() if match else total
+                atom = pattern[index:end]
+                if atom == r'\s':
+                    node = WhitespaceNode(atom)
+                elif atom in (r'\A', r'\Z'):
+                    node = AnchorNode(atom)
+                elif atom[1:2].isalnum():
+                    node = RawNode(atom)
                 else:
-                    cls._variable.option = arg.lstrip('meta_data_')
+                    node = LiteralNode(atom)
             else:
-                match = re.match(or_pat, arg, flags=re.I)
-                if match:
-                    case = match.group('case')
-                    if case == 'empty':
-                        is_empty = True
-                        cls._or_empty = is_empty
-                    else:
-                        if case in REF:
-                            if re.match('(?i)time|date(time)?', case):
-                                pat = REF.get(case).get('format', f'unsupported-{case}-format')
-                                pat not in lst and lst.append(pat)
-                            else:
-                                pat = REF.get(case).get('pattern')
-                                pat not in lst and lst.append(pat)
-                        else:
-                            if re.match('(?i)time|date(time)?', case):
-                                kw, *indices = re.split('_format', case)
-                                node = REF.get(kw, None)
-                                if node:
-                                    if indices:
-                                        for index in indices:
-                                            key = f'format{index}'
-                                            pat = node.get(key, f'unsupported-{kw}{key}')
-                                            pat not in lst and lst.append(pat)
-                                    else:
-                                        pat = node.get('format', f'unsupported-{kw}format')
-                                        pat not in lst and lst.append(pat)
-                                else:
-                                    pat = case
-                                    pat not in lst and lst.append(pat)
-                            else:
-                                pat = case
-                                pat not in lst and lst.append(pat)
+                end, atom = index + 1, char
+                if char in '^$':
+                    node = AnchorNode(atom)
+                elif char == ' ':
+                    node = WhitespaceNode(atom)
+                elif char == '.':
+                    node = RawNode(atom)
                 else:
-                    pat = do_soft_regex_escape(arg)
-                    pat not in lst and lst.append(pat)
+                    node = LiteralNode(atom)
 
-        is_empty and lst.append('')
-        pattern = cls.join_list(lst)
-        pattern = cls.add_word_bound(pattern, word_bound=word_bound)
-        pattern = cls.add_var_name(pattern, name=name)
-        pattern = cls.add_head_of_string(pattern, head=head)
-        pattern = cls.add_tail_of_string(pattern, tail=tail)
-        pattern = pattern.replace('__comma__', ',')
-        return True, pattern
+            match = re.compile(cls.quantifier_pattern).match(pattern, end)
+            quantifier = match.group() if match else ''
+            index = end + len(quantifier)
 
-    @classmethod
-    def build_start_pattern(cls, keyword, params):
-        """build a start pattern over given keyword, params
+            if isinstance(node, LiteralNode) and not quantifier:
+                literal += atom
+                continue
+
+            if literal:
+                yield LiteralNode(literal)
+                literal = ''
+
+            if isinstance(node, WhitespaceNode):
+                yield WhitespaceNode(atom, quantifier=quantifier)
+            elif quantifier:
+                yield QuantifierNode(node, quantifier)
+            else:
+                yield node
+
+        if literal:
+            yield LiteralNode(literal)
+
+    def get_cached(self, key, func, *args):
+        """return a cached value of node
 
         Parameters
         ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+        key (hashable): a cache key.
+        func (callable): a callable which computes a value.
+        args (tuple): arguments of func.
 
         Returns
         -------
-        str: a regex pattern.
+        object: a cached value.
         """
-        if keyword != 'start':
-            return False, ''
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = dict()
+        elif key in cache:
+            return cache[key]
+        value = cache[key] = func(*args)
+        return value
 
-        table = dict(space=r'^ *', spaces=r'^ +', space_plus=r'^ +',
-                     ws=r'^\s*', ws_plus=r'^\s+',
-                     whitespace=r'^\s*', whitespaces=r'^\s+',
-                     whitespace_plus=r'^\s+')
-        pat = table.get(params, r'^')
-        return True, pat
+    def render(self):
+        """return a regex pattern of node"""
+        return self.get_cached('render', self.render_pattern)
 
-    @classmethod
-    def build_end_pattern(cls, keyword, params):
-        """build an end pattern over given keyword, params
+    def render_pattern(self):
+        """build a regex pattern of node"""
+        raise NotImplementedError
 
-        Parameters
-        ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+    def to_pattern(self):
+        """return a rendering of node as a pattern without conversion"""
+        return TextPattern(self.render(), as_is=True)
+
+    def get_literal_runs(self):
+        """return runs of literal text which every match of node contains
 
         Returns
         -------
-        str: a regex pattern.
+        list: a list of literal text, or None if node is an alternation.
         """
-        if keyword != 'end':
+        return self.get_cached('literal_runs', get_literal_runs, self.render())
+
+    def match_leaves(self, *patterns, at_end=False, is_exact=False):
+        """check if leading or trailing leaves fully match patterns
+
+        Parameters
+        ----------
+        patterns (tuple): regex patterns, one per leaf.
+        at_end (bool): a flag to check trailing leaves.  Default is False.
+        is_exact (bool): a flag to require that node has exactly
+                as many leaves as patterns.  Default is False.
+
+        Returns
+        -------
+        bool: True if every leaf matches its pattern.
+        """
+        leaves, total = self.leaves, len(patterns)
+        if len(leaves) < total or is_exact and len(leaves) != total:
+            return False
+        leaves = leaves[len(leaves) - total:] if at_end else leaves[:total]
+        for pattern, leaf in zip(patterns, leaves):
+            if not re.fullmatch(pattern, leaf.render()):
+                return False
+        return True
+
+
+class LiteralNode(PatternNode):
+    """Use to represent an escaped literal text, e.g. abc or 1\\.2
+
+    Parameters
+    ----------
+    pattern (str): an escaped literal text.
+    """
+    __slots__ = ('pattern',)
+
+    def __init__(self, pattern):
+        super().__init__()
+        self.pattern = pattern
+
+    def __reduce__(self):
+        return self.__class__, (self.pattern,)
+
+    @property
+    def is_literal_start(self):
+        return True
+
+    @property
+    def is_literal_end(self):
+        return True
+
+    def render_pattern(self):
+        return self.pattern
+
+
+class WhitespaceNode(PatternNode):
+    """Use to represent a run of whitespace, e.g. ' ', ' +', \\s, or \\s*
+
+    Parameters
+    ----------
+    pattern (str): a whitespace pattern, i.e. ' ', \\s, or [\\r\\n].
+    quantifier (str): a quantifier.  Default is empty.
+    """
+    __slots__ = ('pattern', 'quantifier')
+
+    def __init__(self, pattern=' ', quantifier=''):
+        super().__init__()
+        self.pattern = pattern
+        self.quantifier = quantifier
+
+    def __reduce__(self):
+        return self.__class__, (self.pattern, self.quantifier)
+
+    @property
+    def is_literal_start(self):
+        return self.pattern == ' '
+
+    @property
+    def is_literal_end(self):
+        return self.pattern == ' ' and not self.quantifier
+
+    def render_pattern(self):
+        return self.pattern + self.quantifier
+
+
+class AnchorNode(PatternNode):
+    """Use to represent an anchor, i.e. ^, $, \\A, or \\Z
+
+    Parameters
+    ----------
+    symbol (str): an anchor.
+    """
+    __slots__ = ('symbol',)
+
+    def __init__(self, symbol):
+        super().__init__()
+        self.symbol = symbol
+
+    def __reduce__(self):
+        return self.__class__, (self.symbol,)
+
+    def render_pattern(self):
+        return self.symbol
+
+
+class FlagNode(PatternNode):
+    """Use to represent an inline flag, e.g. (?i)
+
+    Parameters
+    ----------
+    flags (str): inline flags.
+    """
+    __slots__ = ('flags',)
+
+    def __init__(self, flags):
+        super().__init__()
+        self.flags = flags
+
+    def __reduce__(self):
+        return self.__class__, (self.flags,)
+
+    def render_pattern(self):
+        return '(?{})'.format(self.flags)
+
+
+class RawNode(PatternNode):
+    """Use to represent an opaque atom, e.g. a group, a character class, or \\d
+
+    Parameters
+    ----------
+    pattern (str): a regex pattern.
+    """
+    __slots__ = ('pattern',)
+
+    def __init__(self, pattern):
+        super().__init__()
+        self.pattern = pattern
+
+    def __reduce__(self):
+        return self.__class__, (self.pattern,)
+
+    def render_pattern(self):
+        return self.pattern
+
+
+class QuantifierNode(PatternNode):
+    """Use to represent a quantified node, e.g. \\d+ or (?:ab)*
+
+    Parameters
+    ----------
+    node (PatternNode): a quantified node.
+    quantifier (str): a quantifier.
+    """
+    __slots__ = ('node', 'quantifier')
+
+    def __init__(self, node, quantifier):
+        super().__init__()
+        self.node = node
+        self.quantifier = quantifier
+
+    def __reduce__(self):
+        return self.__class__, (self.node, self.quantifier)
+
+    @property
+    def is_literal_start(self):
+        return self.node.is_literal_start
+
+    def render_pattern(self):
+        pattern = self.node.render()
+        if len(self.node.leaves) > 1:
+            pattern = '(?:{})'.format(pattern)
+        return pattern + self.quantifier
+
+
+class AlternationNode(PatternNode):
+    """Use to represent an alternation, e.g. (a|b) or a|b
+
+    Parameters
+    ----------
+    nodes (list): a list of alternative nodes.
+    prefix (str): an opening of group, e.g. (, (?:, or empty for a
+            top-level alternation.  Default is (.
+    """
+    __slots__ = ('nodes', 'prefix')
+
+    def __init__(self, nodes, prefix='('):
+        super().__init__()
+        self.nodes = tuple(nodes)
+        self.prefix = prefix
+
+    def __reduce__(self):
+        return self.__class__, (self.nodes, self.prefix)
+
+    def render_pattern(self):
+        pattern = '|'.join(node.render() for node in self.nodes)
+        return '{}{})'.format(self.prefix, pattern) if self.prefix else pattern
+
+
+class SequenceNode(PatternNode):
+    """Use to represent a sequence of nodes
+
+    Parameters
+    ----------
+    nodes (list): a list of nodes.
+
+    Methods
+    -------
+    SequenceNode.from_pattern(pattern) -> SequenceNode
+    join_literal_runs() -> list
+    copy_with(nodes) -> SequenceNode
+    trim(first=0, last=0) -> SequenceNode
+    lstrip() -> SequenceNode
+    rstrip() -> SequenceNode
+    """
+    __slots__ = ('nodes',)
+
+    def __init__(self, nodes=()):
+        super().__init__()
+        self.nodes = tuple(nodes)
+
+    def __reduce__(self):
+        return self.__class__, (self.nodes,)
+
+    @property
+    def leaves(self):
+        return self.get_cached('leaves', self.get_leaves)
+
+    @classmethod
+    def from_pattern(cls, pattern):
+        """create a sequence node of a regex pattern
+
+        A node is shared by every caller with the same pattern, so its
+        rendered pattern and literal runs are computed once.
+
+        Parameters
+        ----------
+        pattern (str): a regex pattern.
+
+        Returns
+        -------
+        SequenceNode: a sequence node.
+        """
+        key = (cls, str(pattern))
+        node = cls.parse_cache.get(key)
+        if node is None:
+            node = cls(parse_pattern_nodes(pattern))
+            cls.parse_cache.set(key, node)
+        return node
+
+    def get_leaves(self):
+        lst = []
+        for node in self.nodes:
+            lst.extend(node.leaves)
+        return tuple(lst)
+
+    def render_pattern(self):
+        return ''.join(node.render() for node in self.nodes)
+
+    def get_literal_runs(self):
+        return self.get_cached('literal_runs', self.join_literal_runs)
+
+    def join_literal_runs(self):
+        """join runs of literal text of leaves which are cached per leaf"""
+        runs, is_open = [], False
+        for leaf in self.leaves:
+            leaf_runs = leaf.get_literal_runs()
+            if leaf_runs is None:
+                return None
+            leaf_runs = list(leaf_runs)
+            if is_open and runs and leaf_runs and leaf.is_literal_start:
+                runs[-1] += leaf_runs.pop(0)
+            runs.extend(leaf_runs)
+            is_open = leaf.is_literal_end
+        return runs
+
+    def copy_with(self, nodes):
+        """return a new node of the same kind with other nodes"""
+        return self.__class__(nodes)
+
+    def trim(self, first=0, last=0):
+        """remove leading and trailing leaves
+
+        Parameters
+        ----------
+        first (int): a number of leading leaves.  Default is 0.
+        last (int): a number of trailing leaves.  Default is 0.
+
+        Returns
+        -------
+        SequenceNode: a new node.
+        """
+        if not first and not last:
+            return self
+
+        nodes = list(self.nodes)
+        while first and nodes:
+            total = len(nodes[0].leaves)
+            if total <= first:
+                nodes.pop(0)
+                first -= total
+            else:
+                nodes[0], first = nodes[0].trim(first=first), 0
+        while last and nodes:
+            total = len(nodes[-1].leaves)
+            if total <= last:
+                nodes.pop()
+                last -= total
+            else:
+                nodes[-1], last = nodes[-1].trim(last=last), 0
+        return self.copy_with(nodes)
+
+    def lstrip(self):
+        """remove leading unquantified spaces"""
+        leaves = self.leaves
+        index = 0
+        while index < len(leaves) and leaves[index] == WhitespaceNode(' '):
+            index += 1
+        return self.trim(first=index)
+
+    def rstrip(self):
+        """remove trailing unquantified spaces"""
+        leaves = self.leaves
+        index = len(leaves)
+        while index > 0 and leaves[index - 1] == WhitespaceNode(' '):
+            index -= 1
+        return self.trim(last=len(leaves) - index)
+
+
+class TextNode(SequenceNode):
+    """Use to represent a converted text, i.e. a node of TextPattern
+
+    Methods
+    -------
+    TextNode.from_pattern(pattern) -> TextNode
+    lstrip() -> TextNode
+    rstrip() -> TextNode
+    """
+    __slots__ = ()
+
+    def lstrip(self):
+        """remove leading whitespace, i.e. a node of text.lstrip()"""
+        leaves = self.leaves
+        index = 0
+        while index < len(leaves) and isinstance(leaves[index], WhitespaceNode):
+            index += 1
+        return self.trim(first=index)
+
+    def rstrip(self):
+        """remove trailing whitespace, i.e. a node of text.rstrip()"""
+        leaves = self.leaves
+        index = len(leaves)
+        while index > 0 and isinstance(leaves[index - 1], WhitespaceNode):
+            index -= 1
+        return self.trim(last=len(leaves) - index)
+
+
+class ElementNode(SequenceNode):
+    """Use to represent an element with a start and an end of string pattern
+
+    Parameters
+    ----------
+    element (ElementPattern): an element pattern.
+    head (tuple): leaves of a start of string pattern.  Default is empty.
+    body (tuple): leaves of an element pattern.  Default is empty.
+    tail (tuple): leaves of an end of string pattern.  Default is empty.
+
+    Properties
+    ----------
+    variable (VarCls): a regex variable of element.
+    or_empty (bool): a flag if element is expecting a zero match.
+    prepended_pattern (str): a start of string pattern.
+    appended_pattern (str): an end of string pattern.
+
+    Methods
+    -------
+    ElementNode.from_pattern(element) -> ElementNode
+    remove_head() -> ElementNode
+    remove_tail() -> ElementNode
+    to_pattern() -> ElementPattern
+    """
+    __slots__ = ('element', 'head', 'body', 'tail')
+
+    def __init__(self, element, head=(), body=(), tail=()):
+        self.element = element
+        self.head, self.body, self.tail = tuple(head), tuple(body), tuple(tail)
+        super().__init__(self.head + self.body + self.tail)
+
+    def __reduce__(self):
+        return self.__class__, (self.element, self.head, self.body, self.tail)
+
+    @property
+    def variable(self):
+        return self.element.variable
+
+    @property
+    def or_empty(self):
+        return self.element.or_empty
+
+    @property
+    def prepended_pattern(self):
+        return ''.join(node.render() for node in self.head)
+
+    @property
+    def appended_pattern(self):
+        return ''.join(node.render() for node in self.tail)
+
+    @classmethod
+    def from_pattern(cls, element):
+        """create a node of an element pattern
+
+        Parameters
+        ----------
+        element (ElementPattern): an element pattern.
+
+        Returns
+        -------
+        ElementNode: a node of element.
+        """
+        pattern = str(element)
+        head = getattr(element, 'prepended_pattern', '')
+        tail = getattr(element, 'appended_pattern', '')
+        head = head if pattern.startswith(head) else ''
+        tail = tail if pattern.endswith(tail) and len(head + tail) <= len(pattern) else ''
+        body = pattern[len(head):len(pattern) - len(tail)]
+        return cls(
+            element, head=parse_pattern_nodes(head),
+            body=parse_pattern_nodes(body), tail=parse_pattern_nodes(tail)
+        )
+
+    def trim(self, first=0, last=0):
+        parts = [list(self.head), list(self.body), list(self.tail)]
+        for part in parts:
+            count = min(first, len(part))
+            del part[:count]
+            first -= count
+        for part in reversed(parts):
+            count = min(last, len(part))
+            del part[len(part) - count:]
+            last -= count
+        return ElementNode(self.element, *parts)
+
+    def remove_head(self):
+        """remove a start of string pattern i.e ^ or ^\\s* or ^\\s+ or ^ * or ^ +"""
+        if self.head and self.head[0] == AnchorNode('^'):
+            return ElementNode(self.element, body=self.body, tail=self.tail)
+        return self
+
+    def remove_tail(self):
+        """remove an end of string pattern i.e $ or \\s*$ or \\s+$ or  *$ or  +$"""
+        if self.tail and self.tail[-1] == AnchorNode('$'):
+            return ElementNode(self.element, head=self.head, body=self.body)
+        return self
+
+    def to_pattern(self):
+        """return an element pattern of node which keeps variable of element"""
+        pattern = self.render()
+        if pattern == self.element:
+            return self.element
+        new_instance = ElementPattern(pattern, as_is=True)
+        new_instance.as_is = False
+        new_instance.variable = self.variable
+        new_instance.or_empty = self.or_empty
+        new_instance.prepended_pattern = self.prepended_pattern
+        new_instance.appended_pattern = self.appended_pattern
+        return new_instance
+
+
+class TextPattern(str):
+    """Use to convert text data to regex pattern
+
+    Attributes
+    ----------
+    text (str): a text.
+    as_is (bool): keeping text an AS-IS pattern.
+
+    Methods
+    -------
+    is_empty() -> bool
+        check if a pattern matches empty string.
+    is_empty_or_whitespace() -> bool
+        check if a pattern matches empty string or whitespace
+    is_whitespace() -> bool
+        check if a pattern matches whitespace
+
+    TextPattern.get_pattern(text) -> str
+    lstrip(chars=None) -> TextPattern
+    rstrip(chars=None) -> TextPattern
+    strip(chars=None) -> TextPattern
+    add(other, as_is=True) -> TextPattern
+    concatenate(*other, as_is=True) -> TextPattern
+
+    Raises
+    ------
+    TextPatternError: raise an exception if pattern is invalid.
+    """
+    def __new__(cls, text, as_is=False):
+        data = str(text)
+
+        if as_is:
+            return str.__new__(cls, data)
+
+        if data:
+            text_pattern = cls.get_pattern(data)
+        else:
+            text_pattern = ''
+        return str.__new__(cls, text_pattern)
+
+    def __init__(self, text, as_is=False):
+        self.text = text
+        self.as_is = as_is
+
+    def __reduce__(self):
+        return restore_pattern, (self.__class__, str(self)), self.__getstate__()
+
+    def __getstate__(self):
+        return self.__dict__.copy()
+
+    def __add__(self, other):
+        result = super().__add__(other)
+        result_pat = TextPattern(result, as_is=True)
+        return result_pat
+
+    def __radd__(self, other):
+        if isinstance(other, TextPattern):
+            return other.__add__(self)
+        else:
+            other_pat = TextPattern(other, as_is=True)
+            return other_pat.__add__(self)
+
+    @property
+    def is_empty(self):
+        if self == '':
+            return True
+        else:
+            result = re.match(str(self), '')
+            return bool(result)
+
+    @property
+    def is_space(self):
+        is_space = bool(re.match(self, ' '))
+        return is_space
+
+    @property
+    def is_empty_or_space(self):
+        is_empty = self.is_empty
+        is_space = self.is_space
+        return is_empty or is_space
+
+    @property
+    def is_whitespace(self):
+        is_ws = all(True for c in WHITESPACE_CHARS if re.match(self, c))
+        return is_ws
+
+    @property
+    def is_empty_or_whitespace(self):
+        is_empty = self.is_empty
+        is_ws = self.is_whitespace
+        return is_empty or is_ws
+
+    @classmethod
+    def get_pattern(cls, text):
+        """convert data to regex pattern
+
+        Parameters
+        ----------
+        text (str): a text
+
+        Returns
+        -------
+        str: a regex pattern.
+
+        Raises
+        ------
+        TextPatternError: raise an exception if pattern is invalid.
+        """
+        text_pattern = ''
+        start = 0
+        m = None
+        for m in re.finditer(r'[\r\n]+', text):
+            pre_match = text[start:m.start()]
+            if pre_match:
+                text_pattern += Line(pre_match).convert_to_regex_pattern()
+            match = m.group()
+            multi = '{1,2}' if len(match) == len(set(match)) else '{2,}'
+            text_pattern += f'[\\r\\n]{multi}'
+        if m:
+            post_match = text[m.end():]
+            if post_match:
+                text_pattern += Line(post_match).convert_to_regex_pattern()
+        else:
+            text_pattern = Line(text).convert_to_regex_pattern()
+
+        validate_pattern(text_pattern, exception_cls=TextPatternError)
+        return text_pattern
+
+    @classmethod
+    def get_pattern_bak(cls, text):
+        """convert data to regex pattern
+
+        Parameters
+        ----------
+        text (str): a text
+
+        Returns
+        -------
+        str: a regex pattern.
+
+        Raises
+        ------
+        TextPatternError: raise an exception if pattern is invalid.
+        """
+        start = 0
+        result = []
+        for item in re.finditer(r'\s+', text):
+            before_matched = text[start: item.start()]
+            before_matched and result.append(do_soft_regex_escape(before_matched))
+            matched = item.group()
+            total = len(matched)
+            lst = list(matched)
+            is_space = lst[0] == ' ' and len(set(lst)) == 1
+            is_space and result.append(' ' if total == 1 else ' +')
+            not is_space and result.append(r'\s' if total == 1 else r'\s+')
+            start = item.end()
+        else:
+            if result:
+                after_matched = text[start:]
+                after_matched and result.append(do_soft_regex_escape(after_matched))
+            else:
+                result.append(do_soft_regex_escape(text))
+
+        text_pattern = ''.join(result)
+
+        validate_pattern(text_pattern, exception_cls=TextPatternError)
+        return text_pattern
+
+    def lstrip(self, chars=None):
+        """Return a copy of the TextPattern with leading whitespace removed.
+
+        Parameters
+        ----------
+        chars (None, str): If chars is given and not None,
+                remove characters in chars instead.
+
+        Returns
+        -------
+        TextPattern: a new TextPattern with leading whitespace removed.
+
+        """
+        new_text = self.text.lstrip() if chars is None else self.text.lstrip(chars)
+        pattern = TextPattern(new_text)
+        return pattern
+
+    def rstrip(self, chars=None):
+        """Return a copy of the TextPattern with trailing whitespace removed.
+
+        Parameters
+        ----------
+        chars (None, str): If chars is given and not None,
+                remove characters in chars instead.
+
+        Returns
+        -------
+        TextPattern: a new TextPattern with trailing whitespace removed.
+
+        """
+        new_text = self.text.rstrip() if chars is None else self.text.rstrip(chars)
+        pattern = TextPattern(new_text)
+        return pattern
+
+    def strip(self, chars=None):
+        """Return a copy of the TextPattern with leading and
+        trailing whitespace removed.
+
+        Parameters
+        ----------
+        chars (None, str): If chars is given and not None,
+                remove characters in chars instead.
+
+        Returns
+        -------
+        TextPattern: a new TextPattern with leading and trailing whitespace removed.
+
+        """
+        new_text = self.text.strip() if chars is None else self.text.strip(chars)
+        pattern = TextPattern(new_text)
+        return pattern
+
+    def add(self, other, as_is=True):
+        """return a concatenated TextPattern.
+
+        Parameters
+        ----------
+        other (str, TextElement): other
+        as_is (bool): a flag to keep adding other AS-IS condition.
+
+        Returns
+        -------
+        TextPattern: a concatenated TextPattern instance.
+        """
+        if isinstance(other, TextPattern):
+            result = self + other
+        else:
+            if isinstance(other, (list, tuple)):
+                result = self
+                for item in other:
+                    if isinstance(item, TextPattern):
+                        result = result + item
+                    else:
+                        item_pat = TextPattern(str(item), as_is=as_is)
+                        result = result + item_pat
+            else:
+                other_pat = TextPattern(str(other), as_is=as_is)
+                result = self + other_pat
+
+        return result
+
+    def concatenate(self, *other, as_is=True):
+        """return a concatenated TextPattern.
+
+        Parameters
+        ----------
+        other (tuple): other
+        as_is (bool): a flag to keep adding other AS-IS condition.
+
+        Returns
+        -------
+        TextPattern: a concatenated TextPattern instance.
+        """
+        result = self
+        for item in other:
+            result = result.add(item, as_is=as_is)
+        return result
+
+
+class ElementPattern(str):
+    """Use to convert element data to regex pattern
+
+    Attributes
+    ----------
+    variable (VarCls): a regex variable.
+    or_empty (bool): a flag if pattern is expecting a zero match, i.e. empty.
+            Default is False.
+    compiled (re.Pattern): a compiled pattern.  Default is None.
+    pattern_cache (PatternCache): a shared cache of converted element patterns.
+
+    Parameters
+    ----------
+    text (str): a text.
+    as_is (bool): keeping text an AS-IS pattern.
+
+    Methods
+    -------
+    ElementPattern.get_pattern(data) -> str
+    ElementPattern.get_cache_stats() -> dict
+    ElementPattern.build_pattern(keyword, params) -> str
+    ElementPattern.build_custom_pattern(keyword, params) -> bool, str
+    ElementPattern.build_datetime_pattern(keyword, params) -> bool, str
+    ElementPattern.build_choice_pattern(keyword, params) -> bool, str
+    ElementPattern.build_data_pattern(keyword, params) -> bool, str
+    ElementPattern.build_start_pattern(keyword, params) -> bool, str
+    ElementPattern.build_end_pattern(keyword, params) -> bool, str
+    ElementPattern.build_raw_pattern(keyword, params) -> bool, str
+    ElementPattern.build_default_pattern(keyword, params) -> bool, str
+    ElementPattern.join_list(lst, is_enclosed=False) -> str
+    ElementPattern.get_literal_tokens(pattern) -> tuple
+    ElementPattern.is_reorderable(first, other) -> bool
+    ElementPattern.factor_alternatives(lst) -> list
+    ElementPattern.build_trie_pattern(lst_of_tokens) -> str
+    ElementPattern.add_var_name(pattern, name='') -> str
+    ElementPattern.add_word_bound(pattern, word_bound='', added_parentheses=True) -> str
+    ElementPattern.add_start_of_string(pattern, head='') -> str
+    ElementPattern.add_end_of_string(pattern, tail='') -> str
+    ElementPattern.add_repetition(lst, repetition='') -> list
+    ElementPattern.add_occurrence(lst, occurrence='') -> list
+    ElementPattern.add_case_occurrence(lst, first, last, is_phrase) -> bool
+    ElementPattern.is_singular_pattern(pattern) -> bool
+    remove_head_of_string() -> ElementPattern
+    remove_tail_of_string() -> ElementPattern
+
+    Raises
+    ------
+    ElementPatternError: raise an exception if pattern is invalid.
+    """
+    # patterns
+    word_bound_pattern = r'word_bound(_left|_right|_raw)?$'
+    head_pattern = r'head(_raw|((_just)?_(whitespaces?|ws|spaces?)(_plus)?))?$'
+    tail_pattern = r'tail(_raw|((_just)?_(whitespaces?|ws|spaces?)(_plus)?))?$'
+    repetition_pattern = r'repetition_\d*(_\d*)?$'
+    occurrence_pattern = r'({})(?P<is_phrase>_(group|phrase))?_occurrences?$'.format(
+        '|'.join([
+            r'((?P<fda>\d+)_or_(?P<lda>\d+))',
+            r'((?P<fdb>\d+)_or_(?P<ldb>more))',
+            r'(at_(?P<fdc>least|most)_(?P<ldc>\d+))',
+            r'(?P<fdd>\d+)'
+        ])
+    )
+    meta_data_pattern = r'^meta_data_\w+'
+    literal_token_pattern = r'\\[^0-9A-Za-z]|[^\\.^$*+?{}\[\]()|]'
+    literal_pattern = r'(?:{})+'.format(literal_token_pattern)
+    pattern_cache = PatternCache(maxsize=4096)
+
+    def __new__(cls, text, as_is=False):
+        data = str(text)
+        context = BuildContext()
+
+        if as_is or not data:
+            pattern = data
+        else:
+            with context:
+                pattern = cls.get_pattern(data)
+
+        instance = str.__new__(cls, pattern)
+        instance.variable = context.variable
+        instance.or_empty = context.or_empty
+        instance.prepended_pattern = context.prepended_pattern
+        instance.appended_pattern = context.appended_pattern
+        instance.compiled = None
+        if not as_is and data:
+            instance.compiled = context.finalize(
+                pattern, lambda: cls(text), exception_cls=ElementPatternError
+            )
+        return instance
+
+    def __init__(self, text, as_is=False):
+        self.text = text
+        self.as_is = as_is
+
+    def __reduce__(self):
+        return restore_pattern, (self.__class__, str(self)), self.__getstate__()
+
+    def __getstate__(self):
+        return self.__dict__.copy()
+
+    @classmethod
+    def get_pattern(cls, text):
+        """convert data to regex pattern
+
+        Parameters
+        ----------
+        text (str): a text
+
+        Returns
+        -------
+        str: a regex pattern.
+
+        Raises
+        ------
+        ElementPatternError: raise an exception if pattern is invalid.
+        """
+        context = BuildContext.get_current()
+        version = (REF.version, SYMBOL.version)
+        key = (cls, text)
+
+        entry = cls.pattern_cache.get(key, version=version)
+        if entry:
+            pattern, variable, or_empty, prepended_pattern, appended_pattern, compiled = entry
+            if compiled is None:
+                compiled = validate_pattern(pattern, exception_cls=ElementPatternError)
+                compiled and cls.pattern_cache.set(
+                    key, entry[:-1] + (compiled,), version=version
+                )
+            context.variable = copy(variable)
+            context.or_empty = or_empty
+            context.prepended_pattern = prepended_pattern
+            context.appended_pattern = appended_pattern
+            context.compiled = compiled
+            return pattern
+
+        with context:
+            sep_pat = r'(?P<keyword>\w+)[(](?P<params>.*)[)]$'
+            match = re.match(sep_pat, text.strip())
+            if match:
+                keyword = match.group('keyword')
+                params = match.group('params').strip()
+                pattern = cls.build_pattern(keyword, params)
+            else:
+                pattern = do_soft_regex_escape(text)
+
+            compiled = validate_pattern(pattern, exception_cls=ElementPatternError)
+            context.compiled = compiled
+
+        entry = (
+            pattern, copy(context.variable), context.or_empty,
+            context.prepended_pattern, context.appended_pattern, compiled
+        )
+        cls.pattern_cache.set(key, entry, version=version)
+        return pattern
+
+    @classmethod
+    def get_cache_stats(cls):
+        """return statistics of element pattern cache
+
+        Returns
+        -------
+        dict: hits, misses, invalidations, size, and maxsize.
+        """
+        return cls.pattern_cache.get_stats()
+
+    @classmethod
+    def build_pattern(cls, keyword, params):
+        """build a regex pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        str: a regex pattern.
+        """
+        params = ElementParams.parse(keyword, params)
+
+        is_built, raw_pattern = cls.build_raw_pattern(keyword, params)
+        if is_built:
+            return raw_pattern
+
+        is_built, start_pattern = cls.build_start_pattern(keyword, params)
+        if is_built:
+            return start_pattern
+
+        is_built, end_pattern = cls.build_end_pattern(keyword, params)
+        if is_built:
+            return end_pattern
+
+        is_built, symbol_pattern = cls.build_symbol_pattern(keyword, params)
+        if is_built:
+            return symbol_pattern
+
+        is_built, datetime_pattern = cls.build_datetime_pattern(keyword, params)
+        if is_built:
+            return datetime_pattern
+
+        is_built, choice_pattern = cls.build_choice_pattern(keyword, params)
+        if is_built:
+            return choice_pattern
+
+        is_built, data_pattern = cls.build_data_pattern(keyword, params)
+        if is_built:
+            return data_pattern
+
+        is_built, custom_pattern = cls.build_custom_pattern(keyword, params)
+        if is_built:
+            return custom_pattern
+
+        _, default_pattern = cls.build_default_pattern(keyword, params)
+        return default_pattern
+
+    @classmethod
+    def build_custom_pattern(cls, keyword, params):
+        """build a custom pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        tuple: status, a regex pattern.
+        """
+        if keyword not in REF:
+            return False, ''
+
+        parsed = ElementParams.parse(keyword, params)
+        lst = [REF.get(keyword).get('pattern')]
+        lst, is_empty, spaces_occurrence_pat, is_or_either = cls.apply_arguments(
+            lst, parsed, is_repeatable=True, is_spaced_or=True
+        )
+
+        is_empty and lst.append('')
+        is_multiple = len(lst) > 1
+        is_enclosed = bool(parsed.name or parsed.word_bound or spaces_occurrence_pat)
+        pattern = cls.join_list(lst, is_enclosed=is_enclosed)
+        pattern = cls.add_word_bound(
+            pattern, word_bound=parsed.word_bound, added_parentheses=is_multiple
+        )
+        if spaces_occurrence_pat:
+            fmt = '(%s)|( *%s *)' if is_or_either else '(%s)|(%s)'
+            pattern = fmt % (spaces_occurrence_pat, pattern)
+
+        pattern = cls.add_var_name(pattern, name=parsed.name)
+        pattern = cls.add_head_of_string(pattern, head=parsed.head)
+        pattern = cls.add_tail_of_string(pattern, tail=parsed.tail)
+        pattern = pattern.replace('__comma__', ',')
+        return True, pattern
+
+    @classmethod
+    def build_symbol_pattern(cls, keyword, params):
+        """build a symbol over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a symbol keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        tuple: status, a regex pattern.
+        """
+        parsed = ElementParams.parse(keyword, params)
+        if keyword != 'symbol' or not parsed.params.strip():
+            return False, ''
+
+        if not parsed.has_symbol_name:
+            return False, ''
+
+        symbol_name = parsed.symbol_name
+        val = SYMBOL.get(symbol_name, do_soft_regex_escape(symbol_name))
+        lst = [val]
+        lst, is_empty, *_ = cls.apply_arguments(
+            lst, parsed, skipped_kinds=('symbol_name',), is_repeatable=True
+        )
+
+        is_empty and lst.append('')
+        is_multiple = len(lst) > 1
+        is_enclosed = bool(parsed.name or parsed.word_bound)
+        pattern = cls.join_list(lst, is_enclosed=is_enclosed)
+        pattern = cls.add_word_bound(
+            pattern, word_bound=parsed.word_bound, added_parentheses=is_multiple
+        )
+        pattern = cls.add_var_name(pattern, name=parsed.name)
+        pattern = cls.add_head_of_string(pattern, head=parsed.head)
+        pattern = cls.add_tail_of_string(pattern, tail=parsed.tail)
+        pattern = pattern.replace('__comma__', ',')
+        return True, pattern
+
+    @classmethod
+    def build_datetime_pattern(cls, keyword, params):
+        """build a datetime pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        tuple: status, a regex pattern.
+        """
+        if keyword not in REF:
+            return False, ''
+
+        node = REF.get(keyword)
+        fmt_lst = [key for key in node if key.startswith('format')]
+        if not fmt_lst:
+            return False, ''
+
+        parsed = ElementParams.parse(keyword, params)
+        lst = IndexedList()
+        for fmt in parsed.formats:
+            pat = node.get(fmt)
+            pat not in lst and lst.append(pat)
+        if not lst:
+            lst.append(node.get('format'))
+
+        lst, is_empty, *_ = cls.apply_arguments(
+            lst, parsed, skipped_kinds=('format',)
+        )
+
+        is_empty and lst.append('')
+        is_enclosed = bool(parsed.name or parsed.word_bound)
+        pattern = cls.join_list(lst, is_enclosed=is_enclosed)
+        pattern = cls.add_word_bound(pattern, word_bound=parsed.word_bound)
+        pattern = cls.add_var_name(pattern, name=parsed.name)
+        pattern = cls.add_head_of_string(pattern, head=parsed.head)
+        pattern = cls.add_tail_of_string(pattern, tail=parsed.tail)
+        pattern = pattern.replace('__comma__', ',')
+        return True, pattern
+
+    @classmethod
+    def build_choice_pattern(cls, keyword, params):
+        """build a choice pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        str: a regex pattern.
+        """
+        if keyword != 'choice':
+            return False, ''
+
+        parsed = ElementParams.parse(keyword, params)
+        lst, is_empty, *_ = cls.apply_arguments([], parsed)
+
+        is_empty and lst.append('')
+        is_enclosed = bool(parsed.name or parsed.word_bound)
+        pattern = cls.join_list(lst, is_enclosed=is_enclosed)
+        pattern = cls.add_word_bound(pattern, word_bound=parsed.word_bound)
+        pattern = cls.add_var_name(pattern, name=parsed.name)
+        pattern = cls.add_head_of_string(pattern, head=parsed.head)
+        pattern = cls.add_tail_of_string(pattern, tail=parsed.tail)
+        pattern = pattern.replace('__comma__', ',')
+        return True, pattern
+
+    @classmethod
+    def build_data_pattern(cls, keyword, params):
+        """build a data pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        str: a regex pattern.
+        """
+        if keyword != 'data':
+            return False, ''
+
+        parsed = ElementParams.parse(keyword, params)
+        lst, is_empty, *_ = cls.apply_arguments([], parsed)
+
+        is_empty and lst.append('')
+        is_enclosed = bool(parsed.name or parsed.word_bound)
+        pattern = cls.join_list(lst, is_enclosed=is_enclosed)
+        pattern = cls.add_word_bound(pattern, word_bound=parsed.word_bound)
+        pattern = cls.add_var_name(pattern, name=parsed.name)
+        pattern = cls.add_head_of_string(pattern, head=parsed.head)
+        pattern = cls.add_tail_of_string(pattern, tail=parsed.tail)
+        pattern = pattern.replace('__comma__', ',')
+        return True, pattern
+
+    @classmethod
+    def apply_arguments(cls, lst, parsed, skipped_kinds=(),
+                        is_repeatable=False, is_spaced_or=False):
+        """apply parsed arguments to a list of sub-patterns
+
+        Parameters
+        ----------
+        lst (list): a list of sub-patterns.
+        parsed (ElementParams): parsed parameters.
+        skipped_kinds (tuple): argument kinds that are already consumed
+                by a build strategy.  Default is empty.
+        is_repeatable (bool): a flag to apply repetition and occurrence
+                argument.  Default is False.
+        is_spaced_or (bool): a flag to apply or_repeat_..._space and
+                or_..._occurrence_space argument.  Default is False.
+
+        Returns
+        -------
+        tuple: a list of sub-patterns, an or_empty flag, a spaces
+                occurrence pattern, and an or_either flag.
+        """
+        context = BuildContext.get_current()
+        lst = IndexedList(lst)
+        is_empty = False
+        is_repeated = False
+        is_occurrence = False
+        is_or_either = False
+        spaces_occurrence_pat = ''
+
+        repeating_space_pat = r'(?:either_)?repeat(?:s|ing)?(_[0-9_]+)_spaces?$'
+        occurring_space_pat = r'(?:either_)?((at_(least|most)_)?\d+(_occurrences?)?)_spaces?$'
+
+        for arg in parsed.arguments:
+            kind = arg.kind
+            if kind == 'var' or kind in skipped_kinds:
+                continue
+            elif kind in ('word_bound', 'head', 'tail'):
+                arg.is_raw and kind not in lst and lst.append(kind)
+            elif kind == 'repetition' and is_repeatable:
+                if not is_repeated or not is_occurrence:
+                    lst = cls.add_repetition(lst, repetition=arg.text)
+                    is_repeated = True
+            elif kind == 'occurrence' and is_repeatable:
+                if not is_repeated or not is_occurrence:
+                    lst = cls.add_occurrence(lst, occurrence=arg.text)
+                    is_occurrence = True
+            elif kind == 'meta_data':
+                if arg.is_raw:
+                    'meta_data' not in lst and lst.append('meta_data')
+                else:
+                    context.variable.option = arg.value
+            elif kind == 'or_case':
+                case = arg.value
+                if case == 'empty':
+                    is_empty = True
+                    context.or_empty = is_empty
+                elif is_spaced_or and re.match(repeating_space_pat, case, flags=re.I):
+                    r_case = re.sub(repeating_space_pat, r'repetition\1', case.lower())
+                    spaces_occurrence_pat = cls('space(%s)' % r_case)
+                    is_or_either = str.lower(case).startswith('either_')
+                elif is_spaced_or and re.match(occurring_space_pat, case, flags=re.I):
+                    o_case = re.sub(occurring_space_pat, r'\1', case.lower())
+                    o_case = o_case if 'occurrence' in o_case else '%s_occurrence' % o_case
+                    spaces_occurrence_pat = cls('space(%s)' % o_case)
+                    is_or_either = str.lower(case).startswith('either_')
+                else:
+                    for pat in cls.build_or_case_patterns(case):
+                        pat not in lst and lst.append(pat)
+            else:
+                pat = do_soft_regex_escape(arg.text)
+                pat not in lst and lst.append(pat)
+
+        return lst, is_empty, spaces_occurrence_pat, is_or_either
+
+    @classmethod
+    def build_or_case_patterns(cls, case):
+        """build a list of patterns for a case of or_ argument
+
+        Parameters
+        ----------
+        case (str): a case of or_ argument, i.e. a keyword, a datetime
+                keyword with format, or a raw pattern.
+
+        Returns
+        -------
+        list: a list of regex pattern.
+        """
+        is_datetime = bool(re.match('(?i)time|date(time)?', case))
+        if case in REF:
+            if is_datetime:
+                return [REF.get(case).get('format', f'unsupported-{case}-format')]
+            return [REF.get(case).get('pattern')]
+
+        if not is_datetime:
+            return [case]
+
+        kw, *indices = re.split('_format', case)
+        node = REF.get(kw, None)
+        if not node:
+            return [case]
+
+        if indices:
+            lst = []
+            for index in indices:
+                key = f'format{index}'
+                lst.append(node.get(key, f'unsupported-{kw}{key}'))
+            return lst
+        return [node.get('format', f'unsupported-{kw}format')]
+
+    @classmethod
+    def build_start_pattern(cls, keyword, params):
+        """build a start pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        str: a regex pattern.
+        """
+        if keyword != 'start':
+            return False, ''
+
+        params = ElementParams.parse(keyword, params).params
+        table = dict(space=r'^ *', spaces=r'^ +', space_plus=r'^ +',
+                     ws=r'^\s*', ws_plus=r'^\s+',
+                     whitespace=r'^\s*', whitespaces=r'^\s+',
+                     whitespace_plus=r'^\s+')
+        pat = table.get(params, r'^')
+        return True, pat
+
+    @classmethod
+    def build_end_pattern(cls, keyword, params):
+        """build an end pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        str: a regex pattern.
+        """
+        if keyword != 'end':
+            return False, ''
+
+        params = ElementParams.parse(keyword, params).params
+        table = dict(space=r' *$', spaces=r' +$', space_plus=r' +$',
+                     ws=r'\s*$', ws_plus=r'\s+$',
+                     whitespace=r'\s*$', whitespaces=r'\s+$',
+                     whitespace_plus=r'\s+$')
+        pat = table.get(params, r'$')
+        return True, pat
+
+    @classmethod
+    def build_raw_pattern(cls, keyword, params):
+        """build a raw data pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        str: a regex pattern.
+        """
+        params = ElementParams.parse(keyword, params).params
+        if not params.startswith('raw>>>'):
             return False, ''
+        params = re.sub(r'raw>+', '', params, count=1)
+        new_params = do_soft_regex_escape(params)
+        pattern = r'{}\({}\)'.format(keyword, new_params)
+        return True, pattern
+
+    @classmethod
+    def build_default_pattern(cls, keyword, params):
+        """build a default pattern over given keyword, params
+
+        Parameters
+        ----------
+        keyword (str): a custom keyword
+        params (str, ElementParams): a list of parameters
+
+        Returns
+        -------
+        tuple: status, a regex pattern.
+        """
+        params = ElementParams.parse(keyword, params).params
+        pattern = do_soft_regex_escape('{}({})'.format(keyword, params))
+        return True, pattern
+
+    @classmethod
+    def join_list(cls, lst, is_enclosed=False):
+        """join item of list
+
+        Parameters
+        ----------
+        lst (list): list of pattern
+        is_enclosed (bool): True if a caller encloses a joined pattern,
+                i.e. with a var name or a word bound.  Default is False.
+
+        Returns
+        -------
+        str: a string data.
+        """
+        new_lst = IndexedList()
+        has_ws = False
+        is_multiple = len(lst) > 1
+        if len(lst) > 1:
+            for item in lst:
+                if ' ' in item or r'\s' in item:
+                    has_ws = True
+                    if item.startswith('(') and item.endswith(')'):
+                        v = item
+                    else:
+                        if re.match(r' ([?+*]+|([{][0-9,]+[}]))$', item):
+                            v = item
+                        else:
+                            v = '({})'.format(item)
+                else:
+                    if item:
+                        chk1 = '\\' in item
+                        chk2 = '[' in item and ']' in item
+                        chk3 = '(' in item and ')' in item
+                        chk4 = '{' in item and '}' in item
+                        if chk1 or chk2 or chk3 or chk4:
+                            v = '({})'.format(item)
+                        else:
+                            v = item
+                    else:
+                        v = item
+                v not in new_lst and new_lst.append(v)
+        else:
+            new_lst = lst
+
+        has_empty = bool([True for item in new_lst if item == ''])
+        if has_empty:
+            other_lst = [item for item in new_lst if item]
+            other_lst = cls.factor_alternatives(other_lst)
+            result = '|'.join(other_lst)
+            result = f"({result}|)" if len(other_lst) == 1 and not has_ws else f"(({result})|)"
+            return result
+        else:
+            is_wrapped = is_multiple and has_ws
+            if is_enclosed or is_wrapped:
+                new_lst = cls.factor_alternatives(new_lst)
+            result = '|'.join(new_lst)
+            result = f"({result})" if is_wrapped else result
+            return result
+
+    @classmethod
+    def get_literal_tokens(cls, pattern):
+        """split a literal pattern into tokens
+
+        Parameters
+        ----------
+        pattern (str): a pattern which might be enclosed by parentheses.
+
+        Returns
+        -------
+        tuple: tokens, i.e. a char or an escaped char, or None if pattern
+                is not a literal pattern.
+        """
+        if pattern.startswith('(') and pattern.endswith(')'):
+            pattern = pattern[1:-1]
+        if not pattern or not re.fullmatch(cls.literal_pattern, pattern):
+            return None
+        return tuple(re.findall(cls.literal_token_pattern, pattern))
+
+    @classmethod
+    def is_reorderable(cls, first, other):
+        """check if two alternatives can swap without changing a match
+
+        Parameters
+        ----------
+        first (str): a first token of an alternative.
+        other (str): a first token of other alternative.
+
+        Returns
+        -------
+        bool: True if no text can match both first tokens, even with
+                ignore case flag, otherwise False.
+        """
+        if not first or not other:
+            return False
+        char, other_char = first[-1], other[-1]
+        if not char.isascii() or not other_char.isascii():
+            return False
+        return char.lower() != other_char.lower()
+
+    @classmethod
+    def factor_alternatives(cls, lst):
+        """factor shared prefixes of literal alternatives into a trie,
+        e.g. GigE|GigabitEthernet|TenGigE becomes Gig(?:E|abitEthernet)|TenGigE.
+        Alternatives are only regrouped across other alternatives whose
+        first char can not match, so a match is the same as a flat alternation.
+
+        Parameters
+        ----------
+        lst (list): list of pattern
+
+        Returns
+        -------
+        list: list of pattern, or lst if no prefix is shared.
+        """
+        groups = []
+        for item in lst:
+            tokens = cls.get_literal_tokens(item)
+            first = tokens[0] if tokens else ''
+            for group in reversed(groups):
+                if first and group[0] == first:
+                    group[1].append(tokens)
+                    group[2].append(item)
+                    break
+                if not cls.is_reorderable(group[0], first):
+                    groups.append((first, [tokens], [item]))
+                    break
+            else:
+                groups.append((first, [tokens], [item]))
+
+        if len(groups) == len(lst):
+            return lst
+
+        new_lst = []
+        for _, lst_of_tokens, items in groups:
+            if len(items) == 1:
+                new_lst.append(items[0])
+            else:
+                new_lst.append(cls.build_trie_pattern(lst_of_tokens))
+        return new_lst
+
+    @classmethod
+    def build_trie_pattern(cls, lst_of_tokens):
+        """build a pattern of tokens of alternatives sharing a prefix
+
+        Parameters
+        ----------
+        lst_of_tokens (list): list of tokens of literal alternatives.
+
+        Returns
+        -------
+        str: a pattern, i.e. a shared prefix and a non-capturing group of
+                factored suffixes.  An empty suffix at either end becomes
+                a greedy or lazy optional group, e.g. Gi0/1(?:\\.100)?.
+        """
+        prefix = []
+        for tokens in zip(*lst_of_tokens):
+            if len(set(tokens)) > 1:
+                break
+            prefix.append(tokens[0])
+        index = len(prefix)
+        suffixes = IndexedList()
+        for tokens in lst_of_tokens:
+            suffix = ''.join(tokens[index:])
+            suffix not in suffixes and suffixes.append(suffix)
+
+        prefix = ''.join(prefix)
+        if len(suffixes) == 1:
+            return prefix + suffixes[0]
+
+        lst = cls.factor_alternatives(list(suffixes))
+        if lst[-1] == '':
+            return '{}(?:{})?'.format(prefix, '|'.join(lst[:-1]))
+        elif lst[0] == '':
+            return '{}(?:{})??'.format(prefix, '|'.join(lst[1:]))
+        return '{}(?:{})'.format(prefix, '|'.join(lst))
+
+        # result = '|'.join(new_lst)
+        #
+        # has_empty = bool([True for i in new_lst if i == ''])
+        # if has_empty or len(new_lst) > 1 and has_ws:
+        #     result = '({})'.format(result)
+        #
+        # return result
+
+    @classmethod
+    def add_var_name(cls, pattern, name=''):
+        """add var name to regex pattern
+
+        Parameters
+        ----------
+        pattern (str): a pattern
+        name (str): a regex variable name
+
+        Returns
+        -------
+        str: new pattern with variable name.
+        """
+        if name:
+            variable = BuildContext.get_current().variable
+            variable.name = name
+            variable.pattern = pattern
+            if pattern.startswith('(') and pattern.endswith(')'):
+                sub_pat = pattern[1:-1]
+                if pattern.endswith('|)'):
+                    new_pattern = '(?P<{}>{})'.format(name, sub_pat)
+                else:
+                    try:
+                        re.compile(sub_pat)
+                        variable.pattern = sub_pat
+                        new_pattern = '(?P<{}>{})'.format(name, sub_pat)
+                    except Exception as ex:     # noqa
+                        new_pattern = '(?P<{}>{})'.format(name, pattern)
+            else:
+                new_pattern = '(?P<{}>{})'.format(name, pattern)
+            return new_pattern
+        return pattern
+
+    @classmethod
+    def add_word_bound(cls, pattern, word_bound='', added_parentheses=True):
+        """add word bound i.e \\b to regex pattern
+
+        Parameters
+        ----------
+        pattern (str): a pattern
+        word_bound (str): word bound case.  Default is empty.
+                value of word_bound can be word_bound, word_bound_left,
+                or word_bound_right
+        added_parentheses (bool): always add parentheses to pattern.  Default is True.
+
+        Returns
+        -------
+        str: new pattern with enclosing word bound pattern if it is required.
+        """
+        if not word_bound:
+            return pattern
+
+        has_ws = ' ' in pattern or r'\s' in pattern
+        new_pattern = '({})'.format(pattern) if has_ws else pattern
+        if added_parentheses:
+            if not new_pattern.startswith('(') or not new_pattern.endswith(')'):
+                new_pattern = '({})'.format(new_pattern)
+
+        if word_bound == 'word_bound_left':
+            new_pattern = r'\b{}'.format(new_pattern)
+        elif word_bound == 'word_bound_right':
+            new_pattern = r'{}\b'.format(new_pattern)
+        else:
+            new_pattern = r'\b{}\b'.format(new_pattern)
+        return new_pattern
+
+    @classmethod
+    def add_head_of_string(cls, pattern, head=''):
+        """prepend start of string i.e ^ or ^\\s* or ^\\s+ or ^ * or ^ + regex pattern
+
+        Parameters
+        ----------
+        pattern (str): a pattern
+        head (str): start of string case.  Default is empty.
+
+        Returns
+        -------
+        str: new pattern with start of string pattern
+        """
+        if head:
+            context = BuildContext.get_current()
+            case1, case2 = r'^\s*', r'^\s+'
+            case3, case4 = r'^ *', r'^ +'
+            case5 = r'^'
+
+            case6, case7 = r'\s*', r'\s+'
+            case8, case9 = r' *', r' +'
+
+            case10, case11 = r'^\s*', r'^\s+'
+            case12, case13 = r'\s*', r'\s+'
+
+            if head == 'head_ws' and not pattern.startswith(case1):
+                new_pattern = '{}{}'.format(case1, pattern)
+                context.prepended_pattern = case1
+            elif head == 'head_ws_plus' and not pattern.startswith(case2):
+                new_pattern = '{}{}'.format(case2, pattern)
+                context.prepended_pattern = case2
+            elif head == 'head_space' and not pattern.startswith(case3):
+                new_pattern = '{}{}'.format(case3, pattern)
+                context.prepended_pattern = case3
+            elif head == 'head_space_plus' and not pattern.startswith(case4):
+                new_pattern = '{}{}'.format(case4, pattern)
+                context.prepended_pattern = case4
+            elif head == 'head_spaces' and not pattern.startswith(case4):
+                new_pattern = '{}{}'.format(case4, pattern)
+                context.prepended_pattern = case4
+            elif head == 'head' and not pattern.startswith(case5):
+                new_pattern = '{}{}'.format(case5, pattern)
+                context.prepended_pattern = case5
+            elif head == 'head_just_ws' and not pattern.startswith(case6):
+                new_pattern = '{}{}'.format(case6, pattern)
+                context.prepended_pattern = case6
+            elif head == 'head_just_ws_plus' and not pattern.startswith(case7):
+                new_pattern = '{}{}'.format(case7, pattern)
+                context.prepended_pattern = case7
+            elif head == 'head_just_space' and not pattern.startswith(case8):
+                new_pattern = '{}{}'.format(case8, pattern)
+                context.prepended_pattern = case8
+            elif head == 'head_just_space_plus' and not pattern.startswith(case9):
+                new_pattern = '{}{}'.format(case9, pattern)
+                context.prepended_pattern = case9
+            elif head == 'head_just_spaces' and not pattern.startswith(case9):
+                new_pattern = '{}{}'.format(case9, pattern)
+                context.prepended_pattern = case9
+            elif head == 'head_whitespace' and not pattern.startswith(case10):
+                new_pattern = '{}{}'.format(case10, pattern)
+                context.prepended_pattern = case10
+            elif head == 'head_whitespace_plus' and not pattern.startswith(case11):
+                new_pattern = '{}{}'.format(case11, pattern)
+                context.prepended_pattern = case11
+            elif head == 'head_whitespaces' and not pattern.startswith(case11):
+                new_pattern = '{}{}'.format(case11, pattern)
+                context.prepended_pattern = case11
+            elif head == 'head_just_whitespace' and not pattern.startswith(case12):
+                new_pattern = '{}{}'.format(case12, pattern)
+                context.prepended_pattern = case12
+            elif head == 'head_just_whitespace_plus' and not pattern.startswith(case13):
+                new_pattern = '{}{}'.format(case13, pattern)
+                context.prepended_pattern = case13
+            elif head == 'head_just_whitespaces' and not pattern.startswith(case13):
+                new_pattern = '{}{}'.format(case13, pattern)
+                context.prepended_pattern = case13
+            else:
+                new_pattern = pattern
+            return new_pattern
+        return pattern
+
+    @classmethod
+    def add_tail_of_string(cls, pattern, tail=''):
+        """append end of string i.e $ or \\s*$ or $\\s+$ or  *$ or  +$ regex pattern
+
+        Parameters
+        ----------
+        pattern (str): a pattern
+        tail (str): end of string case.  Default is empty.
+
+        Returns
+        -------
+        str: new pattern with end of string pattern
+        """
+        if tail:
+            context = BuildContext.get_current()
+            case1, case2 = r'\s*$', r'\s+$'
+            case3, case4 = r' *$', r' +$'
+            case5 = r'$'
+
+            case6, case7 = r'\s*', r'\s+'
+            case8, case9 = r' *', r' +'
+
+            case10, case11 = r'\s*$', r'\s+$'
+            case12, case13 = r'\s*', r'\s+'
+
+            if tail == 'tail_ws' and not pattern.endswith(case1):
+                new_pattern = '{}{}'.format(pattern, case1)
+                context.appended_pattern = case1
+            elif tail == 'tail_ws_plus' and not pattern.endswith(case2):
+                new_pattern = '{}{}'.format(pattern, case2)
+                context.appended_pattern = case2
+            elif tail == 'tail_space' and not pattern.endswith(case3):
+                new_pattern = '{}{}'.format(pattern, case3)
+                context.appended_pattern = case3
+            elif tail == 'tail_space_plus' and not pattern.endswith(case4):
+                new_pattern = '{}{}'.format(pattern, case4)
+                context.appended_pattern = case4
+            elif tail == 'tail_spaces' and not pattern.endswith(case4):
+                new_pattern = '{}{}'.format(pattern, case4)
+                context.appended_pattern = case4
+            elif tail == 'tail' and not pattern.endswith(case5):
+                new_pattern = '{}{}'.format(pattern, case5)
+                context.appended_pattern = case5
+            elif tail == 'tail_just_ws' and not pattern.startswith(case6):
+                new_pattern = '{}{}'.format(pattern, case6)
+                context.appended_pattern = case6
+            elif tail == 'tail_just_ws_plus' and not pattern.startswith(case7):
+                new_pattern = '{}{}'.format(pattern, case7)
+                context.appended_pattern = case7
+            elif tail == 'tail_just_space' and not pattern.startswith(case8):
+                new_pattern = '{}{}'.format(pattern, case8)
+                context.appended_pattern = case8
+            elif tail == 'tail_just_space_plus' and not pattern.startswith(case9):
+                new_pattern = '{}{}'.format(pattern, case9)
+                context.appended_pattern = case9
+            elif tail == 'tail_just_spaces' and not pattern.startswith(case9):
+                new_pattern = '{}{}'.format(pattern, case9)
+                context.appended_pattern = case9
+            elif tail == 'tail_whitespace' and not pattern.startswith(case10):
+                new_pattern = '{}{}'.format(pattern, case10)
+                context.appended_pattern = case10
+            elif tail == 'tail_whitespace_plus' and not pattern.startswith(case11):
+                new_pattern = '{}{}'.format(pattern, case11)
+                context.appended_pattern = case11
+            elif tail == 'tail_whitespaces' and not pattern.startswith(case11):
+                new_pattern = '{}{}'.format(pattern, case11)
+                context.appended_pattern = case11
+            elif tail == 'tail_just_whitespace' and not pattern.startswith(case12):
+                new_pattern = '{}{}'.format(pattern, case12)
+                context.appended_pattern = case12
+            elif tail == 'tail_just_whitespace_plus' and not pattern.startswith(case13):
+                new_pattern = '{}{}'.format(pattern, case13)
+                context.appended_pattern = case13
+            elif tail == 'tail_just_whitespaces' and not pattern.startswith(case13):
+                new_pattern = '{}{}'.format(pattern, case13)
+                context.appended_pattern = case13
+            else:
+                new_pattern = pattern
+            return new_pattern
+        return pattern
+
+    @classmethod
+    def add_repetition(cls, lst, repetition=''):
+        """insert regex repetition for a first item of list
+
+        Parameters
+        ----------
+        lst (lst): a list of sub pattens
+        repetition (str): a repetition expression.  Default is empty.
+
+        Returns
+        -------
+        list: a new list if repetition is required.
+        """
+        if not repetition:
+            return lst
+
+        new_lst = lst[:]
+        item = new_lst[0]
+
+        is_singular = ElementPattern.is_singular_pattern(item)
+        item = item if is_singular else '({})'.format(item)
+
+        _, m, *last = repetition.split('_', 2)
+        if last:
+            n = last[0]
+            new_lst[0] = '%s{%s,%s}' % (item, m, n)
+        else:
+            new_lst[0] = '%s{%s}' % (item, m)
+        return new_lst
+
+    @classmethod
+    def add_occurrence(cls, lst, occurrence=''):
+        """insert regex occurrence for a first item of list
+
+        Parameters
+        ----------
+        lst (lst): a list of sub pattens
+        occurrence (str): an occurrence expression.  Default is empty.
+
+        Returns
+        -------
+        list: a new list if occurrence is happened.
+        """
+        if not occurrence:
+            return lst
+
+        new_lst = lst[:]
+        m = re.match(cls.occurrence_pattern, occurrence)
+        is_phrase = bool(m.group('is_phrase'))
+        spacer = ' +' if is_phrase and m.group('is_phrase') == '_group' else ' '
+
+        fda, lda = m.group('fda') or '', m.group('lda') or ''
+        fdb, ldb = m.group('fdb') or '', m.group('ldb') or ''
+        fdc, ldc = m.group('fdc') or '', m.group('ldc') or ''
+        fdd, ldd = m.group('fdd') or '', m.group('fdd') or ''
+
+        func = ElementPattern.add_case_occurrence
+
+        is_case_a = func(new_lst, fda, lda, is_phrase, spacer=spacer)
+        is_case_b = is_case_a or func(new_lst, fdb, ldb, is_phrase, spacer=spacer)
+        is_case_c = is_case_b or func(new_lst, fdc, ldc, is_phrase, spacer=spacer)
+        is_case_c or func(new_lst, fdd, ldd, is_phrase, spacer=spacer)
+
+        return new_lst
+
+    @classmethod
+    def add_case_occurrence(cls, lst, first, last, is_phrase, spacer=' '):
+        """check if pattern is a singular pattern
+
+        Parameters
+        ----------
+        lst (str): a list.
+        first (str): a first digit or option of case.
+        last (str): a last digit or option of case.
+        is_phrase (bool): a flag for matching a group of occurrences.
+
+        Returns
+        -------
+        bool: True if occurrence happened, otherwise False.
+        """
+        if not first and not last:
+            return False
+
+        item = lst[0]
+        if is_phrase:
+            # item = '{0}( {0})'.format(item)
+            item = f'{item}({spacer}{item})'
+        else:
+            is_singular = ElementPattern.is_singular_pattern(item)
+            item = item if is_singular else '({})'.format(item)
+
+        first = int(first) if first.isdigit() else first
+        last = int(last) if last.isdigit() else last
+
+        if first == 'least' or first == 'most':
+            if last == 0:
+                fmt = '%s*' if first == 'least' else '%s?'
+            else:
+                fmt = '%%s{%s,}' if first == 'least' else '%%s{,%s}'
+                fmt = fmt % last
+        elif last == 'more':
+            fmt = '%s*' if first == 0 else '%s+' if first == 1 else '%%s{%s,}' % first
+        elif first == last:
+            fmt = '%s' if first == 1 else '%%s{%s}' % first if first else '%s?'
+        else:
+            first, last = min(first, last), max(first, last)
+            fmt = '%s?' if first == 0 and last == 1 else '%%s{%s,%s}' % (first, last)
+
+        if fmt:
+            lst[0] = fmt % item
+            return True
+        else:
+            return False
+
+    @classmethod
+    def is_singular_pattern(cls, pattern):
+        """check if pattern is a singular pattern
+
+        Parameters
+        ----------
+        pattern (str): a pattern.
+
+        Returns
+        -------
+        bool: True if pattern is a singular pattern, otherwise False.
+        """
+        left_bracket, right_bracket = '[', ']'
+        pattern = str(pattern)
+        first, last = pattern[:1], pattern[-1:]
+        total = len(pattern)
+        is_singular = total <= 1
+        is_escape = total == 2 and first == '\\'
+        is_char_set = pattern.count(first) == 1 and first == left_bracket
+        is_char_set &= pattern.count(last) == 1 and last == right_bracket
+        return is_singular or is_escape or is_char_set
+
+    def remove_head_of_string(self):
+        """remove a start of string pattern i.e ^ or ^\\s* or ^\\s+ or ^ * or ^ +
+
+        Returns
+        -------
+        ElementPattern: new ElementPattern
+        """
+        if self.prepended_pattern and self.startswith('^'):
+            pattern = str(self)[len(self.prepended_pattern):]
+            new_instance = ElementPattern(pattern, as_is=True)
+            new_instance.as_is = False
+            new_instance.variable = copy(self.variable)
+            new_instance.or_empty = self.or_empty
+            new_instance.prepended_pattern = ''
+            new_instance.appended_pattern = self.appended_pattern
+        else:
+            new_instance = copy(self)
+
+        return new_instance
+
+    def remove_tail_of_string(self):
+        """remove an end of string pattern i.e $ or \\s*$ or \\s+$ or  *$ or  +$
+
+        Returns
+        -------
+        ElementPattern: new ElementPattern
+        """
+        if self.appended_pattern and self.endswith('$'):
+            pattern = str(self)[:-len(self.appended_pattern)]
+            new_instance = ElementPattern(pattern, as_is=True)
+            new_instance.as_is = False
+            new_instance.variable = copy(self.variable)
+            new_instance.or_empty = self.or_empty
+            new_instance.prepended_pattern = self.prepended_pattern
+            new_instance.appended_pattern = ''
+        else:
+            new_instance = copy(self)
 
-        table = dict(space=r' *$', spaces=r' +$', space_plus=r' +$',
-                     ws=r'\s*$', ws_plus=r'\s+$',
-                     whitespace=r'\s*$', whitespaces=r'\s+$',
-                     whitespace_plus=r'\s+$')
-        pat = table.get(params, r'$')
-        return True, pat
+        return new_instance
+
+
+class ElementArgument:
+    """Use to store a classified argument of keyword(params)
+
+    Attributes
+    ----------
+    kind (str): an argument kind, i.e. var, format, symbol_name,
+            word_bound, head, tail, repetition, occurrence, meta_data,
+            or_case, or text.
+    text (str): an argument text.
+    value (str): a variable name, a symbol name, a meta data option,
+            or a case of or_ argument.  Default is empty.
+
+    Properties
+    ----------
+    is_raw -> bool
+    """
+    def __init__(self, kind, text, value=''):
+        self.kind = kind
+        self.text = text
+        self.value = value
+
+    def __repr__(self):
+        fmt = '{}(kind={!r}, text={!r}, value={!r})'
+        return fmt.format(type(self).__name__, self.kind, self.text, self.value)
+
+    @property
+    def is_raw(self):
+        return self.text == '{}_raw'.format(self.kind)
+
+
+class ElementParams:
+    """Use to parse parameters of keyword(params) in a single pass
+
+    Every argument is classified once by a compiled tokenizer, and the
+    result is shared by all build strategies of ElementPattern.
+
+    Attributes
+    ----------
+    keyword (str): a keyword.
+    params (str): a raw text of parameters.
+    arguments (list): a list of ElementArgument in order of appearance.
+    name (str): a variable name, i.e. the first var_ argument.
+    word_bound (str): a word bound case, i.e. the last word_bound argument.
+    head (str): a start of string case, i.e. the last head argument.
+    tail (str): an end of string case, i.e. the last tail argument.
+    formats (list): a list of format argument.
+    symbol_name (str): a symbol name, i.e. the last name= argument.
+    has_symbol_name (bool): a flag if there is a name= argument.
+
+    Methods
+    -------
+    ElementParams.parse(keyword, params) -> ElementParams
+    ElementParams.tokenize(arg) -> ElementArgument
+    """
+    tokenizer = re.compile('|'.join([
+        r'(?P<var>(?i:var_)(?P<var_name>\w+)$)',
+        r'(?P<format>format)',
+        r'(?P<symbol_name>name=(?P<symbol>.*))',
+        r'(?P<word_bound>{})'.format(ElementPattern.word_bound_pattern),
+        r'(?P<head>{})'.format(ElementPattern.head_pattern),
+        r'(?P<tail>{})'.format(ElementPattern.tail_pattern),
+        r'(?P<repetition>{})'.format(ElementPattern.repetition_pattern),
+        r'(?P<occurrence>{})'.format(ElementPattern.occurrence_pattern),
+        r'(?P<meta_data>{})'.format(ElementPattern.meta_data_pattern),
+        r'(?P<or_case>(?i:or_)(?P<case>[^,]+))',
+    ]))
+
+    def __init__(self, keyword, params):
+        self.keyword = keyword
+        self.params = str(params)
+        self.arguments = []
+        self.name = ''
+        self.word_bound = ''
+        self.head = ''
+        self.tail = ''
+        self.formats = []
+        self.symbol_name = ''
+        self.has_symbol_name = False
+
+        arguments = re.split(r' *, *', self.params) if self.params else []
+        for arg in arguments:
+            argument = self.tokenize(arg)
+            self.arguments.append(argument)
+
+            kind = argument.kind
+            if kind == 'var':
+                self.name = self.name or argument.value
+            elif kind == 'format':
+                self.formats.append(arg)
+            elif kind == 'symbol_name':
+                self.symbol_name = argument.value
+                self.has_symbol_name = True
+            elif kind in ('word_bound', 'head', 'tail') and not argument.is_raw:
+                setattr(self, kind, arg)
+
+    @classmethod
+    def tokenize(cls, arg):
+        """classify an argument
+
+        Parameters
+        ----------
+        arg (str): an argument.
+
+        Returns
+        -------
+        ElementArgument: a classified argument.
+        """
+        match = cls.tokenizer.match(arg)
+        if not match:
+            return ElementArgument('text', arg)
+
+        kind = match.lastgroup
+        if kind == 'var':
+            value = match.group('var_name')
+        elif kind == 'symbol_name':
+            value = match.group('symbol')
+        elif kind == 'meta_data':
+            value = arg.lstrip('meta_data_')
+        elif kind == 'or_case':
+            value = match.group('case')
+        else:
+            value = ''
+        return ElementArgument(kind, arg, value=value)
+
+    @classmethod
+    def parse(cls, keyword, params):
+        """parse parameters of keyword(params)
+
+        Parameters
+        ----------
+        keyword (str): a keyword.
+        params (str, ElementParams): a text of parameters or parsed parameters.
+
+        Returns
+        -------
+        ElementParams: parsed parameters.
+        """
+        if isinstance(params, cls):
+            return params
+        return cls(keyword, params)
+
+
+class LinePattern(str):
+    """Use to convert a line text to regex pattern
+
+    Attributes:
+    variables (list): a list of pattern variable
+    items (list): a list of sub-pattern, i.e. TextPattern or ElementPattern
+    nodes (list): a list of PatternNode of sub-pattern
+    node (SequenceNode): a node of which pattern is a rendering
+    compiled (re.Pattern): a compiled pattern
+    required_literal (str): the longest literal text which every match contains
+
+    Properties
+    ----------
+    statement (str): a template statement
+
+    Parameters
+    ----------
+    text (str): a text.
+    prepended_ws (bool): prepend a whitespace at the beginning of a pattern.
+            Default is False.
+    appended_ws (bool): append a whitespace at the end of a pattern.
+            Default is False.
+    ignore_case (bool): prepend (?i) at the beginning of a pattern.
+            Default is False.
+
+    Methods
+    -------
+    LinePattern.build_batch(lst_of_text, **kwargs) -> BatchResult
+    LinePattern.get_pattern(text) -> str
+    LinePattern.get_blank_line_pattern(context) -> str
+    LinePattern.get_required_literal(lst, ignore_case=False) -> str
+    LinePattern.readjust_if_or_empty(lst) -> None
+    LinePattern.ensure_start_of_line_pattern(lst) -> None
+    LinePattern.ensure_end_of_line_pattern(lst) -> None
+    LinePattern.prepend_whitespace(lst) -> None
+    LinePattern.prepend_ignorecase_flag(lst) -> None
+    LinePattern.append_whitespace(lst) -> None
+
+    Raises
+    ------
+    LinePatternError: raise an exception if pattern is invalid.
+
+    """
+
+    def __new__(cls, text, prepended_ws=False, appended_ws=False,
+                ignore_case=False):
+        data = str(text)
+        context = BuildContext()
+        if data:
+            with context:
+                pattern = cls.get_pattern(
+                    data, prepended_ws=prepended_ws,
+                    appended_ws=appended_ws, ignore_case=ignore_case
+                )
+        else:
+            pattern = cls.get_blank_line_pattern(context)
+        instance = str.__new__(cls, pattern)
+        instance.variables = context.variables
+        instance.nodes = context.nodes
+        instance.items = [node.to_pattern() for node in context.nodes]
+        instance.node = context.node or SequenceNode.from_pattern(pattern)
+        instance.required_literal = context.required_literal
+        instance.compiled = context.finalize(
+            pattern,
+            lambda: cls(text, prepended_ws=prepended_ws,
+                        appended_ws=appended_ws, ignore_case=ignore_case),
+            exception_cls=LinePatternError
+        )
+        return instance
+
+    def __init__(self, text,
+                 prepended_ws=False, appended_ws=False,
+                 ignore_case=False):
+        self.text = text
+        self.prepended_ws = prepended_ws
+        self.appended_ws = appended_ws
+        self.ignore_case = ignore_case
+
+    def __reduce__(self):
+        return restore_pattern, (self.__class__, str(self)), self.__getstate__()
+
+    def __getstate__(self):
+        return self.__dict__.copy()
+
+    @classmethod
+    def build_batch(cls, lst_of_text, prepended_ws=False, appended_ws=False,
+                    ignore_case=False):
+        """build line patterns of many lines, converting every unique line once
+
+        Parameters
+        ----------
+        lst_of_text (list): a list of text.
+        prepended_ws (bool): prepend a whitespace at the beginning of a pattern.
+                Default is False.
+        appended_ws (bool): append a whitespace at the end of a pattern.
+                Default is False.
+        ignore_case (bool): prepend (?i) at the beginning of a pattern.
+                Default is False.
+
+        Returns
+        -------
+        BatchResult: line patterns in order of text and batch statistics.
+        """
+        return build_pattern_batch(
+            cls, lst_of_text, prepended_ws=prepended_ws,
+            appended_ws=appended_ws, ignore_case=ignore_case
+        )
+
+    @property
+    def statement(self):
+        lst = []
+        for item in self.nodes:
+            if isinstance(item, ElementNode):
+                if not item.variable.is_empty:
+                    lst.append(item.variable.var_name)
+                else:
+                    lst.append(item.render())
+            else:
+                lst.append(item.render())
+        return ''.join(lst)
+
+    @classmethod
+    def get_pattern(cls, text,
+                    prepended_ws=False, appended_ws=False,
+                    ignore_case=False):
+        """convert text to regex pattern
+
+        Parameters
+        ----------
+        text (str): a text
+        prepended_ws (bool): prepend a whitespace at the beginning of a pattern.
+                Default is False.
+        appended_ws (bool): append a whitespace at the end of a pattern.
+                Default is False.
+        ignore_case (bool): prepend (?i) at the beginning of a pattern.
+                Default is False.
+
+        Returns
+        -------
+        str: a regex pattern.
+
+        Raises
+        ------
+        LinePatternError: raise an exception if pattern is invalid.
+        """
+        line = str(text)
+        context = BuildContext.get_current()
+
+        lst = []
+        start = 0
+        m = None
+        for m in re.finditer(r'\w+[(][^)]*[)]', line):
+            pre_match = m.string[start:m.start()]
+            if pre_match:
+                lst.append(TextNode.from_pattern(TextPattern(pre_match)))
+            elm_pat = ElementPattern(m.group())
+            if not elm_pat.variable.is_empty:
+                context.variables.append(elm_pat.variable)
+            lst.append(ElementNode.from_pattern(elm_pat))
+            start = m.end()
+        else:
+            if m and start:
+                after_match = m.string[start:]
+                if after_match:
+                    lst.append(TextNode.from_pattern(TextPattern(after_match)))
+
+        if len(lst) == 1 and lst[0].render().strip() == '':
+            return cls.get_blank_line_pattern(context)
+        elif not lst:
+            if line.strip() == '':
+                return cls.get_blank_line_pattern(context)
+            lst.append(TextNode.from_pattern(TextPattern(line)))
+
+        cls.readjust_if_or_empty(lst)
+        cls.ensure_start_of_line_pattern(lst)
+        cls.ensure_end_of_line_pattern(lst)
+        prepended_ws and cls.prepend_whitespace(lst)
+        ignore_case and cls.prepend_ignorecase_flag(lst)
+        appended_ws and cls.append_whitespace(lst)
+        context.nodes = lst
+        context.node = SequenceNode(lst)
+        context.required_literal = cls.get_required_literal(
+            lst, ignore_case=ignore_case
+        )
+        pattern = context.node.render()
+        context.compiled = validate_pattern(pattern, exception_cls=LinePatternError)
+        return pattern
+
+    @classmethod
+    def get_blank_line_pattern(cls, context):
+        """return a pattern of a blank line and record its compiled pattern
+
+        Parameters
+        ----------
+        context (BuildContext): a build context.
+
+        Returns
+        -------
+        str: a pattern which matches a blank or whitespace-only line.
+        """
+        pattern = r'^\s*$'
+        context.compiled = validate_pattern(pattern, exception_cls=LinePatternError)
+        return pattern
+
+    @classmethod
+    def get_required_literal(cls, lst, ignore_case=False):
+        """return the longest literal text of sub-patterns which every match contains
+
+        Parameters
+        ----------
+        lst (list): a list of PatternNode of sub-pattern.
+        ignore_case (bool): a flag if pattern is case-insensitive.
+                Default is False.
+
+        Returns
+        -------
+        str: a required literal text or empty string if there is none.
+        """
+        if ignore_case:
+            return ''
+
+        runs = []
+        for item in lst:
+            item_runs = item.get_literal_runs()
+            if item_runs is None:
+                return ''
+            runs.extend(item_runs)
+        return max(runs, key=len) if runs else ''
+
+    @classmethod
+    def readjust_if_or_empty(cls, lst):
+        """readjust pattern if ElementPattern has or_empty flag
+
+        Parameters
+        ----------
+        lst (list): a list of PatternNode.
+        """
+        if len(lst) < 2:
+            return
+
+        total = len(lst)
+        ws_pat = ElementNode.from_pattern(ElementPattern('zero_or_whitespaces()'))
+        insert_indices = []
+        for index, item in enumerate(lst[1:], 1):
+            prev_item = lst[index-1]
+            if isinstance(item, ElementNode) and item.or_empty:
+                if prev_item.match_leaves(' ', at_end=True):
+                    lst[index-1] = prev_item.rstrip()
+                    insert_indices.insert(0, index)
+                elif prev_item.match_leaves(r'\\s', at_end=True):
+                    lst[index-1] = prev_item.trim(last=1)
+                    insert_indices.insert(0, index)
+                elif index == total - 1:
+                    if prev_item.match_leaves(r'( |\\s)\+', at_end=True):
+                        lst[index-1] = prev_item.trim(last=1)
+                        insert_indices.insert(0, index)
+
+        for index in insert_indices:
+            lst.insert(index, ws_pat)
+
+        index = len(lst) - 1
+        insert_indices = []
+        while index > 0 and isinstance(lst[index], ElementNode):
+            prev_item, item = lst[index-1], lst[index]
+            if item.or_empty:
+                if prev_item.match_leaves(' ', at_end=True):
+                    lst[index - 1] = prev_item.rstrip()
+                    insert_indices.insert(0, index)
+                elif prev_item.match_leaves(r'\\s\+?| \+', at_end=True):
+                    lst[index - 1] = prev_item.trim(last=1)
+                    insert_indices.insert(0, index)
+            index -= 2
+
+        for index in insert_indices:
+            lst.insert(index, ws_pat)
+
+        index = len(lst) - 1
+        is_prev_containing_empty = False
+        while index > 0 and isinstance(lst[index-1], ElementNode):
+            prev_item, item = lst[index-1], lst[index]
+            is_ws = item.match_leaves(r'( |\\s)\+?', is_exact=True)
+            if prev_item.or_empty:
+                if is_ws:
+                    lst[index] = ws_pat
+                is_prev_containing_empty = True
+            else:
+                if is_ws and is_prev_containing_empty:
+                    lst[index] = ws_pat
+                is_prev_containing_empty = False
+            index -= 2
+
+    @classmethod
+    def ensure_start_of_line_pattern(cls, lst):
+        """Ensure a start pattern does not contain duplicate whitespace
+
+        Parameters
+        ----------
+        lst (list): a list of PatternNode.
+        """
+        if len(lst) < 2:
+            return
+
+        curr, nxt = lst[0], lst[1]
+
+        if curr.match_leaves(r'\^', is_exact=True):
+            if isinstance(nxt, TextNode):
+                if nxt.match_leaves(' ', is_exact=True):
+                    lst.pop(1)
+                    return
+                if nxt.match_leaves(' '):
+                    lst[1] = nxt.lstrip()
+                    return
+
+        if curr.match_leaves(r'\^|\\A', r'( |\\s)[*+]*', is_exact=True):
+            if isinstance(nxt, TextNode) and nxt.match_leaves(r'( |\\s)[*+]*'):
+                new_val = nxt.trim(first=1)
+                if new_val.leaves:
+                    lst[1] = new_val
+                else:
+                    lst.pop(1)
+
+        # clean up any invalid a start of string pattern
+        for index, node in enumerate(lst[1:], 1):
+            if isinstance(node, ElementNode) and node.prepended_pattern:
+                lst[index] = node.remove_head()
 
     @classmethod
-    def build_raw_pattern(cls, keyword, params):
-        """build a raw data pattern over given keyword, params
+    def ensure_end_of_line_pattern(cls, lst):
+        """Ensure an end pattern does not contain duplicate whitespace
 
         Parameters
         ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
-
-        Returns
-        -------
-        str: a regex pattern.
+        lst (list): a list of PatternNode.
         """
-        if not params.startswith('raw>>>'):
-            return False, ''
-        params = re.sub(r'raw>+', '', params, count=1)
-        new_params = do_soft_regex_escape(params)
-        pattern = r'{}\({}\)'.format(keyword, new_params)
-        return True, pattern
+        if len(lst) < 2:
+            return
 
-    @classmethod
-    def build_default_pattern(cls, keyword, params):
-        """build a default pattern over given keyword, params
+        last, prev = lst[-1], lst[-2]
 
-        Parameters
-        ----------
-        keyword (str): a custom keyword
-        params (str): a list of parameters
+        if last.match_leaves(r'\$', is_exact=True):
+            if isinstance(prev, TextNode):
+                if prev.match_leaves(' ', is_exact=True):
+                    lst.pop(-2)
+                    return
+                if not prev.match_leaves(' [+*]', at_end=True):
+                    lst[-2] = prev.rstrip()
+                    return
 
-        Returns
-        -------
-        tuple: status, a regex pattern.
-        """
-        pattern = do_soft_regex_escape('{}({})'.format(keyword, params))
-        return True, pattern
+        if last.match_leaves(r'( |\\s)[*+]?', r'\$|\\Z', is_exact=True):
+            if isinstance(prev, TextNode) and prev.match_leaves(r'( |\\s)[*+]*', at_end=True):
+                new_val = prev.trim(last=1)
+                if new_val.leaves:
+                    lst[-2] = new_val
+                else:
+                    lst.pop(-2)
+
+        # clean up any invalid a start of string pattern
+        for index, node in enumerate(lst[:-1]):
+            if isinstance(node, ElementNode) and node.appended_pattern:
+                lst[index] = node.remove_tail()
 
     @classmethod
-    def join_list(cls, lst):
-        """join item of list
+    def prepend_whitespace(cls, lst):
+        """prepend whitespace pattern to list
 
         Parameters
         ----------
-        lst (list): list of pattern
-
-        Returns
-        -------
-        str: a string data.
+        lst (list): a list of PatternNode.
         """
-        new_lst = []
-        has_ws = False
-        if len(lst) > 1:
-            for item in lst:
-                if ' ' in item or r'\s' in item:
-                    has_ws = True
-                    if item.startswith('(') and item.endswith(')'):
-                        v = item
-                    else:
-                        if re.match(r' ([?+*]+|([{][0-9,]+[}]))$', item):
-                            v = item
-                        else:
-                            v = '({})'.format(item)
-                else:
-                    if item:
-                        chk1 = '\\' in item
-                        chk2 = '[' in item and ']' in item
-                        chk3 = '(' in item and ')' in item
-                        chk4 = '{' in item and '}' in item
-                        if chk1 or chk2 or chk3 or chk4:
-                            v = '({})'.format(item)
-                        else:
-                            v = item
-                    else:
-                        v = item
-                v not in new_lst and new_lst.append(v)
-        else:
-            new_lst = lst
-
-        has_empty = bool([True for item in new_lst if item == ''])
-        if has_empty:
-            other_lst = [item for item in new_lst if item]
-            result = '|'.join(other_lst)
-            result = f"({result}|)" if len(other_lst) == 1 and not has_ws else f"(({result})|)"
-            return result
-        else:
-            result = '|'.join(new_lst)
-            result = f"({result})" if len(new_lst) > 1 and has_ws else result
-            return result
+        if not lst:
+            return
 
-        # result = '|'.join(new_lst)
-        #
-        # has_empty = bool([True for i in new_lst if i == ''])
-        # if has_empty or len(new_lst) > 1 and has_ws:
-        #     result = '({})'.format(result)
-        #
-        # return result
+        if not lst[0].match_leaves(r'\^|\\A', r'( |\\s).*'):
+            lst.insert(0, SequenceNode.from_pattern(r'^\s*'))
 
     @classmethod
-    def add_var_name(cls, pattern, name=''):
-        """add var name to regex pattern
+    def prepend_ignorecase_flag(cls, lst):
+        """prepend regex ignorecase flag, i.e. (?i) to list
 
         Parameters
         ----------
-        pattern (str): a pattern
-        name (str): a regex variable name
-
-        Returns
-        -------
-        str: new pattern with variable name.
+        lst (list): a list of PatternNode.
         """
-        if name:
-            cls._variable.name = name
-            cls._variable.pattern = pattern
-            if pattern.startswith('(') and pattern.endswith(')'):
-                sub_pat = pattern[1:-1]
-                if pattern.endswith('|)'):
-                    new_pattern = '(?P<{}>{})'.format(name, sub_pat)
-                else:
-                    try:
-                        re.compile(sub_pat)
-                        cls._variable.pattern = sub_pat
-                        new_pattern = '(?P<{}>{})'.format(name, sub_pat)
-                    except Exception as ex:     # noqa
-                        new_pattern = '(?P<{}>{})'.format(name, pattern)
-            else:
-                new_pattern = '(?P<{}>{})'.format(name, pattern)
-            return new_pattern
-        return pattern
+        if not lst:
+            return
+
+        if not lst[0].match_leaves(r'[(][?]i[)]'):
+            lst.insert(0, SequenceNode.from_pattern('(?i)'))
 
     @classmethod
-    def add_word_bound(cls, pattern, word_bound='', added_parentheses=True):
-        """add word bound i.e \\b to regex pattern
+    def append_whitespace(cls, lst):
+        """append whitespace pattern to list
 
         Parameters
         ----------
-        pattern (str): a pattern
-        word_bound (str): word bound case.  Default is empty.
-                value of word_bound can be word_bound, word_bound_left,
-                or word_bound_right
-        added_parentheses (bool): always add parentheses to pattern.  Default is True.
-
-        Returns
-        -------
-        str: new pattern with enclosing word bound pattern if it is required.
+        lst (list): a list of PatternNode.
         """
-        if not word_bound:
-            return pattern
+        if not lst:
+            return
 
-        has_ws = ' ' in pattern or r'\s' in pattern
-        new_pattern = '({})'.format(pattern) if has_ws else pattern
-        if added_parentheses:
-            if not new_pattern.startswith('(') or not new_pattern.endswith(')'):
-                new_pattern = '({})'.format(new_pattern)
+        if not lst[-1].match_leaves(r'( |\\s)[*+]?', r'\$|\\Z', at_end=True):
+            lst.append(SequenceNode.from_pattern(r'\s*$'))
 
-        if word_bound == 'word_bound_left':
-            new_pattern = r'\b{}'.format(new_pattern)
-        elif word_bound == 'word_bound_right':
-            new_pattern = r'{}\b'.format(new_pattern)
+
+class MultilinePattern(str):
+    """Use to convert multiple lines to regex pattern
+
+    Parameters
+    ----------
+    text (str): a text.
+    ignore_case (bool): prepend (?i) at the beginning of a pattern.
+            Default is False.
+
+    Attributes
+    ----------
+    text (str, list): a text or a list of text.
+    compiled (re.Pattern): a compiled pattern.
+    required_literal (str): the longest literal text which every match contains.
+    node (SequenceNode): a node of which pattern is a rendering.
+    line_skip_pattern (str): a pattern which skips the rest of a line and
+            any following lines between two line patterns.
+    compiled_line_skip_pattern (str): a form of line_skip_pattern which
+            is compiled in process, i.e. with possessive quantifiers on
+            Python 3.11+.
+
+    Methods
+    -------
+    MultilinePattern.build_batch(lst_of_text, **kwargs) -> BatchResult
+    MultilinePattern.get_pattern(lines, ignore_case=False, is_exact=False) -> str
+    MultilinePattern.reformat(pattern, **kwargs) -> SequenceNode
+    MultilinePattern.get_compiled_form(pattern) -> str
+
+    Notes
+    -----
+    line_skip_pattern consumes every newline character in exactly one
+    way, so a failed search is linear in size of text.  A former
+    [^\r\n]*[\r\n]+([^\r\n]*[\r\n]+)* split a run of newline characters,
+    e.g. CRLF or blank lines, in exponentially many ways.  Both match the
+    same text, i.e. any text which ends with a newline character, and both
+    try the longest text first, so matches and named groups are the same.
+    On Python 3.11+, the compiled pattern uses possessive quantifiers so
+    that a line is not rescanned on backtracking.  A pattern text, which
+    is emitted in test scripts and copied elsewhere, always has the
+    portable form which compiles on every supported Python version.
+    """
+    line_skip_pattern = r'[^\r\n]*[\r\n](?:[^\r\n]*[\r\n])*'
+    if sys.version_info >= (3, 11):
+        compiled_line_skip_pattern = r'[^\r\n]*+[\r\n](?:[^\r\n]*+[\r\n])*'
+    else:
+        compiled_line_skip_pattern = line_skip_pattern
+
+    def __new__(cls, text, ignore_case=False, is_exact=False):
+
+        lines = []
+        if isinstance(text, (list, tuple)):
+            for line in text:
+                lines.extend(re.split(r'\r\n|\r|\n', line))
+        elif isinstance(text, str):
+            lines = re.split(r'\r\n|\r|\n', text)
         else:
-            new_pattern = r'\b{}\b'.format(new_pattern)
-        return new_pattern
+            'text argument must be string or list of string'
+            raise MultilinePatternError(text)
+
+        context = BuildContext()
+        if lines:
+            with context:
+                pattern = cls.get_pattern(
+                    lines, ignore_case=ignore_case, is_exact=is_exact
+                )
+        else:
+            pattern = r'^\s*$'
+        instance = str.__new__(cls, pattern)
+        instance.text = text
+        instance.node = context.node or SequenceNode.from_pattern(pattern)
+        instance.required_literal = context.required_literal
+        instance.compiled = context.finalize(
+            cls.get_compiled_form(pattern),
+            lambda: cls(text, ignore_case=ignore_case, is_exact=is_exact),
+            exception_cls=MultilinePatternError
+        )
+        return instance
+
+    def __reduce__(self):
+        return restore_pattern, (self.__class__, str(self)), self.__getstate__()
+
+    def __getstate__(self):
+        return self.__dict__.copy()
 
     @classmethod
-    def add_head_of_string(cls, pattern, head=''):
-        """prepend start of string i.e ^ or ^\\s* or ^\\s+ or ^ * or ^ + regex pattern
+    def build_batch(cls, lst_of_text, ignore_case=False, is_exact=False):
+        """build multiline patterns of many texts, converting every unique text once
 
         Parameters
         ----------
-        pattern (str): a pattern
-        head (str): start of string case.  Default is empty.
+        lst_of_text (list): a list of text or a list of list of text.
+        ignore_case (bool): prepend (?i) at the beginning of a pattern.
+                Default is False.
+        is_exact (bool): a flag of exact matching.  Default is False.
 
         Returns
         -------
-        str: new pattern with start of string pattern
+        BatchResult: multiline patterns in order of text and batch statistics.
         """
-        if head:
-            case1, case2 = r'^\s*', r'^\s+'
-            case3, case4 = r'^ *', r'^ +'
-            case5 = r'^'
+        return build_pattern_batch(
+            cls, lst_of_text, ignore_case=ignore_case, is_exact=is_exact
+        )
 
-            case6, case7 = r'\s*', r'\s+'
-            case8, case9 = r' *', r' +'
+    @classmethod
+    def get_pattern(cls, lines, ignore_case=False, is_exact=False):
+        """convert text to regex pattern
 
-            case10, case11 = r'^\s*', r'^\s+'
-            case12, case13 = r'\s*', r'\s+'
+        Parameters
+        ----------
+        lines (lines): list of string
+        ignore_case (bool): prepend (?i) at the beginning of a pattern.
+                Default is False.
 
-            if head == 'head_ws' and not pattern.startswith(case1):
-                new_pattern = '{}{}'.format(case1, pattern)
-                cls._prepended_pattern = case1
-            elif head == 'head_ws_plus' and not pattern.startswith(case2):
-                new_pattern = '{}{}'.format(case2, pattern)
-                cls._prepended_pattern = case2
-            elif head == 'head_space' and not pattern.startswith(case3):
-                new_pattern = '{}{}'.format(case3, pattern)
-                cls._prepended_pattern = case3
-            elif head == 'head_space_plus' and not pattern.startswith(case4):
-                new_pattern = '{}{}'.format(case4, pattern)
-                cls._prepended_pattern = case4
-            elif head == 'head_spaces' and not pattern.startswith(case4):
-                new_pattern = '{}{}'.format(case4, pattern)
-                cls._prepended_pattern = case4
-            elif head == 'head' and not pattern.startswith(case5):
-                new_pattern = '{}{}'.format(case5, pattern)
-                cls._prepended_pattern = case5
-            elif head == 'head_just_ws' and not pattern.startswith(case6):
-                new_pattern = '{}{}'.format(case6, pattern)
-                cls._prepended_pattern = case6
-            elif head == 'head_just_ws_plus' and not pattern.startswith(case7):
-                new_pattern = '{}{}'.format(case7, pattern)
-                cls._prepended_pattern = case7
-            elif head == 'head_just_space' and not pattern.startswith(case8):
-                new_pattern = '{}{}'.format(case8, pattern)
-                cls._prepended_pattern = case8
-            elif head == 'head_just_space_plus' and not pattern.startswith(case9):
-                new_pattern = '{}{}'.format(case9, pattern)
-                cls._prepended_pattern = case9
-            elif head == 'head_just_spaces' and not pattern.startswith(case9):
-                new_pattern = '{}{}'.format(case9, pattern)
-                cls._prepended_pattern = case9
-            elif head == 'head_whitespace' and not pattern.startswith(case10):
-                new_pattern = '{}{}'.format(case10, pattern)
-                cls._prepended_pattern = case10
-            elif head == 'head_whitespace_plus' and not pattern.startswith(case11):
-                new_pattern = '{}{}'.format(case11, pattern)
-                cls._prepended_pattern = case11
-            elif head == 'head_whitespaces' and not pattern.startswith(case11):
-                new_pattern = '{}{}'.format(case11, pattern)
-                cls._prepended_pattern = case11
-            elif head == 'head_just_whitespace' and not pattern.startswith(case12):
-                new_pattern = '{}{}'.format(case12, pattern)
-                cls._prepended_pattern = case12
-            elif head == 'head_just_whitespace_plus' and not pattern.startswith(case13):
-                new_pattern = '{}{}'.format(case13, pattern)
-                cls._prepended_pattern = case13
-            elif head == 'head_just_whitespaces' and not pattern.startswith(case13):
-                new_pattern = '{}{}'.format(case13, pattern)
-                cls._prepended_pattern = case13
-            else:
-                new_pattern = pattern
-            return new_pattern
-        return pattern
+        Returns
+        -------
+        str: a regex pattern.
+
+        """
+
+        if not lines:
+            return r'^\s*$'
+
+        context = BuildContext.get_current()
+        line_patterns = []
+        for line in lines:
+            line_pat = LinePattern(line, ignore_case=ignore_case)
+            line_patterns.append(line_pat)
+
+        first, last = line_patterns[0], line_patterns[-1]
+        last = line_patterns[-1]
+
+        literals = [line_pat.required_literal for line_pat in line_patterns]
+        context.required_literal = max(literals, key=len)
+
+        if len(line_patterns) == 1:
+            context.node = first.node
+            context.compiled = first.compiled
+            return first
+
+        new_line_patterns = [cls.reformat(first, is_first=True, is_exact=is_exact)]
+        for line_pat in line_patterns[1:-1]:
+            new_line_patterns.append(cls.reformat(line_pat, is_exact=is_exact))
+
+        new_line_patterns.append(cls.reformat(last, is_last=True, is_exact=is_exact))
+
+        context.node = SequenceNode(new_line_patterns)
+        new_pattern = context.node.render()
+        context.compiled = validate_pattern(
+            cls.get_compiled_form(new_pattern), exception_cls=MultilinePatternError
+        )
+        return new_pattern
 
     @classmethod
-    def add_tail_of_string(cls, pattern, tail=''):
-        """append end of string i.e $ or \\s*$ or $\\s+$ or  *$ or  +$ regex pattern
+    def get_compiled_form(cls, pattern):
+        """return a form of pattern which is compiled in process
 
         Parameters
         ----------
-        pattern (str): a pattern
-        tail (str): end of string case.  Default is empty.
+        pattern (str): a multiline pattern.
 
         Returns
         -------
-        str: new pattern with end of string pattern
+        str: a pattern whose line skip patterns are compiled_line_skip_pattern.
         """
-        if tail:
-            case1, case2 = r'\s*$', r'\s+$'
-            case3, case4 = r' *$', r' +$'
-            case5 = r'$'
-
-            case6, case7 = r'\s*', r'\s+'
-            case8, case9 = r' *', r' +'
-
-            case10, case11 = r'\s*$', r'\s+$'
-            case12, case13 = r'\s*', r'\s+'
-
-            if tail == 'tail_ws' and not pattern.endswith(case1):
-                new_pattern = '{}{}'.format(pattern, case1)
-                cls._appended_pattern = case1
-            elif tail == 'tail_ws_plus' and not pattern.endswith(case2):
-                new_pattern = '{}{}'.format(pattern, case2)
-                cls._appended_pattern = case2
-            elif tail == 'tail_space' and not pattern.endswith(case3):
-                new_pattern = '{}{}'.format(pattern, case3)
-                cls._appended_pattern = case3
-            elif tail == 'tail_space_plus' and not pattern.endswith(case4):
-                new_pattern = '{}{}'.format(pattern, case4)
-                cls._appended_pattern = case4
-            elif tail == 'tail_spaces' and not pattern.endswith(case4):
-                new_pattern = '{}{}'.format(pattern, case4)
-                cls._appended_pattern = case4
-            elif tail == 'tail' and not pattern.endswith(case5):
-                new_pattern = '{}{}'.format(pattern, case5)
-                cls._appended_pattern = case5
-            elif tail == 'tail_just_ws' and not pattern.startswith(case6):
-                new_pattern = '{}{}'.format(pattern, case6)
-                cls._appended_pattern = case6
-            elif tail == 'tail_just_ws_plus' and not pattern.startswith(case7):
-                new_pattern = '{}{}'.format(pattern, case7)
-                cls._appended_pattern = case7
-            elif tail == 'tail_just_space' and not pattern.startswith(case8):
-                new_pattern = '{}{}'.format(pattern, case8)
-                cls._appended_pattern = case8
-            elif tail == 'tail_just_space_plus' and not pattern.startswith(case9):
-                new_pattern = '{}{}'.format(pattern, case9)
-                cls._appended_pattern = case9
-            elif tail == 'tail_just_spaces' and not pattern.startswith(case9):
-                new_pattern = '{}{}'.format(pattern, case9)
-                cls._appended_pattern = case9
-            elif tail == 'tail_whitespace' and not pattern.startswith(case10):
-                new_pattern = '{}{}'.format(pattern, case10)
-                cls._appended_pattern = case10
-            elif tail == 'tail_whitespace_plus' and not pattern.startswith(case11):
-                new_pattern = '{}{}'.format(pattern, case11)
-                cls._appended_pattern = case11
-            elif tail == 'tail_whitespaces' and not pattern.startswith(case11):
-                new_pattern = '{}{}'.format(pattern, case11)
-                cls._appended_pattern = case11
-            elif tail == 'tail_just_whitespace' and not pattern.startswith(case12):
-                new_pattern = '{}{}'.format(pattern, case12)
-                cls._appended_pattern = case12
-            elif tail == 'tail_just_whitespace_plus' and not pattern.startswith(case13):
-                new_pattern = '{}{}'.format(pattern, case13)
-                cls._appended_pattern = case13
-            elif tail == 'tail_just_whitespaces' and not pattern.startswith(case13):
-                new_pattern = '{}{}'.format(pattern, case13)
-                cls._appended_pattern = case13
-            else:
-                new_pattern = pattern
-            return new_pattern
-        return pattern
+        return str(pattern).replace(cls.line_skip_pattern, cls.compiled_line_skip_pattern)
 
     @classmethod
-    def add_repetition(cls, lst, repetition=''):
-        """insert regex repetition for a first item of list
+    def reformat(cls, pattern, is_first=False, is_last=False, is_exact=False):
+        """reformat pattern to work with re.MULTILINE matching
 
         Parameters
         ----------
-        lst (lst): a list of sub pattens
-        repetition (str): a repetition expression.  Default is empty.
+        pattern (LinePattern, str): a line pattern.
+        is_first (bool): indicator to tell that is a first line.  Default is False.
+        is_last (bool): indicator to tell that is a last line.  Default is False.
+        is_exact (bool): a flag to match a next line right after a line.
+                Default is False, i.e. skip any lines in between.
 
         Returns
         -------
-        list: a new list if repetition is required.
+        SequenceNode: a node of pattern after reformat.
         """
-        if not repetition:
-            return lst
+        node = getattr(pattern, 'node', None)
+        if node is None:
+            node = SequenceNode.from_pattern(pattern)
 
-        new_lst = lst[:]
-        item = new_lst[0]
+        if is_first:
+            return node.trim(last=int(node.last == AnchorNode('$')))
 
-        is_singular = ElementPattern.is_singular_pattern(item)
-        item = item if is_singular else '({})'.format(item)
+        nodes = node.nodes
+        node = SequenceNode(
+            item for item in nodes if not item.match_leaves(r'[(][?]i[)]', is_exact=True)
+        )
+        node = node.trim(first=int(node.first == AnchorNode('^')))
+        if not is_last:
+            node = node.trim(last=int(node.last == AnchorNode('$')))
 
-        _, m, *last = repetition.split('_', 2)
-        if last:
-            n = last[0]
-            new_lst[0] = '%s{%s,%s}' % (item, m, n)
+        if is_exact:
+            lst = [LiteralNode(r'\r\n'), LiteralNode(r'\r'), LiteralNode(r'\n')]
+            add_on_node = AlternationNode(lst)
         else:
-            new_lst[0] = '%s{%s}' % (item, m)
-        return new_lst
+            add_on_node = SequenceNode.from_pattern(cls.line_skip_pattern)
+        return SequenceNode([add_on_node, node])
+
+
+class PatternBuilder(str):
+    """Use to convert a list of text to regex pattern
+
+    Parameters
+    ----------
+    lst_of_text (list): a list of text.
+    var_name (str): a pattern variable.
+    word_bound (str): word bound case.  Default is empty.
+            value of word_bound can be word_bound, word_bound_left,
+            or word_bound_right
+
+    Methods
+    -------
+    PatternBuilder.get_pattern(text) -> str
+    PatternBuilder.get_alnum_pattern(text) -> str
+    PatternBuilder.add_var_name(pattern, name='') -> str
+
+    Attributes
+    ----------
+    compiled (re.Pattern): a compiled pattern.
+
+    Raises
+    ------
+    PatternBuilderError: raise an exception if pattern is invalid.
+    """
+    def __new__(cls, lst_of_text, var_name='', word_bound=''):
+        if not isinstance(lst_of_text, (list, tuple)):
+            lst_of_text = [lst_of_text]
+
+        context = BuildContext()
+        with context:
+            lst = IndexedList()
+            is_empty = False
+            for text in lst_of_text:
+                data = str(text)
+                if data:
+                    pattern = cls.get_pattern(data)
+                    pattern not in lst and lst.append(pattern)
+                else:
+                    is_empty = True
+
+            is_empty and lst.append('')
+            pattern = ElementPattern.join_list(lst, is_enclosed=True)
+            pattern = ElementPattern.add_word_bound(pattern, word_bound=word_bound)
+            pattern = cls.add_var_name(pattern, name=var_name)
+            context.compiled = validate_pattern(
+                pattern, exception_cls=PatternBuilderError
+            )
+
+        instance = str.__new__(cls, pattern)
+        instance.compiled = context.finalize(
+            pattern,
+            lambda: cls(lst_of_text, var_name=var_name, word_bound=word_bound),
+            exception_cls=PatternBuilderError
+        )
+        return instance
+
+    def __reduce__(self):
+        return restore_pattern, (self.__class__, str(self)), self.__getstate__()
+
+    def __getstate__(self):
+        return self.__dict__.copy()
 
     @classmethod
-    def add_occurrence(cls, lst, occurrence=''):
-        """insert regex occurrence for a first item of list
+    def get_pattern(cls, text):
+        """convert text to regex pattern
 
         Parameters
         ----------
-        lst (lst): a list of sub pattens
-        occurrence (str): an occurrence expression.  Default is empty.
+        text (str): a text
 
         Returns
         -------
-        list: a new list if occurrence is happened.
-        """
-        if not occurrence:
-            return lst
-
-        new_lst = lst[:]
-        m = re.match(cls.occurrence_pattern, occurrence)
-        is_phrase = bool(m.group('is_phrase'))
-        spacer = ' +' if is_phrase and m.group('is_phrase') == '_group' else ' '
+        str: a regex pattern.
 
-        fda, lda = m.group('fda') or '', m.group('lda') or ''
-        fdb, ldb = m.group('fdb') or '', m.group('ldb') or ''
-        fdc, ldc = m.group('fdc') or '', m.group('ldc') or ''
-        fdd, ldd = m.group('fdd') or '', m.group('fdd') or ''
+        Raises
+        ------
+        PatternBuilderError: raise an exception if pattern is invalid.
+        """
+        start = 0
+        lst = []
 
-        func = ElementPattern.add_case_occurrence
+        for m in re.finditer(r'[^a-zA-Z0-9]+', text):
+            before_match = text[start:m.start()]
+            lst.append(cls.get_alnum_pattern(before_match))
+            lst.append(TextPattern(m.group()))
+            start = m.end()
+        else:
+            if start > 0:
+                after_match = text[start:]
+                lst.append(cls.get_alnum_pattern(after_match))
 
-        is_case_a = func(new_lst, fda, lda, is_phrase, spacer=spacer)
-        is_case_b = is_case_a or func(new_lst, fdb, ldb, is_phrase, spacer=spacer)
-        is_case_c = is_case_b or func(new_lst, fdc, ldc, is_phrase, spacer=spacer)
-        is_case_c or func(new_lst, fdd, ldd, is_phrase, spacer=spacer)
+        pattern = ''.join(lst) if lst else cls.get_alnum_pattern(text)
+        validate_pattern(pattern, exception_cls=PatternBuilderError)
+        return pattern
 
-        return new_lst
+    @classmethod
+    def get_alnum_pattern(cls, text):
+        if text:
+            if text.isdigit():
+                return '[0-9]+'
+            elif text.isalpha():
+                return '[a-zA-Z]+'
+            elif text.isalnum():
+                return '[a-zA-Z0-9]+'
+            else:
+                return '.*'
+        else:
+            return ''
 
     @classmethod
-    def add_case_occurrence(cls, lst, first, last, is_phrase, spacer=' '):
-        """check if pattern is a singular pattern
+    def add_var_name(cls, pattern, name=''):
+        """add var name to regex pattern
 
         Parameters
         ----------
-        lst (str): a list.
-        first (str): a first digit or option of case.
-        last (str): a last digit or option of case.
-        is_phrase (bool): a flag for matching a group of occurrences.
+        pattern (str): a pattern
+        name (str): a regex variable name
 
         Returns
         -------
-        bool: True if occurrence happened, otherwise False.
+        str: new pattern with variable name.
         """
-        if not first and not last:
-            return False
+        if name:
+            new_pattern = '(?P<{}>{})'.format(name, pattern)
+            return new_pattern
+        return pattern
 
-        item = lst[0]
-        if is_phrase:
-            # item = '{0}( {0})'.format(item)
-            item = f'{item}({spacer}{item})'
-        else:
-            is_singular = ElementPattern.is_singular_pattern(item)
-            item = item if is_singular else '({})'.format(item)
 
-        first = int(first) if first.isdigit() else first
-        last = int(last) if last.isdigit() else last
+class BatchResult:
+    """Use to hold results of a batch build and its statistics
 
-        if first == 'least' or first == 'most':
-            if last == 0:
-                fmt = '%s*' if first == 'least' else '%s?'
-            else:
-                fmt = '%%s{%s,}' if first == 'least' else '%%s{,%s}'
-                fmt = fmt % last
-        elif last == 'more':
-            fmt = '%s*' if first == 0 else '%s+' if first == 1 else '%%s{%s,}' % first
-        elif first == last:
-            fmt = '%s' if first == 1 else '%%s{%s}' % first if first else '%s?'
-        else:
-            first, last = min(first, last), max(first, last)
-            fmt = '%s?' if first == 0 and last == 1 else '%%s{%s,%s}' % (first, last)
+    Attributes
+    ----------
+    results (list): a result per input, in order of input.
+    total (int): a number of input texts.
+    unique_total (int): a number of unique input texts.
+    element_total (int): a number of element snippets, i.e. keyword(...).
+    unique_element_total (int): a number of unique element snippets.
+    timings (OrderedDict): duration in seconds of every phase, i.e.
+            dedup, element, build, and fanout.
 
-        if fmt:
-            lst[0] = fmt % item
-            return True
-        else:
-            return False
+    Properties
+    ----------
+    unique_ratio -> float
+    elapsed -> float
+
+    Methods
+    -------
+    to_dict() -> OrderedDict
+    """
+    def __init__(self, results=None, total=0, unique_total=0,
+                 element_total=0, unique_element_total=0):
+        self.results = results or []
+        self.total = total
+        self.unique_total = unique_total
+        self.element_total = element_total
+        self.unique_element_total = unique_element_total
+        self.timings = OrderedDict(dedup=0.0, element=0.0, build=0.0, fanout=0.0)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __getitem__(self, index):
+        return self.results[index]
+
+    @property
+    def unique_ratio(self):
+        return self.unique_total / self.total if self.total else 0.0
 
-    @classmethod
-    def is_singular_pattern(cls, pattern):
-        """check if pattern is a singular pattern
+    @property
+    def elapsed(self):
+        return sum(self.timings.values())
 
-        Parameters
-        ----------
-        pattern (str): a pattern.
+    def to_dict(self):
+        """return batch statistics
 
         Returns
         -------
-        bool: True if pattern is a singular pattern, otherwise False.
+        OrderedDict: counters, unique ratio, and timings of batch.
         """
-        left_bracket, right_bracket = '[', ']'
-        pattern = str(pattern)
-        first, last = pattern[:1], pattern[-1:]
-        total = len(pattern)
-        is_singular = total <= 1
-        is_escape = total == 2 and first == '\\'
-        is_char_set = pattern.count(first) == 1 and first == left_bracket
-        is_char_set &= pattern.count(last) == 1 and last == right_bracket
-        return is_singular or is_escape or is_char_set
+        result = OrderedDict(
+            total=self.total, unique_total=self.unique_total,
+            unique_ratio=self.unique_ratio, element_total=self.element_total,
+            unique_element_total=self.unique_element_total,
+            timings=OrderedDict(self.timings), elapsed=self.elapsed
+        )
+        return result
 
-    def remove_head_of_string(self):
-        """remove a start of string pattern i.e ^ or ^\\s* or ^\\s+ or ^ * or ^ +
 
-        Returns
-        -------
-        ElementPattern: new ElementPattern
-        """
-        if self.prepended_pattern and self.startswith('^'):
-            pattern = str(self)[len(self.prepended_pattern):]
-            new_instance = ElementPattern(pattern, as_is=True)
-            new_instance.as_is = False
-            new_instance.variable = copy(self.variable)
-            new_instance.or_empty = self.or_empty
-            new_instance.prepended_pattern = ''
-            new_instance.appended_pattern = self.appended_pattern
-        else:
-            new_instance = copy(self)
+def build_pattern_batch(cls, lst_of_text, **kwargs):
+    """build patterns of many texts, converting every unique text once
 
-        return new_instance
+    Identical texts are converted once, and so are identical element
+    snippets, i.e. keyword(...), which are shared between unique texts.
+    Patterns are fanned back out in order of input, so identical texts
+    share a pattern instance.
 
-    def remove_tail_of_string(self):
-        """remove an end of string pattern i.e $ or \\s*$ or \\s+$ or  *$ or  +$
+    Parameters
+    ----------
+    cls (class): a pattern class, i.e. LinePattern or MultilinePattern.
+    lst_of_text (list): a list of text.  A text of MultilinePattern can
+            also be a list of text.
+    kwargs (dict): keyword arguments of pattern class.
+
+    Returns
+    -------
+    BatchResult: patterns in order of text and batch statistics.
+    """
+    batch = BatchResult(total=len(lst_of_text))
+
+    start = time.perf_counter()
+    keys = [
+        tuple(text) if isinstance(text, (list, tuple)) else str(text)
+        for text in lst_of_text
+    ]
+    unique_table = OrderedDict()
+    for key, text in zip(keys, lst_of_text):
+        unique_table.setdefault(key, text)
+    batch.unique_total = len(unique_table)
+    batch.timings['dedup'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    snippets = []
+    for key in unique_table:
+        text = '\n'.join(key) if isinstance(key, tuple) else key
+        snippets.extend(m.group() for m in re.finditer(r'\w+[(][^)]*[)]', text))
+    unique_snippets = OrderedDict.fromkeys(snippets)
+    for snippet in unique_snippets:
+        ElementPattern(snippet)
+    batch.element_total = len(snippets)
+    batch.unique_element_total = len(unique_snippets)
+    batch.timings['element'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pattern_table = dict()
+    for key, text in unique_table.items():
+        pattern_table[key] = cls(text, **kwargs)
+    batch.timings['build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch.results = [pattern_table[key] for key in keys]
+    batch.timings['fanout'] = time.perf_counter() - start
+    return batch
+
+
+class PatternEntry:
+    """Use to store a compiled pattern of PatternSet
+
+    Attributes
+    ----------
+    pattern (str): a regex pattern, i.e. LinePattern or MultilinePattern.
+    regex (re.Pattern): a compiled pattern.
+    flags (int): regex flags which pattern is compiled with.
+    groups (tuple): a tuple of named groups of pattern.
+    user_data (str): user data which pattern is built from.
+    index (int): a position of pattern in PatternSet.
+    literal (str): a literal text which every match contains.  Default
+            is empty, i.e. pattern is tried against every data.
+
+    Methods
+    -------
+    search(data) -> re.Match
+    """
+    def __init__(self, pattern, regex, flags=0, user_data='', index=0, literal=''):
+        self.pattern = pattern
+        self.regex = regex
+        self.flags = flags
+        self.groups = tuple(regex.groupindex)
+        self.user_data = user_data
+        self.index = index
+        self.literal = literal
+
+    def __repr__(self):
+        fmt = '{}(index={}, pattern={!r})'
+        return fmt.format(type(self).__name__, self.index, str(self.pattern))
+
+    def search(self, data):
+        """scan through data for a match of pattern
+
+        Parameters
+        ----------
+        data (str): a test data.
 
         Returns
         -------
-        ElementPattern: new ElementPattern
+        re.Match: a match object or None.
         """
-        if self.appended_pattern and self.endswith('$'):
-            pattern = str(self)[:-len(self.appended_pattern)]
-            new_instance = ElementPattern(pattern, as_is=True)
-            new_instance.as_is = False
-            new_instance.variable = copy(self.variable)
-            new_instance.or_empty = self.or_empty
-            new_instance.prepended_pattern = self.prepended_pattern
-            new_instance.appended_pattern = ''
-        else:
-            new_instance = copy(self)
-
-        return new_instance
+        if self.literal and self.literal not in data:
+            return None
+        return self.regex.search(data)
 
 
-class LinePattern(str):
-    """Use to convert a line text to regex pattern
+class PatternMatch:
+    """Use to store a match of PatternSet
 
-    Attributes:
-    variables (list): a list of pattern variable
-    items (list): a list of sub-pattern
+    Attributes
+    ----------
+    entry (PatternEntry): a matched pattern entry.
+    match (re.Match): a match object.
+    data (str): a matched data.
+    line_index (int): a position of data in test data.  Default is 0.
 
     Properties
     ----------
-    statement (str): a template statement
+    pattern -> str
+    groupdict -> dict
+    """
+    def __init__(self, entry, match, data, line_index=0):
+        self.entry = entry
+        self.match = match
+        self.data = data
+        self.line_index = line_index
+
+    def __repr__(self):
+        fmt = '{}(line_index={}, pattern_index={}, match={!r})'
+        return fmt.format(
+            type(self).__name__, self.line_index,
+            self.entry.index, self.match.group()
+        )
+
+    @property
+    def pattern(self):
+        return self.entry.pattern
+
+    @property
+    def groupdict(self):
+        return self.match.groupdict()
+
+
+class PatternSet:
+    """Use to hold a list of precompiled patterns for reusable matching
+
+    Patterns are compiled once, so matching does not depend on the size
+    of internal cache of re module.  A compiled object which is attached
+    to a pattern at build time is reused when flags are not provided.
+
+    A pattern is only tried against data which contains its required
+    literal.  With a few literals, every literal is checked with ``in``.
+    With many literals, data is scanned once by a combined regex of the
+    literals, and only patterns whose literal is found, together with
+    patterns without a literal, are tried against data.
 
     Parameters
     ----------
-    text (str): a text.
-    prepended_ws (bool): prepend a whitespace at the beginning of a pattern.
-            Default is False.
-    appended_ws (bool): append a whitespace at the end of a pattern.
-            Default is False.
-    ignore_case (bool): prepend (?i) at the beginning of a pattern.
-            Default is False.
+    patterns (list): a list of pattern, i.e. LinePattern or MultilinePattern.
+    flags (int): regex flags.  Default is 0.
+    user_data_table (dict): a mapping of pattern to its user data.
+            Default is None, i.e. user data is taken from pattern text.
 
     Methods
     -------
-    LinePattern.get_pattern(text) -> str
-    LinePattern.readjust_if_or_empty(lst) -> None
-    LinePattern.ensure_start_of_line_pattern(lst) -> None
-    LinePattern.ensure_end_of_line_pattern(lst) -> None
-    LinePattern.prepend_whitespace(lst) -> None
-    LinePattern.prepend_ignorecase_flag(lst) -> None
-    LinePattern.append_whitespace(lst) -> None
+    PatternSet.from_builder(builder, flags=0) -> PatternSet
+    build_scanner() -> None
+    get_candidates(data) -> list
+    search(data) -> PatternMatch
+    match_all(data) -> list
+    iter_matches(lines) -> generator
+    iter_records(lines, workers=1, chunk_size=0) -> generator
 
     Raises
     ------
-    LinePatternError: raise an exception if pattern is invalid.
-
+    PatternSetError: raise an exception if a pattern is invalid.
     """
-
-    _variables = None
-
-    def __new__(cls, text, prepended_ws=False, appended_ws=False,
-                ignore_case=False):
-        cls._variables = list()
-        cls._items = list()
-        data = str(text)
-        if data:
-            pattern = cls.get_pattern(
-                data, prepended_ws=prepended_ws,
-                appended_ws=appended_ws, ignore_case=ignore_case
+    scanner_threshold = 24
+    chunks_per_worker = 4
+
+    def __init__(self, patterns=None, flags=0, user_data_table=None):
+        self.flags = flags
+        self.entries = []
+
+        patterns = [patterns] if isinstance(patterns, str) else patterns or []
+        user_data_table = user_data_table or dict()
+        for pattern in patterns:
+            compiled = getattr(pattern, 'compiled', None)
+            if compiled is None or flags:
+                try:
+                    compiled = re.compile(pattern, flags=flags)
+                except Exception as ex:
+                    msg = '{} - {}'.format(type(ex).__name__, ex)
+                    raise PatternSetError(msg)
+
+            user_data = user_data_table.get(pattern, getattr(pattern, 'text', ''))
+            literal = getattr(pattern, 'required_literal', None)
+            if literal is None:
+                literal = get_required_literal(pattern)
+            literal = '' if flags & (re.IGNORECASE | re.VERBOSE) else literal
+            entry = PatternEntry(
+                pattern, compiled, flags=flags,
+                user_data=user_data, index=len(self.entries), literal=literal
             )
-        else:
-            pattern = r'^\s*$'
-        return str.__new__(cls, pattern)
+            self.entries.append(entry)
 
-    def __init__(self, text,
-                 prepended_ws=False, appended_ws=False,
-                 ignore_case=False):
-        self.text = text
-        self.prepended_ws = prepended_ws
-        self.appended_ws = appended_ws
-        self.ignore_case = ignore_case
+        self.scanner = None
+        self.unanchored_entries = []
+        self.literal_table = dict()
+        self.prefix_table = dict()
+        self.build_scanner()
 
-        self.variables = self._variables
-        self.items = self._items
+    def __len__(self):
+        return len(self.entries)
 
-        # clear class variable after initialization
-        self._variables = list()
-        self._items = list()
+    def __iter__(self):
+        return iter(self.entries)
 
-    @property
-    def statement(self):
-        lst = []
-        for item in self.items:
-            if isinstance(item, ElementPattern):
-                if not item.variable.is_empty:
-                    lst.append(item.variable.var_name)
-                else:
-                    lst.append(item)
-            else:
-                lst.append(item)
-        return ''.join(lst)
+    def __getitem__(self, index):
+        return self.entries[index]
 
     @classmethod
-    def get_pattern(cls, text,
-                    prepended_ws=False, appended_ws=False,
-                    ignore_case=False):
-        """convert text to regex pattern
+    def from_builder(cls, builder, flags=0):
+        """create PatternSet from patterns of RegexBuilder
 
         Parameters
         ----------
-        text (str): a text
-        prepended_ws (bool): prepend a whitespace at the beginning of a pattern.
-                Default is False.
-        appended_ws (bool): append a whitespace at the end of a pattern.
-                Default is False.
-        ignore_case (bool): prepend (?i) at the beginning of a pattern.
-                Default is False.
+        builder (RegexBuilder): a regex builder which patterns are built.
+        flags (int): regex flags.  Default is 0.
 
         Returns
         -------
-        str: a regex pattern.
+        PatternSet: a pattern set.
+        """
+        return cls(
+            builder.patterns, flags=flags,
+            user_data_table=builder.pattern_user_data_table
+        )
 
-        Raises
-        ------
-        LinePatternError: raise an exception if pattern is invalid.
+    def build_scanner(self):
+        """build a combined regex of the required literals of patterns"""
+        for entry in self.entries:
+            if entry.literal:
+                self.literal_table.setdefault(entry.literal, []).append(entry)
+            else:
+                self.unanchored_entries.append(entry)
+
+        if len(self.literal_table) <= self.scanner_threshold:
+            return
+
+        # a lookahead reports only the longest literal starting at a position,
+        # so every literal also registers other literals which are its prefix.
+        for literal in self.literal_table:
+            self.prefix_table[literal] = [
+                literal[:index] for index in range(1, len(literal) + 1)
+                if literal[:index] in self.literal_table
+            ]
+
+        literals = sorted(self.literal_table, key=lambda item: (-len(item), item))
+        alternation = '|'.join(re.escape(literal) for literal in literals)
+        self.scanner = re.compile('(?=({}))'.format(alternation))
+
+    def get_candidates(self, data):
+        """return entries which can match data
+
+        Parameters
+        ----------
+        data (str): a test data.
+
+        Returns
+        -------
+        list: a list of PatternEntry in order of pattern.
         """
-        line = str(text)
+        if not self.scanner:
+            return [
+                entry for entry in self.entries
+                if not entry.literal or entry.literal in data
+            ]
 
-        lst = []
-        start = 0
-        m = None
-        for m in re.finditer(r'\w+[(][^)]*[)]', line):
-            pre_match = m.string[start:m.start()]
-            if pre_match:
-                lst.append(TextPattern(pre_match))
-            elm_pat = ElementPattern(m.group())
-            if not elm_pat.variable.is_empty:
-                cls._variables.append(elm_pat.variable)
-            lst.append(elm_pat)
-            start = m.end()
-        else:
-            if m and start:
-                after_match = m.string[start:]
-                if after_match:
-                    lst.append(TextPattern(after_match))
+        literals = set()
+        for match in self.scanner.finditer(data):
+            literals.update(self.prefix_table[match.group(1)])
 
-        if len(lst) == 1 and lst[0].strip() == '':
-            return r'^\s*$'
-        elif not lst:
-            if line.strip() == '':
-                return r'^\s*$'
-            lst.append(TextPattern(line))
+        if not literals:
+            return self.unanchored_entries
 
-        cls.readjust_if_or_empty(lst)
-        cls.ensure_start_of_line_pattern(lst)
-        cls.ensure_end_of_line_pattern(lst)
-        prepended_ws and cls.prepend_whitespace(lst)
-        ignore_case and cls.prepend_ignorecase_flag(lst)
-        appended_ws and cls.append_whitespace(lst)
-        cls._items = lst
-        pattern = ''.join(lst)
-        validate_pattern(pattern, exception_cls=LinePatternError)
-        return pattern
+        candidates = self.unanchored_entries[:]
+        for literal in literals:
+            candidates.extend(self.literal_table[literal])
+        candidates.sort(key=lambda entry: entry.index)
+        return candidates
 
-    @classmethod
-    def readjust_if_or_empty(cls, lst):
-        """readjust pattern if ElementPattern has or_empty flag
+    def search(self, data):
+        """return a first match in order of pattern
 
         Parameters
         ----------
-        lst (list): a list of pattern
+        data (str): a test data.
+
+        Returns
+        -------
+        PatternMatch: a first match or None.
         """
-        if len(lst) < 2:
-            return
+        for entry in self.get_candidates(data):
+            match = entry.regex.search(data)
+            if match:
+                return PatternMatch(entry, match, data)
+        return None
 
-        total = len(lst)
-        ws_pat = ElementPattern('zero_or_whitespaces()')
-        insert_indices = []
-        for index, item in enumerate(lst[1:], 1):
-            prev_item = lst[index-1]
-            is_prev_item_text_pat = isinstance(prev_item, (TextPattern, str))
-            is_item_elm_pat = isinstance(item, ElementPattern)
-            if is_prev_item_text_pat and is_item_elm_pat:
-                if item.or_empty:
-                    if prev_item.endswith(' '):
-                        lst[index-1] = prev_item.rstrip()
-                        insert_indices.insert(0, index)
-                    elif prev_item.endswith(r'\s'):
-                        lst[index-1] = prev_item[:-2]
-                        insert_indices.insert(0, index)
-                    elif index == total - 1:
-                        if prev_item.endswith(' +'):
-                            lst[index-1] = prev_item[:-2]
-                            insert_indices.insert(0, index)
-                        elif prev_item.endswith(r'\s+'):
-                            lst[index-1] = prev_item[:-3]
-                            insert_indices.insert(0, index)
+    def match_all(self, data):
+        """return a match of every pattern which matches data
 
-        for index in insert_indices:
-            lst.insert(index, ws_pat)
+        Parameters
+        ----------
+        data (str): a test data.
 
-        index = len(lst) - 1
-        is_stopped = False
-        insert_indices = []
-        while index > 0 and not is_stopped:
-            prev_item, item = lst[index-1], lst[index]
-            is_prev_item_text_pat = isinstance(prev_item, (TextPattern, str))
-            is_item_elm_pat = isinstance(item, ElementPattern)
-            if is_prev_item_text_pat and is_item_elm_pat:
-                if item.or_empty:
-                    if prev_item.endswith(' '):
-                        lst[index - 1] = prev_item.rstrip()
-                        insert_indices.insert(0, index)
-                    elif prev_item.endswith(r'\s') or prev_item.endswith(' +'):
-                        lst[index - 1] = prev_item[:-2]
-                        insert_indices.insert(0, index)
-                    elif prev_item.endswith(r'\s+'):
-                        lst[index - 1] = prev_item[:-3]
-                        insert_indices.insert(0, index)
-            else:
-                is_stopped = True
-            index -= 2
+        Returns
+        -------
+        list: a list of PatternMatch in order of pattern.
+        """
+        result = []
+        for entry in self.get_candidates(data):
+            match = entry.regex.search(data)
+            match and result.append(PatternMatch(entry, match, data))
+        return result
 
-        for index in insert_indices:
-            lst.insert(index, ws_pat)
+    def iter_matches(self, lines):
+        """iterate every match of every pattern over lines
 
-        index = len(lst) - 1
-        is_stopped = False
-        is_prev_containing_empty = False
-        while index > 0 and not is_stopped:
-            prev_item, item = lst[index-1], lst[index]
-            is_prev_item_elm_pat = isinstance(prev_item, ElementPattern)
-            is_item_text_pat = isinstance(item, (TextPattern, str))
-            if is_prev_item_elm_pat and is_item_text_pat:
-                if prev_item.or_empty:
-                    if item in [' ', ' +', r'\s', r'\s+']:
-                        lst[index] = ws_pat
-                    is_prev_containing_empty = True
-                else:
-                    if item in [' ', ' +', r'\s', r'\s+'] and is_prev_containing_empty:
-                        lst[index] = ws_pat
-                    is_prev_containing_empty = False
-            else:
-                is_stopped = True
-            index -= 2
+        Parameters
+        ----------
+        lines (str, list): a test data or a list of test data.  A string
+                is split into lines.
 
-    @classmethod
-    def ensure_start_of_line_pattern(cls, lst):
-        """Ensure a start pattern does not contain duplicate whitespace
+        Returns
+        -------
+        generator: PatternMatch in order of line, then order of pattern.
+        """
+        lines = lines.splitlines() if isinstance(lines, str) else lines
+        for line_index, line in enumerate(lines):
+            for entry in self.get_candidates(line):
+                match = entry.regex.search(line)
+                if match:
+                    yield PatternMatch(entry, match, line, line_index=line_index)
+
+    def iter_records(self, lines, workers=1, chunk_size=0):
+        """iterate matched pattern indices and groups of every line
+
+        Lines are sharded into chunks which are matched in a process pool
+        when workers is more than one.  Records are yielded in order of
+        line regardless of which worker matches a chunk.
 
         Parameters
         ----------
-        lst (list): a list of pattern
+        lines (list): a list of test data.
+        workers (int): number of worker processes.  Default is 1, i.e.
+                lines are matched in current process.  None is number
+                of processors.
+        chunk_size (int): number of lines per chunk.  Default is 0, i.e.
+                lines are split into a few chunks per worker.
+
+        Returns
+        -------
+        generator: a tuple of line index and a list of tuple of pattern
+                index and groupdict of every line.
         """
-        if len(lst) < 2:
+        if workers == 1 or len(lines) < 2:
+            for line_index, line in enumerate(lines):
+                records = [
+                    (item.entry.index, item.groupdict)
+                    for item in self.match_all(line)
+                ]
+                yield line_index, records
             return
 
-        curr, nxt = lst[0], lst[1]
+        workers = workers or os.cpu_count() or 1
+        if not chunk_size:
+            chunk_size = -(-len(lines) // (workers * self.chunks_per_worker))
+        chunks = [
+            lines[index:index + chunk_size]
+            for index in range(0, len(lines), chunk_size)
+        ]
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_pattern_set_worker,
+            initargs=([entry.pattern for entry in self], self.flags)
+        ) as executor:
+            line_index = 0
+            for chunk_records in executor.map(match_pattern_set_chunk, chunks):
+                for records in chunk_records:
+                    yield line_index, records
+                    line_index += 1
+
+
+worker_pattern_set = None
+
+
+def init_pattern_set_worker(patterns, flags):
+    """create pattern set of a worker process
+
+    Parameters
+    ----------
+    patterns (list): a list of pattern, i.e. LinePattern or MultilinePattern,
+            which keep their required literals across processes.
+    flags (int): regex flags.
+    """
+    global worker_pattern_set
+    worker_pattern_set = PatternSet(patterns, flags=flags)
+
+
+def match_pattern_set_chunk(lines):
+    """match a chunk of lines against pattern set of a worker process
+
+    Parameters
+    ----------
+    lines (list): a list of test data.
+
+    Returns
+    -------
+    list: a list of records, i.e. a tuple of pattern index and groupdict,
+            of every line.
+    """
+    result = []
+    for line in lines:
+        records = [
+            (item.entry.index, item.groupdict)
+            for item in worker_pattern_set.match_all(line)
+        ]
+        result.append(records)
+    return result
 
-        if curr == '^':
-            if isinstance(nxt, TextPattern):
-                if nxt == ' ':
-                    lst.pop(1)
-                    return
-                if re.match(' [^+*]', nxt):
-                    lst[1] = nxt.lstrip()
-                    return
 
-        match = re.match(r'(?P<pre_ws>( |\\s)[*+]*)', nxt)
-        if re.match(r'(\^|\\A)( |\\s)[*+]*$', curr):
-            if isinstance(nxt, TextPattern) and match:
-                index = len(match.group('pre_ws'))
-                new_val = nxt[index:]
-                if new_val == '':
-                    lst.pop(1)
-                else:
-                    lst[1] = new_val
+class PatternIssue:
+    """Use to describe a construct of pattern which may backtrack heavily
 
-        # clean up any invalid a start of string pattern
-        for index, node in enumerate(lst[1:], 1):
-            if isinstance(node, ElementPattern) and node.prepended_pattern:
-                lst[index] = node.remove_head_of_string()
+    Attributes
+    ----------
+    kind (str): an issue kind, i.e. nested-quantifier, empty-loop,
+            overlapping-alternation, or adjacent-quantifiers.
+    level (str): a worst-case matching time, i.e. exponential,
+            polynomial, or linear.
+    description (str): a description of issue.
+    group (str): a name or a number of innermost group which contains
+            construct.  Default is empty.
+    chars (str): samples of characters which can be matched in more
+            than one way.  Default is empty.
+    """
+    weights = dict(exponential=100, polynomial=10, linear=2)
 
-    @classmethod
-    def ensure_end_of_line_pattern(cls, lst):
-        """Ensure an end pattern does not contain duplicate whitespace
+    def __init__(self, kind, level, description, group='', chars=''):
+        self.kind = kind
+        self.level = level
+        self.description = description
+        self.group = group
+        self.chars = chars
 
-        Parameters
-        ----------
-        lst (list): a list of pattern
-        """
-        if len(lst) < 2:
-            return
+    def __repr__(self):
+        fmt = '{}(kind={!r}, level={!r}, group={!r})'
+        return fmt.format(type(self).__name__, self.kind, self.level, self.group)
 
-        last, prev = lst[-1], lst[-2]
+    def __str__(self):
+        text = '{} [{}]: {}'.format(self.kind, self.level, self.description)
+        text += ' in group {}'.format(self.group) if self.group else ''
+        text += ', e.g. {}'.format(self.chars) if self.chars else ''
+        return text
 
-        if last == '$':
-            if isinstance(prev, TextPattern):
-                if prev == ' ':
-                    lst.pop(-2)
-                    return
-                if not re.search(' [+*]$', prev):
-                    lst[-2] = prev.rstrip()
-                    return
+    @property
+    def score(self):
+        return self.weights[self.level]
+
+    def to_dict(self):
+        """return issue as a JSON-serializable dictionary"""
+        return OrderedDict(
+            kind=self.kind, level=self.level, description=self.description,
+            group=self.group, chars=self.chars, score=self.score
+        )
 
-        match = re.search(r'(?P<post_ws>( |\\s)[*+]*)$', prev)
-        if re.match(r'( |\\s)[*+]?(\$|\\Z)$', last):
-            if isinstance(prev, TextPattern) and match:
-                index = len(match.group('post_ws'))
-                new_val = prev[:-index]
-                if new_val == '':
-                    lst.pop(-2)
-                else:
-                    lst[-2] = new_val
 
-        # clean up any invalid a start of string pattern
-        for index, node in enumerate(lst[:-1]):
-            if isinstance(node, ElementPattern) and node.appended_pattern:
-                lst[index] = node.remove_tail_of_string()
+class PatternAnalysis:
+    """Use to store a result of static complexity analysis of pattern
 
-    @classmethod
-    def prepend_whitespace(cls, lst):
-        """prepend whitespace pattern to list
+    Attributes
+    ----------
+    pattern (str): an analyzed pattern.
+    issues (list): a list of PatternIssue.
+    total_quantifiers (int): a number of unbounded quantifiers.
 
-        Parameters
-        ----------
-        lst (list): a list of pattern
-        """
-        if not lst:
-            return
+    Properties
+    ----------
+    score -> int
+    level -> str
+    is_safe -> bool
 
-        pat = r'(\^|\\A)( |\\s)[*+]?'
-        if not re.match(pat, lst[0]):
-            lst.insert(0, r'^\s*')
+    Methods
+    -------
+    to_dict() -> OrderedDict
+    get_report() -> str
+    """
+    levels = ['linear', 'polynomial', 'exponential']
 
-    @classmethod
-    def prepend_ignorecase_flag(cls, lst):
-        """prepend regex ignorecase flag, i.e. (?i) to list
+    def __init__(self, pattern, issues=None, total_quantifiers=0):
+        self.pattern = pattern
+        self.issues = list(issues or [])
+        self.total_quantifiers = total_quantifiers
 
-        Parameters
-        ----------
-        lst (list): a list of pattern
-        """
-        if not lst:
-            return
+    def __repr__(self):
+        fmt = '{}(level={!r}, score={}, issues={})'
+        return fmt.format(type(self).__name__, self.level, self.score, len(self.issues))
 
-        pat = r'[(][?]i[)]'
-        if not re.match(pat, lst[0]):
-            lst.insert(0, '(?i)')
+    def __str__(self):
+        return self.get_report()
 
-    @classmethod
-    def append_whitespace(cls, lst):
-        """append whitespace pattern to list
+    @property
+    def score(self):
+        """a complexity score, i.e. weights of issues plus unbounded quantifiers"""
+        return self.total_quantifiers + sum(issue.score for issue in self.issues)
 
-        Parameters
-        ----------
-        lst (list): a list of pattern
-        """
-        if not lst:
-            return
-        pat = r'( |\\s)[*+]?(\$|\\Z)$'
-        if not re.search(pat, lst[-1]):
-            lst.append(r'\s*$')
+    @property
+    def level(self):
+        """the worst level of issues, or linear if pattern has no issue"""
+        levels = [self.levels.index(issue.level) for issue in self.issues]
+        return self.levels[max(levels, default=0)]
 
+    @property
+    def is_safe(self):
+        return self.level != 'exponential'
+
+    def to_dict(self):
+        """return analysis as a JSON-serializable dictionary"""
+        return OrderedDict(
+            pattern=str(self.pattern), level=self.level, score=self.score,
+            total_quantifiers=self.total_quantifiers,
+            issues=[issue.to_dict() for issue in self.issues]
+        )
 
-class MultilinePattern(str):
-    """Use to convert multiple lines to regex pattern
+    def get_report(self):
+        """return analysis as text"""
+        lst = [
+            'pattern: {}'.format(self.pattern),
+            'complexity: {} (score {})'.format(self.level, self.score)
+        ]
+        lst.extend('  - {}'.format(issue) for issue in self.issues)
+        return '\n'.join(lst)
+
+
+class PatternAnalyzer:
+    """Use to detect constructs of pattern which cause catastrophic backtracking
+
+    A pattern is parsed by the parser of re module, and its tree is
+    walked to find
+        - an unbounded quantifier whose body has an unbounded quantifier
+          which can also match a next character, i.e. a first character
+          of a rest of body or of body itself, e.g. (a+)+, (\\w+\\s?)*,
+          or (\\w+\\d)+, i.e. exponential,
+        - an alternation whose alternatives can start with a same
+          character, or an alternative which is a prefix of a later one,
+          e.g. (a|a ), i.e. exponential in an unbounded quantifier,
+        - adjacent unbounded quantifiers which can match a same
+          character, e.g. .*\\s* or \\s* *, i.e. polynomial.
+    Character sets are compared over printable ASCII characters and
+    a few non-ASCII samples.  Possessive quantifiers and atomic groups
+    never backtrack into, so they are not reported.
 
     Parameters
     ----------
-    text (str): a text.
-    ignore_case (bool): prepend (?i) at the beginning of a pattern.
-            Default is False.
+    pattern (str): a pattern, e.g. LinePattern, MultilinePattern, or
+            PatternBuilder.
+    flags (int): regex flags.  Default is 0.
 
-    """
-    def __new__(cls, text, ignore_case=False, is_exact=False):
+    Methods
+    -------
+    analyze() -> PatternAnalysis
 
-        lines = []
-        if isinstance(text, (list, tuple)):
-            for line in text:
-                lines.extend(re.split(r'\r\n|\r|\n', line))
-        elif isinstance(text, str):
-            lines = re.split(r'\r\n|\r|\n', text)
-        else:
-            'text argument must be string or list of string'
-            raise MultilinePatternError(text)
+    Raises
+    ------
+    PatternAnalysisError: raise an exception if pattern is invalid.
+    """
+    alphabet = frozenset(string.printable + '\xa0\xe9 ')
+    categories = dict(
+        CATEGORY_DIGIT=r'\d', CATEGORY_NOT_DIGIT=r'\D',
+        CATEGORY_SPACE=r'\s', CATEGORY_NOT_SPACE=r'\S',
+        CATEGORY_WORD=r'\w', CATEGORY_NOT_WORD=r'\W',
+    )
+    category_sets = dict()
 
-        if lines:
-            pattern = cls.get_pattern(
-                lines, ignore_case=ignore_case, is_exact=is_exact
-            )
-        else:
-            pattern = r'^\s*$'
-        return str.__new__(cls, pattern)
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        try:
+            self.parsed = sre_parse.parse(str(pattern), flags)
+        except Exception as ex:
+            msg = '{} - {}'.format(type(ex).__name__, ex)
+            raise PatternAnalysisError(msg)
+
+        state = self.parsed.state
+        self.flags = state.flags
+        self.group_names = {index: name for name, index in state.groupdict.items()}
+        self.issues = []
+        self.total_quantifiers = 0
+
+    def analyze(self):
+        """return a complexity analysis of pattern"""
+        self.issues = []
+        self.total_quantifiers = 0
+        self.walk(self.parsed, False, '')
+        return PatternAnalysis(
+            self.pattern, issues=self.issues,
+            total_quantifiers=self.total_quantifiers
+        )
 
     @classmethod
-    def get_pattern(cls, lines, ignore_case=False, is_exact=False):
-        """convert text to regex pattern
+    def get_category_set(cls, category):
+        """return sample characters of a category, e.g. \\d or \\s"""
+        name = str(category)
+        if name not in cls.category_sets:
+            pattern = re.compile(cls.categories.get(name, r'[\s\S]'))
+            chars = frozenset(char for char in cls.alphabet if pattern.match(char))
+            cls.category_sets[name] = chars
+        return cls.category_sets[name]
+
+    def get_char_set(self, op, av):
+        """return sample characters of a single character item"""
+        if op is sre_parse.LITERAL:
+            chars = {chr(av)}
+        elif op is sre_parse.NOT_LITERAL:
+            chars = set(self.alphabet - {chr(av)})
+        elif op is sre_parse.ANY:
+            chars = set(self.alphabet)
+            self.flags & re.DOTALL or chars.discard('\n')
+        else:
+            chars = set()
+            is_negated = False
+            for sub_op, sub_av in av:
+                if sub_op is sre_parse.NEGATE:
+                    is_negated = True
+                elif sub_op is sre_parse.LITERAL:
+                    chars.add(chr(sub_av))
+                elif sub_op is sre_parse.RANGE:
+                    chars.update(c for c in self.alphabet if sub_av[0] <= ord(c) <= sub_av[1])
+                elif sub_op is sre_parse.CATEGORY:
+                    chars.update(self.get_category_set(sub_av))
+            chars = set(self.alphabet - chars) if is_negated else chars
+
+        if self.flags & re.IGNORECASE:
+            chars.update([char.swapcase() for char in chars])
+        return chars
+
+    def is_repeat(self, op):
+        return op is sre_parse.MAX_REPEAT or op is sre_parse.MIN_REPEAT
+
+    def get_edge(self, items, is_first=True):
+        """return characters which can start or end items, and if items can be empty
 
         Parameters
         ----------
-        lines (lines): list of string
-        ignore_case (bool): prepend (?i) at the beginning of a pattern.
-                Default is False.
+        items (list): parsed items.
+        is_first (bool): True for first characters, False for last characters.
 
         Returns
         -------
-        str: a regex pattern.
-
+        tuple: a set of sample characters and a flag if items can match
+                an empty text.
         """
+        result = set()
+        for op, av in (items if is_first else list(items)[::-1]):
+            if op in (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.ANY, sre_parse.IN):
+                chars, is_nullable = self.get_char_set(op, av), False
+            elif self.is_repeat(op) or op is POSSESSIVE_REPEAT:
+                chars, is_nullable = self.get_edge(av[2], is_first=is_first)
+                is_nullable = is_nullable or av[0] == 0
+            elif op is sre_parse.SUBPATTERN:
+                chars, is_nullable = self.get_edge(av[-1], is_first=is_first)
+            elif op is ATOMIC_GROUP:
+                chars, is_nullable = self.get_edge(av, is_first=is_first)
+            elif op is sre_parse.BRANCH:
+                chars, is_nullable = set(), False
+                for alternative in av[1]:
+                    sub_chars, sub_is_nullable = self.get_edge(alternative, is_first=is_first)
+                    chars |= sub_chars
+                    is_nullable = is_nullable or sub_is_nullable
+            elif op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+                chars, is_nullable = set(self.alphabet), True
+            else:
+                chars, is_nullable = set(), True
+            result |= chars
+            if not is_nullable:
+                return result, False
+        return result, True
+
+    def get_edge_repeats(self, items, is_first=True):
+        """return bodies of backtracking unbounded quantifiers at start or end of items"""
+        result = []
+        for op, av in (items if is_first else list(items)[::-1]):
+            if self.is_repeat(op):
+                av[1] == sre_parse.MAXREPEAT and result.append(av[2])
+            elif op is sre_parse.SUBPATTERN:
+                result.extend(self.get_edge_repeats(av[-1], is_first=is_first))
+            elif op is sre_parse.BRANCH:
+                for alternative in av[1]:
+                    result.extend(self.get_edge_repeats(alternative, is_first=is_first))
+            if not self.get_edge([(op, av)], is_first=is_first)[1]:
+                break
+        return result
 
-        if not lines:
-            return r'^\s*$'
-
-        line_patterns = []
-        for line in lines:
-            line_pat = LinePattern(line, ignore_case=ignore_case)
-            line_patterns.append(line_pat)
-
-        first, last = line_patterns[0], line_patterns[-1]
-        last = line_patterns[-1]
-
-        if len(line_patterns) == 1:
-            return first
-
-        new_line_patterns = [cls.reformat(first, is_first=True, is_exact=is_exact)]
-        for line_pat in line_patterns[1:-1]:
-            new_line_patterns.append(cls.reformat(line_pat, is_exact=is_exact))
+    def add_issue(self, kind, level, description, group, chars=None):
+        samples = ''.join(sorted(chars or [])[:5])
+        self.issues.append(
+            PatternIssue(kind, level, description, group=group, chars=repr(samples) if samples else '')
+        )
 
-        new_line_patterns.append(cls.reformat(last, is_last=True, is_exact=is_exact))
+    def check_repeat(self, body, group):
+        """check an unbounded quantifier whose body may be split in many ways"""
+        first_chars, is_nullable = self.get_edge(body)
+        if is_nullable:
+            description = 'unbounded quantifier repeats a body which can match empty text'
+            self.add_issue('empty-loop', 'exponential', description, group)
+            return
 
-        new_pattern = ''.join(new_line_patterns)
-        validate_pattern(new_pattern, exception_cls=MultilinePatternError)
-        return new_pattern
+        chars = self.get_follow_overlap(body, first_chars)
+        if chars:
+            description = ('unbounded quantifier repeats a body which has '
+                           'an unbounded quantifier matching its next character')
+            self.add_issue('nested-quantifier', 'exponential', description, group, chars)
 
-    @classmethod
-    def reformat(cls, pattern, is_first=False, is_last=False, is_exact=False):
-        """reformat pattern to work with re.MULTILINE matching
+    def get_follow_overlap(self, items, follow_chars):
+        """return characters which an inner unbounded quantifier shares with its follower
 
         Parameters
         ----------
-        pattern (LinePattern, str): a line pattern.
-        is_first (bool): indicator to tell that is a first line.  Default is False.
-        is_last (bool): indicator to tell that is a last line.  Default is False.
+        items (list): parsed items of a repeated body.
+        follow_chars (set): characters which can follow items, i.e. first
+                characters of a next repetition of body.
 
         Returns
         -------
-        str: a new pattern after reformat.
+        set: characters which an unbounded quantifier of items can match
+                while a rest of body, or a next repetition, can start with.
         """
-        pat1 = r'(\r\n|\r|\n)'
-        pat2 = r'[^\r\n]*[\r\n]+([^\r\n]*[\r\n]+)*'
-        add_on_pat = pat1 if is_exact else pat2
-        if is_first:
-            return pattern[:-1] if pattern.endswith('$') else pattern
-        else:
-            pattern = pattern.replace('(?i)', '')
-            pattern = pattern[1:] if pattern.startswith('^') else pattern
-            if is_last:
-                return f'{add_on_pat}{pattern}'
+        for op, av in list(items)[::-1]:
+            if self.is_repeat(op) and av[1] == sre_parse.MAXREPEAT:
+                chars = self.get_edge(av[2], is_first=False)[0] & follow_chars
+                if chars:
+                    return chars
+            elif op is sre_parse.SUBPATTERN:
+                chars = self.get_follow_overlap(av[-1], follow_chars)
+                if chars:
+                    return chars
+            elif op is sre_parse.BRANCH:
+                for alternative in av[1]:
+                    chars = self.get_follow_overlap(alternative, follow_chars)
+                    if chars:
+                        return chars
+
+            first_chars, is_nullable = self.get_edge([(op, av)])
+            follow_chars = first_chars | follow_chars if is_nullable else first_chars
+        return set()
+
+    def check_branch(self, alternatives, is_repeated, group):
+        """check an alternation whose alternatives can match a same start"""
+        edges = [self.get_edge(alternative) for alternative in alternatives]
+        for index, (chars, is_nullable) in enumerate(edges):
+            later_edges = edges[index + 1:]
+            if is_nullable and any(later_chars for later_chars, _ in later_edges):
+                description = 'an alternative is a prefix of a later alternative'
             else:
-                pattern = pattern[:-1] if pattern.endswith('$') else pattern
-                return f'{add_on_pat}{pattern}'
-
+                overlapped = set()
+                for later_chars, _ in later_edges:
+                    overlapped |= chars & later_chars
+                if not overlapped:
+                    continue
+                description = 'alternatives can start with a same character'
+                chars = overlapped
+            level = 'exponential' if is_repeated else 'linear'
+            self.add_issue('overlapping-alternation', level, description, group, chars)
+            return
 
-class PatternBuilder(str):
-    """Use to convert a list of text to regex pattern
+    def check_sequence(self, items, group):
+        """check adjacent unbounded quantifiers which can match a same character"""
+        items = list(items)
+        for index, item in enumerate(items):
+            left_bodies = self.get_edge_repeats([item], is_first=False)
+            if not left_bodies:
+                continue
+            last_chars = set()
+            for body in left_bodies:
+                last_chars |= self.get_edge(body, is_first=False)[0]
+
+            for next_item in items[index + 1:]:
+                first_chars = set()
+                for body in self.get_edge_repeats([next_item]):
+                    first_chars |= self.get_edge(body)[0]
+                chars = last_chars & first_chars
+                if chars:
+                    description = 'adjacent unbounded quantifiers can match a same character'
+                    self.add_issue('adjacent-quantifiers', 'polynomial', description, group, chars)
+                    return
+                if not self.get_edge([next_item])[1]:
+                    break
+
+    def walk(self, items, is_repeated, group):
+        """walk parsed items and record issues"""
+        self.check_sequence(items, group)
+        for op, av in items:
+            if self.is_repeat(op) or op is POSSESSIVE_REPEAT:
+                is_unbounded = av[1] == sre_parse.MAXREPEAT
+                self.total_quantifiers += 1 if is_unbounded else 0
+                is_backtracking = is_unbounded and op is not POSSESSIVE_REPEAT
+                is_backtracking and self.check_repeat(av[2], group)
+                self.walk(av[2], is_repeated or is_backtracking, group)
+            elif op is sre_parse.SUBPATTERN:
+                index = av[0]
+                sub_group = self.group_names.get(index, index) if index else group
+                self.walk(av[-1], is_repeated, repr(sub_group) if index else group)
+            elif op is ATOMIC_GROUP:
+                self.walk(av, is_repeated, group)
+            elif op is sre_parse.BRANCH:
+                self.check_branch(av[1], is_repeated, group)
+                for alternative in av[1]:
+                    self.walk(alternative, is_repeated, group)
+            elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                self.walk(av[1], is_repeated, group)
+
+
+def analyze_pattern(pattern, flags=0):
+    """analyze a pattern for catastrophic backtracking
 
     Parameters
     ----------
-    lst_of_text (list): a list of text.
-    var_name (str): a pattern variable.
-    word_bound (str): word bound case.  Default is empty.
-            value of word_bound can be word_bound, word_bound_left,
-            or word_bound_right
+    pattern (str, dict): a pattern, e.g. LinePattern, MultilinePattern,
+            or PatternBuilder, or a REF entry, i.e. a dictionary with
+            pattern or format keys.
+    flags (int): regex flags.  Default is 0.
 
-    Methods
+    Returns
     -------
-    PatternBuilder.get_pattern(text) -> str
-    PatternBuilder.get_alnum_pattern(text) -> str
-    PatternBuilder.add_var_name(pattern, name='') -> str
+    PatternAnalysis: a complexity analysis.  Analyses of patterns of
+            a REF entry are merged into one.
 
     Raises
     ------
-    PatternBuilderError: raise an exception if pattern is invalid.
+    PatternAnalysisError: raise an exception if pattern is invalid.
     """
-    def __new__(cls, lst_of_text, var_name='', word_bound=''):
-        if not isinstance(lst_of_text, (list, tuple)):
-            lst_of_text = [lst_of_text]
+    if not isinstance(pattern, dict):
+        return PatternAnalyzer(pattern, flags=flags).analyze()
+
+    keys = [key for key in pattern if re.fullmatch(r'pattern|format\d*', key)]
+    analyses = [analyze_pattern(pattern[key], flags=flags) for key in keys]
+    return PatternAnalysis(
+        '\n'.join(str(analysis.pattern) for analysis in analyses),
+        issues=[issue for analysis in analyses for issue in analysis.issues],
+        total_quantifiers=sum(analysis.total_quantifiers for analysis in analyses)
+    )
 
-        lst = []
-        is_empty = False
-        for text in lst_of_text:
-            data = str(text)
-            if data:
-                pattern = cls.get_pattern(data)
-                pattern not in lst and lst.append(pattern)
-            else:
-                is_empty = True
 
-        is_empty and lst.append('')
-        pattern = ElementPattern.join_list(lst)
-        pattern = ElementPattern.add_word_bound(pattern, word_bound=word_bound)
-        pattern = cls.add_var_name(pattern, name=var_name)
-        validate_pattern(pattern, exception_cls=PatternBuilderError)
-        return str.__new__(cls, pattern)
+class RegexGroup:
+    """Use to store a group of a parsed pattern
 
-    @classmethod
-    def get_pattern(cls, text):
-        """convert text to regex pattern
+    Parameters
+    ----------
+    prefix (str): an opening of group, e.g. (, (?:, (?P<name>, or (?=.
+    alternatives (list): list of sequences, i.e. list of [atom, quantifier]
+            items where an atom is a text or a RegexGroup.
 
-        Parameters
-        ----------
-        text (str): a text
+    Properties
+    ----------
+    is_plain -> bool
+    is_capturing -> bool
+    is_conditional -> bool
+    """
+    def __init__(self, prefix='(?:', alternatives=None):
+        self.prefix = prefix
+        self.alternatives = alternatives if alternatives is not None else [[]]
 
-        Returns
-        -------
-        str: a regex pattern.
+    @property
+    def is_plain(self):
+        return self.prefix in ('(', '(?:')
 
-        Raises
-        ------
-        PatternBuilderError: raise an exception if pattern is invalid.
-        """
-        start = 0
-        lst = []
+    @property
+    def is_capturing(self):
+        return self.prefix == '(' or self.prefix.startswith('(?P<')
 
-        for m in re.finditer(r'[^a-zA-Z0-9]+', text):
-            before_match = text[start:m.start()]
-            lst.append(cls.get_alnum_pattern(before_match))
-            lst.append(TextPattern(m.group()))
-            start = m.end()
+    @property
+    def is_conditional(self):
+        return self.prefix.startswith('(?(')
+
+    def has_capturing_group(self):
+        """return True if group has a nested capturing group"""
+        for sequence in self.alternatives:
+            for atom, _ in sequence:
+                if isinstance(atom, RegexGroup):
+                    if atom.is_capturing or atom.has_capturing_group():
+                        return True
+        return False
+
+
+class PatternSimplifier:
+    """Use to simplify a built pattern without changing its matches
+
+    A pattern is parsed into a tree of groups, alternatives, and
+    quantified atoms, and rendered again after
+        - a redundant group is removed, e.g. ((x)) to (x), (?P<n>(a|b))
+          to (?P<n>a|b), (a)b to ab, or (\\s)+ to \\s+,
+        - adjacent whitespace quantifiers are merged if a match is the
+          same, e.g. \\s*\\s+ to \\s+, \\s+ * to \\s+, or  * * to  *,
+          but \\s* + is kept because it ends with a space,
+        - a duplicate alternative is removed, e.g. (a|b|a) to (a|b).
+    Named groups are kept.  Unnamed groups are treated as groupings,
+    so their numbers might change, unless a pattern has a backreference
+    or a conditional group.  A verbose pattern is not simplified.
+
+    Parameters
+    ----------
+    pattern (str): a pattern, e.g. LinePattern, MultilinePattern, or
+            PatternBuilder.
+    flags (int): regex flags.  Default is 0.
+
+    Methods
+    -------
+    simplify() -> str
+    parse() -> RegexGroup
+    render(group) -> str
+    """
+    anchors = ('^', '$', r'\A', r'\Z', r'\b', r'\B')
+    whitespaces = (' ', r'\s')
+    quantifier_pattern = r'([*+?]|[{]\d*(,\d*)?[}])[?+]?'
+    escape_pattern = r'\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N[{][^}]*[}]|[0-7]{1,3}|\d{1,2}|.)'
+
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self.flags = flags
+        self.text = str(pattern)
+        self.index = 0
+        self.keeps_groups = False
+
+    def simplify(self):
+        """return a simplified pattern text, or pattern text if it can not
+        be simplified, e.g. a verbose pattern"""
+        try:
+            compiled = re.compile(self.text, self.flags)
+            if compiled.flags & re.VERBOSE:
+                return self.text
+            group = self.parse()
+            self.simplify_group(group, is_top=True)
+            text = self.render(group)
+            new_compiled = re.compile(text, self.flags)
+        except (re.error, IndexError):
+            return self.text
+
+        if new_compiled.groupindex.keys() != compiled.groupindex.keys():
+            return self.text
+        return text
+
+    def parse(self):
+        """parse pattern text to a group of alternatives"""
+        self.index = 0
+        self.keeps_groups = False
+        group = self.parse_group('')
+        if self.index < len(self.text):
+            raise re.error('unbalanced parenthesis', self.text, self.index)
+        return group
+
+    def parse_group(self, prefix):
+        text = self.text
+        alternatives = [[]]
+        while self.index < len(text):
+            char = text[self.index]
+            if char == ')':
+                if not prefix:
+                    return RegexGroup(prefix, alternatives)
+                self.index += 1
+                return RegexGroup(prefix, alternatives)
+            elif char == '|':
+                self.index += 1
+                alternatives.append([])
+                continue
+            elif char in '*+?' or (char == '{' and self.match_quantifier()):
+                quantifier = self.match_quantifier()
+                sequence = alternatives[-1]
+                if not sequence or sequence[-1][1]:
+                    raise re.error('nothing to repeat', text, self.index)
+                sequence[-1][1] = quantifier
+                self.index += len(quantifier)
+                continue
+            alternatives[-1].append([self.parse_atom(), ''])
+        if prefix:
+            raise re.error('missing ), unterminated subpattern', text, self.index)
+        return RegexGroup(prefix, alternatives)
+
+    def match_quantifier(self):
+        match = re.compile(self.quantifier_pattern).match(self.text, self.index)
+        return match.group() if match else ''
+
+    def parse_atom(self):
+        text, index = self.text, self.index
+        char = text[index]
+        if char == '\\':
+            match = re.compile(self.escape_pattern, re.S).match(text, index)
+            atom = match.group()
+            if re.fullmatch(r'\\[1-9]\d?', atom):
+                self.keeps_groups = True
+        elif char == '[':
+            end = index + 1
+            end += 1 if text[end:end + 1] == '^' else 0
+            end += 1 if text[end:end + 1] == ']' else 0
+            while text[end] != ']':
+                end += 2 if text[end] == '\\' else 1
+            atom = text[index:end + 1]
+        elif char == '(':
+            return self.parse_open_parenthesis()
         else:
-            if start > 0:
-                after_match = text[start:]
-                lst.append(cls.get_alnum_pattern(after_match))
+            atom = char
+        self.index = index + len(atom)
+        return atom
 
-        pattern = ''.join(lst) if lst else cls.get_alnum_pattern(text)
-        validate_pattern(pattern, exception_cls=PatternBuilderError)
-        return pattern
+    def parse_open_parenthesis(self):
+        text, index = self.text, self.index
+        if not text.startswith('(?', index):
+            self.index = index + 1
+            return self.parse_group('(')
 
-    @classmethod
-    def get_alnum_pattern(cls, text):
-        if text:
-            if text.isdigit():
-                return '[0-9]+'
-            elif text.isalpha():
-                return '[a-zA-Z]+'
-            elif text.isalnum():
-                return '[a-zA-Z0-9]+'
+        match = re.compile(r'[(][?](P=\w+[)]|#[^)]*[)]|[aiLmsux]+[)])').match(text, index)
+        if match:
+            atom = match.group()
+            self.keeps_groups |= atom.startswith('(?P=')
+            self.index = index + len(atom)
+            return atom
+
+        pattern = r'[(][?](P<\w+>|[(]\w+[)]|[-aiLmsux]*:|[=!>]|<[=!])'
+        match = re.compile(pattern).match(text, index)
+        if not match:
+            raise re.error('unknown extension', text, index)
+        prefix = match.group()
+        self.keeps_groups |= prefix.startswith('(?(')
+        self.index = index + len(prefix)
+        return self.parse_group(prefix)
+
+    def render(self, group):
+        """render a group of alternatives to pattern text"""
+        lst = []
+        for sequence in group.alternatives:
+            items = []
+            for atom, quantifier in sequence:
+                atom = self.render(atom) if isinstance(atom, RegexGroup) else atom
+                items.append(atom + quantifier)
+            lst.append(''.join(items))
+        text = '|'.join(lst)
+        return '{}{})'.format(group.prefix, text) if group.prefix else text
+
+    def is_removable(self, group):
+        """return True if group only groups, i.e. it can be removed"""
+        if group.prefix == '(?:':
+            return True
+        return group.prefix == '(' and not self.keeps_groups
+
+    def simplify_group(self, group, is_top=False):
+        alternatives = []
+        for sequence in group.alternatives:
+            sequence = self.simplify_sequence(sequence)
+            if len(sequence) == 1 and not is_top and not group.is_conditional:
+                atom, quantifier = sequence[0]
+                if isinstance(atom, RegexGroup) and not quantifier and self.is_removable(atom):
+                    alternatives.extend(atom.alternatives)
+                    continue
+            alternatives.append(sequence)
+
+        if group.is_conditional:
+            group.alternatives = alternatives
+            return
+
+        group.alternatives = []
+        rendered_lst = []
+        for sequence in alternatives:
+            rendered = self.render(RegexGroup('', [sequence]))
+            if rendered in rendered_lst:
+                is_capturing = any(
+                    isinstance(atom, RegexGroup) and (atom.is_capturing or atom.has_capturing_group())
+                    for atom, _ in sequence
+                )
+                if not is_capturing or not self.keeps_groups:
+                    continue
+            rendered_lst.append(rendered)
+            group.alternatives.append(sequence)
+
+    def simplify_sequence(self, sequence):
+        new_sequence = []
+        for atom, quantifier in sequence:
+            if not isinstance(atom, RegexGroup):
+                new_sequence.append([atom, quantifier])
+                continue
+
+            self.simplify_group(atom)
+            if not self.is_removable(atom) or len(atom.alternatives) != 1:
+                new_sequence.append([atom, quantifier])
+                continue
+
+            items = atom.alternatives[0]
+            if not quantifier:
+                new_sequence.extend(items)
+            elif len(items) == 1 and not items[0][1] and self.is_quantifiable(items[0][0]):
+                new_sequence.append([items[0][0], quantifier])
             else:
-                return '.*'
-        else:
-            return ''
+                new_sequence.append([atom, quantifier])
+        return self.merge_whitespaces(new_sequence)
+
+    def is_quantifiable(self, atom):
+        if isinstance(atom, RegexGroup):
+            return True
+        return atom not in self.anchors and not atom.startswith('(?')
+
+    def merge_whitespaces(self, sequence):
+        new_sequence = []
+        for item in sequence:
+            if new_sequence:
+                merged_item = self.merge_items(new_sequence[-1], item)
+                if merged_item:
+                    new_sequence[-1] = merged_item
+                    continue
+            new_sequence.append(item)
+        return new_sequence
+
+    def merge_items(self, item, other):
+        """return a merged item of adjacent whitespace items, or None if
+        a merged item does not match the same text"""
+        (atom, quantifier), (other_atom, other_quantifier) = item, other
+        if atom not in self.whitespaces or other_atom not in self.whitespaces:
+            return None
+        if not quantifier and not other_quantifier:
+            return None
+        repeat, other_repeat = self.get_repeat(quantifier), self.get_repeat(other_quantifier)
+        if not repeat or not other_repeat:
+            return None
+
+        (first, last), (other_first, other_last) = repeat, other_repeat
+        if atom == other_atom:
+            new_last = None if last is None or other_last is None else last + other_last
+            return [atom, self.get_quantifier(first + other_first, new_last)]
+        if atom == ' ' and first == 0 and other_last is None:
+            return list(other)
+        if other_atom == ' ' and other_first == 0 and last is None:
+            return list(item)
+        return None
 
     @classmethod
-    def add_var_name(cls, pattern, name=''):
-        """add var name to regex pattern
+    def get_repeat(cls, quantifier):
+        """return minimum and maximum of a greedy quantifier, or None"""
+        table = {'': (1, 1), '*': (0, None), '+': (1, None), '?': (0, 1)}
+        if quantifier in table:
+            return table[quantifier]
+        match = re.fullmatch(r'[{](\d*)(,?)(\d*)[}]', quantifier)
+        if not match:
+            return None
+        first, comma, last = match.groups()
+        first = int(first or 0)
+        last = int(last) if last else None if comma else first
+        return first, last
 
-        Parameters
-        ----------
-        pattern (str): a pattern
-        name (str): a regex variable name
+    @classmethod
+    def get_quantifier(cls, first, last):
+        """return a greedy quantifier of minimum and maximum"""
+        table = {(1, 1): '', (0, None): '*', (1, None): '+', (0, 1): '?'}
+        if (first, last) in table:
+            return table[(first, last)]
+        if last is None:
+            return '{%s,}' % first
+        return '{%s}' % first if first == last else '{%s,%s}' % (first, last)
 
-        Returns
-        -------
-        str: new pattern with variable name.
-        """
-        if name:
-            new_pattern = '(?P<{}>{})'.format(name, pattern)
-            return new_pattern
+
+def simplify_pattern(pattern, flags=0):
+    """simplify a built pattern without changing its matches
+
+    Parameters
+    ----------
+    pattern (str): a pattern, e.g. LinePattern, MultilinePattern, or
+            PatternBuilder.
+    flags (int): regex flags.  Default is 0.
+
+    Returns
+    -------
+    str: a simplified pattern.  An instance of a pattern class keeps its
+            class and attributes, and its compiled pattern is recompiled.
+    """
+    text = PatternSimplifier(pattern, flags=flags).simplify()
+    if text == pattern:
         return pattern
+    if type(pattern) is str:
+        return text
+
+    new_pattern = restore_pattern(type(pattern), text)
+    new_pattern.__dict__.update(pattern.__dict__)
+    if getattr(pattern, 'compiled', None) is not None:
+        new_pattern.compiled = re.compile(text, pattern.compiled.flags)
+    return new_pattern
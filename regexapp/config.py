@@ -11,6 +11,7 @@ company details, and file paths for system and user reference data.
 Contents
 --------
 - Version and edition identifiers (`version`, `edition`).
+- `PackageText`, which formats a package version on first access.
 - The `Data` class, which encapsulates:
   * File paths for system references, symbols, and user keyword files.
   * Application metadata such as version, company information, and URLs.
@@ -26,18 +27,18 @@ Notes
 - User keyword files are automatically created and initialized with
   sample content if missing.
 - License text is read from the `LICENSE` file at module import time.
+- genericlib is not imported at module import time, so the daemon
+  client of the CLI, which only needs `version` and `Data`, starts fast.
 """
 
 from os import path
+from importlib import import_module
 
 from pathlib import Path
 from pathlib import PurePath
 
 import yaml
 
-from genericlib import version as gtlib_version
-from genericlib import File
-
 __version__ = '0.5.1a1'
 version = __version__
 __edition__ = 'Community'
@@ -50,6 +51,26 @@ __all__ = [
 ]
 
 
+class PackageText:
+    """
+    Class attribute which formats a package name and its version.
+
+    The package is imported on first access of the attribute, e.g.
+    ``Data.gtgenlib_text`` is ``genericlib v0.6.3``.
+
+    Parameters
+    ----------
+    package : str
+        A package name which has a `version` attribute.
+    """
+    def __init__(self, package):
+        self.package = package
+
+    def __get__(self, instance, owner):
+        module = import_module(self.package)
+        return f'{self.package} v{module.version}'
+
+
 class Data:
     """
     Centralized application metadata and reference management for regexapp.
@@ -72,6 +93,16 @@ class Data:
     user_reference_filename : str
         Path to the YAML file containing user-defined keyword references,
         located in the user's home directory.
+    reference_cache_dirname : str
+        Path to the directory of serialized reference tables, located
+        next to the user reference file.
+    build_cache_dirname : str
+        Path to the directory of cached build results of `RegexBuilder`.
+    daemon_socket_filename : str
+        Path to the Unix domain socket of the regexapp daemon.
+    daemon_port : int
+        Localhost TCP port of the regexapp daemon on platforms without
+        Unix domain sockets.
     app_version : str
         Current application version string.
     main_app_text : str
@@ -158,6 +189,32 @@ class Data:
             'user_references.yaml'
         )
     )
+    reference_cache_dirname = str(
+        PurePath(
+            Path.home(),
+            '.geekstrident',
+            'regexapp',
+            'cache'
+        )
+    )
+    build_cache_dirname = str(
+        PurePath(
+            Path.home(),
+            '.geekstrident',
+            'regexapp',
+            'cache',
+            'build'
+        )
+    )
+    daemon_socket_filename = str(
+        PurePath(
+            Path.home(),
+            '.geekstrident',
+            'regexapp',
+            'regexapp.sock'
+        )
+    )
+    daemon_port = 47391
 
     app_version = version
 
@@ -168,7 +225,7 @@ class Data:
     pyyaml_text = f'pyyaml v{yaml.__version__}'
     pyyaml_link = 'https://pypi.org/project/PyYAML/'
 
-    gtgenlib_text = f"genericlib v{gtlib_version}"
+    gtgenlib_text = PackageText('genericlib')
     gtgenlib_link = "https://pypi.org/project/genericlib/"
 
     # company
@@ -321,6 +378,8 @@ class Data:
           it only returns the file contents as text.
         """
 
+        from genericlib import File
+
         filename = cls.user_reference_filename
         sample_file = cls.sample_user_keywords_filename
         if not File.is_exist(filename):
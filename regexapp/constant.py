@@ -46,5 +46,7 @@ class FWTYPE:
 class FORMATTYPE:
     CSV = ICSValue('csv')
     JSON = ICSValue('json')
+    NDJSON = ICSValue('ndjson', 'jsonl')
+    TEXT = ICSValue('text', 'txt')
     YAML = ICSValue('yaml', 'yml')
     TEMPLATE = ICSValue('template')
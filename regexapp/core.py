@@ -25,6 +25,8 @@ add_reference(name: str, pattern: str, **kwargs) -> None
     quick inline testing.
 remove_reference(name: str) -> None
     Remove a keyword reference previously added inline.
+refresh_references(force: bool = False) -> bool
+    Reload user references if `user_references.yaml` has changed.
 
 Classes
 -------
@@ -54,8 +56,8 @@ PatternReferenceError
 Notes
 -----
 - The module relies on `regexapp.collection.REF` as a baseline
-  reference set, which is deep-copied into `BASELINE_REF` for
-  local use.
+  reference set. `BASELINE_REF` holds a separate copy of system and
+  user references for local use; both are loaded on first use.
 - All builders support optional metadata (author, email, company,
   filename) to embed provenance into generated test scripts.
 - Community edition keyword arguments include `prepended_ws`,
@@ -64,6 +66,10 @@ Notes
 
 
 import re
+import os
+import time
+from io import StringIO
+from collections.abc import Iterator
 from datetime import datetime
 from copy import copy, deepcopy
 from collections import OrderedDict
@@ -76,9 +82,18 @@ from regexapp.exceptions import RegexBuilderError
 from regexapp.exceptions import PatternReferenceError
 
 from regexapp.collection import REF
+from regexapp.collection import PatternReference
+from regexapp.collection import SYMBOL
+from regexapp.collection import DeferredValidation
+from regexapp.collection import IndexedList
+from regexapp.collection import PatternSet
+from regexapp.collection import BuildCache
+from regexapp.collection import analyze_pattern
+from regexapp.collection import simplify_pattern
+from regexapp.report import MatchReport
 import regexapp
 
-BASELINE_REF = deepcopy(REF)
+BASELINE_REF = PatternReference(is_lazy=True)
 
 
 def enclose_string(text):
@@ -268,16 +283,39 @@ class RegexBuilder:
 
     filename : str, optional
         File name to save the generated test script.
+    deferred_validation : bool, optional
+        If True, skip validation of intermediate fragments while building
+        and compile each final pattern only once. Default is False.
+    build_cache : bool, str, or BuildCache, optional
+        A persistent cache of build results. True uses the default cache
+        directory, a string is a cache directory. Default is None, i.e.
+        no cache.
+    check_complexity : bool, optional
+        If True, `build` analyzes every pattern and raises
+        `RegexBuilderError` if one can backtrack exponentially.
+        Default is False.
+    simplified : bool, optional
+        If True, every built pattern is simplified by `simplify_pattern`,
+        i.e. redundant groups, adjacent whitespace quantifiers, and
+        duplicate alternatives are removed. Default is False.
     kwargs : dict, optional
         Additional keyword arguments. Community edition supports:
         `prepended_ws`, `appended_ws`, `ignore_case`.
 
-    patterns : list
-        List of regex patterns generated from user data.
+    patterns : IndexedList
+        List of regex patterns generated from user data, with an O(1)
+        membership test.
     test_report : str
-        Report summarizing test execution results.
+        Report summarizing test execution results. It is rendered from
+        `match_report` on first access.
+    match_report : MatchReport
+        Structured result of the last test, i.e. per-pattern match counts,
+        matched line indices, captured groups, and timing.
     test_result : bool
         Boolean flag indicating overall test success or failure.
+    test_summary : OrderedDict
+        Counters of the last test, i.e. total and matched test data
+        entries, and match counts per pattern.
     user_data_pattern_table : OrderedDict
         Mapping of user data to generated patterns.
     pattern_user_data_table : OrderedDict
@@ -286,6 +324,13 @@ class RegexBuilder:
         Mapping of test data to generated patterns.
     pattern_test_data_table : OrderedDict
         Mapping of patterns back to test data.
+    pattern_fingerprint_table : OrderedDict
+        Mapping of fingerprints of user data entries to built patterns,
+        which `update` reuses for unchanged entries.
+    is_cached : bool
+        True if the last `build` loaded its patterns from `build_cache`.
+    analyses : list of PatternAnalysis
+        Complexity analyses of `patterns` by the last `analyze`.
 
     Methods
     -------
@@ -293,8 +338,20 @@ class RegexBuilder:
         Validate input data format for regex building.
     build() -> None
         Construct regex patterns from user and test data.
+    get_build_options() -> OrderedDict
+        Return options which affect built patterns.
+    analyze() -> list
+        Analyze built regex patterns for catastrophic backtracking.
+    build_many(list_of_user_data, **options) -> BatchResult
+        Construct regex patterns of many user data snippets in one batch.
+    update(user_data) -> int
+        Rebuild regex patterns of added or changed user data entries only.
     test(showed=True) -> bool
         Execute tests against generated patterns and return results.
+    iter_test(source=None) -> generator
+        Yield match events while reading test data incrementally.
+    test_stream(source=None, showed=False, callback=None) -> bool
+        Execute tests incrementally against a file or an iterator.
     create_unittest() -> str
         Generate a Python unittest script.
     create_pytest() -> str
@@ -307,14 +364,17 @@ class RegexBuilder:
     Raises
     ------
     RegexBuilderError
-        Raised if `user_data` or `test_data` is provided in an invalid format.
+        Raised if `user_data` or `test_data` is provided in an invalid format,
+        or if `check_complexity` is set and a pattern can backtrack
+        exponentially.
     """
     def __init__(self, user_data='', test_data='',
                  prepended_ws=False, appended_ws=False, ignore_case=False,
                  test_name='', is_line=False, is_exact=False,
                  max_words=6, test_cls_name='TestDynamicGenTestScript',
                  author='', email='', company='', filename='',
-                 **kwargs
+                 deferred_validation=False, build_cache=None,
+                 check_complexity=False, simplified=False, **kwargs
                  ):
 
         self.raw_user_data = user_data
@@ -334,18 +394,49 @@ class RegexBuilder:
         self.email = email
         self.company = company
         self.filename = filename
+        self.deferred_validation = deferred_validation
+        if build_cache is True:
+            build_cache = BuildCache()
+        elif isinstance(build_cache, str):
+            build_cache = BuildCache(dirname=build_cache)
+        self.build_cache = build_cache or None
+        self.check_complexity = check_complexity
+        self.simplified = simplified
         self.kwargs = kwargs
 
-        self.patterns = []
+        self.patterns = IndexedList()
+        self.match_report = None
         self.test_report = ''
         self.test_result = False
         self.user_data_pattern_table = OrderedDict()    # user data via pattern
         self.pattern_user_data_table = OrderedDict()    # pattern via user data
         self.test_data_pattern_table = OrderedDict()    # test data via pattern
         self.pattern_test_data_table = OrderedDict()    # pattern via test data
+        self.pattern_fingerprint_table = OrderedDict()  # pattern via fingerprint
+        self.is_cached = False
+        self.analyses = []
 
         BASELINE_REF.load_reference(BASELINE_REF.user_ref_loc, is_warning=False)
 
+    @property
+    def test_report(self):
+        if self._test_report is None:
+            report = self.match_report
+            self._test_report = report.render() if report else ''
+        return self._test_report
+
+    @test_report.setter
+    def test_report(self, value):
+        self._test_report = value
+
+    @property
+    def test_summary(self):
+        report = self.match_report
+        if not report:
+            return OrderedDict()
+        counts = [pattern.count for pattern in report.patterns]
+        return OrderedDict(total=report.total, matched=report.matched, counts=counts)
+
     @classmethod
     def validate_data(cls, **kwargs):
         """
@@ -409,7 +500,8 @@ class RegexBuilder:
         1. Validate `user_data` using `validate_data`.
         2. If `user_data` is empty, record a failure message in
            `self.test_report` and return early.
-        3. Normalize `user_data` into a list of strings:
+        3. Normalize `user_data` into a list of strings
+           (`get_lst_of_user_data`):
            - If `is_line` is True: split into lines or copy list/tuple.
            - If `is_line` is False: wrap strings in a list, or join
              nested lists/tuples into multi-line strings.
@@ -417,9 +509,17 @@ class RegexBuilder:
            - `LinePattern`: respects `prepended_ws`, `appended_ws`,
              and `ignore_case`.
            - `MultilinePattern`: respects `ignore_case` and `is_exact`.
+           - If `simplified` is set, a pattern is simplified by
+             `simplify_pattern`.
         5. Append new patterns to `self.patterns` and update mapping
            tables (`user_data_pattern_table`, `pattern_user_data_table`).
 
+        If `build_cache` is set, steps 4 and 5 replay a cached result of
+        an identical build, i.e. same user data, build options, regexapp
+        version, and pattern references, and a new result is saved.
+        If `check_complexity` is set, built patterns are analyzed by
+        `analyze`.
+
         Returns
         -------
         None
@@ -430,6 +530,8 @@ class RegexBuilder:
         ------
         RegexBuilderError
             If `user_data` fails validation (not a string or list of strings).
+            If `check_complexity` is set and a pattern can backtrack
+            exponentially.
 
         Side Effects
         ------------
@@ -446,39 +548,307 @@ class RegexBuilder:
             print(self.test_report)
             return
 
+        lst_of_user_data = self.get_lst_of_user_data()
+
+        cache = self.build_cache
+        key = cache.get_key(data, **self.get_build_options()) if cache else ''
+        entries = cache.load(key) if cache else None
+        self.is_cached = entries is not None
+        if self.is_cached:
+            for user_data, pattern in entries:
+                self.pattern_fingerprint_table[self.get_fingerprint(user_data)] = pattern
+                self.add_pattern(user_data, pattern)
+        else:
+            entries = []
+            with DeferredValidation(enabled=self.deferred_validation):
+                for user_data in lst_of_user_data:
+                    pattern = self.build_pattern(user_data)
+                    entries.append((user_data, pattern))
+                    self.add_pattern(user_data, pattern)
+            cache and cache.save(key, entries)
+
+        self.check_complexity and self.check_pattern_complexity()
+
+    def analyze(self):
+        """
+        Analyze built regex patterns for catastrophic backtracking.
+
+        Returns
+        -------
+        list of PatternAnalysis
+            A complexity analysis per pattern, in order of `patterns`.
+            It is also stored in `analyses`.
+        """
+        self.analyses = [analyze_pattern(pattern) for pattern in self.patterns]
+        return self.analyses
+
+    def check_pattern_complexity(self):
+        """
+        Verify that no built regex pattern can backtrack exponentially.
+
+        Raises
+        ------
+        RegexBuilderError
+            If a pattern has an exponential complexity, e.g. nested
+            unbounded quantifiers. The message includes its analysis.
+        """
+        unsafe_analyses = [analysis for analysis in self.analyze() if not analysis.is_safe]
+        if unsafe_analyses:
+            reports = '\n'.join(analysis.get_report() for analysis in unsafe_analyses)
+            msg = 'Pattern can backtrack exponentially:\n{}'.format(reports)
+            raise RegexBuilderError(msg)
+
+    def get_build_options(self):
+        """
+        Return options which affect built patterns.
+
+        Returns
+        -------
+        OrderedDict
+            `is_line`, `prepended_ws`, `appended_ws`, `ignore_case`,
+            `is_exact`, and `simplified`.
+        """
+        options = OrderedDict(
+            is_line=self.is_line, prepended_ws=self.prepended_ws,
+            appended_ws=self.appended_ws, ignore_case=self.ignore_case,
+            is_exact=self.is_exact, simplified=self.simplified
+        )
+        return options
+
+    def update(self, user_data):
+        """
+        Rebuild regex patterns after `user_data` changes.
+
+        Only entries which are added or changed since the previous build
+        are converted.  Patterns of unchanged entries are reused from
+        `pattern_fingerprint_table`, so the result is identical to a full
+        rebuild of a new builder with the same `user_data`.
+
+        Parameters
+        ----------
+        user_data : str or list of str
+            New user data.
+
+        Returns
+        -------
+        int
+            Number of entries which were converted.
+
+        Raises
+        ------
+        RegexBuilderError
+            If `user_data` fails validation (not a string or list of strings).
+            If `check_complexity` is set and a pattern can backtrack
+            exponentially.
+
+        Side Effects
+        ------------
+        - Replaces `self.user_data`.
+        - Refreshes `self.patterns` and mapping tables in place.
+        - Drops fingerprints of entries which no longer exist.
+        """
+        self.__class__.validate_data(user_data=user_data)    # noqa
+        self.user_data = user_data
+
+        self.patterns.clear()
+        self.user_data_pattern_table.clear()
+        self.pattern_user_data_table.clear()
+
+        if not user_data:
+            self.pattern_fingerprint_table.clear()
+            self.test_report = 'CANT build regex pattern with an empty data.'
+            print(self.test_report)
+            return 0
+
+        fingerprint_table = self.pattern_fingerprint_table
+        self.pattern_fingerprint_table = OrderedDict()
+        total = 0
+        with DeferredValidation(enabled=self.deferred_validation):
+            for data in self.get_lst_of_user_data():
+                fingerprint = self.get_fingerprint(data)
+                pattern = fingerprint_table.get(fingerprint)
+                if pattern is None:
+                    pattern = self.build_pattern(data)
+                    total += 1
+                self.pattern_fingerprint_table[fingerprint] = pattern
+                self.add_pattern(data, pattern)
+
+        self.check_complexity and self.check_pattern_complexity()
+        return total
+
+    def get_fingerprint(self, user_data):
+        """
+        Return a fingerprint of an entry of user data.
+
+        Parameters
+        ----------
+        user_data : str
+            An entry of user data.
+
+        Returns
+        -------
+        tuple
+            Entry text together with build options and versions of
+            pattern references, so a change of any of them is a miss.
+        """
+        fingerprint = (
+            user_data, self.is_line, self.prepended_ws, self.appended_ws,
+            self.ignore_case, self.is_exact, self.simplified,
+            REF.version, SYMBOL.version
+        )
+        return fingerprint
+
+    def build_pattern(self, user_data):
+        """
+        Build a regex pattern of an entry of user data.
+
+        Parameters
+        ----------
+        user_data : str
+            An entry of user data.
+
+        Returns
+        -------
+        LinePattern or MultilinePattern
+            A pattern which is recorded in `pattern_fingerprint_table`.
+        """
         if self.is_line:
-            lst_of_user_data = data[:] if isinstance(data, (list, tuple)) else data.splitlines()
+            pattern = LinePattern(
+                user_data,
+                prepended_ws=self.prepended_ws,
+                appended_ws=self.appended_ws,
+                ignore_case=self.ignore_case
+            )
         else:
-            if isinstance(data, str):
-                lst_of_user_data = [data]
+            pattern = MultilinePattern(
+                user_data,
+                ignore_case=self.ignore_case,
+                is_exact=self.is_exact
+            )
+        if self.simplified:
+            pattern = simplify_pattern(pattern)
+        self.pattern_fingerprint_table[self.get_fingerprint(user_data)] = pattern
+        return pattern
+
+    def get_lst_of_user_data(self):
+        """
+        Normalize `user_data` into a list of strings.
+
+        Returns
+        -------
+        list of str
+            Lines of user data if `is_line` is True. Otherwise, a list
+            of multi-line user data, i.e. nested lists/tuples are joined.
+        """
+        data = self.user_data
+        if self.is_line:
+            return data[:] if isinstance(data, (list, tuple)) else data.splitlines()
+
+        if isinstance(data, str):
+            return [data]
+
+        lst_of_user_data = []
+        for item in data:
+            if isinstance(item, (list, tuple)):
+                lst_of_user_data.append('\n'.join(map(str, item)))
             else:
-                lst_of_user_data = []
-                for item in data:
-                    if isinstance(item, (list, tuple)):
-                        lst_of_user_data.append('\n'.join(map(str, item)))
-                    else:
-                        lst_of_user_data.append(str(item))
+                lst_of_user_data.append(str(item))
+        return lst_of_user_data
 
-        for user_data in lst_of_user_data:
-            if self.is_line:
-                pattern = LinePattern(
-                    user_data,
-                    prepended_ws=self.prepended_ws,
-                    appended_ws=self.appended_ws,
-                    ignore_case=self.ignore_case
+    def add_pattern(self, user_data, pattern):
+        """
+        Record a pattern which is built from user data.
+
+        Parameters
+        ----------
+        user_data : str
+            An entry of user data.
+        pattern : LinePattern or MultilinePattern
+            A pattern which is built from `user_data`.
+        """
+        pattern not in self.patterns and self.patterns.append(pattern)
+        self.user_data_pattern_table[user_data] = pattern
+        self.pattern_user_data_table[pattern] = user_data
+
+    @classmethod
+    def build_many(cls, list_of_user_data, **options):
+        """
+        Build regex patterns of many user data snippets in one batch.
+
+        Identical entries across all snippets, e.g. repeated banners,
+        separators, or blank lines, and identical element snippets are
+        converted once, then fanned back out to a builder per snippet.
+        Every builder ends up in the same state as if its `build` ran.
+
+        Parameters
+        ----------
+        list_of_user_data : list
+            User data snippets, each one a string or a list of strings.
+        **options : dict
+            Keyword arguments of `RegexBuilder`, e.g. `is_line`,
+            `prepended_ws`, `ignore_case`, or `deferred_validation`.
+
+        Returns
+        -------
+        BatchResult
+            A built `RegexBuilder` per snippet in `results`, in order of
+            `list_of_user_data`, together with batch statistics, i.e.
+            total and unique entries, unique ratio, and time per phase.
+
+        Raises
+        ------
+        RegexBuilderError
+            If a snippet is not a string or list of strings.
+            If `check_complexity` is set and a pattern can backtrack
+            exponentially.
+        """
+        builders = [cls(user_data=user_data, **options) for user_data in list_of_user_data]
+        factory = builders[0] if builders else cls(**options)
+
+        lst_of_entries = []
+        for builder in builders:
+            cls.validate_data(user_data=builder.user_data)
+            if builder.user_data:
+                lst_of_entries.append((builder, builder.get_lst_of_user_data()))
+            else:
+                builder.build()
+
+        lst_of_text = [text for _, lst in lst_of_entries for text in lst]
+        with DeferredValidation(enabled=factory.deferred_validation):
+            if factory.is_line:
+                batch = LinePattern.build_batch(
+                    lst_of_text,
+                    prepended_ws=factory.prepended_ws,
+                    appended_ws=factory.appended_ws,
+                    ignore_case=factory.ignore_case
                 )
             else:
-                pattern = MultilinePattern(
-                    user_data,
-                    ignore_case=self.ignore_case,
-                    is_exact=self.is_exact
+                batch = MultilinePattern.build_batch(
+                    lst_of_text,
+                    ignore_case=factory.ignore_case,
+                    is_exact=factory.is_exact
                 )
 
-            pattern not in self.patterns and self.patterns.append(pattern)
-            self.user_data_pattern_table[user_data] = pattern
-            self.pattern_user_data_table[pattern] = user_data
-
-    def test(self, showed=False):
+        start = time.perf_counter()
+        patterns = iter(batch.results)
+        simplified_patterns = dict()
+        for builder, lst in lst_of_entries:
+            for user_data in lst:
+                pattern = next(patterns)
+                if factory.simplified:
+                    if pattern not in simplified_patterns:
+                        simplified_patterns[pattern] = simplify_pattern(pattern)
+                    pattern = simplified_patterns[pattern]
+                builder.pattern_fingerprint_table[builder.get_fingerprint(user_data)] = pattern
+                builder.add_pattern(user_data, pattern)
+        batch.results = builders
+        batch.timings['fanout'] += time.perf_counter() - start
+
+        for builder, _ in lst_of_entries:
+            builder.check_complexity and builder.check_pattern_complexity()
+        return batch
+
+    def test(self, showed=False, workers=1):
         """
         Execute regex pattern tests against provided test data.
 
@@ -492,6 +862,10 @@ class RegexBuilder:
         showed : bool, optional
             If True, print the generated test report to stdout.
             Default is False.
+        workers : int, optional
+            Number of worker processes which test data is sharded across.
+            Default is 1, i.e. test runs in current process. None uses
+            every processor.
 
         Returns
         -------
@@ -504,6 +878,12 @@ class RegexBuilder:
         RegexBuilderError
             If `test_data` is invalid (not a string or list of strings).
 
+        Notes
+        -----
+        - If `test_data` is a path-like object, a file object, or an
+          iterator of lines, the test is delegated to `test_stream`,
+          which runs in current process.
+
         Workflow
         --------
         1. Validate `test_data` using `validate_data`.
@@ -513,26 +893,32 @@ class RegexBuilder:
            - If `is_line` is True: split into lines or copy list/tuple.
            - Otherwise: wrap strings in a list, or join nested lists/tuples
              into multi-line strings.
-        4. For each regex pattern in `self.patterns`:
-           - Attempt to match against each test data entry.
-           - Record matches, including any named groups.
-           - Update mapping tables (`test_data_pattern_table`,
-             `pattern_test_data_table`).
-           - Append results to the report.
-        5. Store overall success/failure in `self.test_result` and
-           formatted report in `self.test_report`.
+        4. Scan test data once with a `PatternSet` of `self.patterns`,
+           recording every match, including any named groups, in a
+           `MatchReport`.  With `workers`, chunks of test data are
+           scanned in a process pool and merged in order of test data.
+        5. For each regex pattern in `self.patterns`, update mapping
+           tables (`test_data_pattern_table`, `pattern_test_data_table`)
+           in order of test data.
+        6. Store overall success/failure in `self.test_result` and
+           structured result in `self.match_report`.
 
         Side Effects
         ------------
         - Updates `self.test_result` with overall pass/fail status.
-        - Updates `self.test_report` with a detailed report string.
+        - Updates `self.match_report`; `self.test_report` is rendered
+          from it on first access.
         - Populates mapping tables for test data ↔ pattern relationships.
         - Optionally prints the report if `showed=True`.
         """
         data = self.test_data
+        if self.is_stream_source(data):
+            return self.test_stream(data, showed=showed)
+
         self.__class__.validate_data(test_data=data)    # noqa
 
         if not data:
+            self.match_report = None
             self.test_report = 'CANT run test with an empty data.'
             showed and print(self.test_report)
             return False
@@ -550,32 +936,166 @@ class RegexBuilder:
                     else:
                         lst_of_test_data.append(str(item))
 
-        result = ['Test Data:', '-' * 9, '\n'.join(lst_of_test_data), '']
-        result += ['Matched Result:', '-' * 14]
-
-        test_result = True
-        for pat in self.patterns:
-            is_matched = False
-            lst = []
-            for test_data in lst_of_test_data:
-                match = re.search(pat, test_data)
-                if match:
-                    is_matched = True
-                    match.groupdict() and lst.append(match.groupdict())
-                    self.test_data_pattern_table[test_data] = pat
-                    self.pattern_test_data_table[pat] = test_data
-
-            test_result &= is_matched
-            tr = 'NO' if not is_matched else lst if lst else 'YES'
-            result.append('pattern: {}'.format(pat))
-            result.append('matched: {}'.format(tr))
-            result.append('-' * 10)
-
-        self.test_result = test_result
-        self.test_report = '\n'.join(result)
+        pattern_set = PatternSet.from_builder(self)
+        report = MatchReport.from_pattern_set(pattern_set, test_data=lst_of_test_data)
+        if workers == 1:
+            for line_index, test_data in enumerate(lst_of_test_data):
+                matches = pattern_set.match_all(test_data)
+                for item in matches:
+                    item.line_index = line_index
+                report.add_entry(matches)
+        else:
+            records = pattern_set.iter_records(lst_of_test_data, workers=workers)
+            for line_index, lst in records:
+                report.add_records(line_index, lst)
+        report.finish()
+
+        for pattern_report in report.patterns:
+            pat = pattern_report.pattern
+            for line_index in pattern_report.line_indices:
+                test_data = lst_of_test_data[line_index]
+                self.test_data_pattern_table[test_data] = pat
+                self.pattern_test_data_table[pat] = test_data
+
+        self.match_report = report
+        self.test_result = report.result
+        self.test_report = None
         showed and print(self.test_report)
 
-        return test_result
+        return self.test_result
+
+    @classmethod
+    def is_stream_source(cls, data):
+        """
+        Check if test data should be consumed incrementally.
+
+        Parameters
+        ----------
+        data : any
+            Test data.
+
+        Returns
+        -------
+        bool
+            True if `data` is a path-like object, a file object,
+            or an iterator, False otherwise.
+        """
+        is_file = hasattr(data, 'read')
+        return isinstance(data, (os.PathLike, Iterator)) or is_file
+
+    def iter_test_data(self, source):
+        """
+        Iterate test data entries from a source without loading it at once.
+
+        Parameters
+        ----------
+        source : str, os.PathLike, file object, or iterable
+            A file path, a file object, or an iterable of lines.
+
+        Yields
+        ------
+        str
+            A test data entry. If `is_line` is True, each line of source
+            without its line break. Otherwise, each item of an iterable,
+            or a whole content of a file.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source) as stream:
+                yield from self.iter_test_data(stream)
+            return
+
+        if hasattr(source, 'read') and not self.is_line:
+            yield source.read()
+            return
+
+        for item in source:
+            if self.is_line:
+                yield str(item).rstrip('\r\n')
+            elif isinstance(item, (list, tuple)):
+                yield '\n'.join(map(str, item))
+            else:
+                yield str(item)
+
+    def iter_test(self, source=None):
+        """
+        Test patterns incrementally and yield a match event per line.
+
+        Test data is read entry by entry, so memory usage does not grow
+        with size of test data. Only per-pattern counters are kept in
+        `self.match_report`, and mapping tables are not populated.
+
+        Parameters
+        ----------
+        source : str, os.PathLike, file object, or iterable, optional
+            A file path, a file object, or an iterable of lines.
+            Default is None, i.e. `test_data` of builder, where a string
+            is a test data text as in `test`.
+
+        Yields
+        ------
+        PatternMatch
+            A match of a pattern with `line_index` of test data entry,
+            in order of test data, then in order of pattern.
+
+        Side Effects
+        ------------
+        - Updates `self.match_report` while iterating.
+        - Sets `self.test_result` when iteration is exhausted.
+        """
+        if source is None:
+            source = self.test_data
+            source = StringIO(source) if isinstance(source, str) else source
+
+        pattern_set = PatternSet.from_builder(self)
+        report = MatchReport.from_pattern_set(pattern_set)
+        self.match_report = report
+        self.test_report = None
+
+        for line_index, test_data in enumerate(self.iter_test_data(source)):
+            matches = pattern_set.match_all(test_data)
+            for item in matches:
+                item.line_index = line_index
+            report.add_entry(matches)
+            yield from matches
+        report.finish()
+
+        if not report.total:
+            self.test_result = False
+            self.test_report = 'CANT run test with an empty data.'
+            return
+
+        self.test_result = report.result
+
+    def test_stream(self, source=None, showed=False, callback=None):
+        """
+        Execute regex pattern tests against test data incrementally.
+
+        Parameters
+        ----------
+        source : str, os.PathLike, file object, or iterable, optional
+            A file path, a file object, or an iterable of lines.
+            Default is None, i.e. `test_data` of builder.
+        showed : bool, optional
+            If True, print every match event and the summary report.
+            Default is False.
+        callback : callable, optional
+            A callable which is invoked with every `PatternMatch` event.
+
+        Returns
+        -------
+        bool
+            True if every pattern matched at least one test data entry,
+            False otherwise.
+        """
+        for event in self.iter_test(source):
+            callback and callback(event)
+            if showed:
+                result = event.groupdict or event.match.group()
+                fmt = 'line {}: pattern {}: {}'
+                print(fmt.format(event.line_index + 1, event.entry.index + 1, result))
+
+        showed and print(self.test_report)
+        return self.test_result
 
     def create_unittest(self):
         """
@@ -730,6 +1250,7 @@ def add_reference(name='', pattern='', **kwargs):
             for key, value in kwargs.items():
                 if re.match(r'format\d+$', key):
                     REF['datetime'][key] = value
+            REF.mark_modified()
         else:
             if name not in BASELINE_REF:
                 REF[name] = obj
@@ -739,6 +1260,41 @@ def add_reference(name='', pattern='', **kwargs):
                 raise PatternReferenceError(fmt.format(name))
 
 
+def refresh_references(force=False):
+    """
+    Reload user references if `user_references.yaml` has changed.
+
+    The file is checked by modification time and size, then by content
+    hash, so an unchanged file is neither read nor parsed.  Keywords
+    which a previous content added are replaced by keywords of a new
+    content in both `REF` and `BASELINE_REF`.
+
+    Parameters
+    ----------
+    force : bool, optional
+        If True, parse the file even if it is unchanged.
+        Default is False.
+
+    Returns
+    -------
+    bool
+        True if user references are reloaded.
+
+    Raises
+    ------
+    PatternReferenceError
+        If the file has an invalid format.
+
+    Notes
+    -----
+    - `REF.reload_count` and `BASELINE_REF.reload_count` count how many
+      reloads actually happened.
+    """
+    is_reloaded = REF.load_reference(REF.user_ref_loc, is_warning=False, force=force)
+    BASELINE_REF.load_reference(BASELINE_REF.user_ref_loc, is_warning=False, force=force)
+    return is_reloaded
+
+
 def remove_reference(name=''):
     """
     Remove a keyword reference from the PatternReference collection.
@@ -1715,9 +2271,10 @@ class PythonSnippetBuilder:
                 pattern (str): a regular expression pattern
                 """
                 print("Pattern: {{}}".format(pattern))
+                regex = re.compile(pattern)
                 is_matched = False
                 for index, line in enumerate(test_data.splitlines(), 1):
-                    match = re.search(pattern, line)
+                    match = regex.search(line)
                     if match:
                         is_matched = True
                         if match.groupdict():
@@ -1775,9 +2332,10 @@ class PythonSnippetBuilder:
                 """
             
                 for pattern in patterns:
+                    regex = re.compile(pattern)
                     is_matched = False
                     for line in test_data.splitlines():
-                        match = re.search(pattern, line)
+                        match = regex.search(line)
                         if match:
                             is_matched = True
                             print("Pattern: {{}}".format(pattern))
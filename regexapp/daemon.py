@@ -0,0 +1,301 @@
+"""
+regexapp.daemon
+===============
+Local daemon mode for the regexapp command-line interface.
+
+A daemon keeps `REF` and `SYMBOL` loaded and answers build, test, and
+script requests, so a pipeline which runs `regexapp` many times pays for
+interpreter startup, module import, and reference loading once.  The
+`Cli` class forwards a request to a running daemon, and falls back to
+processing it locally if no daemon is available.
+
+Contents
+--------
+Functions
+---------
+process_request(request) -> tuple
+    Process a CLI request and return an exit code and an output.
+
+Classes
+-------
+RegexDaemon
+    Serve CLI requests over a Unix domain socket or localhost TCP.
+
+Exceptions
+----------
+DaemonError
+    Raised if a daemon cannot serve, e.g. it is already running.
+
+Notes
+-----
+- A request and a response are JSON documents on a single line, e.g.
+  ``{"command": "build", "user_data": "...", "kwargs": {}}`` and
+  ``{"status": 0, "output": "pattern = r\\"...\\""}``.
+- A Unix domain socket is only accessible by its owner.  On platforms
+  without Unix domain sockets, a daemon listens on ``127.0.0.1`` only.
+- A daemon serves requests of clients with the same regexapp version,
+  and reloads `user_references.yaml` before a request if it changed.
+- `DaemonClient`, `parse_address`, and `get_default_address` live in
+  `regexapp.client` and are re-exported here.
+- A daemon only accepts pattern and test script options in `kwargs`.
+  A request which names a file, e.g. a build cache directory or a test
+  script file name, is rejected, so the client processes it locally.
+"""
+
+import os
+import json
+import socket
+import socketserver
+import threading
+
+from regexapp import RegexBuilder
+from regexapp.client import DaemonClient
+from regexapp.client import get_default_address
+from regexapp.client import parse_address
+from regexapp.core import enclose_string
+from regexapp.core import refresh_references
+from regexapp.config import version
+from regexapp.exceptions import DaemonError
+
+from genericlib import ECODE
+
+
+def process_request(request):
+    """
+    Process a CLI request and return an exit code and an output.
+
+    Parameters
+    ----------
+    request : dict
+        A request with `command`, i.e. build, test, script, or analyze,
+        `user_data`, `test_data`, `platform`, `jobs`, and `kwargs`
+        of `RegexBuilder`.
+
+    Returns
+    -------
+    tuple
+        An exit code and a text which the CLI prints.
+    """
+    command = request.get('command', 'build')
+    user_data = request.get('user_data', '')
+    kwargs = dict(request.get('kwargs') or dict())
+
+    try:
+        if command == 'test':
+            factory = RegexBuilder(
+                user_data=user_data, test_data=request.get('test_data', ''), **kwargs
+            )
+            factory.build()
+            test_result = factory.test(workers=request.get('jobs', 1) or None)
+            return ECODE.SUCCESS, '{}\n{}'.format(factory.test_report, test_result)
+
+        platform = request.get('platform', '').lower()
+        if command == 'script' and platform:
+            tbl = dict(unittest='create_unittest', pytest='create_pytest')
+            method_name = tbl.get(platform, 'create_python_test')
+            factory = RegexBuilder(
+                user_data=user_data, test_data=request.get('test_data', ''), **kwargs
+            )
+            factory.build()
+            test_script = getattr(factory, method_name)()
+            return ECODE.SUCCESS, '\n{}\n'.format(test_script)
+
+        factory = RegexBuilder(user_data=user_data, **kwargs)
+        factory.build()
+        if command == 'analyze':
+            analyses = factory.analyze()
+            output = '\n\n'.join(analysis.get_report() for analysis in analyses)
+            is_safe = all(analysis.is_safe for analysis in analyses)
+            return ECODE.SUCCESS if is_safe else ECODE.BAD, output
+    except Exception as ex:
+        return ECODE.BAD, '*** {}: {}'.format(type(ex).__name__, ex)
+
+    patterns = factory.patterns
+    if not patterns:
+        fmt = '*** CANT generate regex pattern from\n{}'
+        return ECODE.BAD, fmt.format(user_data)
+
+    if len(patterns) == 1:
+        return ECODE.SUCCESS, 'pattern = r{}'.format(enclose_string(patterns[0]))
+
+    fmt = 'pattern{} = r{}'
+    lst = [fmt.format(index, enclose_string(pattern)) for index, pattern in enumerate(patterns, 1)]
+    return ECODE.SUCCESS, '\n'.join(lst)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handle requests of a connection, one JSON document per line."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line.decode('utf-8'))
+                if not isinstance(request, dict):
+                    raise ValueError('request must be a JSON object')
+            except ValueError as ex:
+                response = dict(status=int(ECODE.BAD), error='INVALID-REQUEST - {}'.format(ex))
+            else:
+                response = self.server.regex_daemon.serve_request(request)
+            data = json.dumps(response) + '\n'
+            self.wfile.write(data.encode('utf-8'))
+            self.wfile.flush()
+
+
+class RegexDaemon:
+    """
+    Serve CLI requests over a Unix domain socket or localhost TCP.
+
+    Attributes
+    ----------
+    address : str
+        A Unix domain socket file name, or ``host:port`` for TCP.
+    family : int
+        A socket family.
+    server : socketserver.BaseServer
+        A listening server, or None before `start`.
+    total : int
+        Number of served requests.
+
+    Methods
+    -------
+    start() -> None
+    serve_forever() -> None
+    shutdown() -> None
+    serve_request(request) -> dict
+    validate_request(request) -> str
+
+    Raises
+    ------
+    DaemonError
+        Raised if a daemon already listens on `address`.
+    """
+    allowed_kwargs = (
+        'prepended_ws', 'appended_ws', 'ignore_case', 'is_line', 'is_exact',
+        'test_name', 'max_words', 'test_cls_name', 'author', 'email', 'company',
+        'deferred_validation', 'build_cache', 'check_complexity', 'simplified',
+    )
+
+    def __init__(self, address=''):
+        self.family, self.socket_address = parse_address(address)
+        self.address = address or get_default_address()
+        self.server = None
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Bind and listen on `address`."""
+        if self.family == socket.AF_UNIX:
+            sock = DaemonClient(self.address).connect()
+            if sock:
+                sock.close()
+                msg = 'regexapp daemon is already running at {}'.format(self.address)
+                raise DaemonError(msg)
+            os.path.exists(self.socket_address) and os.remove(self.socket_address)
+            os.makedirs(os.path.dirname(self.socket_address) or '.', exist_ok=True)
+            server_cls = socketserver.ThreadingUnixStreamServer
+        else:
+            server_cls = socketserver.ThreadingTCPServer
+
+        server = server_cls(self.socket_address, RequestHandler, bind_and_activate=False)
+        try:
+            server.allow_reuse_address = True
+            server.server_bind()
+            if self.family == socket.AF_UNIX:
+                os.chmod(self.socket_address, 0o600)
+            server.server_activate()
+        except OSError as ex:
+            server.server_close()
+            raise DaemonError('CANT listen on {} - {}'.format(self.address, ex))
+
+        server.daemon_threads = True
+        server.regex_daemon = self
+        self.server = server
+        if self.family == socket.AF_INET:
+            self.address = '{}:{}'.format(*server.server_address[:2])
+
+    def serve_forever(self):
+        """Serve requests until `shutdown` is called."""
+        self.server or self.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if self.family == socket.AF_UNIX and os.path.exists(self.socket_address):
+                os.remove(self.socket_address)
+
+    def shutdown(self):
+        """Stop `serve_forever` from another thread."""
+        self.server and self.server.shutdown()
+
+    def serve_request(self, request):
+        """
+        Serve a request.
+
+        Parameters
+        ----------
+        request : dict
+            A request of `DaemonClient`.  `command` ping returns the
+            daemon version, and shutdown stops the daemon.
+
+        Returns
+        -------
+        dict
+            A response with `status` and `output`, or `error` if a
+            request is rejected.
+        """
+        if request.get('version') != version:
+            fmt = 'VERSION-MISMATCH - daemon {} vs client {}'
+            return dict(status=int(ECODE.BAD), error=fmt.format(version, request.get('version')))
+
+        error = self.validate_request(request)
+        if error:
+            return dict(status=int(ECODE.BAD), error=error)
+
+        command = request.get('command')
+        if command == 'ping':
+            return dict(status=int(ECODE.SUCCESS), output='', version=version)
+
+        if command == 'shutdown':
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return dict(status=int(ECODE.SUCCESS), output='')
+
+        with self._lock:
+            self.total += 1
+            try:
+                refresh_references()
+            except Exception as ex:
+                output = '*** {}: {}'.format(type(ex).__name__, ex)
+                return dict(status=int(ECODE.BAD), output=output)
+            status, output = process_request(request)
+        return dict(status=int(status), output=output)
+
+    def validate_request(self, request):
+        """
+        Validate `kwargs` of a request.
+
+        Parameters
+        ----------
+        request : dict
+            A request of `DaemonClient`.
+
+        Returns
+        -------
+        str
+            An error message if `kwargs` has an option which is not in
+            `allowed_kwargs`, or `build_cache` is not True, i.e. a cache
+            directory which a daemon would resolve and unpickle on behalf
+            of a client.  Otherwise, an empty string.
+        """
+        kwargs = request.get('kwargs') or dict()
+        if not isinstance(kwargs, dict):
+            return 'INVALID-REQUEST - kwargs must be a dictionary'
+
+        disallowed = sorted(str(key) for key in kwargs if key not in self.allowed_kwargs)
+        if disallowed:
+            return 'INVALID-REQUEST - unsupported option(s): {}'.format(', '.join(disallowed))
+
+        if kwargs.get('build_cache') not in (None, False, True):
+            return 'INVALID-REQUEST - build_cache directory is not accepted'
+        return ''
@@ -43,10 +43,26 @@ class PatternBuilderError(PatternError):
     """Raised when errors occur during pattern building operations."""
 
 
+class PatternSetError(PatternError):
+    """Raised when a PatternSet instance fails to compile its patterns."""
+
+
+class PatternAnalysisError(PatternError):
+    """Raised when a pattern cannot be parsed for complexity analysis."""
+
+
 class RegexBuilderError(Exception):
     """Raised when the RegexBuilder class encounters an error."""
 
 
+class MatchReportError(Exception):
+    """Raised when a MatchReport instance cannot be rendered."""
+
+
+class DaemonError(Exception):
+    """Raised when the regexapp daemon cannot serve or be reached."""
+
+
 class NoUserDataError(Exception):
     """Raised when required user data is missing or not provided."""
 
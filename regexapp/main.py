@@ -4,22 +4,42 @@ Entry-point logic for the regexapp project.
 This module provides the command-line interface (CLI) and GUI entry
 points for regexapp. It defines helper functions and the `Cli` class
 to parse arguments, validate user input, build regex patterns, generate
-test scripts, run tests, and display dependency information.
+test scripts, run tests, and display dependency information. Requests
+are forwarded to a running regexapp daemon (`regexapp --serve`) when
+one is available.  Pattern conversion modules and genericlib are only
+imported if a request is processed locally, so a forwarded request does
+not pay for importing them.
 
 The entry-points are designed to support both interactive GUI usage
 and automated CLI workflows, ensuring flexibility for developers and
 end users.
 """
 
+import os
 import sys
 import argparse
 import re
 import yaml
-from regexapp.application import Application
-from regexapp import RegexBuilder
-from regexapp.core import enclose_string
+from regexapp.client import DaemonClient
 
-from genericlib import ECODE
+
+def exit_with_failure(failure=''):
+    """
+    Print a failure message and exit with ``ECODE.BAD``.
+
+    Parameters
+    ----------
+    failure : str, optional
+        A failure message. Nothing is printed if it is empty.
+
+    Notes
+    -----
+    - genericlib is imported only on exit paths, so a request which is
+      forwarded to a daemon does not pay for importing it.
+    """
+    from genericlib import ECODE
+    failure and print(failure)
+    sys.exit(ECODE.BAD)
 
 
 def run_gui_application(options):
@@ -36,13 +56,56 @@ def run_gui_application(options):
     None
         Invokes ``Application().run()`` and exits with
         ``ECODE.SUCCESS`` if `--gui` is specified.
+
+    Notes
+    -----
+    - The GUI module and tkinter are imported only here, so other
+      commands start fast and run on headless servers.
     """
     if options.gui:
+        from genericlib import ECODE
+        from regexapp.application import Application
         app = Application()
         app.run()
         sys.exit(ECODE.SUCCESS)
 
 
+def run_daemon(options):
+    """
+    Serve CLI requests as a regexapp daemon if requested.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Parsed command-line options. Must contain the `serve` flag and
+        the `socket` address.
+
+    Returns
+    -------
+    None
+        Serves requests until the daemon is stopped, then exits with
+        ``ECODE.SUCCESS`` if `--serve` is specified. Exits with
+        ``ECODE.BAD`` if the daemon cannot listen on its address.
+    """
+    if options.serve:
+        from genericlib import ECODE
+        from regexapp.daemon import RegexDaemon
+        from regexapp.exceptions import DaemonError
+
+        daemon = RegexDaemon(options.socket)
+        try:
+            daemon.start()
+        except DaemonError as ex:
+            exit_with_failure('*** {}: {}'.format(type(ex).__name__, ex))
+
+        print('regexapp daemon is serving at {}'.format(daemon.address))
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        sys.exit(ECODE.SUCCESS)
+
+
 def show_dependency(options):
     """
     Display dependency information if requested.
@@ -60,6 +123,7 @@ def show_dependency(options):
     """
     if options.dependency:
         from platform import uname, python_version
+        from genericlib import ECODE
         from regexapp.config import Data
         lst = [
             Data.main_app_text,
@@ -101,11 +165,34 @@ def show_version(options):
         ``ECODE.SUCCESS`` if `--version` is specified.
     """
     if options.version:
+        from genericlib import ECODE
         from regexapp import version
         print(f'regexapp {version}')
         sys.exit(ECODE.SUCCESS)
 
 
+def parse_jobs(value):
+    """
+    Convert a value of the `-j/--jobs` flag to a number of workers.
+
+    Parameters
+    ----------
+    value : str
+        A value of `-j/--jobs`.
+
+    Returns
+    -------
+    int
+        A non-negative number of worker processes.  Prints an error
+        message and exits with ``ECODE.BAD`` if `value` is negative or
+        not an integer.
+    """
+    if not re.fullmatch(r' *\d+ *', value):
+        fmt = '*** INVALID-JOBS: {!r} - number of jobs must be a non-negative integer.'
+        exit_with_failure(fmt.format(value))
+    return int(value)
+
+
 class Cli:
     """
     Console interface for regexapp.
@@ -122,6 +209,12 @@ class Cli:
         Parsed command-line arguments.
     kwargs : dict
         Additional keyword arguments loaded from configuration.
+
+    Notes
+    -----
+    - Build, test, and script requests are forwarded to a running
+      regexapp daemon (`--serve`) if one is available, unless
+      `--no-daemon` is specified. Otherwise, they are processed locally.
     """
 
     def __init__(self):
@@ -154,6 +247,27 @@ class Cli:
             help='To perform test between test data vs generated regex pattern.'
         )
 
+        parser.add_argument(
+            '-j', '--jobs', type=parse_jobs, dest='jobs',
+            default=1,
+            help='Number of worker processes to run test. 0 uses every processor.'
+        )
+
+        parser.add_argument(
+            '--cache', type=str, nargs='?', const=True, default=None,
+            help='Reuse regex patterns from a build cache, optionally in a directory.'
+        )
+
+        parser.add_argument(
+            '--simplify', action='store_true',
+            help='Remove redundant groups and merge whitespace quantifiers of regex patterns.'
+        )
+
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Analyze generated regex patterns for catastrophic backtracking.'
+        )
+
         parser.add_argument(
             '-p', '--platform', type=str, choices=['unittest', 'pytest', 'snippet'],
             default='',
@@ -166,6 +280,21 @@ class Cli:
             help='Config settings for generated test script.'
         )
 
+        parser.add_argument(
+            '--serve', action='store_true',
+            help='Run as a daemon which keeps references loaded and serves requests.'
+        )
+
+        parser.add_argument(
+            '--socket', type=str, default='',
+            help='Daemon address, i.e. a Unix socket file or host:port.'
+        )
+
+        parser.add_argument(
+            '--no-daemon', action='store_true', dest='no_daemon',
+            help='Process a request locally even if a daemon is running.'
+        )
+
         parser.add_argument(
             '-d', '--dependency', action='store_true',
             help='Show RegexApp dependent package(s).'
@@ -194,7 +323,7 @@ class Cli:
 
         if not self.options.user_data:
             self.parser.print_help()
-            sys.exit(ECODE.BAD)
+            exit_with_failure()
 
         pattern = r'file( *name)?:: *(?P<filename>\S*)'
         m = re.match(pattern, self.options.user_data, re.I)
@@ -204,8 +333,7 @@ class Cli:
                     self.options.user_data = stream.read()
             except Exception as ex:
                 failure = '*** {}: {}'.format(type(ex).__name__, ex)
-                print(failure)
-                sys.exit(ECODE.BAD)
+                exit_with_failure(failure)
 
         if self.options.test_data:
             m = re.match(pattern, self.options.test_data, re.I)
@@ -215,8 +343,7 @@ class Cli:
                         self.options.test_data = stream.read()
                 except Exception as ex:
                     failure = '*** {}: {}'.format(type(ex).__name__, ex)
-                    print(failure)
-                    sys.exit(ECODE.BAD)
+                    exit_with_failure(failure)
 
         if self.options.config:
             config = self.options.config
@@ -227,8 +354,7 @@ class Cli:
                         content = stream.read()
                 except Exception as ex:
                     failure = '*** {}: {}'.format(type(ex).__name__, ex)
-                    print(failure)
-                    sys.exit(ECODE.BAD)
+                    exit_with_failure(failure)
             else:
                 other_pat = r'''(?x)(
                     prepended_ws|appended_ws|ignore_case|
@@ -245,15 +371,60 @@ class Cli:
                         self.kwargs = kwargs
                     else:
                         failure = '*** INVALID-CONFIG: {}'.format(config)
-                        print(failure)
-                        sys.exit(ECODE.BAD)
+                        exit_with_failure(failure)
                 except Exception as ex:
                     failure = '*** LOADING-CONFIG-ERROR - {}'.format(ex)
-                    print(failure)
-                    sys.exit(ECODE.BAD)
+                    exit_with_failure(failure)
+
+        if self.options.cache:
+            self.kwargs.setdefault('build_cache', self.options.cache)
+
+        build_cache = self.kwargs.get('build_cache')
+        if isinstance(build_cache, str):
+            self.kwargs['build_cache'] = os.path.abspath(build_cache)
+
+        if self.options.simplify:
+            self.kwargs.setdefault('simplified', True)
 
         return True
 
+    def process(self, command):
+        """
+        Process a request and print its output.
+
+        The request is forwarded to a running regexapp daemon if one is
+        available, otherwise it is processed locally.
+
+        Parameters
+        ----------
+        command : str
+            A request command, i.e. build, test, script, or analyze.
+
+        Returns
+        -------
+        None
+            Prints the output of the request and exits with its exit code.
+        """
+        request = dict(
+            command=command,
+            user_data=self.options.user_data,
+            test_data=self.options.test_data,
+            platform=self.options.platform,
+            jobs=self.options.jobs,
+            kwargs=self.kwargs
+        )
+        response = None
+        if not self.options.no_daemon:
+            response = DaemonClient(self.options.socket).request(request)
+
+        if response:
+            ecode, output = response.get('status'), response.get('output', '')
+        else:
+            from regexapp.daemon import process_request
+            ecode, output = process_request(request)
+        print(output)
+        sys.exit(ecode)
+
     def build_regex_pattern(self):
         """
         Build and print regex patterns from user data.
@@ -265,29 +436,22 @@ class Cli:
             ``ECODE.SUCCESS`` if successful. Exits with ``ECODE.BAD``
             if no patterns can be generated.
         """
-        factory = RegexBuilder(
-            user_data=self.options.user_data,
-            **self.kwargs
-        )
-        factory.build()
-        patterns = factory.patterns
-        total = len(patterns)
-        if total >= 1:
-            if total == 1:
-                result = 'pattern = r{}'.format(enclose_string(patterns[0]))
-                print(result)
-            else:
-                lst = []
-                fmt = 'pattern{} = r{}'
-                for index, pattern in enumerate(patterns, 1):
-                    lst.append(fmt.format(index, enclose_string(pattern)))
-                result = '\n'.join(lst)
-                print(result)
-            sys.exit(ECODE.SUCCESS)
-        else:
-            fmt = '*** CANT generate regex pattern from\n{}'
-            print(fmt.format(self.options.user_data))
-            sys.exit(ECODE.BAD)
+        self.process('build')
+
+    def analyze_regex_pattern(self):
+        """
+        Build regex patterns and print their complexity analysis.
+
+        Returns
+        -------
+        None
+            Prints a complexity analysis per generated regex pattern and
+            exits with ``ECODE.SUCCESS`` if `--analyze` is specified.
+            Exits with ``ECODE.BAD`` if a pattern can backtrack
+            exponentially.
+        """
+        if self.options.analyze:
+            self.process('analyze')
 
     def build_test_script(self):
         """
@@ -300,19 +464,8 @@ class Cli:
             options, prints it to stdout, and exits with ``ECODE.SUCCESS``.
             Falls back to regex pattern generation if no platform is set.
         """
-        platform = self.options.platform.lower()
-        if platform:
-            tbl = dict(unittest='create_unittest', pytest='create_pytest')
-            method_name = tbl.get(platform, 'create_python_test')
-            factory = RegexBuilder(
-                user_data=self.options.user_data,
-                test_data=self.options.test_data,
-                **self.kwargs
-            )
-            factory.build()
-            test_script = getattr(factory, method_name)()
-            print('\n{}\n'.format(test_script))
-            sys.exit(ECODE.SUCCESS)
+        if self.options.platform:
+            self.process('script')
         else:
             self.build_regex_pattern()
 
@@ -327,15 +480,7 @@ class Cli:
             ``ECODE.SUCCESS`` upon completion.
         """
         if self.options.test:
-            factory = RegexBuilder(
-                user_data=self.options.user_data,
-                test_data=self.options.test_data,
-                **self.kwargs
-            )
-            factory.build()
-            test_result = factory.test(showed=True)
-            print(test_result)
-            sys.exit(ECODE.SUCCESS)
+            self.process('test')
 
     def run(self):
         """
@@ -344,14 +489,16 @@ class Cli:
         Returns
         -------
         None
-            Handles dependency display, GUI launch, validation,
+            Handles dependency display, GUI launch, daemon mode, validation,
             regex generation, test execution, and script creation
             based on CLI flags.
         """
         show_version(self.options)
         show_dependency(self.options)
         run_gui_application(self.options)
+        run_daemon(self.options)
         self.validate_cli_flags()
+        self.analyze_regex_pattern()
         if not self.options.test_data:
             self.build_regex_pattern()
         self.run_test()
@@ -0,0 +1,389 @@
+"""
+regexapp.report
+===============
+Structured test results for regexapp.
+
+This module defines the result objects which `RegexBuilder.test` and
+`RegexBuilder.test_stream` produce.  A result keeps per-pattern match
+counts, matched line indices, captured groupdicts, and timing, and it
+renders lazily to the text report, JSON, or NDJSON.
+
+Contents
+--------
+Classes
+-------
+PatternReport
+    Test result of a single pattern.
+MatchReport
+    Test result of all patterns against test data.
+
+Notes
+-----
+- Rendering methods are generators, so a report can be written to a
+  stream chunk by chunk without building one large string.
+"""
+
+import json
+import time
+from collections import OrderedDict
+
+from regexapp.constant import FORMATTYPE
+from regexapp.exceptions import MatchReportError
+
+
+class PatternReport:
+    """
+    Test result of a single pattern.
+
+    Attributes
+    ----------
+    pattern : str
+        A regex pattern.
+    user_data : str
+        User data which pattern is built from.
+    index : int
+        A position of pattern in a pattern set.
+    count : int
+        Number of test data entries which pattern matches.
+    line_indices : list of int
+        Indices of matched test data entries.
+    groupdicts : list of dict
+        Captured groups of every match, in order of `line_indices`.
+    keeps_details : bool
+        If False, only `count` is recorded to bound memory usage.
+
+    Properties
+    ----------
+    is_matched -> bool
+    """
+    def __init__(self, pattern, user_data='', index=0, keeps_details=True):
+        self.pattern = pattern
+        self.user_data = user_data
+        self.index = index
+        self.count = 0
+        self.line_indices = []
+        self.groupdicts = []
+        self.keeps_details = keeps_details
+
+    @property
+    def is_matched(self):
+        return self.count > 0
+
+    def add(self, line_index, groupdict):
+        """
+        Record a match of pattern.
+
+        Parameters
+        ----------
+        line_index : int
+            An index of matched test data entry.
+        groupdict : dict
+            Captured groups of a match.
+        """
+        self.count += 1
+        if self.keeps_details:
+            self.line_indices.append(line_index)
+            self.groupdicts.append(groupdict)
+
+    def to_dict(self):
+        """
+        Return pattern result as a JSON-serializable dictionary.
+
+        Returns
+        -------
+        OrderedDict
+            A dictionary of index, pattern, user data, count, and
+            details if they are recorded.
+        """
+        user_data = self.user_data
+        user_data = user_data if isinstance(user_data, str) else list(user_data)
+        result = OrderedDict(
+            index=self.index, pattern=str(self.pattern),
+            user_data=user_data, count=self.count
+        )
+        if self.keeps_details:
+            result.update(line_indices=self.line_indices, groupdicts=self.groupdicts)
+        return result
+
+
+class MatchReport:
+    """
+    Test result of all patterns against test data.
+
+    Attributes
+    ----------
+    patterns : list of PatternReport
+        Results per pattern.
+    test_data : list of str
+        Test data entries which are echoed in text report.  None if
+        test data is streamed.
+    total : int
+        Number of tested test data entries.
+    matched : int
+        Number of test data entries which any pattern matches.
+    elapsed : float
+        Duration of test in seconds.
+    is_stream : bool
+        True if test data is streamed.  Text report is then a summary.
+
+    Properties
+    ----------
+    result -> bool
+
+    Methods
+    -------
+    MatchReport.from_pattern_set(pattern_set, test_data=None) -> MatchReport
+    add_entry(matches) -> None
+    add_records(line_index, records) -> None
+    finish() -> None
+    to_dict() -> OrderedDict
+    iter_text() -> generator
+    iter_json() -> generator
+    iter_ndjson() -> generator
+    iter_render(fmt=FORMATTYPE.TEXT) -> generator
+    render(fmt=FORMATTYPE.TEXT) -> str
+    write(stream, fmt=FORMATTYPE.TEXT) -> None
+
+    Raises
+    ------
+    MatchReportError
+        Raised if a render format is not supported.
+    """
+    def __init__(self, patterns=None, test_data=None):
+        self.patterns = list(patterns or [])
+        self.test_data = test_data
+        self.is_stream = test_data is None
+        self.total = 0
+        self.matched = 0
+        self.elapsed = 0.0
+        self._start_time = time.perf_counter()
+
+    def __str__(self):
+        return self.render()
+
+    @classmethod
+    def from_pattern_set(cls, pattern_set, test_data=None):
+        """
+        Create an empty report for patterns of a pattern set.
+
+        Parameters
+        ----------
+        pattern_set : PatternSet
+            A pattern set which is tested.
+        test_data : list of str, optional
+            Test data entries.  Default is None, i.e. streamed test data
+            whose details are not recorded.
+
+        Returns
+        -------
+        MatchReport
+            An empty report.
+        """
+        keeps_details = test_data is not None
+        patterns = [
+            PatternReport(
+                entry.pattern, user_data=entry.user_data,
+                index=entry.index, keeps_details=keeps_details
+            ) for entry in pattern_set
+        ]
+        return cls(patterns=patterns, test_data=test_data)
+
+    @property
+    def result(self):
+        return all(pattern.is_matched for pattern in self.patterns)
+
+    def add_entry(self, matches):
+        """
+        Record matches of a test data entry.
+
+        Parameters
+        ----------
+        matches : list of PatternMatch
+            Matches of patterns with `line_index` of test data entry.
+        """
+        self.total += 1
+        self.matched += 1 if matches else 0
+        for event in matches:
+            self.patterns[event.entry.index].add(event.line_index, event.groupdict)
+
+    def add_records(self, line_index, records):
+        """
+        Record matches of a test data entry from a worker process.
+
+        Parameters
+        ----------
+        line_index : int
+            An index of test data entry.
+        records : list of tuple
+            Pairs of pattern index and captured groups of every match.
+        """
+        self.total += 1
+        self.matched += 1 if records else 0
+        for index, groupdict in records:
+            self.patterns[index].add(line_index, groupdict)
+
+    def finish(self):
+        """Record duration of test."""
+        self.elapsed = time.perf_counter() - self._start_time
+
+    def to_dict(self):
+        """
+        Return report as a JSON-serializable dictionary.
+
+        Returns
+        -------
+        OrderedDict
+            A dictionary of summary and results per pattern.
+        """
+        result = self.get_summary()
+        result.update(patterns=[pattern.to_dict() for pattern in self.patterns])
+        return result
+
+    def get_summary(self):
+        """
+        Return summary of report.
+
+        Returns
+        -------
+        OrderedDict
+            A dictionary of result, total, matched, and elapsed.
+        """
+        result = OrderedDict(
+            result=self.result, total=self.total,
+            matched=self.matched, elapsed=self.elapsed
+        )
+        return result
+
+    def iter_text(self):
+        """
+        Yield lines of text report.
+
+        Yields
+        ------
+        str
+            A line of text report.
+        """
+        if self.is_stream:
+            yield 'Test Summary:'
+            yield '-' * 12
+            yield 'total test data: {}'.format(self.total)
+            yield 'matched test data: {}'.format(self.matched)
+            yield ''
+        else:
+            yield 'Test Data:'
+            yield '-' * 9
+            yield from self.test_data
+            yield ''
+
+        yield 'Matched Result:'
+        yield '-' * 14
+        for pattern in self.patterns:
+            if self.is_stream:
+                tr = pattern.count if pattern.is_matched else 'NO'
+            else:
+                lst = [groupdict for groupdict in pattern.groupdicts if groupdict]
+                tr = 'NO' if not pattern.is_matched else lst if lst else 'YES'
+            yield 'pattern: {}'.format(pattern.pattern)
+            yield 'matched: {}'.format(tr)
+            yield '-' * 10
+
+    def iter_json(self):
+        """
+        Yield chunks of JSON report.
+
+        Yields
+        ------
+        str
+            A chunk of JSON document.
+        """
+        summary = json.dumps(self.get_summary())
+        yield summary[:-1]
+        yield ', "patterns": ['
+        for index, pattern in enumerate(self.patterns):
+            yield ', ' if index else ''
+            yield json.dumps(pattern.to_dict())
+        yield ']}'
+
+    def iter_ndjson(self):
+        """
+        Yield lines of NDJSON report.
+
+        The first line is a summary record, and every following line is
+        a record of a pattern.
+
+        Yields
+        ------
+        str
+            A JSON document of a record.
+        """
+        summary = OrderedDict(type='summary')
+        summary.update(self.get_summary())
+        yield json.dumps(summary)
+        for pattern in self.patterns:
+            record = OrderedDict(type='pattern')
+            record.update(pattern.to_dict())
+            yield json.dumps(record)
+
+    def iter_render(self, fmt=FORMATTYPE.TEXT):
+        """
+        Yield chunks of report in a format.
+
+        Parameters
+        ----------
+        fmt : str, optional
+            A format type, i.e. text, json, or ndjson.  Default is text.
+
+        Yields
+        ------
+        str
+            A chunk of report.  Lines of text and NDJSON formats are
+            separated by a newline.
+
+        Raises
+        ------
+        MatchReportError
+            Raised if a format is not supported.
+        """
+        if fmt == FORMATTYPE.TEXT:
+            lines = self.iter_text()
+        elif fmt == FORMATTYPE.NDJSON:
+            lines = self.iter_ndjson()
+        elif fmt == FORMATTYPE.JSON:
+            yield from self.iter_json()
+            return
+        else:
+            msg = 'Unsupported report format - {!r}'.format(fmt)
+            raise MatchReportError(msg)
+
+        for index, line in enumerate(lines):
+            yield '\n' + line if index else line
+
+    def render(self, fmt=FORMATTYPE.TEXT):
+        """
+        Return report in a format.
+
+        Parameters
+        ----------
+        fmt : str, optional
+            A format type, i.e. text, json, or ndjson.  Default is text.
+
+        Returns
+        -------
+        str
+            A rendered report.
+        """
+        return ''.join(self.iter_render(fmt=fmt))
+
+    def write(self, stream, fmt=FORMATTYPE.TEXT):
+        """
+        Write report to a stream chunk by chunk.
+
+        Parameters
+        ----------
+        stream : file object
+            A writable text stream.
+        fmt : str, optional
+            A format type, i.e. text, json, or ndjson.  Default is text.
+        """
+        for chunk in self.iter_render(fmt=fmt):
+            stream.write(chunk)
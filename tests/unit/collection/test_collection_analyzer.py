@@ -0,0 +1,95 @@
+import pytest
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+from regexapp import MultilinePattern
+from regexapp import PatternBuilder
+from regexapp.collection import REF
+from regexapp.collection import analyze_pattern
+from regexapp.exceptions import PatternAnalysisError
+
+
+class TestPatternAnalyzer:
+    @pytest.mark.parametrize(
+        ('pattern', 'kind', 'level'),
+        [
+            (r'(a+)+b', 'nested-quantifier', 'exponential'),
+            (r'(\w+\s?)*$', 'nested-quantifier', 'exponential'),
+            (r'(?:\w+\d)+$', 'nested-quantifier', 'exponential'),
+            (r'(?:.*,)*x', 'nested-quantifier', 'exponential'),
+            (r'(?:(?:-|\w+)\d)+$', 'nested-quantifier', 'exponential'),
+            (r'(a*)*b', 'empty-loop', 'exponential'),
+            (r'(a|a )*b', 'overlapping-alternation', 'exponential'),
+            (r'(xa|x\wy)*d', 'overlapping-alternation', 'exponential'),
+            (r'(a|a )b', 'overlapping-alternation', 'linear'),
+            (r'.*\s*x', 'adjacent-quantifiers', 'polynomial'),
+            (r'\s* *x', 'adjacent-quantifiers', 'polynomial'),
+            (r'(?P<v>\d+)(\d*)x', 'adjacent-quantifiers', 'polynomial'),
+        ]
+    )
+    def test_issue(self, pattern, kind, level):
+        analysis = analyze_pattern(pattern)
+        assert [issue.kind for issue in analysis.issues] == [kind]
+        assert analysis.level == level
+        assert analysis.is_safe is (level != 'exponential')
+        assert analysis.score > analysis.total_quantifiers
+
+    @pytest.mark.parametrize(
+        'pattern',
+        [
+            r'[a-zA-Z][a-zA-Z0-9]*( [a-zA-Z][a-zA-Z0-9]*)*',
+            r'(\S+ +)*x',
+            r'(?:a+b)+$',
+            r'(?:[^,]*,)*x',
+            r'\s*\S+',
+            r'(a|b)*c',
+            r'(?i)word|other',
+        ]
+    )
+    def test_linear_pattern(self, pattern):
+        analysis = analyze_pattern(pattern)
+        assert analysis.issues == []
+        assert analysis.level == 'linear'
+        assert analysis.score == analysis.total_quantifiers
+
+    def test_ignore_case(self):
+        assert analyze_pattern(r'(ab|Ac)*d').issues == []
+        assert analyze_pattern(r'(?i)(ab|Ac)*d').level == 'exponential'
+
+    def test_generated_patterns(self):
+        line_pattern = LinePattern('Interface word(var_name) is words(var_status)')
+        multiline_pattern = MultilinePattern('Interface word(var_name)\n  digits(var_mtu) mtu')
+        builder_pattern = PatternBuilder(['Gi0/1', 'Gi0/1.100'], var_name='v')
+        element_pattern = ElementPattern('choice(var_state, up, upper)')
+        assert analyze_pattern(line_pattern).level == 'linear'
+        assert analyze_pattern(multiline_pattern).is_safe
+        compiled_form = MultilinePattern.get_compiled_form(multiline_pattern)
+        if compiled_form != multiline_pattern:
+            assert analyze_pattern(compiled_form).level == 'linear'
+
+        issue, = analyze_pattern(builder_pattern).issues
+        assert (issue.kind, issue.group) == ('overlapping-alternation', "'v'")
+        assert analyze_pattern(element_pattern).issues == []
+        issue, = analyze_pattern('(?P<state>up|upper)').issues
+        assert issue.description == 'an alternative is a prefix of a later alternative'
+
+    def test_reference_entry(self):
+        analysis = analyze_pattern(REF['comma_word'])
+        assert analysis.level == 'exponential'
+        assert analysis.to_dict()['issues'][-1]['kind'] == 'nested-quantifier'
+
+        analysis = analyze_pattern(REF['datetime'])
+        assert analysis.pattern.count('\n') == 4
+
+    def test_report(self):
+        report = analyze_pattern(r'(a+)+b').get_report()
+        assert report.splitlines() == [
+            'pattern: (a+)+b',
+            'complexity: exponential (score 102)',
+            '  - nested-quantifier [exponential]: unbounded quantifier repeats a body '
+            "which has an unbounded quantifier matching its next character, e.g. 'a'",
+        ]
+
+    def test_invalid_pattern(self):
+        with pytest.raises(PatternAnalysisError):
+            analyze_pattern('(a')
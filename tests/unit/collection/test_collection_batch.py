@@ -0,0 +1,58 @@
+import pytest
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+from regexapp import MultilinePattern
+
+
+@pytest.fixture
+def element_cache():
+    ElementPattern.pattern_cache.clear()
+    yield ElementPattern.pattern_cache
+    ElementPattern.pattern_cache.clear()
+
+
+class TestLinePatternBatch:
+    def test_build_batch(self, element_cache):
+        lst_of_text = [
+            '=====',
+            'Interface word(var_name) is word(var_status)',
+            '=====',
+            '',
+            'digits(var_packets) packets input word(var_name)',
+            'Interface word(var_name) is word(var_status)',
+        ]
+        batch = LinePattern.build_batch(lst_of_text, prepended_ws=True)
+
+        assert len(batch) == 6
+        assert batch.total == 6
+        assert batch.unique_total == 4
+        assert batch.unique_ratio == pytest.approx(4 / 6)
+        assert batch.element_total == 4
+        assert batch.unique_element_total == 3
+        assert list(batch.timings) == ['dedup', 'element', 'build', 'fanout']
+        assert batch[0] is batch[2]
+        for pattern, text in zip(batch, lst_of_text):
+            expected = LinePattern(text, prepended_ws=True)
+            assert pattern == expected
+            assert pattern.text == text
+            assert [v.name for v in pattern.variables] == [v.name for v in expected.variables]
+
+    def test_build_batch_with_empty_list(self):
+        batch = LinePattern.build_batch([])
+        assert len(batch) == 0
+        assert batch.unique_ratio == 0.0
+        assert batch.to_dict()['total'] == 0
+
+
+class TestMultilinePatternBatch:
+    def test_build_batch(self):
+        lst_of_text = [
+            ['Interface word(var_name)', 'digits(var_mtu) MTU'],
+            'Interface word(var_name)\ndigits(var_mtu) MTU',
+            ['Interface word(var_name)', 'digits(var_mtu) MTU'],
+        ]
+        batch = MultilinePattern.build_batch(lst_of_text, ignore_case=True)
+        assert batch.unique_total == 2
+        assert batch[0] is batch[2]
+        assert batch[1] == batch[0] == MultilinePattern(lst_of_text[0], ignore_case=True)
@@ -0,0 +1,84 @@
+import pytest       # noqa
+
+from regexapp import ElementPattern
+from regexapp import add_reference
+from regexapp import remove_reference
+from regexapp.collection import PatternCache
+from regexapp.collection import REF
+
+
+@pytest.fixture
+def element_cache():
+    ElementPattern.pattern_cache.clear()
+    yield ElementPattern.pattern_cache
+    ElementPattern.pattern_cache.clear()
+
+
+class TestPatternCache:
+    def test_lru_eviction(self):
+        cache = PatternCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert len(cache) == 2
+
+    def test_version_invalidation(self):
+        cache = PatternCache()
+        cache.set('a', 1, version=1)
+        assert cache.get('a', version=1) == 1
+        assert cache.get('a', version=2) is None
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['invalidations'] == 1
+
+
+class TestElementPatternCache:
+    @pytest.mark.parametrize(
+        'data',
+        [
+            'mac_address(var_mac)',
+            'digits(var_n, meta_data_filldown)',
+            'word(var_v1, or_empty)',
+            'digits(var_n, head_ws)',
+            'word(var_unit, tail_ws)',
+        ]
+    )
+    def test_cached_element_pattern(self, element_cache, data):
+        expected_pattern = ElementPattern(data)
+        pattern = ElementPattern(data)
+
+        assert element_cache.get_stats()['hits'] >= 1
+        assert pattern == expected_pattern
+        assert pattern.variable is not expected_pattern.variable
+        assert pattern.variable.value == expected_pattern.variable.value
+        assert pattern.or_empty == expected_pattern.or_empty
+        assert pattern.prepended_pattern == expected_pattern.prepended_pattern
+        assert pattern.appended_pattern == expected_pattern.appended_pattern
+
+    def test_invalidation_on_reference_change(self, element_cache):
+        add_reference(name='cache_test_kw', pattern=r'\d+')
+        try:
+            assert ElementPattern('cache_test_kw(var_a)') == r'(?P<a>\d+)'
+            remove_reference(name='cache_test_kw')
+            add_reference(name='cache_test_kw', pattern=r'[a-z]+')
+            assert ElementPattern('cache_test_kw(var_a)') == r'(?P<a>[a-z]+)'
+            assert element_cache.get_stats()['invalidations'] >= 1
+        finally:
+            'cache_test_kw' in REF and remove_reference(name='cache_test_kw')
+
+    def test_invalidation_on_datetime_format_change(self, element_cache):
+        add_reference(name='datetime', format9=r'\d+-\d+')
+        try:
+            pattern = ElementPattern('datetime(var_dt, format9)')
+            assert pattern == r'(?P<dt>\d+-\d+)'
+
+            add_reference(name='datetime', format9=r'\d+/\d+')
+            pattern = ElementPattern('datetime(var_dt, format9)')
+            assert pattern == r'(?P<dt>\d+/\d+)'
+        finally:
+            remove_reference(name='datetime')
@@ -0,0 +1,101 @@
+import pytest       # noqa
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+from regexapp import RegexBuilder
+
+
+USER_DATA_LINES = [
+    'interface word(var_name) is choice(var_status, up, down, administratively down)',
+    'mac_address(var_mac) digits(var_vlan, meta_data_filldown) mixed_word(var_port, or_empty)',
+    '   IPv4 Address. . . : ipv4_address(var_ipv4_addr)(word(var_status))',
+    'start() letters(var_key): data(var_value, abc, or_empty) end(space)',
+    'digits(var_n, head_ws) phrase(var_desc, or_empty) word(var_unit, tail_ws)',
+    'datetime(var_dt, format1) - puncts(var_sep) - number(var_num, or_repeat_2_3_spaces)',
+    'symbol(var_sym, name=copyright_sign) non_whitespaces(var_token, word_bound)',
+    'blab data(var_v1, abc, or_empty) ++blab-- data(var_v2, xyz, or_empty) blab',
+]
+
+
+def snapshot_line_pattern(text):
+    pattern = LinePattern(text)
+    variables = [(v.name, v.pattern, v.option) for v in pattern.variables]
+    items = [str(item) for item in pattern.items]
+    return str(pattern), variables, items
+
+
+def snapshot_element_pattern(text):
+    pattern = ElementPattern(text)
+    variable = pattern.variable
+    return (
+        str(pattern), variable.name, variable.pattern, variable.option,
+        pattern.or_empty, pattern.prepended_pattern, pattern.appended_pattern
+    )
+
+
+@pytest.fixture
+def frequent_thread_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+class TestConcurrentPatternConstruction:
+    @pytest.mark.usefixtures('frequent_thread_switching')
+    def test_line_pattern_construction(self):
+        lines = USER_DATA_LINES * 250
+        expected_results = [snapshot_line_pattern(line) for line in lines]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(snapshot_line_pattern, lines))
+
+        assert results == expected_results
+
+    @pytest.mark.usefixtures('frequent_thread_switching')
+    def test_element_pattern_construction(self):
+        snippets = [
+            'word(var_name)', 'digits(var_n, meta_data_filldown)',
+            'mixed_word(var_port, or_empty)', 'digits(var_n, head_ws)',
+            'word(var_unit, tail_ws)', 'number(var_num, or_repeat_2_3_spaces)',
+        ] * 500
+        expected_results = [snapshot_element_pattern(s) for s in snippets]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(snapshot_element_pattern, snippets))
+
+        assert results == expected_results
+
+    @pytest.mark.usefixtures('frequent_thread_switching')
+    def test_regex_builder_build(self):
+        user_data = '\n'.join(USER_DATA_LINES)
+
+        def build(_):
+            factory = RegexBuilder(user_data=user_data, is_line=True)
+            factory.build()
+            return [str(pattern) for pattern in factory.patterns]
+
+        expected_patterns = build(None)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(build, range(200)))
+
+        assert all(patterns == expected_patterns for patterns in results)
+
+
+class TestNestedPatternConstruction:
+    @pytest.mark.parametrize(
+        ('data', 'expected_prefix'),
+        [
+            ('a word(var_v, or_empty, or_either_2_spaces) b', r'a\s*(?P<v>( {2})|'),
+            ('a word(var_v, or_either_2_spaces, or_empty) b', r'a\s*(?P<v>( {2})|'),
+            ('a word(var_v, or_empty, or_repeat_2_3_spaces) b', r'a\s*(?P<v>( {2,3})|'),
+            ('a word(var_v, or_repeat_2_3_spaces, or_empty) b', r'a\s*(?P<v>( {2,3})|'),
+        ]
+    )
+    def test_or_empty_with_nested_space_element(self, data, expected_prefix):
+        pattern = LinePattern(data)
+        assert pattern.startswith(expected_prefix)
+        match = pattern.compiled.search('a b')
+        assert match and match.group('v') == ''
@@ -0,0 +1,106 @@
+import re
+
+import pytest
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+from regexapp import MultilinePattern
+from regexapp import PatternBuilder
+from regexapp.collection import DeferredValidation
+from regexapp.exceptions import ElementPatternError
+from regexapp.exceptions import LinePatternError
+
+
+@pytest.fixture
+def compile_counter(monkeypatch):
+    counter = dict(total=0)
+    compile_ = re.compile
+
+    def counting_compile(*args, **kwargs):
+        counter['total'] += 1
+        return compile_(*args, **kwargs)
+
+    ElementPattern.pattern_cache.clear()
+    monkeypatch.setattr('regexapp.collection.re.compile', counting_compile)
+    yield counter
+    ElementPattern.pattern_cache.clear()
+
+
+class TestDeferredValidation:
+    def test_is_active(self):
+        assert DeferredValidation.is_active() is False
+        with DeferredValidation():
+            assert DeferredValidation.is_active() is True
+            with DeferredValidation(enabled=False):
+                assert DeferredValidation.is_active() is False
+            assert DeferredValidation.is_active() is True
+        assert DeferredValidation.is_active() is False
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            ['Interface word(var_name) is mac_address(var_mac)',
+             'digits(var_n) packets input, datetime(var_dt, format1)',
+             'end'],
+            ['  word(var_name)  digits(var_number)  '],
+        ]
+    )
+    def test_multiline_pattern(self, data):
+        expected = MultilinePattern(data)
+        with DeferredValidation():
+            pattern = MultilinePattern(data)
+
+        assert pattern == expected
+        assert pattern.compiled.pattern == MultilinePattern.get_compiled_form(expected)
+        assert expected.compiled.pattern == pattern.compiled.pattern
+
+    def test_line_pattern(self):
+        text = 'a letter(var_a) b digits(var_b, or_empty)'
+        expected = LinePattern(text)
+        with DeferredValidation():
+            pattern = LinePattern(text)
+        assert pattern == expected
+        assert pattern.variables[0].name == 'a'
+        assert pattern.compiled.pattern == expected
+
+    def test_pattern_builder(self):
+        with DeferredValidation():
+            pattern = PatternBuilder(['abc_123', 'xyz.456'], var_name='v')
+        assert pattern == PatternBuilder(['abc_123', 'xyz.456'], var_name='v')
+        assert pattern.compiled.match('abc_123').group('v') == 'abc_123'
+
+    def test_fewer_compilations(self, compile_counter):
+        data = [
+            'Interface word(var_name) is mac_address(var_mac) digits(var_n)',
+            'uptime datetime(var_dt, format1) words(var_words)',
+        ]
+        MultilinePattern(data)
+        strict_total = compile_counter['total']
+
+        ElementPattern.pattern_cache.clear()
+        compile_counter['total'] = 0
+        with DeferredValidation():
+            MultilinePattern(data)
+        assert compile_counter['total'] < strict_total
+
+    @pytest.mark.parametrize(
+        ('text', 'exception_cls', 'msg'),
+        [
+            ('x letter(or_a[) y', ElementPatternError, 'unterminated character set'),
+            ('a data(var_x) b data(var_x)', LinePatternError, 'redefinition of group name'),
+        ]
+    )
+    def test_locating_invalid_fragment(self, text, exception_cls, msg):
+        ElementPattern.pattern_cache.clear()
+        with pytest.raises(exception_cls, match=msg):
+            with DeferredValidation():
+                LinePattern(text)
+
+    @pytest.mark.parametrize('text', ['', '   ', ' \t '])
+    @pytest.mark.parametrize('is_deferred', [False, True])
+    def test_blank_line_pattern(self, text, is_deferred):
+        with DeferredValidation(enabled=is_deferred):
+            pattern = LinePattern(text)
+        assert pattern == r'^\s*$'
+        assert pattern.compiled.pattern == pattern
+        assert pattern.compiled.search(text)
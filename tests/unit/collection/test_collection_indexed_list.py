@@ -0,0 +1,46 @@
+import copy
+import pickle
+
+from regexapp.collection import IndexedList
+
+
+class TestIndexedList:
+    def test_list_compatible(self):
+        lst = IndexedList(['a', 'b'])
+        lst.append('c')
+        assert isinstance(lst, list)
+        assert lst == ['a', 'b', 'c']
+        assert 'c' in lst and 'x' not in lst
+        assert lst[1:] == ['b', 'c']
+        assert isinstance(lst[1:], IndexedList)
+        assert '|'.join(lst) == 'a|b|c'
+
+    def test_add(self):
+        lst = IndexedList()
+        assert lst.add('a') is True
+        assert lst.add('a') is False
+        assert lst == ['a']
+
+    def test_mutation_keeps_index(self):
+        lst = IndexedList(['a', 'b', 'a'])
+        lst.remove('a')
+        assert 'a' in lst
+        lst.pop()
+        assert 'a' not in lst
+        lst[0] = 'x'
+        assert 'b' not in lst and 'x' in lst
+        lst += ['y', 'z']
+        del lst[1]
+        assert 'y' not in lst
+        lst.insert(0, 'w')
+        assert lst == ['w', 'x', 'z'] and 'w' in lst
+        lst.clear()
+        assert 'w' not in lst
+
+    def test_copy_and_pickle(self):
+        lst = IndexedList(['a', 'b'])
+        for result in (copy.copy(lst), copy.deepcopy(lst), lst.copy(),
+                       pickle.loads(pickle.dumps(lst))):
+            assert type(result) is IndexedList
+            assert result == lst
+            assert 'b' in result and 'x' not in result
@@ -0,0 +1,73 @@
+import re
+import sys
+import time
+
+import pytest
+
+from regexapp import MultilinePattern
+from regexapp import RegexBuilder
+
+
+LEGACY_LINE_SKIP_PATTERN = r'[^\r\n]*[\r\n]+([^\r\n]*[\r\n]+)*'
+
+USER_DATA = 'Interface word(var_name) is up\n  digits(var_packets) packets input\ncounters cleared'
+
+
+class TestMultilineBacktracking:
+    def test_line_skip_pattern_by_version(self):
+        pattern = MultilinePattern(USER_DATA)
+        assert pattern.count(MultilinePattern.line_skip_pattern) == 2
+        assert '*+' not in pattern
+        is_possessive = sys.version_info >= (3, 11)
+        assert ('*+' in MultilinePattern.compiled_line_skip_pattern) is is_possessive
+        assert pattern.compiled.pattern == MultilinePattern.get_compiled_form(pattern)
+        assert pattern.compiled.pattern.count(MultilinePattern.compiled_line_skip_pattern) == 2
+
+    @pytest.mark.parametrize(
+        'method_name',
+        ['create_unittest', 'create_pytest', 'create_python_test']
+    )
+    def test_emitted_pattern_is_portable(self, method_name):
+        """Python 3.9 and 3.10 do not support possessive quantifiers or atomic groups"""
+        test_data = 'Interface eth0 is up\n  10 packets input\ncounters cleared'
+        factory = RegexBuilder(user_data=USER_DATA, test_data=test_data)
+        factory.build()
+        script = getattr(factory, method_name)()
+        assert MultilinePattern.line_skip_pattern in script
+        assert not re.search(r'[*?}]\+|[(][?]>', script)
+        assert re.search(str(factory.patterns[0]), test_data)
+
+    @pytest.mark.parametrize(
+        'newline',
+        ['\r\n', '\n\n', '\r\n\r\n']
+    )
+    def test_same_match_as_legacy(self, newline):
+        pattern = MultilinePattern(USER_DATA)
+        legacy_pattern = pattern.replace(
+            MultilinePattern.line_skip_pattern, LEGACY_LINE_SKIP_PATTERN
+        )
+        lines = [
+            'Interface eth0 is up', 'log', '  10 packets input', '',
+            '  20 packets input', 'counters cleared', 'counters cleared now'
+        ]
+        test_data = newline.join(lines)
+        match = re.search(pattern, test_data)
+        expected_match = re.search(legacy_pattern, test_data)
+        assert match.span() == expected_match.span()
+        assert match.groupdict() == expected_match.groupdict() == dict(name='eth0', packets='20')
+
+    @pytest.mark.parametrize(
+        'newline',
+        ['\r\n', '\n\n', '\r\r\n']
+    )
+    def test_failed_search_time(self, newline):
+        """a failed search used to take exponential time in number of lines"""
+        pattern = MultilinePattern(USER_DATA)
+        lines = ['Interface eth0 is up', '  10 packets input'] + ['log line'] * 20000
+        test_data = newline.join(lines)
+
+        start = time.perf_counter()
+        match = pattern.compiled.search(test_data)
+        elapsed = time.perf_counter() - start
+        assert match is None
+        assert elapsed < 2.0
@@ -0,0 +1,199 @@
+import copy
+import pickle
+import re
+
+import pytest
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+from regexapp import MultilinePattern
+from regexapp import TextPattern
+from regexapp.collection import AlternationNode
+from regexapp.collection import AnchorNode
+from regexapp.collection import ElementNode
+from regexapp.collection import FlagNode
+from regexapp.collection import LiteralNode
+from regexapp.collection import QuantifierNode
+from regexapp.collection import RawNode
+from regexapp.collection import SequenceNode
+from regexapp.collection import TextNode
+from regexapp.collection import WhitespaceNode
+from regexapp.collection import get_literal_runs
+from regexapp.collection import parse_pattern_nodes
+
+
+class TestPatternNode:
+    @pytest.mark.parametrize(
+        ('pattern', 'expected_result'),
+        [
+            (
+                r'a +b\.c',
+                (LiteralNode('a'), WhitespaceNode(' ', '+'), LiteralNode(r'b\.c'))
+            ),
+            (
+                r'(?i)^\s*(?P<v>\w+)\s+\$',
+                (
+                    FlagNode('i'), AnchorNode('^'), WhitespaceNode(r'\s', '*'),
+                    RawNode(r'(?P<v>\w+)'), WhitespaceNode(r'\s', '+'), LiteralNode(r'\$')
+                )
+            ),
+            (
+                r'(-- ){2,}x[\r\n]{1,2}',
+                (
+                    QuantifierNode(RawNode('(-- )'), '{2,}'), LiteralNode('x'),
+                    WhitespaceNode(r'[\r\n]', '{1,2}')
+                )
+            ),
+            (r'\d+\Z', (QuantifierNode(RawNode(r'\d'), '+'), AnchorNode(r'\Z'))),
+            ('a|b c', (AlternationNode([], prefix=''),)),
+        ]
+    )
+    def test_parse_pattern(self, pattern, expected_result):
+        nodes = parse_pattern_nodes(pattern)
+        assert [type(node) for node in nodes] == [type(node) for node in expected_result]
+        if not isinstance(nodes[0], AlternationNode):
+            assert nodes == expected_result
+        assert SequenceNode(nodes).render() == pattern
+
+    def test_parse_cache(self):
+        assert parse_pattern_nodes('abc +') is parse_pattern_nodes('abc +')
+        assert TextNode.from_pattern('abc +') is TextNode.from_pattern('abc +')
+        assert TextNode.from_pattern('abc +') is not SequenceNode.from_pattern('abc +')
+
+    def test_slots_and_cache(self):
+        node = TextNode.from_pattern('a +b')
+        assert not hasattr(node, '__dict__')
+        with pytest.raises(AttributeError):
+            node.extra = True
+        assert node.render() is node.render()
+        assert node.get_cached('key', str.upper, 'x') == 'X'
+        assert node.get_cached('key', str.upper, 'y') == 'X'
+
+    @pytest.mark.parametrize(
+        'pattern',
+        [
+            'abc def', r'abc +\$', r'^\s*abc\.xyz', r'a+b c?d{2}e', r'a(b c)d \d+ e',
+            r'(?:ab)+ c[d ]e *f', r'\x41 b'
+        ]
+    )
+    def test_literal_runs(self, pattern):
+        node = SequenceNode.from_pattern(pattern)
+        assert node.get_literal_runs() == get_literal_runs(pattern)
+
+    def test_trim_and_strip(self):
+        node = TextNode.from_pattern(r' +abc\s')
+        assert node.lstrip().render() == r'abc\s'
+        assert node.rstrip().render() == ' +abc'
+        assert node.trim(first=1, last=1).render() == 'abc'
+        assert isinstance(node.trim(first=1), TextNode)
+        assert SequenceNode.from_pattern('ab ').rstrip().render() == 'ab'
+
+    @pytest.mark.parametrize(
+        'node',
+        [
+            TextNode.from_pattern(r'a +b\s*$'),
+            AlternationNode([LiteralNode('a'), LiteralNode('b')]),
+            QuantifierNode(SequenceNode.from_pattern('ab'), '+'),
+            LinePattern('word(var_name, head_ws) is up').node,
+        ]
+    )
+    def test_pickle_and_copy(self, node):
+        for result in [pickle.loads(pickle.dumps(node)), copy.deepcopy(node)]:
+            assert type(result) is type(node)
+            assert result == node
+            assert result.render() == node.render()
+
+
+class TestElementNode:
+    def test_head_and_tail(self):
+        pattern = LinePattern('word(var_v, head_ws, tail_ws)')
+        node = ElementNode.from_pattern(pattern.nodes[0].element)
+        assert node.prepended_pattern == r'^\s*'
+        assert node.appended_pattern == r'\s*$'
+        assert node.body == (RawNode('(?P<v>[a-zA-Z][a-zA-Z0-9]*)'),)
+        assert node.remove_head().render() == r'(?P<v>[a-zA-Z][a-zA-Z0-9]*)\s*$'
+        assert node.remove_tail().render() == r'^\s*(?P<v>[a-zA-Z][a-zA-Z0-9]*)'
+        assert node.variable.name == 'v'
+
+    def test_trim_keeps_element(self):
+        pattern = LinePattern('word(var_v, tail_just_space_plus)')
+        node = ElementNode.from_pattern(pattern.nodes[0].element)
+        result = node.trim(last=1)
+        assert isinstance(result, ElementNode)
+        assert result.render() == '(?P<v>[a-zA-Z][a-zA-Z0-9]*)'
+        assert result.variable is node.variable
+
+
+class TestLinePatternNode:
+    @pytest.mark.parametrize(
+        ('data', 'kwargs'),
+        [
+            ('Interface word(var_name) is word(var_status, or_empty)', dict()),
+            ('start() digits(var_n)  packets end(space)', dict(ignore_case=True)),
+            ('  abc word(var_v, head_ws) xyz  ', dict(prepended_ws=True, appended_ws=True)),
+        ]
+    )
+    def test_pattern_is_rendering_of_node(self, data, kwargs):
+        pattern = LinePattern(data, **kwargs)
+        assert pattern.node.render() == pattern
+        assert pattern.node.nodes == tuple(pattern.nodes)
+        assert ''.join(pattern.items) == pattern
+
+    def test_statement(self):
+        pattern = LinePattern('Interface word(var_name) is word(var_status, or_empty)')
+        assert pattern.statement == r'Interface ${name} is\s*${status}'
+        assert isinstance(pattern.nodes[0], TextNode)
+        assert isinstance(pattern.nodes[1], ElementNode)
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            'abc digits(var_x)',
+            'Interface word(var_name) is word(var_status, or_empty)',
+            'word(var_v, head_ws) xyz word(var_w, tail_ws)',
+        ]
+    )
+    def test_items_are_str_patterns(self, data):
+        pattern = LinePattern(data, prepended_ws=True, ignore_case=True)
+        assert ''.join(pattern.items) == pattern
+        assert all(isinstance(item, (TextPattern, ElementPattern)) for item in pattern.items)
+        variables = [
+            item.variable for item in pattern.items
+            if isinstance(item, ElementPattern) and not item.variable.is_empty
+        ]
+        assert variables == pattern.variables
+
+    def test_pickled_line_pattern(self):
+        pattern = LinePattern('digits(var_n) packets', ignore_case=True)
+        result = pickle.loads(pickle.dumps(pattern))
+        assert result.node == pattern.node
+        assert result.statement == pattern.statement
+
+
+class TestMultilinePatternNode:
+    def test_escaped_dollar_at_end_of_line(self):
+        pattern = MultilinePattern(['cost 5$', 'digits(var_n) items'], is_exact=True)
+        assert pattern == r'cost 5\$(\r\n|\r|\n)(?P<n>\d+) items'
+        assert pattern.compiled.search('cost 5$\n3 items').group('n') == '3'
+
+        pattern = MultilinePattern(['cost 5$', 'digits(var_n) items'])
+        assert pattern.startswith(r'cost 5\$[^\r\n]')
+        assert pattern.compiled.search('cost 5$\nlog\n3 items').group('n') == '3'
+
+    def test_pattern_is_rendering_of_node(self):
+        pattern = MultilinePattern(
+            ['Interface word(var_name)', 'digits(var_mtu) MTU in bytes'],
+            ignore_case=True, is_exact=True
+        )
+        assert pattern.node.render() == pattern
+        add_on_node = pattern.node.nodes[1].nodes[0]
+        assert isinstance(add_on_node, AlternationNode)
+        assert add_on_node.render() == r'(\r\n|\r|\n)'
+        assert pattern.count('(?i)') == 1
+        assert re.compile(pattern)
+
+    def test_reformat_string_pattern(self):
+        node = MultilinePattern.reformat(r'(?i)^abc$', is_exact=True)
+        assert node.render() == r'(\r\n|\r|\n)abc'
+        node = MultilinePattern.reformat(r'^abc$', is_first=True)
+        assert node.render() == '^abc'
@@ -0,0 +1,46 @@
+import pytest       # noqa
+
+from regexapp.collection import ElementParams
+
+
+class TestElementParams:
+    @pytest.mark.parametrize(
+        ('arg', 'kind', 'value'),
+        [
+            ('var_abc', 'var', 'abc'),
+            ('VAR_abc', 'var', 'abc'),
+            ('format', 'format', ''),
+            ('format3', 'format', ''),
+            ('name=copyright_sign', 'symbol_name', 'copyright_sign'),
+            ('word_bound_left', 'word_bound', ''),
+            ('head_ws', 'head', ''),
+            ('tail_raw', 'tail', ''),
+            ('repetition_1_3', 'repetition', ''),
+            ('at_least_2_occurrences', 'occurrence', ''),
+            ('meta_data_filldown', 'meta_data', 'filldown'),
+            ('or_empty', 'or_case', 'empty'),
+            ('abc xyz', 'text', ''),
+        ]
+    )
+    def test_tokenize(self, arg, kind, value):
+        argument = ElementParams.tokenize(arg)
+        assert argument.kind == kind
+        assert argument.value == value
+        assert argument.text == arg
+
+    def test_parse(self):
+        params = ElementParams.parse(
+            'datetime',
+            'var_a, var_b, format1, format2, head, tail_raw, word_bound'
+        )
+        assert params.name == 'a'
+        assert params.formats == ['format1', 'format2']
+        assert params.head == 'head'
+        assert params.tail == ''
+        assert params.word_bound == 'word_bound'
+        assert ElementParams.parse('datetime', params) is params
+
+    def test_parse_symbol_name(self):
+        params = ElementParams.parse('symbol', 'name=')
+        assert params.has_symbol_name is True
+        assert params.symbol_name == ''
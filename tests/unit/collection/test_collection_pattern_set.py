@@ -0,0 +1,160 @@
+import re
+
+import pytest
+
+from regexapp import LinePattern
+from regexapp import MultilinePattern
+from regexapp import PatternSet
+from regexapp import RegexBuilder
+from regexapp.collection import get_required_literal
+from regexapp.exceptions import PatternSetError
+
+
+@pytest.fixture
+def line_patterns():
+    return [
+        LinePattern('Interface word(var_name) is word(var_status)'),
+        LinePattern('digits(var_packets) packets input'),
+    ]
+
+
+@pytest.fixture
+def test_lines():
+    return [
+        'Interface eth0 is up',
+        '  100 packets input',
+        'Interface eth1 is down',
+    ]
+
+
+@pytest.mark.parametrize(
+    ('pattern', 'expected_result'),
+    [
+        (r'^Interface (?P<name>\S+) is up, line protocol', ' is up, line protocol'),
+        (r'a+bcd*ef?gh{0,2}ij{2}', 'bc'),
+        (r'\x41BCD \d+', 'BCD '),
+        (r'[]abc]def\.ghi', 'def.ghi'),
+        (r'ab(cd(e)f)gh', 'ab'),
+        (r'abc{ x', 'abc{ x'),
+        (r'(?i)abc', ''),
+        (r'abc|xyz', ''),
+        (r'\d+', ''),
+    ]
+)
+def test_get_required_literal(pattern, expected_result):
+    assert get_required_literal(pattern) == expected_result
+
+
+@pytest.mark.parametrize(
+    ('text', 'kwargs', 'expected_result'),
+    [
+        ('Interface word(var_name) is up, line protocol is word(var_status)',
+         dict(), ' is up, line protocol is '),
+        ('Interface word(var_name) is up', dict(ignore_case=True), ''),
+        ('digits(var_a) digits(var_b)', dict(), ' '),
+        ('word(var_a)', dict(), ''),
+        ('', dict(), ''),
+    ]
+)
+def test_line_pattern_required_literal(text, kwargs, expected_result):
+    pattern = LinePattern(text, **kwargs)
+    assert pattern.required_literal == expected_result
+
+
+def test_multiline_pattern_required_literal():
+    pattern = MultilinePattern(['Interface word(var_name)', 'digits(var_mtu) MTU in bytes'])
+    assert pattern.required_literal == ' MTU in bytes'
+
+
+class TestPatternSet:
+    def test_creation(self, line_patterns):
+        pattern_set = PatternSet(line_patterns)
+        assert len(pattern_set) == 2
+        first = pattern_set[0]
+        assert first.pattern is line_patterns[0]
+        assert first.regex is line_patterns[0].compiled
+        assert first.groups == ('name', 'status')
+        assert first.user_data == 'Interface word(var_name) is word(var_status)'
+        assert [entry.index for entry in pattern_set] == [0, 1]
+
+    def test_creation_with_flags(self, line_patterns):
+        pattern_set = PatternSet(line_patterns, flags=re.I)
+        assert pattern_set[0].flags == re.I
+        assert pattern_set.search('INTERFACE eth0 IS up') is not None
+
+    def test_search(self, line_patterns):
+        pattern_set = PatternSet(line_patterns)
+        result = pattern_set.search('  5 packets input')
+        assert result.entry.index == 1
+        assert result.groupdict == dict(packets='5')
+        assert pattern_set.search('no match') is None
+
+    def test_match_all(self):
+        pattern_set = PatternSet([
+            LinePattern('word(var_a) is word(var_b)'),
+            LinePattern('Interface word(var_name) is word(var_status)'),
+        ])
+        result = pattern_set.match_all('Interface eth0 is up')
+        assert [item.entry.index for item in result] == [0, 1]
+        assert result[1].groupdict == dict(name='eth0', status='up')
+
+    def test_iter_matches(self, line_patterns, test_lines):
+        pattern_set = PatternSet(line_patterns)
+        result = [
+            (item.line_index, item.entry.index, item.groupdict)
+            for item in pattern_set.iter_matches('\n'.join(test_lines))
+        ]
+        assert result == [
+            (0, 0, dict(name='eth0', status='up')),
+            (1, 1, dict(packets='100')),
+            (2, 0, dict(name='eth1', status='down')),
+        ]
+
+    def test_multiline_pattern(self):
+        user_data = ['Interface word(var_name)', 'digits(var_mtu) MTU']
+        pattern_set = PatternSet([MultilinePattern(user_data)])
+        assert pattern_set[0].user_data == user_data
+        result = pattern_set.search('Interface eth0\n1500 MTU')
+        assert result.groupdict == dict(name='eth0', mtu='1500')
+
+    def test_from_builder(self, test_lines):
+        user_data = 'Interface word(var_name) is word(var_status)'
+        builder = RegexBuilder(user_data=user_data, is_line=True)
+        builder.build()
+        pattern_set = PatternSet.from_builder(builder)
+        assert pattern_set[0].pattern == builder.patterns[0]
+        assert pattern_set[0].user_data == user_data
+        assert len(list(pattern_set.iter_matches(test_lines))) == 2
+
+    def test_get_candidates(self, line_patterns):
+        pattern_set = PatternSet(line_patterns + [LinePattern('digits(var_n)')])
+        assert pattern_set[0].literal == 'Interface '
+        candidates = pattern_set.get_candidates('Interface eth0 is up')
+        assert [entry.index for entry in candidates] == [0, 2]
+        assert [entry.index for entry in pattern_set.get_candidates('x')] == [2]
+
+    def test_get_candidates_with_prefix_literal(self, monkeypatch):
+        monkeypatch.setattr(PatternSet, 'scanner_threshold', 0)
+        pattern_set = PatternSet(['abc', 'abcdef', 'bcd', 'ab'])
+        assert pattern_set.scanner is not None
+        candidates = pattern_set.get_candidates('xabcdefx')
+        assert [entry.index for entry in candidates] == [0, 1, 2, 3]
+        result = pattern_set.match_all('xabcdefx')
+        assert [item.entry.index for item in result] == [0, 1, 2, 3]
+
+    def test_ignore_case_flags(self, line_patterns):
+        pattern_set = PatternSet(line_patterns, flags=re.I)
+        assert all(not entry.literal for entry in pattern_set)
+        assert len(pattern_set.match_all('interface eth0 IS up')) == 1
+
+    def test_invalid_pattern(self):
+        with pytest.raises(PatternSetError):
+            PatternSet(['(?P<a>x)(?P<a>y)'])
+
+    def test_iter_records(self, line_patterns, test_lines):
+        pattern_set = PatternSet(line_patterns)
+        lines = test_lines * 3
+        expected = list(pattern_set.iter_records(lines))
+        assert expected[1] == (1, [(1, dict(packets='100'))])
+        result = list(pattern_set.iter_records(lines, workers=2, chunk_size=2))
+        assert result == expected
@@ -0,0 +1,111 @@
+import copy
+import multiprocessing
+import pickle
+
+import pytest
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+from regexapp import MultilinePattern
+from regexapp import PatternBuilder
+from regexapp import TextPattern
+
+
+LINE_DATA = [
+    'Interface word(var_name) is word(var_status, or_empty)',
+    '  digits(var_packets) packets input, mac_address(var_mac)',
+]
+
+MULTILINE_DATA = ['Interface word(var_name)', 'digits(var_mtu) MTU in bytes']
+
+
+def build_patterns(data):
+    return [LinePattern(line, prepended_ws=True) for line in data]
+
+
+def build_multiline_pattern(data):
+    return MultilinePattern(data, ignore_case=True)
+
+
+def assert_same_pattern(result, expected):
+    assert type(result) is type(expected)
+    assert str(result) == str(expected)
+    assert vars(result).keys() == vars(expected).keys()
+    for name in ('text', 'or_empty', 'required_literal', 'ignore_case'):
+        if hasattr(expected, name):
+            assert getattr(result, name) == getattr(expected, name)
+    if hasattr(expected, 'variable'):
+        assert vars(result.variable) == vars(expected.variable)
+    if getattr(expected, 'compiled', None):
+        assert result.compiled.pattern == expected.compiled.pattern
+
+
+def assert_same_variables(result, expected):
+    assert [v.name for v in result.variables] == [v.name for v in expected.variables]
+    assert [v.pattern for v in result.variables] == [v.pattern for v in expected.variables]
+    assert [type(i) for i in result.items] == [type(i) for i in expected.items]
+    assert [str(i) for i in result.items] == [str(i) for i in expected.items]
+
+
+@pytest.mark.parametrize(
+    'pattern',
+    [
+        TextPattern('a b+c'),
+        ElementPattern('word(var_name, or_empty)'),
+        ElementPattern('start()'),
+        LinePattern(LINE_DATA[0], appended_ws=True),
+        MultilinePattern(MULTILINE_DATA, is_exact=True),
+        PatternBuilder(['abc_123', 'xyz.456'], var_name='v'),
+    ]
+)
+@pytest.mark.parametrize('clone', [pickle.loads, copy.copy, copy.deepcopy])
+def test_round_trip(pattern, clone):
+    result = clone(pickle.dumps(pattern)) if clone is pickle.loads else clone(pattern)
+    assert_same_pattern(result, pattern)
+    if isinstance(pattern, LinePattern):
+        assert_same_variables(result, pattern)
+
+
+def test_element_pattern_variable():
+    pattern = ElementPattern('digits(var_total)')
+    result = pickle.loads(pickle.dumps(pattern))
+    assert result.variable.name == 'total'
+    assert result.variable.pattern == pattern.variable.pattern
+
+
+@pytest.mark.parametrize(
+    ('data', 'expected_result', 'test_data'),
+    [
+        (
+            'a word(var_v, tail_just_ws) b',
+            r'a (?P<v>[a-zA-Z][a-zA-Z0-9]*)\s* b',
+            'a xyz  b'
+        ),
+        (
+            'x digits(var_n, head_just_ws) y',
+            r'x \s*(?P<n>\d+) y',
+            'x   12 y'
+        ),
+        (
+            'a mixed_phrase(var_v, or_either_2_spaces, tail_just_ws) b',
+            r'a (?P<v>( {2})|( *[\x21-\x7e]*[a-zA-Z0-9][\x21-\x7e]*'
+            r'( [\x21-\x7e]*[a-zA-Z0-9][\x21-\x7e]*)+ *))\s* b',
+            'a x1 y2 b'
+        ),
+    ]
+)
+def test_head_and_tail_of_element_in_middle_of_line(data, expected_result, test_data):
+    pattern = LinePattern(data)
+    assert pattern == expected_result
+    assert pattern.compiled.search(test_data)
+
+
+def test_patterns_from_worker_process():
+    with multiprocessing.Pool(processes=1) as pool:
+        patterns = pool.apply(build_patterns, (LINE_DATA,))
+        multiline_pattern = pool.apply(build_multiline_pattern, (MULTILINE_DATA,))
+
+    for result, expected in zip(patterns, build_patterns(LINE_DATA)):
+        assert_same_pattern(result, expected)
+        assert_same_variables(result, expected)
+    assert_same_pattern(multiline_pattern, build_multiline_pattern(MULTILINE_DATA))
@@ -0,0 +1,186 @@
+import copy
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from regexapp import PatternReference
+from regexapp.collection import LazyVersionedDict
+from regexapp.collection import ReferenceCache
+from regexapp.collection import SymbolCls
+from regexapp.exceptions import PatternReferenceError
+
+
+CONTENT = """
+abc_keyword:
+  group: "test"
+  description: "test"
+  pattern: "abc"
+"""
+
+
+@pytest.fixture
+def ref_file(tmp_path):
+    filename = tmp_path / 'user_references.yaml'
+    filename.write_text(CONTENT)
+    return str(filename)
+
+
+@pytest.fixture
+def ref():
+    return PatternReference()
+
+
+def touch(filename, offset):
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset))
+
+
+class TestPatternReferenceReload:
+    def test_unchanged_file_is_not_reloaded(self, ref, ref_file):
+        assert ref.load_reference(ref_file) is True
+        version = ref.version
+        assert ref.load_reference(ref_file) is False
+        assert ref.reload_count == 0
+        assert ref.version == version
+
+    def test_touched_file_is_not_reparsed(self, ref, ref_file):
+        ref.load_reference(ref_file)
+        touch(ref_file, 10 ** 9)
+        assert ref.load_reference(ref_file) is False
+        assert ref.reload_count == 0
+
+    def test_changed_file_is_reloaded(self, ref, ref_file):
+        ref.load_reference(ref_file)
+        with open(ref_file, 'w') as stream:
+            stream.write(CONTENT.replace('abc_keyword', 'xyz_keyword'))
+        touch(ref_file, 10 ** 9)
+
+        assert ref.load_reference(ref_file) is True
+        assert ref.reload_count == 1
+        assert 'abc_keyword' not in ref
+        assert ref['xyz_keyword']['pattern'] == 'abc'
+
+    def test_forced_reload(self, ref, ref_file):
+        ref.load_reference(ref_file)
+        assert ref.load_reference(ref_file, force=True) is True
+        assert ref.reload_count == 1
+        assert 'abc_keyword' in ref
+
+    def test_invalid_file(self, ref, tmp_path):
+        filename = tmp_path / 'invalid.yaml'
+        filename.write_text('- abc')
+        with pytest.raises(PatternReferenceError):
+            ref.load_reference(str(filename))
+        assert str(filename) not in ref.file_stats
+
+
+class TestReferenceCache:
+    def test_save_and_load(self, ref_file, tmp_path):
+        cache = ReferenceCache('test', [ref_file], dirname=str(tmp_path / 'cache'))
+        assert cache.load() is None
+        assert cache.save(dict(a=[1, 2])) is True
+        assert cache.load() == dict(a=[1, 2])
+
+        touch(ref_file, 10 ** 9)
+        assert cache.load() == dict(a=[1, 2])
+
+        with open(ref_file, 'a') as stream:
+            stream.write('\n')
+        assert cache.load() is None
+
+    def test_stale_header(self, ref_file, tmp_path, monkeypatch):
+        cache = ReferenceCache('test', [ref_file], dirname=str(tmp_path))
+        cache.save(dict(a=1))
+        monkeypatch.setattr(ReferenceCache, 'cache_version', 0)
+        assert cache.load() is None
+
+    def test_corrupted_file(self, ref_file, tmp_path):
+        cache = ReferenceCache('test', [ref_file], dirname=str(tmp_path))
+        with open(cache.filename, 'wb') as stream:
+            stream.write(b'corrupted')
+        assert cache.load() is None
+
+    def test_cached_pattern_reference(self, monkeypatch):
+        expected = PatternReference()
+        monkeypatch.setattr(ReferenceCache, 'is_enabled', False)
+        ref = PatternReference()
+        assert dict(ref) == dict(expected)
+        assert ref.file_stats == expected.file_stats
+        assert ref.file_keys == expected.file_keys
+
+
+class TestLazyReference:
+    def test_lazy_pattern_reference(self):
+        ref = PatternReference(is_lazy=True)
+        assert ref.is_loaded is False
+        assert ref.version == 0
+        assert 'digits' in ref
+        assert ref.is_loaded is True
+        assert ref.version == 0
+        assert dict(ref) == dict(PatternReference())
+
+    def test_lazy_symbol(self):
+        symbol = SymbolCls(is_lazy=True)
+        assert symbol.is_loaded is False
+        assert symbol.get('left_square_bracket') == SymbolCls()['left_square_bracket']
+        assert symbol.version == 0
+
+    def test_lazy_copy(self):
+        ref = PatternReference(is_lazy=True)
+        result = copy.deepcopy(ref)
+        assert ref.is_loaded is True
+        assert dict(result) == dict(ref)
+        result = pickle.loads(pickle.dumps(PatternReference(is_lazy=True)))
+        assert result['digits'] == ref['digits']
+
+    def test_lazy_modification(self):
+        ref = PatternReference(is_lazy=True)
+        ref['xyz_keyword'] = dict(pattern='xyz')
+        assert 'digits' in ref
+        assert ref.version == 1
+
+    def test_concurrent_lazy_loading(self):
+        class SlowDict(LazyVersionedDict):
+            def load_content(self):
+                self.update(a=1)
+                time.sleep(0.05)
+                self.update(b=self['a'] + 1)
+
+        slow_dict = SlowDict(is_lazy=True)
+        barrier = threading.Barrier(8)
+
+        def read(_):
+            barrier.wait()
+            return slow_dict['b']
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert list(executor.map(read, range(8))) == [2] * 8
+        assert slow_dict.is_loaded is True
+        assert slow_dict.version == 0
+
+    def test_concurrent_lazy_reference(self):
+        ref = PatternReference(is_lazy=True)
+        barrier = threading.Barrier(8)
+
+        def read(_):
+            barrier.wait()
+            return ref['word']['pattern']
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(read, range(8)))
+        assert results == [PatternReference()['word']['pattern']] * 8
+
+    def test_failed_lazy_loading(self):
+        class FailedDict(LazyVersionedDict):
+            def load_content(self):
+                raise PatternReferenceError('failed')
+
+        failed_dict = FailedDict(is_lazy=True)
+        with pytest.raises(PatternReferenceError):
+            len(failed_dict)
+        assert failed_dict.is_loaded is False
+        assert failed_dict.is_loading() is False
@@ -0,0 +1,119 @@
+import re
+
+import pytest
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+from regexapp import PatternBuilder
+from regexapp.collection import REF
+from regexapp.collection import PatternSimplifier
+from regexapp.collection import simplify_pattern
+
+from tests.unit.collection import test_collection1
+from tests.unit.collection import test_collection1a
+from tests.unit.collection import test_collection1b
+from tests.unit.collection import test_collection1c
+from tests.unit.collection import test_collection1d
+from tests.unit.collection import test_collection2
+from tests.unit.collection import test_collection3
+
+
+def get_parametrized_args(test_func):
+    mark, = [mark for mark in test_func.pytestmark if mark.name == 'parametrize']
+    return mark.args[1]
+
+
+def get_corpus():
+    patterns = []
+    for test_func in [
+        test_collection1.TestElementPattern.test_element_pattern,
+        test_collection1a.TestElementPatternA.test_element_pattern_combining_other_flag,
+        test_collection1b.TestElementPattern.test_element_pattern,
+        test_collection1c.TestElementPatternC.test_element_pattern_misc,
+        test_collection1d.TestElementPatternD.test_datetime_element_pattern,
+    ]:
+        patterns.extend(ElementPattern(data) for data, _ in get_parametrized_args(test_func))
+
+    texts = [
+        'GigabitEthernet0/0/1 is up', 'TenGigE0/0/0/1 is administratively down',
+        'Mon Jan 15 10:20:30 2024', '2024-01-15 10:20:30.123', '11:22:33:44:55:66',
+        '1a2b.3c4d.5e6f', '192.168.1.254', 'fe80::1', '-12.5%', '+1,234.56', 'N/A', '',
+        ' \t ', 'abc  def', 'a->b', 'file.txt -> /tmp/file.txt',
+    ]
+    test_func = test_collection2.TestLinePattern.test_line_pattern
+    for test_data, user_data, _, prepended_ws, appended_ws, ignore_case, _ in get_parametrized_args(test_func):
+        texts.append(test_data)
+        patterns.append(
+            LinePattern(
+                user_data, prepended_ws=prepended_ws,
+                appended_ws=appended_ws, ignore_case=ignore_case
+            )
+        )
+
+    test_func = test_collection3.TestPatternBuilder.test_pattern_builder
+    for test_data, _, var_name, word_bound in get_parametrized_args(test_func):
+        texts.extend(test_data)
+        patterns.append(PatternBuilder(test_data, var_name=var_name, word_bound=word_bound))
+
+    for node in REF.values():
+        if isinstance(node, dict) and node.get('pattern'):
+            patterns.append(node.get('pattern'))
+
+    texts.extend(word for text in list(texts) for word in text.split())
+    return patterns, texts
+
+
+class TestPatternSimplifier:
+    @pytest.mark.parametrize(
+        ('pattern', 'expected_result'),
+        [
+            ('((x))y', 'xy'),
+            ('a((b|c))d', 'a(b|c)d'),
+            ('(?P<n>(a|b))', '(?P<n>a|b)'),
+            ('(?P<n>((x)))', '(?P<n>x)'),
+            ('(?P<n>(up|down)|)', '(?P<n>up|down|)'),
+            (r'(\s)+', r'\s+'),
+            (r'(?:\s+)*x', r'(?:\s+)*x'),
+            (r'\s*\s+', r'\s+'),
+            (r'\s+ *', r'\s+'),
+            (r' *\s*', r'\s*'),
+            (' * *', ' *'),
+            (' +\\s{2,}', ' +\\s{2,}'),
+            (r'\s* +', r'\s* +'),
+            ('a  b', 'a  b'),
+            ('(a|b|a)', '(a|b)'),
+            (r'(a)\1(?:b)(c)', r'(a)\1b(c)'),
+            ('(?=(a|b))c', '(?=a|b)c'),
+            ('[(|)]+(q)', '[(|)]+q'),
+            ('(?x)(a) b', '(?x)(a) b'),
+            ('(^)?a', '(^)?a'),
+        ]
+    )
+    def test_simplify(self, pattern, expected_result):
+        assert PatternSimplifier(pattern).simplify() == expected_result
+
+    def test_keeping_pattern_class(self):
+        pattern = LinePattern('mac_address(var_addr) is choice(up, down, var_status)')
+        new_pattern = simplify_pattern(pattern)
+        assert type(new_pattern) is LinePattern
+        assert len(new_pattern) < len(pattern)
+        assert new_pattern.required_literal == pattern.required_literal
+        assert new_pattern.compiled.pattern == new_pattern
+        assert new_pattern.compiled.groupindex.keys() == pattern.compiled.groupindex.keys()
+
+    def test_same_match_on_test_corpus(self):
+        patterns, texts = get_corpus()
+        total_simplified = 0
+        for pattern in patterns:
+            new_pattern = simplify_pattern(pattern)
+            total_simplified += new_pattern != pattern
+            compiled, new_compiled = re.compile(pattern), re.compile(new_pattern)
+            for text in texts:
+                for method in ['search', 'match', 'fullmatch']:
+                    match = getattr(compiled, method)(text)
+                    new_match = getattr(new_compiled, method)(text)
+                    assert bool(match) is bool(new_match), (pattern, new_pattern, text)
+                    if match:
+                        assert match.span() == new_match.span()
+                        assert match.groupdict() == new_match.groupdict()
+        assert total_simplified > 50
@@ -0,0 +1,74 @@
+import itertools
+import re
+
+import pytest
+
+from regexapp import ElementPattern
+from regexapp import LinePattern
+
+
+def get_flat_pattern(options, name='v'):
+    flat = '|'.join(re.escape(option) for option in options)
+    return '(?P<{}>{})'.format(name, flat)
+
+
+class TestFactoredAlternation:
+    @pytest.mark.parametrize(
+        ('data', 'expected_result'),
+        [
+            (
+                'choice(GigabitEthernet, GigE, TenGigE, TenGigabitEthernet, var_intf)',
+                '(?P<intf>Gig(?:abitEthernet|E)|TenGig(?:E|abitEthernet))'
+            ),
+            ('choice(Gi0/1.100, Gi0/1, var_v)', r'(?P<v>Gi0/1(?:\.100)?)'),
+            ('choice(up, upper, var_v)', '(?P<v>up(?:per)??)'),
+            ('choice(Gi0/1, Gi0/1.100, Gi0/10, var_v)', r'(?P<v>Gi0/1(?:\.100|0)??)'),
+            ('choice(ab, x, ac, var_v)', '(?P<v>a(?:b|c)|x)'),
+            ('choice(a b, a c)', '(a (?:b|c))'),
+            ('choice(up, admin up, admin down, var_v, or_empty)', '(?P<v>(up|admin (?:up|down))|)'),
+            ('choice(up, down, var_v)', '(?P<v>up|down)'),
+        ]
+    )
+    def test_factored_pattern(self, data, expected_result):
+        assert ElementPattern(data) == expected_result
+
+    @pytest.mark.parametrize(
+        'lst',
+        [
+            ['ab', 'B', 'Ac'],      # B can match b with ignore case
+            ['ab', r'\d+', 'ac'],
+            ['ab', '', 'ac'],
+        ]
+    )
+    def test_not_reordered_across_conflict(self, lst):
+        assert ElementPattern.factor_alternatives(lst) == lst
+
+    def test_not_factored_without_enclosure(self):
+        pattern = LinePattern('Interface choice(up, upper) now')
+        assert pattern == 'Interface up|upper now'
+
+    @pytest.mark.parametrize(
+        'options',
+        [
+            ['GigabitEthernet', 'GigE', 'TenGigE', 'TenGigabitEthernet', 'Gi'],
+            ['Gi0/1', 'Gi0/1.100', 'Gi0/10', 'G', 'gi0/1'],
+            ['abc', 'ab', 'a', 'b', 'abd', 'Abc', 'x.y', 'x-y'],
+        ]
+    )
+    @pytest.mark.parametrize('ignore_case', [False, True])
+    def test_same_match_as_flat_alternation(self, options, ignore_case):
+        flags = re.I if ignore_case else 0
+        chars = sorted(set(''.join(options)))[:6]
+        texts = [''.join(item) for n in range(1, 5) for item in itertools.product(chars, repeat=n)]
+        texts.extend(options)
+        for lst in itertools.permutations(options, 4):
+            data = 'choice({}, var_v)'.format(', '.join(lst))
+            pattern = re.compile(ElementPattern(data), flags)
+            flat_pattern = re.compile(get_flat_pattern(lst), flags)
+            for text in texts:
+                match = pattern.match(text)
+                expected_match = flat_pattern.match(text)
+                assert bool(match) is bool(expected_match)
+                if match:
+                    assert match.span() == expected_match.span()
+                    assert match.groupdict() == expected_match.groupdict()
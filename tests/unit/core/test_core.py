@@ -32,6 +32,10 @@ Tests
 TestRegexBuilder.test_regex_builder_creation
     Verifies that `RegexBuilder` builds and tests regex patterns
     correctly, producing a report identical to the expected output.
+TestRegexBuilder.test_regex_builder_with_deferred_validation
+    Verifies that deferred validation mode produces the same report.
+TestRegexBuilder.test_regex_builder_mapping_tables_order
+    Verifies that mapping tables are filled in pattern order.
 test_add_reference
     Confirms that custom references can be added and used in regex
     pattern creation, producing the expected report.
@@ -172,6 +176,46 @@ class TestRegexBuilder:
         expected_test_report = get_test_report()
         assert factory.test_report == expected_test_report
 
+    def test_regex_builder_with_deferred_validation(self):
+        """
+            Verifies that `RegexBuilder` in deferred validation mode builds
+            the same patterns, each compiled once, and the same report.
+        """
+        factory = RegexBuilder(
+            user_data=get_user_data(),
+            test_data=get_test_data(),
+            is_line=True,
+            deferred_validation=True
+        )
+        factory.build()
+        factory.test()
+
+        assert all(pattern.compiled for pattern in factory.patterns)
+        assert factory.test_result is True
+        expected_test_report = get_test_report()
+        assert factory.test_report == expected_test_report
+
+    def test_regex_builder_mapping_tables_order(self):
+        """
+            Verifies that mapping tables keep pattern order, then test data
+            order, when a later line matches an earlier pattern.
+        """
+        factory = RegexBuilder(
+            user_data='word(var_a) is up\ndigits(var_b) packets',
+            test_data='100 packets\neth0 is up\n200 packets',
+            is_line=True
+        )
+        factory.build()
+        factory.test()
+
+        assert factory.test_result is True
+        assert list(factory.test_data_pattern_table) == [
+            'eth0 is up', '100 packets', '200 packets'
+        ]
+        assert list(factory.pattern_test_data_table.values()) == [
+            'eth0 is up', '200 packets'
+        ]
+
 
 def test_add_reference():
     """
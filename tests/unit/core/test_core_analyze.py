@@ -0,0 +1,70 @@
+"""
+Unit tests for complexity analysis of `RegexBuilder` patterns.
+
+Tests
+-----
+TestRegexBuilderAnalyze.test_analyze
+    Verifies that every built pattern is analyzed in order.
+TestRegexBuilderAnalyze.test_check_complexity
+    Verifies that `build` rejects an exponential pattern on request.
+TestRegexBuilderAnalyze.test_check_complexity_of_update_and_build_many
+    Verifies that `update` and `build_many` reject it as `build` does.
+TestRegexBuilderAnalyze.test_analyze_request
+    Verifies that the CLI analyze request reports and fails.
+"""
+
+import pytest
+
+from regexapp import RegexBuilder
+from regexapp.daemon import process_request
+from regexapp.exceptions import RegexBuilderError
+
+
+USER_DATA = 'Interface word(var_name) is up\nvlans comma_words(var_vlans)'
+
+
+class TestRegexBuilderAnalyze:
+    def test_analyze(self):
+        factory = RegexBuilder(user_data=USER_DATA, is_line=True)
+        factory.build()
+        assert factory.analyses == []
+        analyses = factory.analyze()
+        assert [analysis.level for analysis in analyses] == ['linear', 'exponential']
+        assert analyses[1].pattern == factory.patterns[1]
+
+    def test_check_complexity(self):
+        factory = RegexBuilder(user_data=USER_DATA, is_line=True, check_complexity=True)
+        with pytest.raises(RegexBuilderError) as ex:
+            factory.build()
+        assert 'nested-quantifier' in str(ex.value)
+        assert len(factory.patterns) == 2
+
+        factory = RegexBuilder(
+            user_data='Interface word(var_name) is up', is_line=True, check_complexity=True
+        )
+        factory.build()
+        assert factory.analyses[0].is_safe
+
+    def test_check_complexity_of_update_and_build_many(self):
+        user_data = 'word(var_a, repetition_1_) x'
+        factory = RegexBuilder(
+            user_data='Interface word(var_name) is up', is_line=True, check_complexity=True
+        )
+        factory.build()
+        with pytest.raises(RegexBuilderError) as ex:
+            factory.update(user_data)
+        assert 'nested-quantifier' in str(ex.value)
+
+        with pytest.raises(RegexBuilderError) as ex:
+            RegexBuilder.build_many(['Interface up', user_data], is_line=True, check_complexity=True)
+        assert 'nested-quantifier' in str(ex.value)
+
+        batch = RegexBuilder.build_many([user_data], is_line=True)
+        assert batch.results[0].analyses == []
+
+    def test_analyze_request(self):
+        request = dict(command='analyze', user_data=USER_DATA, kwargs=dict(is_line=True))
+        ecode, output = process_request(request)
+        assert ecode == 1
+        assert output.count('pattern: ') == 2
+        assert 'complexity: exponential' in output
@@ -0,0 +1,57 @@
+"""
+Unit tests for batch build of `RegexBuilder`.
+
+Tests
+-----
+TestRegexBuilderBatch.test_build_many_equals_build
+    Verifies that every builder of a batch matches an individual build.
+TestRegexBuilderBatch.test_build_many_statistics
+    Verifies unique ratio and phases of a batch.
+TestRegexBuilderBatch.test_build_many_with_invalid_data
+    Verifies that invalid user data raises `RegexBuilderError`.
+"""
+
+import pytest
+
+from regexapp import RegexBuilder
+from regexapp.exceptions import RegexBuilderError
+
+
+SNIPPETS = [
+    '=====\nInterface word(var_name) is word(var_status)\n\n=====',
+    '=====\ndigits(var_packets) packets input\nInterface word(var_name) is word(var_status)',
+    ['=====', 'mac_address(var_mac)'],
+]
+
+
+class TestRegexBuilderBatch:
+    @pytest.mark.parametrize(
+        'options',
+        [
+            dict(is_line=True),
+            dict(is_line=True, prepended_ws=True, deferred_validation=True),
+            dict(ignore_case=True),
+        ]
+    )
+    def test_build_many_equals_build(self, options):
+        batch = RegexBuilder.build_many(SNIPPETS, **options)
+        assert len(batch) == len(SNIPPETS)
+        for factory, user_data in zip(batch, SNIPPETS):
+            expected = RegexBuilder(user_data=user_data, **options)
+            expected.build()
+            assert factory.user_data == user_data
+            assert factory.patterns == expected.patterns
+            assert factory.user_data_pattern_table == expected.user_data_pattern_table
+            assert factory.pattern_user_data_table == expected.pattern_user_data_table
+
+    def test_build_many_statistics(self):
+        batch = RegexBuilder.build_many(SNIPPETS, is_line=True)
+        result = batch.to_dict()
+        assert result['total'] == 9
+        assert result['unique_total'] == 5
+        assert result['unique_ratio'] == pytest.approx(5 / 9)
+        assert result['elapsed'] >= sum(result['timings'].values()) - 1e-9
+
+    def test_build_many_with_invalid_data(self):
+        with pytest.raises(RegexBuilderError):
+            RegexBuilder.build_many(['abc', 123], is_line=True)
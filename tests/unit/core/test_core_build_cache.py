@@ -0,0 +1,141 @@
+"""
+Unit tests for the persistent build cache of `RegexBuilder`.
+
+Tests
+-----
+TestBuildCache.test_build_from_cache
+    Verifies that a second build loads patterns, variables, and mapping
+    tables from cache.
+TestBuildCache.test_key_of_options
+    Verifies that build options and user data are part of a cache key.
+TestBuildCache.test_key_of_references
+    Verifies that a change of pattern references is a cache miss.
+TestBuildCache.test_corrupted_file
+    Verifies that an unreadable cache file is a miss and is rewritten.
+TestBuildCache.test_eviction
+    Verifies that least recently used files are removed over size limit.
+TestBuildCache.test_save_without_scanning
+    Verifies that a save under size limit does not scan the cache directory.
+TestBuildCache.test_concurrent_processes
+    Verifies that processes sharing a cache directory read whole entries.
+"""
+
+import multiprocessing
+import os
+
+import pytest
+
+from regexapp import RegexBuilder
+from regexapp.collection import BuildCache
+from regexapp.core import add_reference
+from regexapp.core import remove_reference
+
+
+USER_DATA = 'Interface word(var_name) is word(var_status)\ndigits(var_packets) packets input'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BuildCache(dirname=str(tmp_path / 'build'))
+
+
+def build(cache, user_data=USER_DATA, **kwargs):
+    kwargs.setdefault('is_line', True)
+    factory = RegexBuilder(user_data=user_data, build_cache=cache, **kwargs)
+    factory.build()
+    return factory
+
+
+def save_and_load(dirname, index):
+    cache = BuildCache(dirname=dirname, max_size=4096)
+    for number in range(30):
+        key = cache.get_key('entry {}'.format(number % 5), index=index % 2)
+        cache.save(key, ['x' * 512, number % 5])
+        obj = cache.load(key)
+        if obj is not None and obj[0] != 'x' * 512:
+            return False
+    return True
+
+
+def get_entries_size(entries):
+    return sum(size for _, size, _ in entries)
+
+
+class TestBuildCache:
+    def test_build_from_cache(self, cache):
+        first = build(cache)
+        second = build(cache)
+        assert first.is_cached is False
+        assert second.is_cached is True
+        assert cache.hits == 1
+        assert list(second.patterns) == list(first.patterns)
+        assert vars(second.patterns[0].variables[0]) == vars(first.patterns[0].variables[0])
+        assert second.user_data_pattern_table == first.user_data_pattern_table
+        assert list(second.pattern_user_data_table) == list(first.pattern_user_data_table)
+        assert second.update(USER_DATA) == 0
+
+    def test_key_of_options(self, cache):
+        build(cache)
+        assert build(cache, ignore_case=True).is_cached is False
+        assert build(cache, prepended_ws=True).is_cached is False
+        assert build(cache, user_data=USER_DATA + '\nfoo').is_cached is False
+        assert build(cache, deferred_validation=True).is_cached is True
+
+    def test_key_of_references(self, cache):
+        user_data = 'Interface word(var_name) is word(var_status)'
+        key = cache.get_key(user_data)
+        add_reference(name='cache_test_state', pattern='up|down')
+        try:
+            assert cache.get_key(user_data) != key
+        finally:
+            remove_reference(name='cache_test_state')
+        assert cache.get_key(user_data) == key
+
+    def test_corrupted_file(self, cache):
+        factory = build(cache)
+        key = cache.get_key(USER_DATA, **factory.get_build_options())
+        with open(cache.get_filename(key), 'wb') as stream:
+            stream.write(b'corrupted')
+        assert build(cache).is_cached is False
+        assert build(cache).is_cached is True
+
+    def test_eviction(self, tmp_path):
+        cache = BuildCache(dirname=str(tmp_path), max_size=2000)
+        for index in range(10):
+            filename = cache.get_filename('key{}'.format(index))
+            cache.save('key{}'.format(index), 'x' * 400)
+            os.utime(filename, (index, index))
+        assert cache.get_size() <= 2000
+        assert cache.evictions > 0
+        assert cache.load('key9') == 'x' * 400
+        assert cache.load('key0') is None
+        assert cache.clear() > 0
+        assert cache.get_entries() == []
+
+    def test_save_without_scanning(self, tmp_path, monkeypatch):
+        cache = BuildCache(dirname=str(tmp_path), max_size=8000)
+        get_entries = cache.get_entries
+        counter = dict(total=0)
+
+        def counting_get_entries():
+            counter['total'] += 1
+            return get_entries()
+
+        monkeypatch.setattr(cache, 'get_entries', counting_get_entries)
+        for index in range(10):
+            cache.save('key{}'.format(index), 'x' * 400)
+        assert counter['total'] == 1
+        assert cache.total_size == get_entries_size(get_entries())
+
+        for index in range(10, 20):
+            cache.save('key{}'.format(index), 'x' * 400)
+        assert cache.evictions > 0
+        assert counter['total'] == 2
+        assert cache.total_size == get_entries_size(get_entries()) <= 8000
+
+    def test_concurrent_processes(self, tmp_path):
+        dirname = str(tmp_path)
+        with multiprocessing.Pool(3) as pool:
+            result = pool.starmap(save_and_load, [(dirname, index) for index in range(3)])
+        assert result == [True, True, True]
+        assert not [name for name in os.listdir(dirname) if name.endswith('.tmp')]
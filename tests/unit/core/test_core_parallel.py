@@ -0,0 +1,49 @@
+"""
+Unit tests for parallel test execution of `RegexBuilder`.
+
+Tests
+-----
+TestRegexBuilderParallel.test_parallel_equals_serial
+    Verifies that sharded test data gives the same report and tables.
+TestRegexBuilderParallel.test_parallel_with_unmatched_pattern
+    Verifies that a pattern without a match fails in parallel mode.
+"""
+
+from regexapp import RegexBuilder
+
+
+USER_DATA = 'Interface word(var_name) is word(var_status)\ndigits(var_packets) packets input'
+
+TEST_DATA = [
+    'Interface eth{} is {}'.format(index, 'up' if index % 2 else 'down')
+    if index % 3 else '  {} packets input'.format(index)
+    for index in range(40)
+]
+
+
+def run_test(test_data, workers):
+    factory = RegexBuilder(user_data=USER_DATA, test_data=test_data, is_line=True)
+    factory.build()
+    test_result = factory.test(workers=workers)
+    return factory, test_result
+
+
+class TestRegexBuilderParallel:
+    def test_parallel_equals_serial(self):
+        serial, serial_result = run_test(TEST_DATA, workers=1)
+        parallel, parallel_result = run_test(TEST_DATA, workers=2)
+
+        assert parallel_result is serial_result is True
+        assert parallel.test_report == serial.test_report
+        assert parallel.test_summary == serial.test_summary
+        assert parallel.test_data_pattern_table == serial.test_data_pattern_table
+        assert parallel.pattern_test_data_table == serial.pattern_test_data_table
+        expected = [pattern.line_indices for pattern in serial.match_report.patterns]
+        result = [pattern.line_indices for pattern in parallel.match_report.patterns]
+        assert result == expected
+
+    def test_parallel_with_unmatched_pattern(self):
+        test_data = ['Interface eth0 is up', 'Interface eth1 is down']
+        factory, test_result = run_test(test_data, workers=2)
+        assert test_result is False
+        assert factory.test_summary['counts'] == [2, 0]
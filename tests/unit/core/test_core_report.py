@@ -0,0 +1,86 @@
+"""
+Unit tests for structured test results of `RegexBuilder`.
+
+Tests
+-----
+TestMatchReport.test_text_report
+    Verifies that the text report is rendered lazily in the test format.
+TestMatchReport.test_json_report
+    Verifies per-pattern counts, line indices, groupdicts, and timing.
+TestMatchReport.test_ndjson_report
+    Verifies a summary record followed by a record per pattern.
+TestMatchReport.test_write_report
+    Verifies that a report is written to a stream chunk by chunk.
+TestMatchReport.test_stream_report
+    Verifies that a streamed report keeps counts only.
+TestMatchReport.test_unsupported_format
+    Verifies that an unknown format raises `MatchReportError`.
+"""
+
+import io
+import json
+
+import pytest
+
+from regexapp import RegexBuilder
+from regexapp.constant import FORMATTYPE
+from regexapp.exceptions import MatchReportError
+
+
+USER_DATA = 'Interface word(var_name) is word(var_status)\ndigits(var_packets) packets input'
+
+TEST_DATA = 'Interface eth0 is up\n  100 packets input\nsome log line\nInterface eth1 is down'
+
+
+@pytest.fixture
+def builder():
+    factory = RegexBuilder(user_data=USER_DATA, test_data=TEST_DATA, is_line=True)
+    factory.build()
+    factory.test()
+    return factory
+
+
+class TestMatchReport:
+    def test_text_report(self, builder):
+        assert builder.test_result is True
+        assert builder._test_report is None
+        report = builder.test_report
+        assert report.startswith('Test Data:\n---------\nInterface eth0 is up\n')
+        assert "matched: [{'name': 'eth0', 'status': 'up'}, " in report
+        assert str(builder.match_report) == report
+
+    def test_json_report(self, builder):
+        result = json.loads(builder.match_report.render(FORMATTYPE.JSON))
+        assert result['result'] is True
+        assert result['total'] == 4
+        assert result['matched'] == 3
+        assert result['elapsed'] >= 0
+        first, second = result['patterns']
+        assert first['count'] == 2
+        assert first['line_indices'] == [0, 3]
+        assert first['groupdicts'][1] == dict(name='eth1', status='down')
+        assert second['user_data'] == 'digits(var_packets) packets input'
+        assert second['line_indices'] == [1]
+
+    def test_ndjson_report(self, builder):
+        lines = builder.match_report.render('jsonl').splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [record['type'] for record in records] == ['summary', 'pattern', 'pattern']
+        assert [record['count'] for record in records[1:]] == [2, 1]
+
+    def test_write_report(self, builder):
+        stream = io.StringIO()
+        builder.match_report.write(stream, fmt=FORMATTYPE.NDJSON)
+        assert stream.getvalue() == builder.match_report.render(FORMATTYPE.NDJSON)
+
+    def test_stream_report(self, builder):
+        builder.test_stream(io.StringIO(TEST_DATA))
+        result = builder.match_report.to_dict()
+        assert result['total'] == 4
+        assert result['patterns'][0]['count'] == 2
+        assert 'line_indices' not in result['patterns'][0]
+        assert builder.test_summary['counts'] == [2, 1]
+
+    def test_unsupported_format(self, builder):
+        with pytest.raises(MatchReportError):
+            builder.match_report.render('csv')
@@ -0,0 +1,63 @@
+"""
+Unit tests for simplified patterns of `RegexBuilder`.
+
+Tests
+-----
+TestRegexBuilderSimplify.test_simplified_patterns
+    Verifies that simplified patterns are shorter and match the same.
+TestRegexBuilderSimplify.test_build_options
+    Verifies that `simplified` is a build option and a fingerprint part.
+TestRegexBuilderSimplify.test_build_many_and_update
+    Verifies that `build_many` and `update` simplify patterns as `build`.
+"""
+
+from regexapp import LinePattern
+from regexapp import RegexBuilder
+
+
+USER_DATA = 'Interface word(var_name) is choice(up, down, var_status)\n  inet ipv4_address(var_addr)'
+
+TEST_DATA = 'Interface eth0 is up\n  inet 10.0.0.1'
+
+
+class TestRegexBuilderSimplify:
+    def test_simplified_patterns(self):
+        factory = RegexBuilder(user_data=USER_DATA, test_data=TEST_DATA, is_line=True)
+        factory.build()
+        simplified_factory = RegexBuilder(
+            user_data=USER_DATA, test_data=TEST_DATA, is_line=True, simplified=True
+        )
+        simplified_factory.build()
+
+        pattern, simplified_pattern = factory.patterns[1], simplified_factory.patterns[1]
+        assert isinstance(simplified_pattern, LinePattern)
+        assert len(simplified_pattern) < len(pattern)
+        assert simplified_factory.patterns[0] == factory.patterns[0]
+
+        assert factory.test(showed=False) is True
+        assert simplified_factory.test(showed=False) is True
+        assert simplified_factory.test_summary == factory.test_summary
+        groupdicts = [report.groupdicts for report in factory.match_report.patterns]
+        simplified_groupdicts = [report.groupdicts for report in simplified_factory.match_report.patterns]
+        assert simplified_groupdicts == groupdicts
+
+    def test_build_options(self):
+        factory = RegexBuilder(user_data=USER_DATA, is_line=True, simplified=True)
+        assert factory.get_build_options()['simplified'] is True
+        other_factory = RegexBuilder(user_data=USER_DATA, is_line=True)
+        assert factory.get_fingerprint('a') != other_factory.get_fingerprint('a')
+
+    def test_build_many_and_update(self):
+        user_data = 'Interface word(var_name) is word(var_status, or_empty)'
+        factory = RegexBuilder(user_data=user_data, is_line=True, simplified=True)
+        factory.build()
+        assert factory.patterns[0].endswith('(?P<status>[a-zA-Z][a-zA-Z0-9]*|)')
+
+        batch = RegexBuilder.build_many([user_data, user_data], is_line=True, simplified=True)
+        for builder in batch.results:
+            assert builder.patterns == factory.patterns
+            assert builder.pattern_fingerprint_table == factory.pattern_fingerprint_table
+
+        builder = batch.results[0]
+        assert builder.update([user_data, 'Interface word(var_name)']) == 1
+        assert builder.patterns[0] == factory.patterns[0]
@@ -0,0 +1,90 @@
+"""
+Unit tests for streaming test mode of `RegexBuilder`.
+
+Tests
+-----
+TestRegexBuilderStream.test_stream_from_file_path
+    Verifies that a file path is tested line by line.
+TestRegexBuilderStream.test_stream_from_file_object
+    Verifies that a file object is tested line by line.
+TestRegexBuilderStream.test_stream_from_iterator
+    Verifies that `test` delegates an iterator of lines to `test_stream`.
+TestRegexBuilderStream.test_iter_test_events
+    Verifies that match events carry line index, pattern, and groups.
+TestRegexBuilderStream.test_stream_with_callback
+    Verifies that a callback receives every match event.
+TestRegexBuilderStream.test_stream_with_unmatched_pattern
+    Verifies that the summary reports a pattern without a match.
+TestRegexBuilderStream.test_stream_with_empty_data
+    Verifies that an empty source fails as in `test`.
+"""
+
+import io
+
+import pytest
+
+from regexapp import RegexBuilder
+
+
+USER_DATA = 'Interface word(var_name) is word(var_status)\ndigits(var_packets) packets input'
+
+TEST_DATA = """Interface eth0 is up
+  100 packets input
+some log line
+Interface eth1 is down
+"""
+
+
+@pytest.fixture
+def builder():
+    factory = RegexBuilder(user_data=USER_DATA, is_line=True)
+    factory.build()
+    return factory
+
+
+class TestRegexBuilderStream:
+    def test_stream_from_file_path(self, builder, tmp_path):
+        filename = tmp_path / 'test_data.txt'
+        filename.write_text(TEST_DATA)
+
+        assert builder.test_stream(str(filename)) is True
+        assert builder.test_summary['total'] == 4
+        assert builder.test_summary['matched'] == 3
+        assert builder.test_summary['counts'] == [2, 1]
+        assert 'some log line' not in builder.test_report
+        assert 'total test data: 4' in builder.test_report
+
+    def test_stream_from_file_object(self, builder):
+        assert builder.test_stream(io.StringIO(TEST_DATA)) is True
+        assert builder.test_summary['counts'] == [2, 1]
+
+    def test_stream_from_iterator(self, builder):
+        builder.test_data = iter(TEST_DATA.splitlines(keepends=True))
+        assert builder.test() is True
+        assert builder.test_summary['counts'] == [2, 1]
+
+    def test_iter_test_events(self, builder):
+        events = list(builder.iter_test(io.StringIO(TEST_DATA)))
+        result = [
+            (event.line_index, event.entry.index, event.groupdict)
+            for event in events
+        ]
+        assert result == [
+            (0, 0, dict(name='eth0', status='up')),
+            (1, 1, dict(packets='100')),
+            (3, 0, dict(name='eth1', status='down')),
+        ]
+        assert builder.test_result is True
+
+    def test_stream_with_callback(self, builder):
+        events = []
+        builder.test_stream(io.StringIO(TEST_DATA), callback=events.append)
+        assert [event.line_index for event in events] == [0, 1, 3]
+
+    def test_stream_with_unmatched_pattern(self, builder):
+        assert builder.test_stream(['Interface eth0 is up']) is False
+        assert 'matched: NO' in builder.test_report
+
+    def test_stream_with_empty_data(self, builder):
+        assert builder.test_stream(iter([])) is False
+        assert builder.test_report == 'CANT run test with an empty data.'
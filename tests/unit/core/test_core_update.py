@@ -0,0 +1,80 @@
+"""
+Unit tests for incremental rebuild of `RegexBuilder`.
+
+Tests
+-----
+TestRegexBuilderUpdate.test_update_equals_full_rebuild
+    Verifies that patterns and mapping tables match a full rebuild.
+TestRegexBuilderUpdate.test_update_converts_changed_lines_only
+    Verifies that unchanged lines reuse their patterns.
+TestRegexBuilderUpdate.test_update_after_reference_change
+    Verifies that a reference change invalidates fingerprints.
+TestRegexBuilderUpdate.test_update_with_empty_data
+    Verifies that empty user data clears patterns.
+"""
+
+import pytest
+
+from regexapp import RegexBuilder
+from regexapp.collection import REF
+
+
+LINES = [
+    'Interface word(var_name) is word(var_status)',
+    '  digits(var_packets) packets input',
+    '=====',
+    'MTU digits(var_mtu) bytes',
+]
+
+
+def build(user_data, **kwargs):
+    factory = RegexBuilder(user_data=user_data, **kwargs)
+    factory.build()
+    return factory
+
+
+def assert_same_build(factory, expected):
+    assert factory.patterns == expected.patterns
+    assert factory.user_data_pattern_table == expected.user_data_pattern_table
+    assert factory.pattern_user_data_table == expected.pattern_user_data_table
+    assert list(factory.user_data_pattern_table) == list(expected.user_data_pattern_table)
+
+
+class TestRegexBuilderUpdate:
+    @pytest.mark.parametrize(
+        'kwargs',
+        [
+            dict(is_line=True),
+            dict(is_line=True, prepended_ws=True, deferred_validation=True),
+            dict(is_line=False),
+        ]
+    )
+    def test_update_equals_full_rebuild(self, kwargs):
+        factory = build('\n'.join(LINES), **kwargs)
+        new_lines = [LINES[3], 'Port word(var_port) is up', LINES[0], LINES[2]]
+        factory.update('\n'.join(new_lines))
+        assert_same_build(factory, build('\n'.join(new_lines), **kwargs))
+
+    def test_update_converts_changed_lines_only(self):
+        factory = build('\n'.join(LINES), is_line=True)
+        patterns = factory.patterns
+        first = factory.user_data_pattern_table[LINES[0]]
+
+        new_lines = LINES[:]
+        new_lines[1] = '  digits(var_packets) packets output'
+        assert factory.update(new_lines) == 1
+        assert factory.patterns is patterns
+        assert factory.user_data_pattern_table[LINES[0]] is first
+        assert factory.update(new_lines) == 0
+        assert len(factory.pattern_fingerprint_table) == len(new_lines)
+
+    def test_update_after_reference_change(self):
+        factory = build('\n'.join(LINES), is_line=True)
+        REF.mark_modified()
+        assert factory.update('\n'.join(LINES)) == len(LINES)
+
+    def test_update_with_empty_data(self):
+        factory = build('\n'.join(LINES), is_line=True)
+        assert factory.update('') == 0
+        assert factory.patterns == []
+        assert factory.pattern_fingerprint_table == dict()
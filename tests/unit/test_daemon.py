@@ -0,0 +1,209 @@
+"""
+Unit tests for the regexapp daemon mode.
+
+Tests
+-----
+TestRegexDaemon.test_build_request
+    Verifies that a daemon answers a build request like the CLI.
+TestRegexDaemon.test_test_and_script_requests
+    Verifies that a daemon answers test and script requests.
+TestRegexDaemon.test_invalid_user_data
+    Verifies that a build error is reported with a failure exit code.
+TestRegexDaemon.test_version_mismatch
+    Verifies that a daemon rejects a client of another version.
+TestRegexDaemon.test_already_running
+    Verifies that a second daemon on the same address fails to start.
+TestRegexDaemon.test_tcp_address
+    Verifies that a daemon serves on localhost TCP.
+TestRegexDaemon.test_non_object_request
+    Verifies that a daemon rejects JSON which is not an object.
+TestRegexDaemon.test_rejected_kwargs
+    Verifies that a daemon rejects file options and unknown options.
+TestDaemonClient.test_unavailable_daemon
+    Verifies that a client returns None without a daemon.
+TestDaemonClient.test_cli_forwards_request
+    Verifies that `Cli` forwards a request to a running daemon.
+TestDaemonClient.test_forwarding_imports
+    Verifies that a forwarded request imports neither pattern
+    conversion modules nor genericlib, while a local one does.
+TestDaemonClient.test_cli_cache_directory
+    Verifies that `Cli` resolves a cache directory and builds locally.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from regexapp.config import version
+from regexapp.daemon import DaemonClient
+from regexapp.daemon import RegexDaemon
+from regexapp.daemon import process_request
+from regexapp.exceptions import DaemonError
+from regexapp.main import Cli
+
+
+USER_DATA = 'Interface word(var_name) is word(var_status)'
+
+requires_unix_socket = pytest.mark.skipif(
+    not hasattr(socket, 'AF_UNIX'), reason='Unix domain socket is not supported'
+)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = RegexDaemon(str(tmp_path / 'regexapp.sock'))
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+@requires_unix_socket
+class TestRegexDaemon:
+    def test_build_request(self, daemon):
+        request = dict(command='build', user_data=USER_DATA)
+        response = DaemonClient(daemon.address).request(request)
+        assert response['status'] == 0
+        assert response['output'] == process_request(request)[1]
+        assert response['output'].startswith('pattern = r"Interface (?P<name>')
+        assert daemon.total == 1
+
+    def test_test_and_script_requests(self, daemon):
+        client = DaemonClient(daemon.address)
+        request = dict(command='test', user_data=USER_DATA, test_data='Interface eth0 is up')
+        response = client.request(request)
+        assert response['output'].endswith("matched: [{'name': 'eth0', 'status': 'up'}]\n----------\nTrue")
+
+        request.update(command='script', platform='unittest')
+        response = client.request(request)
+        assert 'import unittest' in response['output']
+
+    def test_invalid_user_data(self, daemon):
+        response = DaemonClient(daemon.address).request(dict(command='build', user_data=1))
+        assert response['status'] == 1
+        assert response['output'].startswith('*** RegexBuilderError')
+
+    def test_version_mismatch(self, daemon):
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(daemon.address)
+            sock.sendall(b'{"command": "ping", "version": "0.0.0"}\n')
+            response = json.loads(sock.makefile('rb').readline())
+        assert response['error'].startswith('VERSION-MISMATCH')
+
+    def test_already_running(self, daemon):
+        with pytest.raises(DaemonError):
+            RegexDaemon(daemon.address).start()
+        assert DaemonClient(daemon.address).is_available()
+
+    def test_tcp_address(self):
+        server = RegexDaemon('127.0.0.1:0')
+        server.start()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            response = DaemonClient(server.address).request(dict(user_data=USER_DATA))
+            assert response['status'] == 0
+        finally:
+            server.shutdown()
+            thread.join(5)
+
+    def test_non_object_request(self, daemon):
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(daemon.address)
+            stream = sock.makefile('rb')
+            for data in [b'[1, 2]', b'"str"', b'5', b'null']:
+                sock.sendall(data + b'\n')
+                response = json.loads(stream.readline())
+                assert response['error'].startswith('INVALID-REQUEST')
+        assert daemon.total == 0
+        assert DaemonClient(daemon.address).is_available()
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [
+            dict(build_cache='/tmp/other-user-cache'),
+            dict(filename='/tmp/test_script.py'),
+            dict(is_line=True, unknown_option=True),
+        ]
+    )
+    def test_rejected_kwargs(self, daemon, kwargs):
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(daemon.address)
+            request = dict(command='build', user_data=USER_DATA, kwargs=kwargs, version=version)
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            response = json.loads(sock.makefile('rb').readline())
+        assert response['error'].startswith('INVALID-REQUEST')
+        assert daemon.total == 0
+
+        request = dict(command='build', user_data=USER_DATA, kwargs=dict(is_line=True, simplified=True))
+        assert DaemonClient(daemon.address).request(request)['status'] == 0
+
+
+class TestDaemonClient:
+    def test_unavailable_daemon(self, tmp_path):
+        client = DaemonClient(str(tmp_path / 'missing.sock'))
+        assert client.request(dict(command='build', user_data=USER_DATA)) is None
+        assert client.is_available() is False
+
+    @requires_unix_socket
+    def test_cli_forwards_request(self, daemon, monkeypatch, capsys):
+        argv = ['regexapp', '-u', USER_DATA, '--socket', daemon.address]
+        monkeypatch.setattr(sys, 'argv', argv)
+        with pytest.raises(SystemExit) as ex:
+            Cli().run()
+        assert ex.value.code == 0
+        assert capsys.readouterr().out.startswith('pattern = r"Interface (?P<name>')
+        assert daemon.total == 1
+
+    @requires_unix_socket
+    def test_forwarding_imports(self, daemon):
+        code = (
+            'import sys, regexapp.main; '
+            'sys.argv = ["regexapp", "-u", "abc digits(var_n)"] + sys.argv[1:]; '
+            'names = ["regexapp.core", "regexapp.collection", "regexapp.daemon", "genericlib"]\n'
+            'try:\n'
+            '    regexapp.main.execute()\n'
+            'except SystemExit:\n'
+            '    print([name for name in names if name in sys.modules])'
+        )
+        env = dict(os.environ)
+        root = str(Path(__file__).parents[2])
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+
+        for args, expected_modules in [
+            (['--socket', daemon.address], '[]'),
+            (['--no-daemon'], "['regexapp.core', 'regexapp.collection', 'regexapp.daemon', 'genericlib']"),
+        ]:
+            result = subprocess.run(
+                [sys.executable, '-c', code] + args,
+                capture_output=True, text=True, env=env, cwd=root
+            )
+            assert result.returncode == 0, result.stderr
+            lines = result.stdout.strip().splitlines()
+            assert lines[0] == r'pattern = r"abc (?P<n>\d+)"'
+            assert lines[-1] == expected_modules
+        assert daemon.total == 1
+
+    @requires_unix_socket
+    def test_cli_cache_directory(self, daemon, monkeypatch, capsys, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        argv = ['regexapp', '-u', USER_DATA, '--socket', daemon.address, '--cache', 'cache']
+        monkeypatch.setattr(sys, 'argv', argv)
+        cli = Cli()
+        cli.validate_cli_flags()
+        assert cli.kwargs['build_cache'] == os.path.join(str(tmp_path), 'cache')
+
+        with pytest.raises(SystemExit) as ex:
+            cli.build_regex_pattern()
+        assert ex.value.code == 0
+        assert capsys.readouterr().out.startswith('pattern = r"Interface (?P<name>')
+        assert daemon.total == 0
+        assert os.listdir(str(tmp_path / 'cache'))
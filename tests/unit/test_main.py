@@ -0,0 +1,48 @@
+"""
+Unit tests for the command-line entry point.
+
+Tests
+-----
+test_import_without_gui
+    Verifies that importing `regexapp.main` does not load the GUI,
+    tkinter, or the process pool.
+test_invalid_jobs
+    Verifies that a negative or non-integer `-j/--jobs` exits with
+    ``ECODE.BAD`` instead of a traceback.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from genericlib import ECODE
+
+from regexapp.main import Cli
+
+
+def test_import_without_gui():
+    code = (
+        'import sys, regexapp.main; '
+        'names = ["tkinter", "regexapp.application", "concurrent.futures.process"]; '
+        'print([name for name in names if name in sys.modules])'
+    )
+    env = dict(os.environ)
+    root = str(Path(__file__).parents[2])
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, env=env
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == '[]'
+
+
+@pytest.mark.parametrize('jobs', ['-1', 'x'])
+def test_invalid_jobs(jobs, monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'argv', ['regexapp', '-u', 'abc', '-r', '-t', 'abc', '-j', jobs])
+    with pytest.raises(SystemExit) as ex:
+        Cli()
+    assert ex.value.code == ECODE.BAD
+    assert capsys.readouterr().out.startswith('*** INVALID-JOBS')